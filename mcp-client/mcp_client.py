@@ -1,29 +1,813 @@
+import asyncio
+import itertools
 import json
+import os
+import re
+import subprocess
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "datasunrise-mcp-client", "version": "1.0.0"}
+
+# Server started by DataSunriseMCPClient when no command or transport is given
+DEFAULT_SERVER_SCRIPT = os.environ.get(
+    "DS_MCP_SERVER_SCRIPT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "build", "src", "index.js"),
+)
+
+
+class MCPError(Exception):
+    """
+    JSON-RPC error returned by the MCP server.
+    """
+    def __init__(self, code: int, message: str, data=None):
+        super().__init__(f"MCP error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class MCPCommandError(Exception):
+    """
+    A command run by a row iterator failed. `response` holds its response dictionary.
+    """
+    def __init__(self, tool_name: str, response: dict):
+        super().__init__(f"{tool_name} failed: {response.get('error', 'Unknown error')}")
+        self.tool_name = tool_name
+        self.response = response
+
+
+class MCPTransportError(ConnectionError):
+    """
+    The connection to the MCP server failed or was closed.
+    """
+
+
+class StdioTransport:
+    """
+    Persistent JSON-RPC connection to an MCP server over stdio.
+
+    Spawns the server (or attaches to the streams of one that is already running),
+    performs the initialize handshake once, and then multiplexes requests over the
+    pipe: every request gets a numeric id, several can be in flight at once, and a
+    reader thread resolves each one when the response with its id arrives.
+    """
+    def __init__(self, command=None, env=None, cwd=None, reader=None, writer=None, stderr=subprocess.DEVNULL):
+        """
+        Either `command` (argv of the server) or both `reader` and `writer`
+        (binary streams connected to a running server) must be given.
+        """
+        if command is None and (reader is None or writer is None):
+            raise ValueError("StdioTransport needs a server command or reader and writer streams")
+        self.command = list(command) if command is not None else None
+        self.env = env
+        self.cwd = cwd
+        self.stderr = stderr
+        self.process = None
+        self.server_info = None
+        self.server_capabilities = None
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._reader_thread = None
+        self._started = False
+        self._closed = False
+
+    def start(self, timeout: float = 30):
+        """
+        Starts the server if needed and performs the MCP initialize handshake.
+        Calling it again is a no-op; after close() it raises MCPTransportError.
+        """
+        with self._start_lock:
+            if self._closed:
+                raise MCPTransportError("Transport is closed")
+            if self._started:
+                return
+            if self.command is not None:
+                env = dict(os.environ, **self.env) if self.env else None
+                self.process = subprocess.Popen(
+                    self.command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=self.stderr,
+                    env=env,
+                    cwd=self.cwd,
+                )
+                self._reader = self.process.stdout
+                self._writer = self.process.stdin
+            self._reader_thread = threading.Thread(target=self._read_loop, name="mcp-stdio-reader", daemon=True)
+            self._reader_thread.start()
+            try:
+                result = self.send_request("initialize", {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": CLIENT_INFO,
+                }).result(timeout)
+            except BaseException:
+                self.close()
+                raise
+            self.server_info = result.get("serverInfo")
+            self.server_capabilities = result.get("capabilities", {})
+            self.notify("notifications/initialized")
+            self._started = True
+
+    def send_request(self, method: str, params: dict = None) -> Future:
+        """
+        Sends a request without waiting for the response.
+        Returns a Future that resolves to the `result` of the response,
+        or fails with MCPError or MCPTransportError.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise MCPTransportError("Transport is closed")
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        future.request_id = request_id
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            self._write(message)
+        except MCPTransportError as error:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            future.set_exception(error)
+        return future
+
+    def request(self, method: str, params: dict = None, timeout: float = None):
+        """
+        Sends a request and waits for its result. On timeout the server is
+        asked to cancel the request and TimeoutError is raised.
+        """
+        future = self.send_request(method, params)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self.cancel(future, "Client timeout")
+            raise TimeoutError(f"No response to {method} within {timeout} seconds") from None
+
+    def cancel(self, future: Future, reason: str = None):
+        """
+        Stops waiting for a request and tells the server to cancel it.
+        """
+        with self._lock:
+            pending = self._pending.pop(future.request_id, None)
+        if pending is None:
+            return
+        params = {"requestId": future.request_id}
+        if reason:
+            params["reason"] = reason
+        try:
+            self.notify("notifications/cancelled", params)
+        except MCPTransportError:
+            pass
+        future.cancel()
+
+    def notify(self, method: str, params: dict = None):
+        """
+        Sends a notification (no response is expected).
+        """
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._write(message)
+
+    def close(self, timeout: float = 5):
+        """
+        Closes the connection; a spawned server is stopped.
+        Requests still in flight fail with MCPTransportError.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._writer.close()
+        except (OSError, ValueError, AttributeError):
+            pass
+        if self.process is not None:
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.terminate()
+                try:
+                    self.process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+        self._fail_pending(MCPTransportError("Transport closed"))
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _write(self, message: dict):
+        data = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._write_lock:
+            try:
+                self._writer.write(data)
+                self._writer.flush()
+            except (OSError, ValueError) as error:
+                raise MCPTransportError(f"Cannot write to the MCP server: {error}") from error
+
+    def _read_loop(self):
+        try:
+            for line in self._reader:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    # Not a protocol message (e.g. a stray log line)
+                    continue
+                if isinstance(message, dict):
+                    self._dispatch(message)
+        except (OSError, ValueError):
+            pass
+        with self._lock:
+            self._closed = True
+        self._fail_pending(MCPTransportError("The MCP server closed the connection"))
+
+    def _dispatch(self, message: dict):
+        if "method" in message:
+            # Requests from the server; answer so it does not wait forever
+            if "id" in message:
+                if message["method"] == "ping":
+                    reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+                else:
+                    reply = {"jsonrpc": "2.0", "id": message["id"],
+                             "error": {"code": -32601, "message": f"Method not found: {message['method']}"}}
+                try:
+                    self._write(reply)
+                except MCPTransportError:
+                    pass
+            return
+        with self._lock:
+            future = self._pending.pop(message.get("id"), None)
+        if future is None or future.done():
+            return
+        if "error" in message:
+            error = message["error"] or {}
+            future.set_exception(MCPError(error.get("code", 0), error.get("message", ""), error.get("data")))
+        else:
+            future.set_result(message.get("result"))
+
+    def _fail_pending(self, error: Exception):
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+
+def _result_text(result: dict) -> str:
+    return "".join(item.get("text", "") for item in result.get("content", []) if item.get("type") == "text")
+
+
+def _tool_response(result: dict) -> dict:
+    """
+    Converts a run_cli_command tools/call result to the response dictionary
+    returned by the client methods: `status`, `data` (the CLI output),
+    `error`, `exit_code`, parsed `rows` when the server returned them, and the
+    full parsed `result`.
+    """
+    text = _result_text(result)
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        payload = None
+    status = "error" if result.get("isError") else "success"
+    if not isinstance(payload, dict):
+        response = {"status": status, "data": text}
+        if status == "error":
+            response["error"] = text
+        return response
+    return _command_response(payload, status)
+
+
+def _command_response(payload: dict, status: str) -> dict:
+    response = {
+        "status": status,
+        "data": payload.get("stdout", ""),
+        "exit_code": payload.get("exitCode"),
+        "result": payload,
+    }
+    if "rows" in payload:
+        response["rows"] = payload["rows"]
+    if status == "error":
+        response["error"] = payload.get("error") or payload.get("stderr") or "Unknown error"
+    return response
+
+
+def _step_response(step: dict) -> dict:
+    """
+    Converts one step outcome of a run_cli_batch result to a response dictionary.
+    """
+    if "result" not in step:
+        return {"status": "error", "data": "", "error": step.get("error") or "The step did not run"}
+    return _command_response(step["result"], "success" if step.get("status") == "succeeded" else "error")
+
+
+def _error_response(error: MCPError) -> dict:
+    return {"status": "error", "data": "", "error": error.message, "code": error.code}
+
 
-# This is a placeholder for the actual MCP tool calling mechanism.
-# In a real scenario, this function would interact with the MCP infrastructure
-# to invoke the specified tool on the given server with the provided arguments.
-def _call_mcp_tool(server_name: str, tool_name: str, arguments: dict):
+def _page_text(tool_name: str, response: dict) -> str:
     """
-    Placeholder for a function that calls an MCP tool.
-    This should be replaced with the actual implementation for your MCP environment.
+    Returns the output of one page read by a row iterator. Raises MCPCommandError
+    if the command failed or if the server cut the page (maxStdoutBytes), which
+    would break the rows around the cut.
     """
-    print(f"Calling MCP Tool on server '{server_name}':")
-    print(f"  Tool: {tool_name}")
-    print(f"  Arguments: {json.dumps(arguments, indent=2)}")
-    # In a real implementation, this would return the result from the MCP tool.
-    # For now, returning a dummy success response.
-    return {"status": "success", "data": f"Successfully executed {tool_name}"}
+    if response.get("status") != "success":
+        raise MCPCommandError(tool_name, response)
+    omitted = response.get("result", {}).get("stdoutOmittedBytes")
+    if omitted:
+        raise MCPCommandError(tool_name, {**response, "error": f"the server cut {omitted} bytes out of a page"})
+    return response.get("data", "")
+
+
+# Table cells are separated by colons followed by whitespace, so times such as 12:00:00 stay intact
+_CELL_SEPARATOR = re.compile(r":(?=\s|$)")
+
+
+class _RowParser:
+    """
+    Line-by-line port of the server's output parser (src/output_parser.ts)
+    that hands out each row as soon as it is complete, so pages of one output
+    can be fed one after another. JSON output can only be parsed as a whole
+    and is buffered until finish(). Both parsers are tested against
+    test/command_test/output_parser_test_cases.json.
+    """
+    def __init__(self):
+        self._partial = ""
+        self._rows = []
+        self._record = None
+        self._last_key = None
+        self._section = None
+        self._json = None
+        self._saw_content = False
+
+    def feed(self, text: str) -> list:
+        """
+        Parses the next piece of output and returns the rows completed by it.
+        """
+        if self._json is not None:
+            self._json.append(text)
+            return []
+        if not self._saw_content:
+            stripped = text.lstrip()
+            if not stripped:
+                self._partial += text
+                return []
+            self._saw_content = True
+            if stripped[0] in "{[":
+                self._json = [self._partial, text]
+                self._partial = ""
+                return []
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line)
+        rows, self._rows = self._rows, []
+        return rows
+
+    def finish(self) -> list:
+        """
+        Returns the rows left after the last piece of output.
+        """
+        if self._json is not None:
+            return _json_rows("".join(self._json))
+        if self._partial:
+            self._line(self._partial)
+            self._partial = ""
+        self._flush()
+        rows, self._rows = self._rows, []
+        return rows
+
+    def _line(self, raw_line: str):
+        line = raw_line.rstrip()
+        trimmed = line.lstrip()
+        if not trimmed:
+            self._flush()
+            return
+        if trimmed == "OK" and self._record is None:
+            return
+        if trimmed[0] == ":":
+            if line[0] != ":" and self._record is not None and self._last_key is not None:
+                # Indented ': value' continues the previous key
+                _append_value(self._record, self._last_key, trimmed[1:].strip())
+                return
+            self._flush()
+            cells = _CELL_SEPARATOR.split(trimmed)[1:]
+            self._rows.append({f"column{index + 1}": cell.strip() for index, cell in enumerate(cells)})
+            return
+        pair = _split_key_value(trimmed)
+        if pair:
+            if self._record is None:
+                self._record = {}
+            _append_value(self._record, pair[0], pair[1])
+            self._last_key = pair[0]
+            return
+        if trimmed.endswith(":") and trimmed.index(":") == len(trimmed) - 1:
+            # Heading of a list or of a group of keys
+            self._section = trimmed[:-1].strip()
+            return
+        if self._section is None:
+            # Free text such as 'No Servers'
+            return
+        if self._record is not None:
+            _append_value(self._record, self._section, trimmed)
+        else:
+            self._rows.append({"value": trimmed})
+
+    def _flush(self):
+        if self._record is not None:
+            self._rows.append(self._record)
+            self._record = None
+            self._last_key = None
+
+
+def _append_value(record: dict, key: str, value: str):
+    existing = record.get(key)
+    if existing is None:
+        record[key] = value
+    elif isinstance(existing, list):
+        existing.append(value)
+    else:
+        record[key] = [existing, value]
+
+
+def _split_key_value(line: str):
+    separator = line.find(" : ")
+    value_start = separator + 3
+    if separator < 0 and line.endswith(" :"):
+        separator = len(line) - 2
+        value_start = len(line)
+    if separator < 0:
+        separator = line.find(": ")
+        value_start = separator + 2
+    if separator <= 0:
+        return None
+    key = line[:separator].strip()
+    if key.endswith(":"):
+        key = key[:-1].rstrip()
+    return (key, line[value_start:].strip()) if key else None
+
+
+def _json_rows(text: str) -> list:
+    text = text.rstrip()
+    if text.endswith("OK"):
+        text = text[:-2]
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return []
+    if isinstance(value, dict) and isinstance(value.get("data"), list) and value["data"] and isinstance(value["data"][0], list):
+        # Tabular JSON: the first entry holds the column names
+        columns, *records = value["data"]
+        return [dict(zip((str(column) for column in columns), record)) for record in records]
+    return value if isinstance(value, list) else [value]
+
+
+# Words that end the entity family part of a tool name (host_group_add -> host_group)
+_TOOL_VERBS = {
+    "show", "add", "update", "delete", "copy", "change", "grant", "set", "revoke",
+    "enable", "disable", "start", "stop", "restart", "clean", "recover", "create",
+}
+# Commands that change other families than their name says
+_CACHE_INVALIDATES = {
+    "import_users": ("db_user",),
+    "import_hosts": ("host",),
+    "import_apps": ("application",),
+}
+# Commands after which no cached response can be trusted
+_CACHE_CLEARS = {"connect", "dictionary_recover", "dictionary_clean"}
+
+
+def _tool_family(tool_name: str) -> str:
+    """
+    Entity family of a tool: the words before its verb (instance_proxy_show_all -> instance_proxy).
+    """
+    words = tool_name.split("_")
+    for index, word in enumerate(words):
+        if word in _TOOL_VERBS and index > 0:
+            return "_".join(words[:index])
+    return words[0]
+
+
+class ResponseCache:
+    """
+    TTL/LRU cache of `*_show_all` and `*_show_one` responses, grouped by entity family.
+
+    Any other call evicts the cached responses of its family and of related
+    families (instance_proxy_add evicts instance_show_one and the other way
+    round). Only successful responses are kept. Cached dictionaries are shared
+    between callers and must not be modified.
+    """
+    def __init__(self, ttl: float = 30, max_entries: int = 512, clock=time.monotonic):
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("ttl must be positive and max_entries at least 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires, family, response)
+        self._generation = 0  # bumped by every invalidation
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+        self._invalidated = 0
+
+    @staticmethod
+    def cacheable(tool_name: str) -> bool:
+        return "_show_all" in tool_name or "_show_one" in tool_name
+
+    def begin(self, tool_name: str, args: dict):
+        """
+        Starts a call. Returns (cached response or None, ticket for finish()).
+        """
+        if not self.cacheable(tool_name):
+            self.invalidate(tool_name)
+            return None, None
+        family = _tool_family(tool_name)
+        key = (tool_name, json.dumps({k: v for k, v in args.items() if v is not None}, sort_keys=True, default=str))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[2], None
+                del self._entries[key]
+                self._expired += 1
+            self._misses += 1
+            return None, (key, family, self._generation)
+
+    def finish(self, tool_name: str, ticket, response: dict):
+        """
+        Ends a call started with begin(): caches a successful read, or
+        invalidates again after a write. Reads that overlapped a write are
+        not cached.
+        """
+        if ticket is None:
+            if not self.cacheable(tool_name):
+                self.invalidate(tool_name)
+            return
+        key, family, generation = ticket
+        if response.get("status") != "success":
+            return
+        with self._lock:
+            if self._generation != generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, family, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted += 1
+
+    def invalidate(self, tool_name: str):
+        """
+        Evicts the responses a call of this tool may have made stale.
+        """
+        if tool_name in _CACHE_CLEARS:
+            self.clear()
+            return
+        families = _CACHE_INVALIDATES.get(tool_name, (_tool_family(tool_name),))
+        with self._lock:
+            self._generation += 1
+            for key, (_, family, _) in list(self._entries.items()):
+                if any(_related_families(family, changed) for changed in families):
+                    del self._entries[key]
+                    self._invalidated += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._invalidated += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Counters for tuning ttl and max_entries.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "expired": self._expired,
+                "evicted": self._evicted,
+                "invalidated": self._invalidated,
+            }
+
+
+def _related_families(cached: str, changed: str) -> bool:
+    return cached == changed or cached.startswith(changed + "_") or changed.startswith(cached + "_")
+
 
 class DataSunriseMCPClient:
-    def __init__(self, server_name="datasunrise-cli"):
+    def __init__(self, server_name="datasunrise-cli", server_command=None, server_env=None,
+                 transport: StdioTransport = None, timeout: float = None, cache: ResponseCache = None):
+        """
+        Each method sends one run_cli_command request over a persistent
+        connection to the MCP server. By default the server is started with
+        `node <DEFAULT_SERVER_SCRIPT>` on the first call; pass `server_command`
+        (argv, e.g. with extra server options) or an already created `transport`
+        to use another one. `timeout` limits the wait for each response in
+        seconds (None waits as long as the server takes). Pass a ResponseCache
+        as `cache` to reuse `*_show_all` / `*_show_one` responses.
+        """
         self.server_name = server_name
         self.session_active = False
+        self.timeout = timeout
+        self.cache = cache
+        if transport is None:
+            transport = StdioTransport(server_command or ["node", DEFAULT_SERVER_SCRIPT], env=server_env)
+        self.transport = transport
+        self._tool_names = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the connection to the MCP server (and stops it if the client started it).
+        """
+        self.transport.close()
+
+    def batch(self, max_parallel: int = 1) -> "ClientBatch":
+        """
+        Records the method calls made inside a `with` block and sends them
+        together when the block ends:
+
+            with client.batch() as b:
+                added = b.host_add(name="web1", host_address="10.0.0.1")
+                b.tag_add(name="web", entity_type="host", entity_name="web1")
+            added.result()  # the response dictionary
+
+        Inside the block every method returns a Future. The calls run in the
+        order they were made unless `max_parallel` allows several at a time.
+        """
+        return ClientBatch(self, max_parallel)
+
+    def _server_tools(self) -> set:
+        """
+        Names of the tools offered by the server (listed once per client).
+        """
+        if self._tool_names is None:
+            self.transport.start()
+            names, cursor = set(), None
+            while True:
+                result = self.transport.request("tools/list", {"cursor": cursor} if cursor else {}, self.timeout)
+                names.update(tool["name"] for tool in result.get("tools", []))
+                cursor = result.get("nextCursor")
+                if not cursor:
+                    break
+            self._tool_names = names
+        return self._tool_names
+
+    def _submit_tool(self, tool_name: str, args: dict, options: dict = None) -> Future:
+        """
+        Sends one command to the server without waiting; `options` are further
+        run_cli_command arguments such as pageSize and cursor.
+        Returns a Future of the response dictionary.
+        """
+        self.transport.start()
+        arguments = {k: v for k, v in args.items() if v is not None}
+        request = self.transport.send_request("tools/call", {
+            "name": "run_cli_command",
+            "arguments": {"command_name": tool_name, "arguments": arguments, **(options or {})},
+        })
+        response = Future()
+        response.request = request
+
+        def resolve(done: Future):
+            if done.cancelled():
+                response.cancel()
+                return
+            error = done.exception()
+            if isinstance(error, MCPError):
+                response.set_result(_error_response(error))
+            elif error is not None:
+                response.set_exception(error)
+            else:
+                response.set_result(_tool_response(done.result()))
+
+        request.add_done_callback(resolve)
+        return response
+
+    def _call_tool(self, tool_name: str, args: dict) -> dict:
+        """
+        Runs one command on the server and returns its response dictionary.
+        """
+        ticket = None
+        if self.cache is not None:
+            cached, ticket = self.cache.begin(tool_name, args)
+            if cached is not None:
+                return cached
+        result = self._run_tool(tool_name, args)
+        if self.cache is not None:
+            self.cache.finish(tool_name, ticket, result)
+        return result
+
+    def _run_tool(self, tool_name: str, args: dict, options: dict = None) -> dict:
+        response = self._submit_tool(tool_name, args, options)
+        try:
+            return response.result(self.timeout)
+        except FutureTimeoutError:
+            self.transport.cancel(response.request, "Client timeout")
+            raise TimeoutError(f"No response to {tool_name} within {self.timeout} seconds") from None
+
+    def iter_rows(self, tool_name: str, args: dict, page_size: int = 1000):
+        """
+        Runs a command and yields the parsed rows of its output one at a time.
+        The server keeps the output and returns it in pages of `page_size`
+        lines, so only one page is held in memory. Raises MCPCommandError if
+        the command fails or a page comes back cut.
+        """
+        parser = _RowParser()
+        options = {"pageSize": page_size}
+        while True:
+            response = self._run_tool(tool_name, args, options)
+            yield from parser.feed(_page_text(tool_name, response))
+            cursor = response.get("result", {}).get("page", {}).get("nextCursor")
+            if not cursor:
+                break
+            options = {"pageSize": page_size, "cursor": cursor}
+        yield from parser.finish()
+
+    def iter_reports(self, report_type: str, event_type: str, begin_date: str = None, end_date: str = None,
+                     instance: str = None, page_size: int = 1000):
+        """
+        Yields the rows of reports_show one at a time (see iter_rows).
+        """
+        args = {"reportType": report_type, "eventType": event_type, "beginDate": begin_date,
+                "endDate": end_date, "instance": instance}
+        return self.iter_rows("reports_show", args, page_size)
+
+    def iter_events(self, session_id: str, event_type: str, page_size: int = 1000, **filters):
+        """
+        Yields the events of a session one at a time (showEvents, see iter_rows).
+        event_type: audit | security | mask; filters use the tool's names (beginDate, login, ...).
+        """
+        args = {"id": session_id, "type": event_type, **filters}
+        return self.iter_rows("misc_show_events", args, page_size)
+
+    def iter_sessions(self, page_size: int = 1000, **filters):
+        """
+        Yields sessions one at a time (showSessions, see iter_rows).
+        """
+        return self.iter_rows("misc_show_sessions", filters, page_size)
+
+    def iter_system_errors(self, begin_date: str = None, end_date: str = None, page_size: int = 1000):
+        """
+        Yields system errors one at a time (showSystemErrors, see iter_rows).
+        """
+        return self.iter_rows("misc_show_system_errors", {"beginDate": begin_date, "endDate": end_date}, page_size)
+
+    def iter_db_users(self, page_size: int = 1000):
+        """
+        Yields the rows of db_user_show_all one at a time (see iter_rows).
+        """
+        return self.iter_rows("db_user_show_all", {}, page_size)
+
+    def iter_instances(self, page_size: int = 1000):
+        """
+        Yields the rows of instance_show_all one at a time (see iter_rows).
+        """
+        return self.iter_rows("instance_show_all", {}, page_size)
 
     def connect(self, host="127.0.0.1", port="11000", protocol="https", login=None, password=None):
         """
         Connects to the DataSunrise firewall.
         """
+        args = self._connect_args(host, port, protocol, login, password)
+        return self._connected(self._call_tool("connect", args))
+
+    def _connect_args(self, host, port, protocol, login, password) -> dict:
         args = {
             "host": host,
             "port": port,
@@ -33,8 +817,12 @@ class DataSunriseMCPClient:
             args["login"] = login
         if password:
             args["password"] = password
-        
-        response = _call_mcp_tool(self.server_name, "connect", args)
+        return args
+
+    def _connected(self, response: dict) -> dict:
+        """
+        Records the outcome of a connect call.
+        """
         # Assuming the connect tool indicates success in its response
         if response.get("status") == "success": # Adjust based on actual response structure
              # Potentially parse session ID or confirmation from response
@@ -50,21 +838,21 @@ class DataSunriseMCPClient:
         Starts the DataSunrise core engine forcefully.
         """
         args = {"force": force}
-        return _call_mcp_tool(self.server_name, "core_start", args)
+        return self._call_tool("core_start", args)
 
     def core_stop(self, force=True):
         """
         Stops the DataSunrise core engine forcefully.
         """
         args = {"force": force}
-        return _call_mcp_tool(self.server_name, "core_stop", args)
+        return self._call_tool("core_stop", args)
 
     def core_restart(self, force=True):
         """
         Restarts the DataSunrise core engine forcefully.
         """
         args = {"force": force}
-        return _call_mcp_tool(self.server_name, "core_restart", args)
+        return self._call_tool("core_restart", args)
 
     def core_show_state(self, ds_server: str, worker: int = 1):
         """
@@ -74,7 +862,7 @@ class DataSunriseMCPClient:
             "dsServer": ds_server,
             "worker": worker
         }
-        return _call_mcp_tool(self.server_name, "core_show_state", args)
+        return self._call_tool("core_show_state", args)
 
     # --- Application Commands ---
     def application_add(self, name: str):
@@ -82,35 +870,35 @@ class DataSunriseMCPClient:
         Adds a new application.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "application_add", args)
+        return self._call_tool("application_add", args)
 
     def application_update(self, name: str, new_name: str):
         """
         Updates an existing application's name.
         """
         args = {"name": name, "newName": new_name}
-        return _call_mcp_tool(self.server_name, "application_update", args)
+        return self._call_tool("application_update", args)
 
     def application_show_all(self):
         """
         Displays a list of all configured applications.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "application_show_all", args)
+        return self._call_tool("application_show_all", args)
 
     def application_show_one(self, name: str):
         """
         Shows detailed information for a specific application.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "application_show_one", args)
+        return self._call_tool("application_show_one", args)
 
     def application_delete(self, name: str):
         """
         Deletes a specified application.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "application_delete", args)
+        return self._call_tool("application_delete", args)
 
     # --- CEF Commands ---
     def cef_add_group(self, name: str, enable: bool = True):
@@ -118,7 +906,7 @@ class DataSunriseMCPClient:
         Adds a new CEF group.
         """
         args = {"name": name, "enable": enable}
-        return _call_mcp_tool(self.server_name, "cef_add_group", args)
+        return self._call_tool("cef_add_group", args)
 
     def cef_add_item(self, name: str, group_name: str, type: str, cef: str, enable: bool = True):
         """
@@ -131,7 +919,7 @@ class DataSunriseMCPClient:
             "cef": cef,
             "enable": enable
         }
-        return _call_mcp_tool(self.server_name, "cef_add_item", args)
+        return self._call_tool("cef_add_item", args)
 
     def cef_update_group(self, name: str, new_name: str = None, enable: bool = None):
         """
@@ -142,7 +930,7 @@ class DataSunriseMCPClient:
             args["newName"] = new_name
         if enable is not None:
             args["enable"] = enable
-        return _call_mcp_tool(self.server_name, "cef_update_group", args)
+        return self._call_tool("cef_update_group", args)
 
     def cef_update_item(self, name: str, group_name: str, new_name: str = None, type: str = None, cef: str = None, enable: bool = None):
         """
@@ -157,49 +945,49 @@ class DataSunriseMCPClient:
             args["cef"] = cef
         if enable is not None:
             args["enable"] = enable
-        return _call_mcp_tool(self.server_name, "cef_update_item", args)
+        return self._call_tool("cef_update_item", args)
 
     def cef_show_groups(self):
         """
         Displays a list of all configured CEF groups.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "cef_show_groups", args)
+        return self._call_tool("cef_show_groups", args)
 
     def cef_show_group(self, name: str):
         """
         Shows detailed information for a specific CEF group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "cef_show_group", args)
+        return self._call_tool("cef_show_group", args)
 
     def cef_show_items(self, group_name: str):
         """
         Displays all CEF items within a specified CEF group.
         """
         args = {"groupName": group_name}
-        return _call_mcp_tool(self.server_name, "cef_show_items", args)
+        return self._call_tool("cef_show_items", args)
 
     def cef_show_item(self, name: str, group_name: str):
         """
         Shows detailed information for a specific CEF item within a group.
         """
         args = {"name": name, "groupName": group_name}
-        return _call_mcp_tool(self.server_name, "cef_show_item", args)
+        return self._call_tool("cef_show_item", args)
 
     def cef_delete_group(self, name: str):
         """
         Deletes a specified CEF group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "cef_delete_group", args)
+        return self._call_tool("cef_delete_group", args)
 
     def cef_delete_item(self, name: str, group_name: str):
         """
         Deletes a specific CEF item from a CEF group.
         """
         args = {"name": name, "groupName": group_name}
-        return _call_mcp_tool(self.server_name, "cef_delete_item", args)
+        return self._call_tool("cef_delete_item", args)
 
     # --- Database User Commands ---
     def db_user_add(self, name: str, inst: str = None, db_type: str = None):
@@ -208,7 +996,7 @@ class DataSunriseMCPClient:
             args["inst"] = inst
         if db_type:
             args["dbType"] = db_type
-        return _call_mcp_tool(self.server_name, "db_user_add", args)
+        return self._call_tool("db_user_add", args)
 
     def db_user_group_add(self, name: str, inst: str = None, db_type: str = None, add_members: str = None):
         args = {"name": name}
@@ -218,7 +1006,7 @@ class DataSunriseMCPClient:
             args["dbType"] = db_type
         if add_members:
             args["addMembers"] = add_members
-        return _call_mcp_tool(self.server_name, "db_user_group_add", args)
+        return self._call_tool("db_user_group_add", args)
 
     def db_user_mapping_add(self, inst: str, db_login: str, db_password: str, 
                               ad_login: str = None, ad_group: str = None, 
@@ -237,7 +1025,7 @@ class DataSunriseMCPClient:
             args["ldapServer"] = ldap_server
         if hash_type:
             args["hashType"] = hash_type
-        return _call_mcp_tool(self.server_name, "db_user_mapping_add", args)
+        return self._call_tool("db_user_mapping_add", args)
 
     def ldap_server_add(self, name: str, host: str, port: str, base_dn: str, default: bool = True):
         args = {
@@ -247,13 +1035,13 @@ class DataSunriseMCPClient:
             "baseDn": base_dn,
             "default": default
         }
-        return _call_mcp_tool(self.server_name, "ldap_server_add", args)
+        return self._call_tool("ldap_server_add", args)
 
     def db_user_update(self, name: str, new_name: str = None):
         args = {"name": name}
         if new_name:
             args["newName"] = new_name
-        return _call_mcp_tool(self.server_name, "db_user_update", args)
+        return self._call_tool("db_user_update", args)
 
     def db_user_group_update(self, name: str, new_name: str = None, add_members: str = None, remove_members: str = None):
         args = {"name": name}
@@ -263,7 +1051,7 @@ class DataSunriseMCPClient:
             args["addMembers"] = add_members
         if remove_members:
             args["removeMembers"] = remove_members
-        return _call_mcp_tool(self.server_name, "db_user_group_update", args)
+        return self._call_tool("db_user_group_update", args)
 
     def ldap_server_update(self, name: str, new_name: str = None, host: str = None, port: str = None, base_dn: str = None, default: bool = None):
         args = {"name": name}
@@ -272,57 +1060,57 @@ class DataSunriseMCPClient:
         # Other params like host, port, baseDn, default are part of add, not update via CLI tool.
         # For a true MCP client, one might need separate methods or more complex logic if the MCP tool supports more update fields.
         # Sticking to what `dscli updateLdapServer` supports, which is primarily renaming.
-        return _call_mcp_tool(self.server_name, "ldap_server_update", args)
+        return self._call_tool("ldap_server_update", args)
 
 
     def db_user_show_all(self):
-        return _call_mcp_tool(self.server_name, "db_user_show_all", {})
+        return self._call_tool("db_user_show_all", {})
 
     def db_user_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "db_user_show_one", args)
+        return self._call_tool("db_user_show_one", args)
 
     def db_user_group_show_all(self):
-        return _call_mcp_tool(self.server_name, "db_user_group_show_all", {})
+        return self._call_tool("db_user_group_show_all", {})
 
     def db_user_group_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "db_user_group_show_one", args)
+        return self._call_tool("db_user_group_show_one", args)
 
     def db_user_mapping_show(self, instance: str):
         args = {"instance": instance}
-        return _call_mcp_tool(self.server_name, "db_user_mapping_show", args)
+        return self._call_tool("db_user_mapping_show", args)
 
     def ldap_server_show_all(self):
-        return _call_mcp_tool(self.server_name, "ldap_server_show_all", {})
+        return self._call_tool("ldap_server_show_all", {})
 
     def ldap_server_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "ldap_server_show_one", args)
+        return self._call_tool("ldap_server_show_one", args)
 
     def db_user_mapping_enable(self, instance: str, map_type: str = "config"):
         args = {"instance": instance, "mapType": map_type}
-        return _call_mcp_tool(self.server_name, "db_user_mapping_enable", args)
+        return self._call_tool("db_user_mapping_enable", args)
 
     def db_user_mapping_disable(self, instance: str):
         args = {"instance": instance}
-        return _call_mcp_tool(self.server_name, "db_user_mapping_disable", args)
+        return self._call_tool("db_user_mapping_disable", args)
 
     def db_user_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "db_user_delete", args)
+        return self._call_tool("db_user_delete", args)
 
     def db_user_group_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "db_user_group_delete", args)
+        return self._call_tool("db_user_group_delete", args)
 
     def db_user_mapping_delete(self, instance: str, ad_login: str):
         args = {"instance": instance, "adLogin": ad_login}
-        return _call_mcp_tool(self.server_name, "db_user_mapping_delete", args)
+        return self._call_tool("db_user_mapping_delete", args)
 
     def ldap_server_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "ldap_server_delete", args)
+        return self._call_tool("ldap_server_delete", args)
 
     # --- Dictionary Commands ---
     def dictionary_backup_create(self):
@@ -330,35 +1118,35 @@ class DataSunriseMCPClient:
         Creates a backup of the DataSunrise system dictionary.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "dictionary_backup_create", args)
+        return self._call_tool("dictionary_backup_create", args)
 
     def dictionary_backup_show_all(self):
         """
         Displays a list of available dictionary backups.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "dictionary_backup_show_all", args)
+        return self._call_tool("dictionary_backup_show_all", args)
 
     def dictionary_clean(self, force: bool = True):
         """
         Cleans the DataSunrise dictionary.
         """
         args = {"force": force}
-        return _call_mcp_tool(self.server_name, "dictionary_clean", args)
+        return self._call_tool("dictionary_clean", args)
 
     def dictionary_recover(self, backup_id: str): # Changed id to backup_id to avoid keyword clash
         """
         Recovers the DataSunrise dictionary from a specified backup ID.
         """
         args = {"id": backup_id}
-        return _call_mcp_tool(self.server_name, "dictionary_recover", args)
+        return self._call_tool("dictionary_recover", args)
 
     # --- Discovery Commands ---
     def discovery_group_add(self, name: str, security_standards: str = None):
         args = {"name": name}
         if security_standards:
             args["securityStandards"] = security_standards
-        return _call_mcp_tool(self.server_name, "discovery_group_add", args)
+        return self._call_tool("discovery_group_add", args)
 
     def discovery_attribute_add(self, group: str, name: str, col_names: str = None, col_names_cs: bool = False,
                                 col_type: str = None, cont_template: str = None, cont_template_cs: bool = False,
@@ -381,7 +1169,7 @@ class DataSunriseMCPClient:
         if max_val is not None: args["max"] = max_val
         if min_date: args["minDate"] = min_date
         if max_date: args["maxDate"] = max_date
-        return _call_mcp_tool(self.server_name, "discovery_attribute_add", args)
+        return self._call_tool("discovery_attribute_add", args)
 
     def discovery_group_update(self, name: str, new_name: str = None, security_standards: str = None):
         args = {"name": name}
@@ -389,7 +1177,7 @@ class DataSunriseMCPClient:
             args["newName"] = new_name
         if security_standards:
             args["securityStandards"] = security_standards
-        return _call_mcp_tool(self.server_name, "discovery_group_update", args)
+        return self._call_tool("discovery_group_update", args)
 
     def discovery_attribute_update(self, group: str, name: str, new_name: str = None, col_names: str = None, 
                                    col_names_cs: bool = None, col_type: str = None, 
@@ -401,32 +1189,32 @@ class DataSunriseMCPClient:
         if col_type: args["colType"] = col_type
         if cont_template: args["contTemplate"] = cont_template
         if cont_template_cs is not None: args["contTemplateCS"] = cont_template_cs
-        return _call_mcp_tool(self.server_name, "discovery_attribute_update", args)
+        return self._call_tool("discovery_attribute_update", args)
 
     def discovery_group_copy(self, name: str, new_name: str = None):
         args = {"name": name}
         if new_name:
             args["newName"] = new_name
-        return _call_mcp_tool(self.server_name, "discovery_group_copy", args)
+        return self._call_tool("discovery_group_copy", args)
 
     def discovery_group_show_all(self):
-        return _call_mcp_tool(self.server_name, "discovery_group_show_all", {})
+        return self._call_tool("discovery_group_show_all", {})
 
     def discovery_group_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "discovery_group_show_one", args)
+        return self._call_tool("discovery_group_show_one", args)
 
     def discovery_attribute_show(self, group: str, name: str):
         args = {"group": group, "name": name}
-        return _call_mcp_tool(self.server_name, "discovery_attribute_show", args)
+        return self._call_tool("discovery_attribute_show", args)
 
     def discovery_group_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "discovery_group_delete", args)
+        return self._call_tool("discovery_group_delete", args)
 
     def discovery_attribute_delete(self, group: str, name: str):
         args = {"group": group, "name": name}
-        return _call_mcp_tool(self.server_name, "discovery_attribute_delete", args)
+        return self._call_tool("discovery_attribute_delete", args)
 
     # --- DataSunrise User Commands ---
     def ds_user_add(self, login: str, password: str, role: str, email: str = None, 
@@ -446,7 +1234,7 @@ class DataSunriseMCPClient:
         if white_groups: args["whiteGroups"] = white_groups
         if black_hosts: args["blackHosts"] = black_hosts
         if black_groups: args["blackGroups"] = black_groups
-        return _call_mcp_tool(self.server_name, "ds_user_add", args)
+        return self._call_tool("ds_user_add", args)
 
     def ds_user_update(self, login: str, role: str = None, email: str = None, 
                        enable_ad_auth: bool = None, allow_login: bool = None, 
@@ -457,14 +1245,14 @@ class DataSunriseMCPClient:
         if enable_ad_auth is not None: args["enableADAuth"] = enable_ad_auth
         if allow_login is not None: args["allowLogin"] = allow_login
         if two_factor_auth: args["twoFactorAuth"] = two_factor_auth
-        return _call_mcp_tool(self.server_name, "ds_user_update", args)
+        return self._call_tool("ds_user_update", args)
 
     def ds_user_show_all(self):
-        return _call_mcp_tool(self.server_name, "ds_user_show_all", {})
+        return self._call_tool("ds_user_show_all", {})
 
     def ds_user_show_one(self, login: str):
         args = {"login": login}
-        return _call_mcp_tool(self.server_name, "ds_user_show_one", args)
+        return self._call_tool("ds_user_show_one", args)
 
     def ds_user_change_password(self, login: str, current_pwd: str, new_pwd: str):
         args = {
@@ -472,11 +1260,11 @@ class DataSunriseMCPClient:
             "currentPwd": current_pwd,
             "newPwd": new_pwd
         }
-        return _call_mcp_tool(self.server_name, "ds_user_change_password", args)
+        return self._call_tool("ds_user_change_password", args)
 
     def ds_user_delete(self, login: str):
         args = {"login": login}
-        return _call_mcp_tool(self.server_name, "ds_user_delete", args)
+        return self._call_tool("ds_user_delete", args)
 
     # --- Host Commands ---
     def host_add(self, name: str, host_address: str = None, net_ipv4: str = None, net_mask_v4: str = None, 
@@ -499,19 +1287,19 @@ class DataSunriseMCPClient:
         else:
             # Raise an error or handle as appropriate if no valid host type is provided
             pass # Or default to one type if that makes sense
-        return _call_mcp_tool(self.server_name, "host_add", args)
+        return self._call_tool("host_add", args)
 
     def host_group_add(self, name: str, add_members: str = None):
         args = {"name": name}
         if add_members:
             args["addMembers"] = add_members
-        return _call_mcp_tool(self.server_name, "host_group_add", args)
+        return self._call_tool("host_group_add", args)
 
     def host_update(self, name: str, host_address: str = None): # Changed host to host_address for clarity
         args = {"name": name}
         if host_address: # Corresponds to -host in CLI updateHost
             args["host"] = host_address
-        return _call_mcp_tool(self.server_name, "host_update", args)
+        return self._call_tool("host_update", args)
 
     def host_group_update(self, name: str, new_name: str = None, add_members: str = None, remove_members: str = None):
         args = {"name": name}
@@ -521,29 +1309,29 @@ class DataSunriseMCPClient:
             args["addMembers"] = add_members
         if remove_members:
             args["removeMembers"] = remove_members
-        return _call_mcp_tool(self.server_name, "host_group_update", args)
+        return self._call_tool("host_group_update", args)
 
     def host_show_all(self):
-        return _call_mcp_tool(self.server_name, "host_show_all", {})
+        return self._call_tool("host_show_all", {})
 
     def host_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "host_show_one", args)
+        return self._call_tool("host_show_one", args)
 
     def host_group_show_all(self):
-        return _call_mcp_tool(self.server_name, "host_group_show_all", {})
+        return self._call_tool("host_group_show_all", {})
 
     def host_group_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "host_group_show_one", args)
+        return self._call_tool("host_group_show_one", args)
 
     def host_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "host_delete", args)
+        return self._call_tool("host_delete", args)
 
     def host_group_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "host_group_delete", args)
+        return self._call_tool("host_group_delete", args)
 
     # --- Import Commands ---
     def import_users(self, file_name: str):
@@ -551,21 +1339,21 @@ class DataSunriseMCPClient:
         Imports DataSunrise users from a specified CSV file.
         """
         args = {"fileName": file_name}
-        return _call_mcp_tool(self.server_name, "import_users", args)
+        return self._call_tool("import_users", args)
 
     def import_hosts(self, file_name: str):
         """
         Imports host definitions from a specified CSV file.
         """
         args = {"fileName": file_name}
-        return _call_mcp_tool(self.server_name, "import_hosts", args)
+        return self._call_tool("import_hosts", args)
 
     def import_apps(self, file_name: str):
         """
         Imports application definitions from a specified CSV file.
         """
         args = {"fileName": file_name}
-        return _call_mcp_tool(self.server_name, "import_apps", args)
+        return self._call_tool("import_apps", args)
 
     # --- Instance Commands ---
     def instance_add(self, name: str, db_type: str, login: str, 
@@ -593,7 +1381,7 @@ class DataSunriseMCPClient:
         if query_result_location_athena: args["queryResultLocation"] = query_result_location_athena
         if env_name: args["envName"] = env_name
         # Add other optional params as needed
-        return _call_mcp_tool(self.server_name, "instance_add", args)
+        return self._call_tool("instance_add", args)
 
     def instance_add_plus(self, name: str, db_type: str, db_host: str, db_port: str, mode: str,
                           proxy_port: str = None, # Required if mode is PROXY
@@ -632,15 +1420,15 @@ class DataSunriseMCPClient:
             if connect_type_trailing: args["connectType"] = connect_type_trailing
         
         if server: args["server"] = server
-        return _call_mcp_tool(self.server_name, "instance_add_plus", args)
+        return self._call_tool("instance_add_plus", args)
 
     def instance_update_metadata(self, instance: str, login: str, password: str):
         args = {"instance": instance, "login": login, "password": password}
-        return _call_mcp_tool(self.server_name, "instance_update_metadata", args)
+        return self._call_tool("instance_update_metadata", args)
 
     def instance_interface_add(self, instance: str, new_host: str, new_port: str):
         args = {"instance": instance, "newHost": new_host, "newPort": new_port}
-        return _call_mcp_tool(self.server_name, "instance_interface_add", args)
+        return self._call_tool("instance_interface_add", args)
 
     def instance_proxy_add(self, instance: str, interface_host: str, interface_port: str, 
                            proxy_host: str, proxy_port: str):
@@ -651,17 +1439,17 @@ class DataSunriseMCPClient:
             "proxyHost": proxy_host,
             "proxyPort": proxy_port
         }
-        return _call_mcp_tool(self.server_name, "instance_proxy_add", args)
+        return self._call_tool("instance_proxy_add", args)
 
     def instance_update(self, name: str, new_name: str = None, login: str = None):
         args = {"name": name}
         if new_name: args["newName"] = new_name
         if login: args["login"] = login
-        return _call_mcp_tool(self.server_name, "instance_update", args)
+        return self._call_tool("instance_update", args)
 
     def instance_update_credentials(self, instance: str, login: str, password: str):
         args = {"instance": instance, "login": login, "password": password}
-        return _call_mcp_tool(self.server_name, "instance_update_credentials", args)
+        return self._call_tool("instance_update_credentials", args)
 
     def instance_interface_update(self, instance: str, prev_host: str, prev_port: str, 
                                   new_host: str, new_port: str):
@@ -672,7 +1460,7 @@ class DataSunriseMCPClient:
             "newHost": new_host,
             "newPort": new_port
         }
-        return _call_mcp_tool(self.server_name, "instance_interface_update", args)
+        return self._call_tool("instance_interface_update", args)
 
     def instance_proxy_update(self, instance: str, interface_host: str, interface_port: str,
                               prev_proxy_host: str, prev_proxy_port: str,
@@ -686,26 +1474,26 @@ class DataSunriseMCPClient:
             "proxyHost": proxy_host,
             "proxyPort": proxy_port
         }
-        return _call_mcp_tool(self.server_name, "instance_proxy_update", args)
+        return self._call_tool("instance_proxy_update", args)
 
     def instance_show_all(self):
-        return _call_mcp_tool(self.server_name, "instance_show_all", {})
+        return self._call_tool("instance_show_all", {})
 
     def instance_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "instance_show_one", args)
+        return self._call_tool("instance_show_one", args)
 
     def instance_interface_show_all(self, instance: str): # Maps to showInterfaces in context
         args = {"instance": instance}
-        return _call_mcp_tool(self.server_name, "instance_interface_show_all", args)
+        return self._call_tool("instance_interface_show_all", args)
 
     def instance_interface_show_one(self, instance: str, host: str, port: str):
         args = {"instance": instance, "host": host, "port": port}
-        return _call_mcp_tool(self.server_name, "instance_interface_show_one", args)
+        return self._call_tool("instance_interface_show_one", args)
 
     def instance_proxy_show_all(self, instance: str, interface_host: str, interface_port: str):
         args = {"instance": instance, "interfaceHost": interface_host, "interfacePort": interface_port}
-        return _call_mcp_tool(self.server_name, "instance_proxy_show_all", args)
+        return self._call_tool("instance_proxy_show_all", args)
 
     def instance_proxy_show_one(self, instance: str, interface_host: str, interface_port: str,
                                 proxy_host: str, proxy_port: str):
@@ -716,15 +1504,15 @@ class DataSunriseMCPClient:
             "proxyHost": proxy_host,
             "proxyPort": proxy_port
         }
-        return _call_mcp_tool(self.server_name, "instance_proxy_show_one", args)
+        return self._call_tool("instance_proxy_show_one", args)
 
     def instance_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "instance_delete", args)
+        return self._call_tool("instance_delete", args)
 
     def instance_interface_delete(self, instance: str, host: str, port: str):
         args = {"instance": instance, "host": host, "port": port}
-        return _call_mcp_tool(self.server_name, "instance_interface_delete", args)
+        return self._call_tool("instance_interface_delete", args)
 
     def instance_proxy_delete(self, instance: str, interface_host: str, interface_port: str,
                               proxy_host: str, proxy_port: str):
@@ -735,7 +1523,7 @@ class DataSunriseMCPClient:
             "proxyHost": proxy_host,
             "proxyPort": proxy_port
         }
-        return _call_mcp_tool(self.server_name, "instance_proxy_delete", args)
+        return self._call_tool("instance_proxy_delete", args)
 
     # --- License Commands ---
     def license_update_key(self, key: str):
@@ -743,35 +1531,35 @@ class DataSunriseMCPClient:
         Updates the DataSunrise license using a provided license key string.
         """
         args = {"key": key}
-        return _call_mcp_tool(self.server_name, "license_update_key", args)
+        return self._call_tool("license_update_key", args)
 
     def license_update_file(self, file: str): # Parameter name 'file' matches MCP tool
         """
         Updates DataSunrise licenses from a specified .reg license file.
         """
         args = {"file": file}
-        return _call_mcp_tool(self.server_name, "license_update_file", args)
+        return self._call_tool("license_update_file", args)
 
     def license_show_all(self):
         """
         Displays all installed licenses in DataSunrise.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "license_show_all", args)
+        return self._call_tool("license_show_all", args)
 
     def license_show_one(self, license_id: str): # Changed id to license_id
         """
         Shows detailed information for a specific license identified by its ID.
         """
         args = {"id": license_id}
-        return _call_mcp_tool(self.server_name, "license_show_one", args)
+        return self._call_tool("license_show_one", args)
 
     def license_delete(self, license_id: int): # MCP tool expects id as number
         """
         Deletes a specific license identified by its ID.
         """
         args = {"id": license_id}
-        return _call_mcp_tool(self.server_name, "license_delete", args)
+        return self._call_tool("license_delete", args)
 
     # --- Object Group Commands ---
     def object_group_add(self, name: str):
@@ -779,7 +1567,7 @@ class DataSunriseMCPClient:
         Adds a new Object Group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "object_group_add", args)
+        return self._call_tool("object_group_add", args)
 
     def object_group_update(self, name: str, new_name: str = None):
         """
@@ -788,28 +1576,28 @@ class DataSunriseMCPClient:
         args = {"name": name}
         if new_name:
             args["newName"] = new_name
-        return _call_mcp_tool(self.server_name, "object_group_update", args)
+        return self._call_tool("object_group_update", args)
 
     def object_group_show_all(self):
         """
         Displays a list of all configured Object Groups.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "object_group_show_all", args)
+        return self._call_tool("object_group_show_all", args)
 
     def object_group_show_one(self, name: str):
         """
         Shows detailed information for a specific Object Group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "object_group_show_one", args)
+        return self._call_tool("object_group_show_one", args)
 
     def object_group_delete(self, name: str):
         """
         Deletes a specified Object Group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "object_group_delete", args)
+        return self._call_tool("object_group_delete", args)
 
     # --- Parameters Commands ---
     def parameter_show_all(self):
@@ -817,27 +1605,27 @@ class DataSunriseMCPClient:
         Displays all system parameters and their current values.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "parameter_show_all", args)
+        return self._call_tool("parameter_show_all", args)
 
     def parameter_change(self, name: str, value: str):
         """
         Changes the value of a specified system parameter.
         """
         args = {"name": name, "value": value}
-        return _call_mcp_tool(self.server_name, "parameter_change", args)
+        return self._call_tool("parameter_change", args)
 
     # --- Periodic Task Commands ---
     def periodic_task_add_clean_audit(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "periodic_task_add_clean_audit", args)
+        return self._call_tool("periodic_task_add_clean_audit", args)
 
     def periodic_task_add_backup_dictionary(self, name: str, backup_name: str):
         args = {"name": name, "backupName": backup_name}
-        return _call_mcp_tool(self.server_name, "periodic_task_add_backup_dictionary", args)
+        return self._call_tool("periodic_task_add_backup_dictionary", args)
 
     def periodic_task_add_user_behavior(self, name: str, tr_start_date: str, tr_end_date: str):
         args = {"name": name, "trStartDate": tr_start_date, "trEndDate": tr_end_date}
-        return _call_mcp_tool(self.server_name, "periodic_task_add_user_behavior", args)
+        return self._call_tool("periodic_task_add_user_behavior", args)
 
     def periodic_task_add_ddl_table_relation_learning(self, name: str, inst: str, table_rel: str, 
                                                       analyze_proc_and_func: bool = False, analyze_view: bool = False,
@@ -848,23 +1636,23 @@ class DataSunriseMCPClient:
         }
         if login: args["login"] = login
         if password: args["password"] = password
-        return _call_mcp_tool(self.server_name, "periodic_task_add_ddl_table_relation_learning", args)
+        return self._call_tool("periodic_task_add_ddl_table_relation_learning", args)
 
     def periodic_task_add_vulnerability_assessment(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "periodic_task_add_vulnerability_assessment", args)
+        return self._call_tool("periodic_task_add_vulnerability_assessment", args)
 
     def periodic_task_add_update_metadata(self, name: str, instance: str):
         args = {"name": name, "instance": instance}
-        return _call_mcp_tool(self.server_name, "periodic_task_add_update_metadata", args)
+        return self._call_tool("periodic_task_add_update_metadata", args)
 
     def periodic_task_add_data_discovery(self, name: str, instance: str, search_by_info_types: str):
         args = {"name": name, "instance": instance, "searchByInfoTypes": search_by_info_types}
-        return _call_mcp_tool(self.server_name, "periodic_task_add_data_discovery", args)
+        return self._call_tool("periodic_task_add_data_discovery", args)
 
     def periodic_task_add_health_check(self, name: str, instance: str):
         args = {"name": name, "instance": instance}
-        return _call_mcp_tool(self.server_name, "periodic_task_add_health_check", args)
+        return self._call_tool("periodic_task_add_health_check", args)
 
     # Generic update for periodic tasks (renaming)
     # Specific updates like periodic_task_update_clean_audit exist.
@@ -872,7 +1660,7 @@ class DataSunriseMCPClient:
     def periodic_task_update_clean_audit(self, name: str, new_name: str = None): # Matches MCP tool
         args = {"name": name}
         if new_name: args["newName"] = new_name
-        return _call_mcp_tool(self.server_name, "periodic_task_update_clean_audit", args)
+        return self._call_tool("periodic_task_update_clean_audit", args)
 
     # For other updates, assuming a simple rename, map to a generic concept or specific if available
     # The CLI context implies only newName is changed for all these updates.
@@ -886,7 +1674,7 @@ class DataSunriseMCPClient:
         # For now, I will assume that if an update tool exists for a specific task type, it's for renaming.
         # If `upd_per_backup_dictionary` maps to `periodic_task_update_backup_dictionary` (hypothetical)
         args = {"name": name, "newName": new_name}
-        return _call_mcp_tool(self.server_name, tool_name, args) # tool_name would be e.g. "periodic_task_update_backup_dictionary"
+        return self._call_tool(tool_name, args) # tool_name would be e.g. "periodic_task_update_backup_dictionary"
 
     # Let's assume specific update tools exist for renaming for now, matching CLI context structure
     def periodic_task_update_backup_dictionary(self, name: str, new_name: str):
@@ -913,66 +1701,66 @@ class DataSunriseMCPClient:
 
     def periodic_task_show_one(self, name: str, task_type: str):
         args = {"name": name, "taskType": task_type}
-        return _call_mcp_tool(self.server_name, "periodic_task_show_one", args)
+        return self._call_tool("periodic_task_show_one", args)
 
     def periodic_task_delete(self, name: str, task_type: str):
         args = {"name": name, "taskType": task_type}
-        return _call_mcp_tool(self.server_name, "periodic_task_delete", args)
+        return self._call_tool("periodic_task_delete", args)
 
     # --- Query Group Commands ---
     def query_group_add(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "query_group_add", args)
+        return self._call_tool("query_group_add", args)
 
     def query_group_add_query(self, name: str, sql: str):
         args = {"name": name, "sql": sql}
-        return _call_mcp_tool(self.server_name, "query_group_add_query", args)
+        return self._call_tool("query_group_add_query", args)
 
     def query_group_update(self, name: str, new_name: str):
         args = {"name": name, "newName": new_name}
-        return _call_mcp_tool(self.server_name, "query_group_update", args)
+        return self._call_tool("query_group_update", args)
 
     def query_group_update_query(self, name: str, sql: str, new_sql: str):
         args = {"name": name, "sql": sql, "newSql": new_sql}
-        return _call_mcp_tool(self.server_name, "query_group_update_query", args)
+        return self._call_tool("query_group_update_query", args)
 
     def query_group_show_all(self):
-        return _call_mcp_tool(self.server_name, "query_group_show_all", {})
+        return self._call_tool("query_group_show_all", {})
 
     def query_group_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "query_group_show_one", args)
+        return self._call_tool("query_group_show_one", args)
 
     def query_group_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "query_group_delete", args)
+        return self._call_tool("query_group_delete", args)
 
     def query_group_delete_query(self, name: str, sql: str):
         args = {"name": name, "sql": sql}
-        return _call_mcp_tool(self.server_name, "query_group_delete_query", args)
+        return self._call_tool("query_group_delete_query", args)
 
     # --- Report Generation Commands ---
     def report_gen_add_audit(self, name: str, **kwargs):
         args = {"name": name, **kwargs}
-        return _call_mcp_tool(self.server_name, "report_gen_add_audit", args)
+        return self._call_tool("report_gen_add_audit", args)
 
     def report_gen_add_masking(self, name: str, **kwargs):
         args = {"name": name, **kwargs}
-        return _call_mcp_tool(self.server_name, "report_gen_add_masking", args)
+        return self._call_tool("report_gen_add_masking", args)
 
     def report_gen_add_security(self, name: str, **kwargs):
         args = {"name": name, **kwargs}
-        return _call_mcp_tool(self.server_name, "report_gen_add_security", args)
+        return self._call_tool("report_gen_add_security", args)
 
     def report_gen_add_operation_errors(self, name: str, **kwargs):
         args = {"name": name, **kwargs}
-        return _call_mcp_tool(self.server_name, "report_gen_add_operation_errors", args)
+        return self._call_tool("report_gen_add_operation_errors", args)
 
     def report_gen_add_session(self, name: str, inst: str = None, **kwargs): # `inst` is optional in MCP tool
         args = {"name": name, **kwargs}
         if inst:
             args["inst"] = inst
-        return _call_mcp_tool(self.server_name, "report_gen_add_session", args)
+        return self._call_tool("report_gen_add_session", args)
         
     def report_gen_add_direct_session(self, name: str, inst: str = None, **kwargs): # MCP tool is report_gen_add_session
         args = {"name": name, **kwargs}
@@ -983,18 +1771,18 @@ class DataSunriseMCPClient:
         # If MCP's report_gen_add_session has a way to specify "direct", it should be used here.
         # The CLI context has add_session_rep_gen and add_direct_session_rep_gen.
         # MCP server has report_gen_add_session and report_gen_add_direct_session
-        return _call_mcp_tool(self.server_name, "report_gen_add_direct_session", args)
+        return self._call_tool("report_gen_add_direct_session", args)
 
 
     def report_gen_add_system_events(self, name: str, **kwargs):
         args = {"name": name, **kwargs}
-        return _call_mcp_tool(self.server_name, "report_gen_add_system_events", args)
+        return self._call_tool("report_gen_add_system_events", args)
 
     def report_gen_add_data_discovery(self, name: str, instance: str, search_by_info_types: str, **kwargs):
         # MCP tool 'report_gen_add_data_discovery' is marked as DEPRECATED.
         # Consider using 'periodic_task_add_data_discovery' instead for new implementations.
         args = {"name": name, "instance": instance, "searchByInfoTypes": search_by_info_types, **kwargs}
-        return _call_mcp_tool(self.server_name, "report_gen_add_data_discovery", args)
+        return self._call_tool("report_gen_add_data_discovery", args)
 
     # Update methods - CLI context only shows renaming. MCP tools might support more.
     # For now, client methods will focus on renaming.
@@ -1002,7 +1790,7 @@ class DataSunriseMCPClient:
         args = {"name": name, **kwargs}
         if new_name:
             args["newName"] = new_name
-        return _call_mcp_tool(self.server_name, "report_gen_update_audit", args)
+        return self._call_tool("report_gen_update_audit", args)
 
     # Assuming similar update tools exist for other report types, primarily for renaming
     # These would map to e.g. report_gen_update_masking, report_gen_update_security etc. if they exist
@@ -1028,7 +1816,7 @@ class DataSunriseMCPClient:
         # For the purpose of this exercise, I will make them call a hypothetical specific tool.
         # If these tools don't exist, these methods will fail.
         print(f"Warning: Calling hypothetical MCP tool {mcp_tool_name}. Verify its existence.")
-        return _call_mcp_tool(self.server_name, mcp_tool_name, args)
+        return self._call_tool(mcp_tool_name, args)
 
 
     def report_gen_update_masking(self, name: str, new_name: str):
@@ -1052,15 +1840,15 @@ class DataSunriseMCPClient:
 
 
     def report_gen_show_all(self):
-        return _call_mcp_tool(self.server_name, "report_gen_show_all", {})
+        return self._call_tool("report_gen_show_all", {})
 
     def report_gen_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "report_gen_show_one", args)
+        return self._call_tool("report_gen_show_one", args)
 
     def report_gen_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "report_gen_delete", args)
+        return self._call_tool("report_gen_delete", args)
 
     # --- Reports Commands ---
     def reports_show(self, report_type: str, event_type: str):
@@ -1070,14 +1858,14 @@ class DataSunriseMCPClient:
         eventType: a (audit), m (masking), s (security)
         """
         args = {"reportType": report_type, "eventType": event_type}
-        return _call_mcp_tool(self.server_name, "reports_show", args)
+        return self._call_tool("reports_show", args)
 
     # --- Role Commands ---
     def role_add_access(self, name: str, group_dn: str = None):
         args = {"name": name}
         if group_dn:
             args["groupDN"] = group_dn
-        return _call_mcp_tool(self.server_name, "role_add_access", args)
+        return self._call_tool("role_add_access", args)
 
     def role_update_access(self, name: str, new_name: str = None, group_dn: str = None):
         args = {"name": name}
@@ -1085,18 +1873,18 @@ class DataSunriseMCPClient:
             args["newName"] = new_name
         if group_dn: # MCP tool takes groupDN for update as well
             args["groupDN"] = group_dn
-        return _call_mcp_tool(self.server_name, "role_update_access", args)
+        return self._call_tool("role_update_access", args)
 
     def role_show_all_access(self):
-        return _call_mcp_tool(self.server_name, "role_show_all_access", {})
+        return self._call_tool("role_show_all_access", {})
 
     def role_show_one_access(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "role_show_one_access", args)
+        return self._call_tool("role_show_one_access", args)
 
     def role_grant_all_permissions(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "role_grant_all_permissions", args)
+        return self._call_tool("role_grant_all_permissions", args)
 
     def role_grant_permissions(self, name: str, delete_actions: str = None, list_actions: str = None,
                                edit_actions: str = None, insert_actions: str = None,
@@ -1108,7 +1896,7 @@ class DataSunriseMCPClient:
         if insert_actions: args["insertActions"] = insert_actions
         if view_actions: args["viewActions"] = view_actions
         if execute_actions: args["executeActions"] = execute_actions
-        return _call_mcp_tool(self.server_name, "role_grant_permissions", args)
+        return self._call_tool("role_grant_permissions", args)
 
     def role_set_permissions(self, name: str, delete_actions: str = None, list_actions: str = None,
                              edit_actions: str = None, insert_actions: str = None,
@@ -1120,11 +1908,11 @@ class DataSunriseMCPClient:
         if insert_actions: args["insertActions"] = insert_actions
         if view_actions: args["viewActions"] = view_actions
         if execute_actions: args["executeActions"] = execute_actions
-        return _call_mcp_tool(self.server_name, "role_set_permissions", args)
+        return self._call_tool("role_set_permissions", args)
 
     def role_revoke_all_permissions(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "role_revoke_all_permissions", args)
+        return self._call_tool("role_revoke_all_permissions", args)
 
     def role_revoke_permissions(self, name: str, delete_actions: str = None, list_actions: str = None,
                                 edit_actions: str = None, insert_actions: str = None,
@@ -1136,42 +1924,42 @@ class DataSunriseMCPClient:
         if insert_actions: args["insertActions"] = insert_actions
         if view_actions: args["viewActions"] = view_actions
         if execute_actions: args["executeActions"] = execute_actions
-        return _call_mcp_tool(self.server_name, "role_revoke_permissions", args)
+        return self._call_tool("role_revoke_permissions", args)
 
     def role_delete_access(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "role_delete_access", args)
+        return self._call_tool("role_delete_access", args)
 
     # --- Rule Commands ---
     def rule_add_audit(self, name: str, db_type: str, enable: bool = True, **kwargs):
         args = {"name": name, "dbType": db_type, "enable": enable, **kwargs}
-        return _call_mcp_tool(self.server_name, "rule_add_audit", args)
+        return self._call_tool("rule_add_audit", args)
 
     def rule_add_masking(self, name: str, db_type: str, instance: str, mask_columns: str, mask_type: str, enable: bool = True, **kwargs):
         args = {
             "name": name, "dbType": db_type, "instance": instance, 
             "maskColumns": mask_columns, "maskType": mask_type, "enable": enable, **kwargs
         }
-        return _call_mcp_tool(self.server_name, "rule_add_masking", args)
+        return self._call_tool("rule_add_masking", args)
 
     def rule_add_security(self, name: str, db_type: str, enable: bool = True, **kwargs):
         args = {"name": name, "dbType": db_type, "enable": enable, **kwargs}
-        return _call_mcp_tool(self.server_name, "rule_add_security", args)
+        return self._call_tool("rule_add_security", args)
 
     def rule_add_learning(self, name: str, db_type: str, enable: bool = True, **kwargs):
         args = {"name": name, "dbType": db_type, "enable": enable, **kwargs}
-        return _call_mcp_tool(self.server_name, "rule_add_learning", args)
+        return self._call_tool("rule_add_learning", args)
 
     def rule_add_external_dispatcher(self, name: str, db_type: str, enable: bool = True, **kwargs):
         args = {"name": name, "dbType": db_type, "enable": enable, **kwargs}
-        return _call_mcp_tool(self.server_name, "rule_add_external_dispatcher", args)
+        return self._call_tool("rule_add_external_dispatcher", args)
 
     # Update methods for rules - primarily for 'enable' status as per CLI context.
     # MCP tools have many more optional params for updates.
     def rule_update_audit(self, name: str, enable: bool = None, **kwargs):
         args = {"name": name, **kwargs}
         if enable is not None: args["enable"] = enable
-        return _call_mcp_tool(self.server_name, "rule_update_audit", args)
+        return self._call_tool("rule_update_audit", args)
         
     # Assuming specific update tools for other rule types, mirroring add tools.
     # If MCP server uses a generic rule_update with a type parameter, this would need adjustment.
@@ -1186,37 +1974,37 @@ class DataSunriseMCPClient:
         # For the purpose of this exercise, I will make them call a hypothetical specific tool.
         # If these tools don't exist, these methods will fail.
         print(f"Warning: Calling hypothetical MCP tool rule_update_masking. Verify its existence or use rule_update_audit with appropriate kwargs.")
-        return _call_mcp_tool(self.server_name, "rule_update_masking", args)
+        return self._call_tool("rule_update_masking", args)
 
 
     def rule_update_security(self, name: str, enable: bool = None, **kwargs):
         args = {"name": name, **kwargs}
         if enable is not None: args["enable"] = enable
         print(f"Warning: Calling hypothetical MCP tool rule_update_security. Verify its existence or use rule_update_audit with appropriate kwargs.")
-        return _call_mcp_tool(self.server_name, "rule_update_security", args)
+        return self._call_tool("rule_update_security", args)
 
     def rule_update_learning(self, name: str, enable: bool = None, **kwargs):
         args = {"name": name, **kwargs}
         if enable is not None: args["enable"] = enable
         print(f"Warning: Calling hypothetical MCP tool rule_update_learning. Verify its existence or use rule_update_audit with appropriate kwargs.")
-        return _call_mcp_tool(self.server_name, "rule_update_learning", args)
+        return self._call_tool("rule_update_learning", args)
 
     def rule_update_external_dispatcher(self, name: str, enable: bool = None, **kwargs):
         args = {"name": name, **kwargs}
         if enable is not None: args["enable"] = enable
         print(f"Warning: Calling hypothetical MCP tool rule_update_external_dispatcher. Verify its existence or use rule_update_audit with appropriate kwargs.")
-        return _call_mcp_tool(self.server_name, "rule_update_external_dispatcher", args)
+        return self._call_tool("rule_update_external_dispatcher", args)
 
     def rule_show_all(self):
-        return _call_mcp_tool(self.server_name, "rule_show_all", {})
+        return self._call_tool("rule_show_all", {})
 
     def rule_show_one(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "rule_show_one", args)
+        return self._call_tool("rule_show_one", args)
 
     def rule_delete(self, name: str):
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "role_delete_access", args)
+        return self._call_tool("role_delete_access", args)
 
     # --- Schedule Commands ---
     def schedule_add(self, name: str, intervals: str):
@@ -1226,7 +2014,7 @@ class DataSunriseMCPClient:
                    (e.g., "mo=09:00:00-17:00:00;tu=09:00:00-12:00:00")
         """
         args = {"name": name, "intervals": intervals}
-        return _call_mcp_tool(self.server_name, "schedule_add", args)
+        return self._call_tool("schedule_add", args)
 
     def schedule_update(self, name: str, new_name: str = None, intervals: str = None):
         """
@@ -1237,28 +2025,35 @@ class DataSunriseMCPClient:
             args["newName"] = new_name
         if intervals: # MCP tool also takes intervals for update
             args["intervals"] = intervals
-        return _call_mcp_tool(self.server_name, "schedule_update", args)
+        return self._call_tool("schedule_update", args)
 
     def schedule_show_all(self):
         """
         Displays a list of all configured schedules.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "schedule_show_all", args)
+        return self._call_tool("schedule_show_all", args)
 
     def schedule_show_one(self, name: str):
         """
         Shows detailed information for a specific schedule.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "schedule_show_one", args)
+        return self._call_tool("schedule_show_one", args)
 
     def schedule_delete(self, name: str):
         """
         Deletes a specified schedule.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "schedule_delete", args)
+        return self._call_tool("schedule_delete", args)
+
+    # --- DataSunrise Server Commands ---
+    def ds_server_show_all(self):
+        """
+        Lists DataSunrise servers (showDsServers).
+        """
+        return self._call_tool("ds_server_show_all", {})
 
     # --- Server Commands (SMTP/SNMP etc.) ---
     def server_add_smtp(self, name: str, host: str, port: str, mail_from: str, 
@@ -1272,7 +2067,7 @@ class DataSunriseMCPClient:
         }
         if login: args["login"] = login
         if password: args["password"] = password
-        return _call_mcp_tool(self.server_name, "server_add_smtp", args)
+        return self._call_tool("server_add_smtp", args)
 
     def server_add_snmp(self, name: str, host: str, port: str, login: str = None):
         """
@@ -1280,7 +2075,7 @@ class DataSunriseMCPClient:
         """
         args = {"name": name, "host": host, "port": port}
         if login: args["login"] = login # Corresponds to community string or SNMPv3 user
-        return _call_mcp_tool(self.server_name, "server_add_snmp", args)
+        return self._call_tool("server_add_snmp", args)
 
     def server_update(self, name: str, new_name: str = None, host: str = None, port: str = None, **kwargs):
         """
@@ -1299,35 +2094,35 @@ class DataSunriseMCPClient:
         # For SMTP, it might take `mailFrom`, `login`, `password`, `certificate`.
         # For SNMP, it might take `login` (community/user).
         # These should be passed via kwargs if needed.
-        return _call_mcp_tool(self.server_name, "server_update", args)
+        return self._call_tool("server_update", args)
 
     def server_show_all(self):
         """
         Displays a list of all configured servers (SMTP, SNMP, etc.).
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "server_show_all", args)
+        return self._call_tool("server_show_all", args)
 
     def server_show_one(self, name: str):
         """
         Shows detailed information for a specific server configuration.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "server_show_one", args)
+        return self._call_tool("server_show_one", args)
 
     def server_delete_by_name(self, name: str):
         """
         Deletes a server configuration by its name.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "server_delete_by_name", args)
+        return self._call_tool("server_delete_by_name", args)
 
     def server_delete_by_id(self, server_id: str): # MCP tool expects id as string
         """
         Deletes a server configuration by its ID.
         """
         args = {"id": server_id}
-        return _call_mcp_tool(self.server_name, "server_delete_by_id", args)
+        return self._call_tool("server_delete_by_id", args)
 
     # --- SSL Key Group Commands ---
     def ssl_key_group_add(self, name: str):
@@ -1335,35 +2130,35 @@ class DataSunriseMCPClient:
         Adds a new SSL Key Group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "ssl_key_group_add", args)
+        return self._call_tool("ssl_key_group_add", args)
 
     def ssl_key_group_update(self, name: str, new_name: str):
         """
         Updates an existing SSL Key Group's name.
         """
         args = {"name": name, "newName": new_name}
-        return _call_mcp_tool(self.server_name, "ssl_key_group_update", args)
+        return self._call_tool("ssl_key_group_update", args)
 
     def ssl_key_group_show_all(self):
         """
         Displays a list of all configured SSL Key Groups.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "ssl_key_group_show_all", args)
+        return self._call_tool("ssl_key_group_show_all", args)
 
     def ssl_key_group_show_one(self, name: str):
         """
         Shows detailed information for a specific SSL Key Group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "ssl_key_group_show_one", args)
+        return self._call_tool("ssl_key_group_show_one", args)
 
     def ssl_key_group_delete(self, name: str):
         """
         Deletes a specified SSL Key Group.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "ssl_key_group_delete", args)
+        return self._call_tool("ssl_key_group_delete", args)
 
     # --- Static Masking Commands ---
     def static_masking_start(self, source_instance: str, target_instance: str, table_file: str):
@@ -1376,21 +2171,21 @@ class DataSunriseMCPClient:
             "targetInstance": target_instance,
             "tableFile": table_file
         }
-        return _call_mcp_tool(self.server_name, "static_masking_start", args)
+        return self._call_tool("static_masking_start", args)
 
     def static_masking_show_status(self, task_id: str): # MCP tool expects id as string
         """
         Shows the status and details of a specific static masking task by its ID.
         """
         args = {"id": task_id}
-        return _call_mcp_tool(self.server_name, "static_masking_show_status", args)
+        return self._call_tool("static_masking_show_status", args)
 
     def static_masking_restart(self, task_id: str): # MCP tool expects id as string
         """
         Restarts a previously run or failed static masking task by its ID.
         """
         args = {"id": task_id}
-        return _call_mcp_tool(self.server_name, "static_masking_restart", args)
+        return self._call_tool("static_masking_restart", args)
 
     # --- Subscriber Commands ---
     def subscriber_add(self, name: str, server_name: str, send_to_address: str):
@@ -1403,7 +2198,7 @@ class DataSunriseMCPClient:
             "serverName": server_name,
             "sendToAddress": send_to_address
         }
-        return _call_mcp_tool(self.server_name, "subscriber_add", args)
+        return self._call_tool("subscriber_add", args)
 
     def subscriber_update(self, name: str, new_name: str = None, server_name: str = None, send_to_address: str = None):
         """
@@ -1422,28 +2217,28 @@ class DataSunriseMCPClient:
         # For now, matching MCP tool which implies if serverName/sendToAddress are not given, they are not changed (if optional)
         # or it might error if they are required for any update.
         # The MCP schema for subscriber_update makes newName, serverName, sendToAddress all optional if name is given.
-        return _call_mcp_tool(self.server_name, "subscriber_update", args)
+        return self._call_tool("subscriber_update", args)
 
     def subscriber_show_all(self):
         """
         Displays a list of all configured subscribers.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "subscriber_show_all", args)
+        return self._call_tool("subscriber_show_all", args)
 
     def subscriber_show_one(self, name: str):
         """
         Shows detailed information for a specific subscriber.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "subscriber_show_one", args)
+        return self._call_tool("subscriber_show_one", args)
 
     def subscriber_delete(self, name: str):
         """
         Deletes a specified subscriber.
         """
         args = {"name": name}
-        return _call_mcp_tool(self.server_name, "subscriber_delete", args)
+        return self._call_tool("subscriber_delete", args)
 
     # --- Tag Commands ---
     def tag_add(self, name: str, entity_type: str, entity_name: str):
@@ -1452,7 +2247,7 @@ class DataSunriseMCPClient:
         entity_type: Rule, Periodic Task, Object Group
         """
         args = {"name": name, "entityType": entity_type, "entityName": entity_name}
-        return _call_mcp_tool(self.server_name, "tag_add", args)
+        return self._call_tool("tag_add", args)
 
     def tag_update(self, name: str, new_name: str, entity_type: str, entity_name: str):
         """
@@ -1464,45 +2259,285 @@ class DataSunriseMCPClient:
             "entityType": entity_type,
             "entityName": entity_name
         }
-        return _call_mcp_tool(self.server_name, "tag_update", args)
+        return self._call_tool("tag_update", args)
 
     def tag_show_for_entity(self, entity_type: str, entity_name: str):
         """
         Displays all tags associated with a specific DataSunrise entity.
         """
         args = {"entityType": entity_type, "entityName": entity_name}
-        return _call_mcp_tool(self.server_name, "tag_show_for_entity", args)
+        return self._call_tool("tag_show_for_entity", args)
 
     def tag_show_one(self, name: str, entity_type: str, entity_name: str):
         """
         Shows detailed information for a specific tag on a specific entity.
         """
         args = {"name": name, "entityType": entity_type, "entityName": entity_name}
-        return _call_mcp_tool(self.server_name, "tag_show_one", args)
+        return self._call_tool("tag_show_one", args)
 
     def tag_show_tagged_entities(self):
         """
         Shows all DataSunrise entities that have at least one tag.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "tag_show_tagged_entities", args)
+        return self._call_tool("tag_show_tagged_entities", args)
 
     def tag_show_untagged_entities(self):
         """
         Shows all DataSunrise entities that do not have any tags.
         """
         args = {}
-        return _call_mcp_tool(self.server_name, "tag_show_untagged_entities", args)
+        return self._call_tool("tag_show_untagged_entities", args)
 
     def tag_delete(self, name: str, entity_type: str, entity_name: str):
         """
         Deletes a specific tag from a DataSunrise entity.
         """
         args = {"name": name, "entityType": entity_type, "entityName": entity_name}
-        return _call_mcp_tool(self.server_name, "tag_delete", args)
+        return self._call_tool("tag_delete", args)
         
     # Add other methods for different MCP tools as needed
 
+
+class ClientBatch(DataSunriseMCPClient):
+    """
+    Records calls made through the client methods and sends them together.
+    Created by DataSunriseMCPClient.batch().
+
+    On exit the recorded calls go to the server as one run_cli_batch request,
+    or, if the server has no batch tool, as pipelined run_cli_command requests
+    with at most `max_parallel` in flight. If the block raises, nothing is sent
+    and the futures are cancelled. Steps the server returns no result for get
+    an error response. Recorded connect calls set `session_active` of the
+    client once the batch is sent.
+    """
+    def __init__(self, client: DataSunriseMCPClient, max_parallel: int = 1):
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        # Shares the connection and settings of the client; only _call_tool differs
+        super().__init__(client.server_name, transport=client.transport, timeout=client.timeout, cache=client.cache)
+        self.session_active = client.session_active
+        self.client = client
+        self.max_parallel = max_parallel
+        self._calls = []
+        self._sent = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+        else:
+            self.discard()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await asyncio.get_running_loop().run_in_executor(None, self.send)
+        else:
+            self.discard()
+
+    def close(self):
+        """
+        Sends the recorded calls; the client connection stays open.
+        """
+        self.send()
+
+    def connect(self, host="127.0.0.1", port="11000", protocol="https", login=None, password=None):
+        """
+        Records a connect call.
+        """
+        return self._call_tool("connect", self._connect_args(host, port, protocol, login, password))
+
+    def _call_tool(self, tool_name: str, args: dict) -> Future:
+        if self._sent:
+            raise RuntimeError("This batch has already been sent")
+        future = Future()
+        self._calls.append((tool_name, {k: v for k, v in args.items() if v is not None}, future))
+        return future
+
+    def iter_rows(self, tool_name: str, args: dict, page_size: int = 1000):
+        """
+        Streaming reads page through the output one request at a time and
+        cannot be recorded; call iter_rows (or the iter_* methods) on the client.
+        """
+        raise TypeError(f"{tool_name} rows cannot be streamed inside a batch; call iter_rows on the client")
+
+    def discard(self):
+        """
+        Drops the recorded calls without sending them.
+        """
+        self._sent = True
+        for _, _, future in self._calls:
+            future.cancel()
+
+    def send(self):
+        """
+        Sends the recorded calls and resolves their futures.
+        Calls the server rejects get an error response, like unbatched calls.
+        """
+        if self._sent:
+            return
+        self._sent = True
+        if not self._calls:
+            return
+        cache = self.client.cache
+        writes = [tool_name for tool_name, _, _ in self._calls if cache is not None and not cache.cacheable(tool_name)]
+        for tool_name in writes:
+            cache.invalidate(tool_name)
+        try:
+            if "run_cli_batch" in self.client._server_tools():
+                self._send_batch()
+            else:
+                self._send_pipelined()
+        except BaseException as error:
+            for _, _, future in self._calls:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+        finally:
+            for tool_name in writes:
+                cache.invalidate(tool_name)
+        connects = [future for tool_name, _, future in self._calls if tool_name == "connect"]
+        if connects:
+            for future in connects:
+                self._connected(future.result())
+            self.client.session_active = self.session_active
+
+    def _send_batch(self):
+        steps = [{"command_name": tool_name, "arguments": args} for tool_name, args, _ in self._calls]
+        try:
+            result = self.transport.request("tools/call", {
+                "name": "run_cli_batch",
+                "arguments": {"steps": steps, "maxParallel": self.max_parallel},
+            }, self.timeout)
+        except MCPError as error:
+            # The server validates the whole batch, e.g. rejects it for one unknown command
+            for _, _, future in self._calls:
+                future.set_result(_error_response(error))
+            return
+        steps = json.loads(_result_text(result)).get("steps", [])
+        for index, (_, _, future) in enumerate(self._calls):
+            step = steps[index] if index < len(steps) else {"error": "The server returned no result for this step"}
+            future.set_result(_step_response(step))
+
+    def _send_pipelined(self):
+        in_flight = []
+
+        def resolve_oldest():
+            tool_name, response, waiting = in_flight[0]
+            try:
+                waiting.set_result(response.result(self.timeout))
+            except FutureTimeoutError:
+                # The requests still in flight would keep running on the server
+                for _, pending, _ in in_flight:
+                    self.transport.cancel(pending.request, "Client timeout")
+                raise TimeoutError(f"No response to {tool_name} within {self.timeout} seconds") from None
+            in_flight.pop(0)
+
+        for tool_name, args, future in self._calls:
+            if len(in_flight) >= self.max_parallel:
+                resolve_oldest()
+            in_flight.append((tool_name, self.client._submit_tool(tool_name, args), future))
+        while in_flight:
+            resolve_oldest()
+
+
+class AsyncDataSunriseMCPClient(DataSunriseMCPClient):
+    """
+    asyncio variant of DataSunriseMCPClient with the same methods.
+
+    Every command method builds its arguments exactly like the blocking client
+    and returns an awaitable of the response dictionary, so independent calls
+    can run together with `asyncio.gather`. All calls share one transport;
+    at most `max_concurrency` of them are in flight at a time in each event
+    loop, so the client can be reused by later `asyncio.run()` calls.
+    """
+    def __init__(self, server_name="datasunrise-cli", server_command=None, server_env=None,
+                 transport: StdioTransport = None, timeout: float = None, cache: ResponseCache = None,
+                 max_concurrency: int = 16):
+        super().__init__(server_name, server_command, server_env, transport, timeout, cache)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        # asyncio primitives belong to the loop they were first used in
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Closes the connection without blocking the event loop.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def connect(self, host="127.0.0.1", port="11000", protocol="https", login=None, password=None):
+        """
+        Connects to the DataSunrise firewall.
+        """
+        args = self._connect_args(host, port, protocol, login, password)
+        return self._connected(await self._call_tool("connect", args))
+
+    async def _call_tool(self, tool_name: str, args: dict) -> dict:
+        """
+        Runs one command on the server and returns its response dictionary.
+        """
+        ticket = None
+        if self.cache is not None:
+            cached, ticket = self.cache.begin(tool_name, args)
+            if cached is not None:
+                return cached
+        result = await self._run_tool(tool_name, args)
+        if self.cache is not None:
+            self.cache.finish(tool_name, ticket, result)
+        return result
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def _run_tool(self, tool_name: str, args: dict, options: dict = None) -> dict:
+        async with self._semaphore():
+            if not self.transport.started:
+                # The handshake blocks; keep it off the event loop
+                await asyncio.get_running_loop().run_in_executor(None, self.transport.start)
+            response = self._submit_tool(tool_name, args, options)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(response), self.timeout)
+            except asyncio.TimeoutError:
+                self.transport.cancel(response.request, "Client timeout")
+                raise TimeoutError(f"No response to {tool_name} within {self.timeout} seconds") from None
+            except asyncio.CancelledError:
+                self.transport.cancel(response.request, "Task cancelled")
+                raise
+
+    async def iter_rows(self, tool_name: str, args: dict, page_size: int = 1000):
+        """
+        Async generator of the parsed rows of a command output, read page by
+        page (see DataSunriseMCPClient.iter_rows). The iter_* methods return
+        it as well: `async for row in client.iter_events(...)`.
+        """
+        parser = _RowParser()
+        options = {"pageSize": page_size}
+        while True:
+            response = await self._run_tool(tool_name, args, options)
+            for row in parser.feed(_page_text(tool_name, response)):
+                yield row
+            cursor = response.get("result", {}).get("page", {}).get("nextCursor")
+            if not cursor:
+                break
+            options = {"pageSize": page_size, "cursor": cursor}
+        for row in parser.finish():
+            yield row
+
+
 if __name__ == '__main__':
     # Example usage (for testing the client directly)
     client = DataSunriseMCPClient()
@@ -0,0 +1,216 @@
+/**
+ * Batch execution of CLI commands with dependencies
+ *
+ * A batch is a list of steps, each naming a command tool and its arguments.
+ * Steps may depend on other steps through `dependsOn`. Steps whose
+ * dependencies have succeeded run concurrently up to a parallelism limit; when
+ * a step fails, every step that depends on it (directly or transitively) is
+ * skipped while unrelated steps keep running.
+ */
+
+/**
+ * One command invocation in a batch
+ */
+export interface BatchStep {
+  /** Step identifier referenced by `dependsOn`; defaults to the 1-based position */
+  id?: string;
+  /** Command tool name (e.g. 'instance_add_plus') */
+  command_name: string;
+  /** Command arguments */
+  arguments?: Record<string, any>;
+  /** Ids of steps that must succeed before this step runs */
+  dependsOn?: string[];
+  /** Per-step timeout override in seconds (0 = no limit) */
+  timeoutSeconds?: number;
+}
+
+export type BatchStepStatus = 'succeeded' | 'failed' | 'skipped';
+
+/**
+ * Outcome of one batch step
+ */
+export interface BatchStepOutcome<R> {
+  id: string;
+  command_name: string;
+  status: BatchStepStatus;
+  /** Command result for steps that ran */
+  result?: R;
+  /** Error message for steps that threw or were skipped */
+  error?: string;
+}
+
+/**
+ * Outcome of a complete batch, with steps in input order
+ */
+export interface BatchOutcome<R> {
+  success: boolean;
+  summary: { total: number; succeeded: number; failed: number; skipped: number };
+  steps: Array<BatchStepOutcome<R>>;
+}
+
+/**
+ * Callbacks and limits used to run a batch
+ */
+export interface BatchRunOptions<R> {
+  /** Maximum number of steps running at the same time */
+  maxParallel: number;
+  /** Runs one step; a thrown error marks the step as failed */
+  execute: (step: BatchStep) => Promise<R>;
+  /** Decides whether a returned result counts as success */
+  isSuccess: (result: R) => boolean;
+}
+
+/**
+ * Assign default step ids and check that the batch forms a valid DAG
+ * @param steps Batch steps as received from the client
+ * @param isKnownCommand Returns true for existing command tool names
+ * @returns Steps with ids filled in
+ * @throws Error describing the first problem found
+ */
+export function validateBatch(steps: BatchStep[], isKnownCommand: (name: string) => boolean): Array<BatchStep & { id: string }> {
+  if (!Array.isArray(steps) || steps.length === 0) {
+    throw new Error('Batch must contain at least one step.');
+  }
+
+  const normalized = steps.map((step, index) => ({ ...step, id: step.id ?? String(index + 1) }));
+  const ids = new Set<string>();
+  for (const step of normalized) {
+    // A numeric id would never match the strings in dependsOn, and a string dependsOn would be read per character
+    if (typeof step.id !== 'string') {
+      throw new Error(`Step id must be a string: ${JSON.stringify(step.id)}`);
+    }
+    if (step.dependsOn !== undefined && (!Array.isArray(step.dependsOn) || step.dependsOn.some(dependency => typeof dependency !== 'string'))) {
+      throw new Error(`dependsOn of step ${step.id} must be an array of step id strings: ${JSON.stringify(step.dependsOn)}`);
+    }
+    if (ids.has(step.id)) {
+      throw new Error(`Duplicate step id: ${step.id}`);
+    }
+    ids.add(step.id);
+    if (!isKnownCommand(step.command_name)) {
+      throw new Error(`Unknown command in step ${step.id}: ${step.command_name}`);
+    }
+  }
+  for (const step of normalized) {
+    for (const dependency of step.dependsOn ?? []) {
+      if (!ids.has(dependency)) {
+        throw new Error(`Step ${step.id} depends on unknown step: ${dependency}`);
+      }
+    }
+  }
+
+  // Kahn's algorithm: every step must become ready eventually, otherwise there is a cycle
+  const remaining = new Map(normalized.map(step => [step.id, new Set(step.dependsOn ?? [])]));
+  let progressed = true;
+  while (remaining.size > 0 && progressed) {
+    progressed = false;
+    for (const [id, dependencies] of remaining) {
+      if ([...dependencies].every(dependency => !remaining.has(dependency))) {
+        remaining.delete(id);
+        progressed = true;
+      }
+    }
+  }
+  if (remaining.size > 0) {
+    throw new Error(`Dependency cycle between steps: ${[...remaining.keys()].join(', ')}`);
+  }
+
+  return normalized;
+}
+
+/**
+ * Run a validated batch
+ * @param steps Steps returned by validateBatch
+ * @param options Execution callbacks and parallelism limit
+ * @returns Per-step outcomes in input order and a summary
+ */
+export function runBatch<R>(steps: Array<BatchStep & { id: string }>, options: BatchRunOptions<R>): Promise<BatchOutcome<R>> {
+  const maxParallel = Math.max(1, options.maxParallel);
+  const outcomes = new Map<string, BatchStepOutcome<R>>();
+  const dependents = new Map<string, string[]>(steps.map(step => [step.id, []]));
+  const pendingDependencies = new Map<string, number>();
+  for (const step of steps) {
+    const dependencies = new Set(step.dependsOn ?? []);
+    pendingDependencies.set(step.id, dependencies.size);
+    for (const dependency of dependencies) {
+      dependents.get(dependency)!.push(step.id);
+    }
+  }
+  const stepsById = new Map(steps.map(step => [step.id, step]));
+  const ready: string[] = steps.filter(step => pendingDependencies.get(step.id) === 0).map(step => step.id);
+  let running = 0;
+
+  return new Promise(resolve => {
+    const finishIfDone = () => {
+      if (outcomes.size < steps.length) {
+        return;
+      }
+      const ordered = steps.map(step => outcomes.get(step.id)!);
+      const count = (status: BatchStepStatus) => ordered.filter(outcome => outcome.status === status).length;
+      const summary = {
+        total: ordered.length,
+        succeeded: count('succeeded'),
+        failed: count('failed'),
+        skipped: count('skipped'),
+      };
+      resolve({ success: summary.succeeded === summary.total, summary, steps: ordered });
+    };
+
+    const skipDependents = (failedId: string) => {
+      const queue = [...dependents.get(failedId)!];
+      while (queue.length > 0) {
+        const id = queue.shift()!;
+        if (outcomes.has(id)) {
+          continue;
+        }
+        outcomes.set(id, {
+          id,
+          command_name: stepsById.get(id)!.command_name,
+          status: 'skipped',
+          error: `Skipped because step ${failedId} did not succeed.`,
+        });
+        queue.push(...dependents.get(id)!);
+      }
+    };
+
+    const complete = (step: BatchStep & { id: string }, outcome: BatchStepOutcome<R>) => {
+      running--;
+      outcomes.set(step.id, outcome);
+      if (outcome.status === 'succeeded') {
+        for (const dependent of dependents.get(step.id)!) {
+          const left = pendingDependencies.get(dependent)! - 1;
+          pendingDependencies.set(dependent, left);
+          if (left === 0 && !outcomes.has(dependent)) {
+            ready.push(dependent);
+          }
+        }
+      } else {
+        skipDependents(step.id);
+      }
+      schedule();
+    };
+
+    const schedule = () => {
+      while (running < maxParallel && ready.length > 0) {
+        const step = stepsById.get(ready.shift()!)!;
+        running++;
+        options.execute(step).then(
+          result => complete(step, {
+            id: step.id,
+            command_name: step.command_name,
+            status: options.isSuccess(result) ? 'succeeded' : 'failed',
+            result,
+          }),
+          error => complete(step, {
+            id: step.id,
+            command_name: step.command_name,
+            status: 'failed',
+            error: error?.message ?? String(error),
+          })
+        );
+      }
+      finishIfDone();
+    };
+
+    schedule();
+  });
+}
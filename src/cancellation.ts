@@ -0,0 +1,120 @@
+/**
+ * Cancellation of in-flight tool calls
+ *
+ * MCP clients cancel a request by sending a `notifications/cancelled`
+ * notification with the id of the request. The registry keeps an
+ * AbortController per running tools/call request; the notification aborts it,
+ * and the abort signal is passed down to the dscli execution, which then kills
+ * its process tree.
+ *
+ * The request id is not exposed to request handlers, so the registry tags
+ * incoming tools/call messages with their id in `params._meta` before the
+ * server dispatches them.
+ */
+
+import { z } from 'zod';
+import { logger } from './logger.js';
+
+/** Key under `params._meta` that carries the JSON-RPC id of a tools/call request */
+export const REQUEST_ID_META_KEY = 'datasunrise/requestId';
+
+/**
+ * Schema of the MCP cancellation notification
+ */
+export const CancelledNotificationSchema = z.object({
+  method: z.literal('notifications/cancelled'),
+  params: z.object({
+    requestId: z.union([z.string(), z.number()]),
+    reason: z.string().optional(),
+  }),
+});
+
+type RequestId = string | number;
+
+interface MessageTransport {
+  onmessage?: (message: any) => void;
+}
+
+/**
+ * Tracks running tool calls so they can be cancelled by request id
+ */
+export class CancellationRegistry {
+  private controllers: Map<RequestId, AbortController> = new Map();
+  private cancelledCount = 0;
+
+  /**
+   * Tag tools/call requests received by a transport with their request id.
+   * Must be called after the server has connected to the transport.
+   * @param transport Connected transport
+   */
+  attach(transport: MessageTransport): void {
+    const onmessage = transport.onmessage;
+    if (!onmessage) {
+      logger.warn('Transport has no message handler; request cancellation is disabled.');
+      return;
+    }
+    transport.onmessage = (message: any) => {
+      if (message?.method === 'tools/call' && message.id !== undefined && message.params) {
+        message.params._meta = { ...message.params._meta, [REQUEST_ID_META_KEY]: message.id };
+      }
+      onmessage.call(transport, message);
+    };
+  }
+
+  /**
+   * Start tracking a request
+   * @param requestId JSON-RPC id of the request, if known
+   * @param parentSignal Signal provided by the MCP SDK, if any; aborting it also aborts the request
+   * @returns Signal aborted when the request is cancelled
+   */
+  begin(requestId: RequestId | undefined, parentSignal?: AbortSignal): AbortSignal {
+    const controller = new AbortController();
+    if (parentSignal) {
+      if (parentSignal.aborted) {
+        controller.abort(parentSignal.reason);
+      } else {
+        parentSignal.addEventListener('abort', () => controller.abort(parentSignal.reason), { once: true });
+      }
+    }
+    if (requestId !== undefined) {
+      this.controllers.set(requestId, controller);
+    }
+    return controller.signal;
+  }
+
+  /**
+   * Stop tracking a finished request
+   * @param requestId JSON-RPC id of the request
+   */
+  end(requestId: RequestId | undefined): void {
+    if (requestId !== undefined) {
+      this.controllers.delete(requestId);
+    }
+  }
+
+  /**
+   * Cancel a running request. Unknown or finished requests are ignored, as
+   * the protocol allows cancellations to race with responses.
+   * @param requestId JSON-RPC id of the request
+   * @param reason Reason given by the client
+   * @returns True if a running request was cancelled
+   */
+  cancel(requestId: RequestId, reason?: string): boolean {
+    const controller = this.controllers.get(requestId);
+    if (!controller) {
+      return false;
+    }
+    this.controllers.delete(requestId);
+    this.cancelledCount++;
+    controller.abort(reason ?? 'Cancelled by client');
+    return true;
+  }
+
+  /**
+   * Get cancellation counters
+   * @returns Running tracked requests and requests cancelled so far
+   */
+  getStats(): { running: number; cancelled: number } {
+    return { running: this.controllers.size, cancelled: this.cancelledCount };
+  }
+}
@@ -0,0 +1,552 @@
+/**
+ * Streaming dscli executor for the DataSunrise CLI MCP server
+ *
+ * Runs dscli through `spawn` with an argv array instead of a shell string, so
+ * argument values never need shell quoting. stdout and stderr are consumed in
+ * chunks; once stdout grows past a configurable byte cap, the complete output
+ * is spilled to a temporary file and only the first `maxBufferedBytes` are
+ * kept in memory. Optionally, stdout is parsed into rows while it streams
+ * (see output_parser.ts), which also covers the part that was spilled.
+ *
+ * Spill files are tracked until a pager takes them over (claimSpillFile) or
+ * they are released: attempts that are thrown away release theirs at once,
+ * the others are removed by sweepSpillFiles once they are older than a TTL,
+ * and removeSpillFiles deletes the rest when the server stops.
+ *
+ * Executions can be bounded by a timeout and cancelled through an
+ * AbortSignal. In both cases the whole process tree is killed, including a
+ * JVM started by a wrapper script such as executecommand.sh.
+ */
+
+import { spawn, ChildProcess, SpawnOptions } from 'node:child_process';
+import * as fs from 'node:fs';
+import * as os from 'node:os';
+import * as path from 'node:path';
+import { performance } from 'node:perf_hooks';
+import { Readable } from 'node:stream';
+import { StringDecoder } from 'node:string_decoder';
+import { CliOutputParser, ParsedOutput } from './output_parser.js';
+import { logger } from './logger.js';
+
+/**
+ * Default number of stdout bytes kept in memory before spilling to a file
+ */
+export const DEFAULT_MAX_BUFFERED_BYTES = 1024 * 1024;
+
+/**
+ * Exit codes reported for executions stopped by the server
+ * (same conventions as coreutils `timeout` and Ctrl+C)
+ */
+export const TIMEOUT_EXIT_CODE = 124;
+export const CANCELLED_EXIT_CODE = 130;
+
+/**
+ * Time between SIGTERM and SIGKILL when killing a process tree
+ */
+const KILL_GRACE_MS = 2000;
+
+/**
+ * How to launch the dscli executable: the program and any fixed leading
+ * arguments (for example the JVM options of the direct Java fallback)
+ */
+export interface CliLaunch {
+  file: string;
+  args: string[];
+}
+
+/**
+ * Options for a single dscli execution
+ */
+export interface CliExecutionOptions {
+  /** Maximum number of stdout/stderr bytes kept in memory */
+  maxBufferedBytes?: number;
+  /** Directory for spill files (defaults to the OS temp directory) */
+  spillDir?: string;
+  /** Parse stdout into rows, keeping at most this many rows (0 or undefined = no parsing) */
+  maxRows?: number;
+  /** Kill the process tree after this many milliseconds (0 or undefined = no limit) */
+  timeoutMs?: number;
+  /** Kill the process tree when this signal is aborted */
+  signal?: AbortSignal;
+}
+
+/**
+ * Timings of one dscli execution in milliseconds
+ */
+export interface CliTimings {
+  /** From the spawn call until the process started (0 for pooled workers) */
+  spawnMs: number;
+  /** From process start until exit (for pooled workers: until the command finished) */
+  runMs: number;
+  /** Time spent parsing stdout into rows */
+  parseMs: number;
+}
+
+/**
+ * Result of a dscli execution
+ */
+export interface CliProcessResult {
+  stdout: string;
+  stderr: string;
+  exitCode: number;
+  /** Signal that terminated the process, if any */
+  signal?: string;
+  /** Total number of bytes written to stdout */
+  stdoutBytes: number;
+  /** Path of the file holding the complete stdout when it exceeded the cap */
+  stdoutFile?: string;
+  /** True when `stdout` holds only the first part of the output */
+  stdoutTruncated?: boolean;
+  /** True when stderr exceeded the cap and was cut */
+  stderrTruncated?: boolean;
+  /** Error raised while starting the process (e.g. ENOENT) */
+  spawnError?: NodeJS.ErrnoException;
+  /** Rows parsed from stdout, when parsing was requested */
+  parsed?: ParsedOutput;
+  /** True when the process was killed because it exceeded its timeout */
+  timedOut?: boolean;
+  /** True when the process was killed because the request was cancelled */
+  cancelled?: boolean;
+  /** Where the time went */
+  timings?: CliTimings;
+}
+
+let spillFileCounter = 0;
+
+/**
+ * Spill files nobody has taken over yet, with their creation time
+ */
+const spillFiles: Map<string, number> = new Map();
+
+/**
+ * Processes started by executeCli that have not exited yet
+ */
+const activeProcesses: Set<ChildProcess> = new Set();
+
+/**
+ * Create a launch description for a plain executable path
+ * @param executable Path of the dscli executable
+ * @returns Launch description without leading arguments
+ */
+export function launchForExecutable(executable: string): CliLaunch {
+  return { file: executable, args: [] };
+}
+
+/**
+ * Quote a single argument for display or for a line-based protocol.
+ * Values with whitespace, quotes or shell-sensitive characters are wrapped in
+ * double quotes; inner backslashes and double quotes are escaped with a
+ * backslash, so `"a\\\"b"` reads back as `a\"b`.
+ * @param arg Argument value
+ * @returns The quoted argument
+ */
+export function quoteCliArgument(arg: string): string {
+  if (arg.length > 0 && !/[\s"'\\:{}=]/.test(arg)) {
+    return arg;
+  }
+  return `"${arg.replace(/["\\]/g, '\\$&')}"`;
+}
+
+/**
+ * Whether a value contains control characters (line breaks, tabs, NUL, ...),
+ * which a line-based protocol cannot carry
+ * @param value Argument or command line
+ * @returns True when the value contains a control character
+ */
+export function hasControlCharacters(value: string): boolean {
+  return /[\x00-\x1f\x7f]/.test(value);
+}
+
+/**
+ * Render an argv array as a single command line (used for display, logging
+ * and the worker pool protocol)
+ * @param argv Arguments, starting with the dscli base command
+ * @returns Command line string
+ */
+export function formatCommandLine(argv: string[]): string {
+  return argv.map(quoteCliArgument).join(' ');
+}
+
+/**
+ * Flags whose values are secrets (passwords, tokens, keys)
+ */
+const SECRET_FLAG_PATTERN = /^-(?!save)\w*(password|pwd|secret|token)$|^-(access|secret|private)?key(ForSign\w*)?$/i;
+
+/**
+ * Placeholder for redacted values
+ */
+export const REDACTED = '***';
+
+/**
+ * Mask the values of secret flags (such as `-password` or `-sessionToken`)
+ * so a command line can be logged or returned to the client
+ * @param argv Arguments, starting with the dscli base command
+ * @returns A copy of argv with secret values replaced by REDACTED
+ */
+export function redactArgv(argv: string[]): string[] {
+  return argv.map((arg, index) => index > 0 && SECRET_FLAG_PATTERN.test(argv[index - 1]) ? REDACTED : arg);
+}
+
+/**
+ * Quote an argument for cmd.exe, which is needed to run .bat/.cmd files
+ */
+function quoteForCmd(arg: string): string {
+  if (arg.length > 0 && !/[\s"&|<>^%]/.test(arg)) {
+    return arg;
+  }
+  return `"${arg.replace(/"/g, '""')}"`;
+}
+
+/**
+ * Kill a process and all of its descendants.
+ * On POSIX the process was started as a process group leader, so the whole
+ * group gets SIGTERM and, after a grace period, SIGKILL. On Windows the tree
+ * is killed with taskkill.
+ * @param child Process to kill
+ */
+export function killProcessTree(child: ChildProcess): void {
+  const pid = child.pid;
+  if (pid === undefined) {
+    return;
+  }
+  if (process.platform === 'win32') {
+    spawn('taskkill', ['/pid', String(pid), '/T', '/F'], { stdio: 'ignore', windowsHide: true })
+      .on('error', () => child.kill());
+    return;
+  }
+  const signalGroup = (signal: NodeJS.Signals) => {
+    try {
+      process.kill(-pid, signal);
+    } catch {
+      // The group is already gone, or the process is not a group leader
+      try {
+        child.kill(signal);
+      } catch {
+        // Already exited
+      }
+    }
+  };
+  signalGroup('SIGTERM');
+  // Descendants (e.g. the JVM under a wrapper script) may outlive the direct child, so always follow up
+  setTimeout(() => signalGroup('SIGKILL'), KILL_GRACE_MS).unref();
+}
+
+/**
+ * Kill every dscli process started by executeCli that is still running
+ * (used when the server shuts down)
+ */
+export function killActiveCliProcesses(): void {
+  activeProcesses.forEach(killProcessTree);
+}
+
+/**
+ * Delete a spill file that is no longer needed (for example the output of an
+ * attempt that was retried)
+ * @param file Path of the spill file
+ */
+export function releaseSpillFile(file: string): void {
+  spillFiles.delete(file);
+  fs.promises.unlink(file).catch(error => {
+    if (error.code !== 'ENOENT') {
+      logger.warn(`Could not delete spill file ${file}: ${error.message}`);
+    }
+  });
+}
+
+/**
+ * Take over a spill file: it is no longer swept, and the caller deletes it
+ * @param file Path of the spill file
+ */
+export function claimSpillFile(file: string): void {
+  spillFiles.delete(file);
+}
+
+/**
+ * Delete spill files that were neither claimed nor released within a TTL
+ * @param maxAgeMs Age after which a spill file is deleted
+ * @param now Current time (overridable for tests)
+ * @returns Number of files deleted
+ */
+export function sweepSpillFiles(maxAgeMs: number, now: number = Date.now()): number {
+  let removed = 0;
+  for (const [file, createdAt] of spillFiles) {
+    if (now - createdAt >= maxAgeMs) {
+      releaseSpillFile(file);
+      removed++;
+    }
+  }
+  return removed;
+}
+
+/**
+ * Synchronously delete every spill file that is still tracked
+ * (used when the server shuts down)
+ */
+export function removeSpillFiles(): void {
+  for (const file of spillFiles.keys()) {
+    try {
+      fs.unlinkSync(file);
+    } catch {
+      // Already gone
+    }
+  }
+  spillFiles.clear();
+}
+
+/**
+ * Spawn the dscli executable without a shell.
+ * Windows batch files cannot be spawned directly, so they are run through
+ * cmd.exe with explicitly quoted arguments. On POSIX the process becomes the
+ * leader of a new process group so killProcessTree() can reach its children.
+ * @param launch Launch description
+ * @param argv Arguments appended after the launch arguments
+ * @param options Additional spawn options
+ * @returns The child process
+ */
+export function spawnCliProcess(launch: CliLaunch, argv: string[], options: SpawnOptions = {}): ChildProcess {
+  const args = [...launch.args, ...argv];
+  if (process.platform === 'win32' && /\.(bat|cmd)$/i.test(launch.file)) {
+    const commandLine = [launch.file, ...args].map(quoteForCmd).join(' ');
+    return spawn(process.env.ComSpec || 'cmd.exe', ['/d', '/s', '/c', `"${commandLine}"`], {
+      ...options,
+      windowsVerbatimArguments: true,
+    });
+  }
+  return spawn(launch.file, args, { detached: process.platform !== 'win32', ...options, shell: false });
+}
+
+/**
+ * Output collected by a CliOutputCollector
+ */
+export type CollectedOutput = Pick<CliProcessResult, 'stdout' | 'stdoutBytes' | 'stdoutFile' | 'stdoutTruncated' | 'parsed'> & {
+  /** Time spent parsing stdout into rows */
+  parseMs: number;
+};
+
+/**
+ * Collects the stdout of one dscli command. The first `maxBufferedBytes` are
+ * kept in memory; once the output grows past that cap, the complete output
+ * is written to a spill file. With `maxRows`, rows are parsed while the
+ * output streams. Used by executeCli and by the worker pool.
+ */
+export class CliOutputCollector {
+  private chunks: Buffer[] = [];
+  private bytes = 0;
+  private maxBufferedBytes: number;
+  private spillDir: string;
+  private spillFile?: string;
+  private spillStream?: fs.WriteStream;
+  private parser?: CliOutputParser;
+  private decoder?: StringDecoder;
+  private parseMs = 0;
+
+  /**
+   * @param options Byte cap, spill directory and row limit
+   * @param source Stream to pause while the spill file catches up
+   */
+  constructor(options: CliExecutionOptions, private readonly source?: Readable) {
+    this.maxBufferedBytes = options.maxBufferedBytes ?? DEFAULT_MAX_BUFFERED_BYTES;
+    this.spillDir = options.spillDir ?? os.tmpdir();
+    if (options.maxRows) {
+      this.parser = new CliOutputParser(options.maxRows);
+      this.decoder = new StringDecoder('utf8');
+    }
+  }
+
+  /**
+   * Add a chunk of stdout
+   * @param chunk Raw output bytes
+   */
+  push(chunk: Buffer): void {
+    this.bytes += chunk.length;
+    if (this.parser) {
+      this.parse(this.decoder!.write(chunk));
+    }
+    if (this.spillStream) {
+      if (!this.spillStream.write(chunk)) {
+        this.source?.pause();
+      }
+      return;
+    }
+    this.chunks.push(chunk);
+    if (this.bytes > this.maxBufferedBytes) {
+      this.spillFile = path.join(this.spillDir, `dscli-output-${process.pid}-${Date.now()}-${++spillFileCounter}.txt`);
+      const spillFile = this.spillFile;
+      spillFiles.set(spillFile, Date.now());
+      this.spillStream = fs.createWriteStream(spillFile);
+      this.spillStream.on('drain', () => this.source?.resume());
+      this.spillStream.on('error', error => {
+        logger.warn(`Failed to write dscli output spill file ${spillFile}: ${error.message}`);
+      });
+      this.chunks.forEach(buffered => this.spillStream!.write(buffered));
+    }
+  }
+
+  /**
+   * Finish collecting: flush the spill file and finish parsing
+   * @returns The collected output
+   */
+  finish(): Promise<CollectedOutput> {
+    return new Promise<CollectedOutput>(resolve => {
+      const done = () => {
+        this.source?.resume();
+        const buffered = Buffer.concat(this.chunks);
+        const output: CollectedOutput = {
+          stdout: (this.spillFile ? buffered.subarray(0, this.maxBufferedBytes) : buffered).toString('utf8'),
+          stdoutBytes: this.bytes,
+          parseMs: 0,
+        };
+        if (this.spillFile) {
+          output.stdoutFile = this.spillFile;
+          output.stdoutTruncated = true;
+        }
+        if (this.parser) {
+          this.parse(this.decoder!.end());
+          const finishStarted = performance.now();
+          output.parsed = this.parser.finish();
+          this.parseMs += performance.now() - finishStarted;
+        }
+        output.parseMs = this.parseMs;
+        resolve(output);
+      };
+      if (this.spillStream) {
+        this.spillStream.end(done);
+      } else {
+        done();
+      }
+    });
+  }
+
+  /**
+   * Drop the output and delete the spill file, if one was started
+   */
+  discard(): void {
+    this.chunks = [];
+    const spillFile = this.spillFile;
+    if (this.spillStream && spillFile) {
+      this.spillStream.end(() => releaseSpillFile(spillFile));
+    }
+    this.source?.resume();
+  }
+
+  private parse(text: string): void {
+    const parseStarted = performance.now();
+    this.parser!.push(text);
+    this.parseMs += performance.now() - parseStarted;
+  }
+}
+
+/**
+ * In-memory buffer that keeps at most `maxBytes` (used for stderr)
+ */
+export class CappedBuffer {
+  private chunks: Buffer[] = [];
+  private bytes = 0;
+  /** True when data past the cap was dropped */
+  truncated = false;
+
+  /**
+   * @param maxBytes Number of bytes to keep
+   */
+  constructor(private readonly maxBytes: number = DEFAULT_MAX_BUFFERED_BYTES) {}
+
+  /**
+   * Add a chunk, dropping whatever does not fit
+   * @param chunk Raw bytes
+   */
+  push(chunk: Buffer): void {
+    if (this.bytes + chunk.length > this.maxBytes) {
+      this.truncated = true;
+      const remaining = this.maxBytes - this.bytes;
+      if (remaining > 0) {
+        this.chunks.push(chunk.subarray(0, remaining));
+        this.bytes += remaining;
+      }
+      return;
+    }
+    this.chunks.push(chunk);
+    this.bytes += chunk.length;
+  }
+
+  /**
+   * @returns The kept bytes decoded as UTF-8
+   */
+  toString(): string {
+    return Buffer.concat(this.chunks).toString('utf8');
+  }
+}
+
+/**
+ * Run a dscli command and stream its output
+ * @param launch Launch description of the executable
+ * @param argv Arguments, starting with the dscli base command
+ * @param options Execution options
+ * @returns The execution result; this promise never rejects
+ */
+export function executeCli(launch: CliLaunch, argv: string[], options: CliExecutionOptions = {}): Promise<CliProcessResult> {
+  return new Promise<CliProcessResult>(resolve => {
+    let spawnError: NodeJS.ErrnoException | undefined;
+    let stopReason: 'timedOut' | 'cancelled' | undefined;
+    const spawnStarted = performance.now();
+    let spawnedAt: number | undefined;
+
+    if (options.signal?.aborted) {
+      resolve({ stdout: '', stderr: '', exitCode: CANCELLED_EXIT_CODE, stdoutBytes: 0, cancelled: true });
+      return;
+    }
+
+    let child: ChildProcess;
+    try {
+      child = spawnCliProcess(launch, argv, { stdio: ['ignore', 'pipe', 'pipe'] });
+    } catch (error: any) {
+      resolve({ stdout: '', stderr: '', exitCode: 1, stdoutBytes: 0, spawnError: error });
+      return;
+    }
+    activeProcesses.add(child);
+    child.once('spawn', () => {
+      spawnedAt = performance.now();
+    });
+
+    const stop = (reason: 'timedOut' | 'cancelled') => {
+      if (!stopReason) {
+        stopReason = reason;
+        killProcessTree(child);
+      }
+    };
+    const timer = options.timeoutMs ? setTimeout(() => stop('timedOut'), options.timeoutMs) : undefined;
+    const onAbort = () => stop('cancelled');
+    options.signal?.addEventListener('abort', onAbort, { once: true });
+
+    const stdout = new CliOutputCollector(options, child.stdout ?? undefined);
+    const stderr = new CappedBuffer(options.maxBufferedBytes);
+    child.stdout?.on('data', (chunk: Buffer) => stdout.push(chunk));
+    child.stderr?.on('data', (chunk: Buffer) => stderr.push(chunk));
+
+    child.on('error', (error: NodeJS.ErrnoException) => {
+      spawnError = error;
+    });
+
+    child.on('close', async (code: number | null, signal: NodeJS.Signals | null) => {
+      const closedAt = performance.now();
+      activeProcesses.delete(child);
+      if (timer) clearTimeout(timer);
+      options.signal?.removeEventListener('abort', onAbort);
+      const { parseMs, ...output } = await stdout.finish();
+      const result: CliProcessResult = {
+        ...output,
+        stderr: stderr.toString(),
+        exitCode: spawnError ? 127 : code ?? 128,
+      };
+      if (signal) result.signal = signal;
+      if (stderr.truncated) result.stderrTruncated = true;
+      const startedAt = spawnedAt ?? closedAt;
+      result.timings = { spawnMs: startedAt - spawnStarted, runMs: closedAt - startedAt, parseMs };
+      if (spawnError) result.spawnError = spawnError;
+      if (stopReason) {
+        result[stopReason] = true;
+        result.exitCode = stopReason === 'timedOut' ? TIMEOUT_EXIT_CODE : CANCELLED_EXIT_CODE;
+      }
+      resolve(result);
+    });
+  });
+}
@@ -0,0 +1,136 @@
+/**
+ * Persisted cache of verified DataSunrise CLI executables
+ *
+ * Verifying the CLI can launch several processes (the given path, the
+ * executecommand scripts and a direct Java fallback). Once a path has been
+ * verified, the resolved launch is stored in a small JSON file keyed by the
+ * configured path, its modification time and its size, so later server starts
+ * can skip probing until the executable changes.
+ */
+
+import * as fs from 'node:fs/promises';
+import * as path from 'node:path';
+import { CliLaunch } from './cli_executor.js';
+import { logger } from './logger.js';
+
+/**
+ * A verified CLI executable and how to launch it
+ */
+export interface VerifiedCli {
+  /** Executable path, or the Java command line for the direct Java fallback */
+  executable: string;
+  launch: CliLaunch;
+}
+
+interface CacheEntry extends VerifiedCli {
+  mtimeMs: number;
+  size: number;
+  verifiedAt: string;
+}
+
+interface CacheFile {
+  version: number;
+  entries: Record<string, CacheEntry>;
+}
+
+const CACHE_VERSION = 1;
+
+/**
+ * File-backed cache of CLI verification results
+ */
+export class CliVerificationCache {
+  /**
+   * @param filePath Cache file location; undefined disables the cache
+   */
+  constructor(private readonly filePath: string | undefined) {}
+
+  /**
+   * Look up a previous verification of a path
+   * @param requestedPath Path the CLI was configured with
+   * @returns The verified executable, or undefined when unknown or the file has changed
+   */
+  async lookup(requestedPath: string): Promise<VerifiedCli | undefined> {
+    if (!this.filePath) {
+      return undefined;
+    }
+    const stamp = await getStamp(requestedPath);
+    const entry = (await this.read()).entries[path.resolve(requestedPath)];
+    if (!stamp || !entry || entry.mtimeMs !== stamp.mtimeMs || entry.size !== stamp.size) {
+      return undefined;
+    }
+    return { executable: entry.executable, launch: entry.launch };
+  }
+
+  /**
+   * Remember a successful verification. Paths that cannot be stat'ed (e.g. a
+   * bare command name resolved through PATH) are not cached.
+   * @param requestedPath Path the CLI was configured with
+   * @param verified The verified executable
+   */
+  async store(requestedPath: string, verified: VerifiedCli): Promise<void> {
+    const stamp = await getStamp(requestedPath);
+    if (!this.filePath || !stamp) {
+      return;
+    }
+    const data = await this.read();
+    data.entries[path.resolve(requestedPath)] = { ...verified, ...stamp, verifiedAt: new Date().toISOString() };
+    await this.write(data);
+  }
+
+  /**
+   * Forget a path, e.g. after its executable could no longer be launched
+   * @param requestedPath Path the CLI was configured with
+   */
+  async remove(requestedPath: string): Promise<void> {
+    if (!this.filePath) {
+      return;
+    }
+    const data = await this.read();
+    const key = path.resolve(requestedPath);
+    if (key in data.entries) {
+      delete data.entries[key];
+      await this.write(data);
+    }
+  }
+
+  private async read(): Promise<CacheFile> {
+    try {
+      const data = JSON.parse(await fs.readFile(this.filePath!, 'utf-8'));
+      if (data?.version === CACHE_VERSION && data.entries && typeof data.entries === 'object') {
+        return data;
+      }
+    } catch (error: any) {
+      if (error.code !== 'ENOENT') {
+        logger.warn(`Ignoring unreadable CLI verification cache ${this.filePath}: ${error.message}`);
+      }
+    }
+    return { version: CACHE_VERSION, entries: {} };
+  }
+
+  private async write(data: CacheFile): Promise<void> {
+    const file = this.filePath!;
+    // Write to a temp file and rename so concurrent server starts never read a partial file
+    const tempFile = `${file}.${process.pid}.tmp`;
+    try {
+      await fs.mkdir(path.dirname(file), { recursive: true });
+      await fs.writeFile(tempFile, JSON.stringify(data, null, 2));
+      await fs.rename(tempFile, file);
+    } catch (error: any) {
+      logger.warn(`Could not write CLI verification cache ${file}: ${error.message}`);
+      await fs.rm(tempFile, { force: true }).catch(() => undefined);
+    }
+  }
+}
+
+/**
+ * Modification time and size of a file, or undefined if it cannot be stat'ed.
+ * The size catches executables replaced with their mtime kept (e.g. `cp -p`).
+ */
+async function getStamp(file: string): Promise<{ mtimeMs: number; size: number } | undefined> {
+  try {
+    const stats = await fs.stat(file);
+    return { mtimeMs: stats.mtimeMs, size: stats.size };
+  } catch {
+    return undefined;
+  }
+}
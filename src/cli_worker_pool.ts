@@ -0,0 +1,568 @@
+/**
+ * Persistent dscli worker pool for the DataSunrise CLI MCP server
+ *
+ * Launching dscli starts a new JVM (com.fw.console.client.cli.Main) for every
+ * command, which costs several seconds of cold start. This module keeps a
+ * configurable number of long-lived dscli processes running and feeds them
+ * commands over stdin instead.
+ *
+ * Worker protocol (line based):
+ * - The server writes one command line per request, terminated by '\n'.
+ *   Arguments with whitespace, quotes or backslashes are wrapped in double
+ *   quotes, with inner `\` and `"` escaped by a backslash (see
+ *   quoteCliArgument). Command lines with control characters, such as a line
+ *   break inside a value, are never sent to a worker.
+ * - The worker writes the command output to stdout/stderr and then a line
+ *   `__DSCLI_END__ <exitCode>` on stdout and a line `__DSCLI_END__` on
+ *   stderr to mark the end of the response. The two pipes are read
+ *   independently, so the stderr marker is what tells which stderr output
+ *   belongs to the command. Workers that never mark stderr are detected on
+ *   their first command; their commands then end with the stdout marker.
+ *
+ * Worker output goes through the same byte cap, spill file and streaming row
+ * parser as one-off processes (see CliOutputCollector).
+ *
+ * Workers are recycled after a configurable number of commands and replaced
+ * when they crash. A command that times out or is cancelled kills its worker
+ * (with its process tree), and the worker is replaced. If workers keep dying right after start (for example
+ * because the executable does not support worker mode), the pool disables
+ * itself and callers fall back to one process per command.
+ *
+ * A command is only rejected with CliWorkerPoolRejectedError while no worker
+ * has seen it, so callers may run it another way. Once a command was written
+ * to a worker, a crash is reported as an error: running the command again
+ * could repeat a write.
+ */
+
+import { ChildProcess } from 'node:child_process';
+import { performance } from 'node:perf_hooks';
+import {
+  CANCELLED_EXIT_CODE,
+  CappedBuffer,
+  CliExecutionOptions,
+  CliLaunch,
+  CliOutputCollector,
+  CliProcessResult,
+  hasControlCharacters,
+  killProcessTree,
+  spawnCliProcess,
+  TIMEOUT_EXIT_CODE,
+} from './cli_executor.js';
+import { logger } from './logger.js';
+
+/**
+ * Marker line that terminates each response written by a worker
+ */
+export const DSCLI_END_MARKER = '__DSCLI_END__';
+
+const END_MARKER_BYTES = Buffer.from(DSCLI_END_MARKER);
+
+/**
+ * Longest line that is still checked for the end marker
+ */
+const MAX_MARKER_LINE_BYTES = 64;
+
+/**
+ * How long to wait for the stderr marker of a worker that has not written one yet
+ */
+const STDERR_MARKER_WAIT_MS = 1000;
+
+/**
+ * A worker that exits this soon after being spawned counts as a startup failure
+ */
+const STARTUP_GRACE_MS = 2000;
+
+/**
+ * Consecutive startup failures after which the pool disables itself
+ */
+const MAX_STARTUP_FAILURES = 3;
+
+/**
+ * Options for creating a worker pool
+ */
+export interface CliWorkerPoolOptions {
+  /** Number of workers to keep running */
+  size: number;
+  /** Number of commands a worker runs before it is recycled (0 = never) */
+  maxCommandsPerWorker: number;
+  /** How to launch the dscli executable */
+  launch: CliLaunch;
+  /** Arguments that start the executable in worker (stdin) mode */
+  workerArgs: string[];
+}
+
+/**
+ * Error for a command that no worker has seen, so it can safely be run
+ * another way (the pool is disabled or shutting down, or the command line
+ * cannot be sent over the worker protocol)
+ */
+export class CliWorkerPoolRejectedError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = 'CliWorkerPoolRejectedError';
+  }
+}
+
+/**
+ * Snapshot of pool state for monitoring
+ */
+export interface CliWorkerPoolStats {
+  enabled: boolean;
+  size: number;
+  liveWorkers: number;
+  busyWorkers: number;
+  idleWorkers: number;
+  queueDepth: number;
+  commandsExecuted: number;
+  workersSpawned: number;
+  workersRecycled: number;
+  workersCrashed: number;
+  commandsStopped: number;
+  disabledReason?: string;
+}
+
+interface PendingJob {
+  commandLine: string;
+  resolve: (result: CliProcessResult) => void;
+  reject: (error: Error) => void;
+  options: CliExecutionOptions;
+  timer?: NodeJS.Timeout;
+  onAbort?: () => void;
+  stopReason?: 'timedOut' | 'cancelled';
+}
+
+interface CliWorker {
+  id: number;
+  process: ChildProcess;
+  spawnedAt: number;
+  commandsRun: number;
+  job?: PendingJob;
+  /** When the current job was written to the worker */
+  jobStartedAt: number;
+  stdout?: CliOutputCollector;
+  stderr?: CappedBuffer;
+  stdoutScanner: EndMarkerScanner;
+  stderrScanner: EndMarkerScanner;
+  /** Exit code from the stdout marker of the current job */
+  exitCode?: number;
+  /** Run time of the current job up to its stdout marker */
+  runMs: number;
+  /** Whether the stderr marker of the current job has arrived */
+  stderrEnded: boolean;
+  /** Whether the worker marks the end of stderr; undefined until its first command */
+  marksStderr?: boolean;
+  stderrWait?: NodeJS.Timeout;
+  retiring: boolean;
+}
+
+/**
+ * Pool of long-lived dscli processes that accept commands over stdin
+ */
+export class CliWorkerPool {
+  private options: CliWorkerPoolOptions;
+  private workers: CliWorker[] = [];
+  private queue: PendingJob[] = [];
+  private nextWorkerId = 1;
+  private startupFailures = 0;
+  private disabledReason?: string;
+  private shuttingDown = false;
+  private commandsExecuted = 0;
+  private workersSpawned = 0;
+  private workersRecycled = 0;
+  private workersCrashed = 0;
+  private commandsStopped = 0;
+
+  /**
+   * Create a new worker pool. Workers are not started until start() is called.
+   * @param options Pool options
+   */
+  constructor(options: CliWorkerPoolOptions) {
+    this.options = options;
+  }
+
+  /**
+   * Whether the pool can currently accept commands
+   */
+  get available(): boolean {
+    return !this.disabledReason && !this.shuttingDown;
+  }
+
+  /**
+   * Warm up the pool by spawning all workers
+   */
+  start(): void {
+    logger.info(`Starting dscli worker pool with ${this.options.size} worker(s): ${[this.options.launch.file, ...this.options.launch.args, ...this.options.workerArgs].join(' ')}`);
+    while (this.workers.length < this.options.size) {
+      this.spawnWorker();
+    }
+  }
+
+  /**
+   * Execute a command on the next free worker
+   * @param commandLine dscli command line without the executable (e.g. 'showInstances')
+   * @param options Output limits, timeout and cancellation for this command; the time spent queued counts towards the timeout
+   * @returns The command result; rejects with CliWorkerPoolRejectedError when no worker took the command
+   */
+  execute(commandLine: string, options: CliExecutionOptions = {}): Promise<CliProcessResult> {
+    if (!this.available) {
+      return Promise.reject(new CliWorkerPoolRejectedError(`dscli worker pool is unavailable: ${this.disabledReason ?? 'shutting down'}`));
+    }
+    if (hasControlCharacters(commandLine)) {
+      return Promise.reject(new CliWorkerPoolRejectedError('command line contains control characters, which the worker protocol cannot carry'));
+    }
+    if (options.signal?.aborted) {
+      return Promise.resolve({ stdout: '', stderr: '', exitCode: CANCELLED_EXIT_CODE, stdoutBytes: 0, cancelled: true });
+    }
+    return new Promise<CliProcessResult>((resolve, reject) => {
+      const job: PendingJob = { commandLine, resolve, reject, options };
+      const settle = (settleFn: () => void) => {
+        if (job.timer) clearTimeout(job.timer);
+        if (job.onAbort) options.signal?.removeEventListener('abort', job.onAbort);
+        settleFn();
+      };
+      job.resolve = result => settle(() => resolve(result));
+      job.reject = error => settle(() => reject(error));
+      if (options.timeoutMs) {
+        job.timer = setTimeout(() => this.stopJob(job, 'timedOut'), options.timeoutMs);
+      }
+      if (options.signal) {
+        job.onAbort = () => this.stopJob(job, 'cancelled');
+        options.signal.addEventListener('abort', job.onAbort, { once: true });
+      }
+      this.queue.push(job);
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Get a snapshot of the pool state
+   * @returns Pool statistics including the current queue depth
+   */
+  getStats(): CliWorkerPoolStats {
+    const busyWorkers = this.workers.filter(w => w.job).length;
+    return {
+      enabled: this.available,
+      size: this.options.size,
+      liveWorkers: this.workers.length,
+      busyWorkers,
+      idleWorkers: this.workers.length - busyWorkers,
+      queueDepth: this.queue.length,
+      commandsExecuted: this.commandsExecuted,
+      workersSpawned: this.workersSpawned,
+      workersRecycled: this.workersRecycled,
+      workersCrashed: this.workersCrashed,
+      commandsStopped: this.commandsStopped,
+      disabledReason: this.disabledReason,
+    };
+  }
+
+  /**
+   * Stop all workers and reject queued commands
+   */
+  async shutdown(): Promise<void> {
+    this.shuttingDown = true;
+    this.rejectQueue(new CliWorkerPoolRejectedError('dscli worker pool is shutting down'));
+    const exits = this.workers.map(worker => new Promise<void>(resolve => {
+      worker.process.once('exit', () => resolve());
+      worker.process.stdin?.end();
+      killProcessTree(worker.process);
+    }));
+    await Promise.all(exits);
+    this.workers = [];
+  }
+
+  private spawnWorker(): void {
+    const child = spawnCliProcess(this.options.launch, this.options.workerArgs, { stdio: ['pipe', 'pipe', 'pipe'] });
+    const worker: CliWorker = {
+      id: this.nextWorkerId++,
+      process: child,
+      spawnedAt: Date.now(),
+      commandsRun: 0,
+      jobStartedAt: 0,
+      stdoutScanner: new EndMarkerScanner(),
+      stderrScanner: new EndMarkerScanner(),
+      runMs: 0,
+      stderrEnded: false,
+      retiring: false,
+    };
+    this.workersSpawned++;
+    this.workers.push(worker);
+
+    child.stdout?.on('data', (chunk: Buffer) => this.onStdout(worker, chunk));
+    child.stderr?.on('data', (chunk: Buffer) => this.onStderr(worker, chunk));
+    child.on('error', (error: Error) => {
+      logger.warn(`dscli worker ${worker.id} error: ${error.message}`);
+    });
+    child.on('exit', (code, signal) => this.onExit(worker, code, signal));
+  }
+
+  /**
+   * Pass worker output on to the job's collector until the end marker line
+   */
+  private onStdout(worker: CliWorker, chunk: Buffer): void {
+    if (!worker.job || !worker.stdout || worker.exitCode !== undefined) {
+      // Banner or other output between commands is not part of any response
+      return;
+    }
+    const collector = worker.stdout;
+    const marker = worker.stdoutScanner.scan(chunk, data => collector.push(data));
+    if (marker) {
+      const exitCode = parseInt(marker.subarray(END_MARKER_BYTES.length).toString('utf8').trim(), 10);
+      worker.exitCode = Number.isNaN(exitCode) ? 1 : exitCode;
+      worker.runMs = performance.now() - worker.jobStartedAt;
+      this.onResponseEnd(worker);
+    }
+  }
+
+  private onStderr(worker: CliWorker, chunk: Buffer): void {
+    if (!worker.stderr || worker.stderrEnded) {
+      return;
+    }
+    const stderr = worker.stderr;
+    if (worker.stderrScanner.scan(chunk, data => stderr.push(data))) {
+      worker.stderrEnded = true;
+      worker.marksStderr = true;
+      this.onResponseEnd(worker);
+    }
+  }
+
+  /**
+   * Complete the job once both pipes are marked, or after the stdout marker
+   * for workers that do not mark stderr
+   */
+  private onResponseEnd(worker: CliWorker): void {
+    if (worker.exitCode === undefined) {
+      return;
+    }
+    if (worker.stderrEnded || worker.marksStderr === false) {
+      this.completeJob(worker);
+    } else if (worker.marksStderr === undefined && !worker.stderrWait) {
+      worker.stderrWait = setTimeout(() => {
+        worker.stderrWait = undefined;
+        worker.marksStderr = false;
+        logger.warn(`dscli worker ${worker.id} does not end stderr with ${DSCLI_END_MARKER}; its stderr may be reported with the wrong command.`);
+        this.completeJob(worker);
+      }, STDERR_MARKER_WAIT_MS);
+    }
+  }
+
+  /**
+   * Hand the finished job its result. The worker is detached from the job
+   * before anything is awaited, so dispatch() can give it the next job at once.
+   */
+  private completeJob(worker: CliWorker): void {
+    const job = worker.job!;
+    const stdout = worker.stdout!;
+    const stderr = worker.stderr!;
+    const exitCode = worker.exitCode!;
+    worker.job = undefined;
+    worker.stdout = undefined;
+    worker.stderr = undefined;
+    worker.exitCode = undefined;
+    if (worker.stderrWait) {
+      clearTimeout(worker.stderrWait);
+      worker.stderrWait = undefined;
+    }
+    worker.commandsRun++;
+    this.commandsExecuted++;
+    this.startupFailures = 0;
+
+    if (this.workers.includes(worker) && this.options.maxCommandsPerWorker > 0 && worker.commandsRun >= this.options.maxCommandsPerWorker) {
+      this.recycle(worker);
+    }
+    this.dispatch();
+    collectResult(stdout, stderr, exitCode, worker.runMs).then(job.resolve, error => job.reject(error));
+  }
+
+  private async onExit(worker: CliWorker, code: number | null, signal: NodeJS.Signals | null): Promise<void> {
+    this.workers = this.workers.filter(w => w !== worker);
+    if (worker.stderrWait) {
+      clearTimeout(worker.stderrWait);
+      worker.stderrWait = undefined;
+    }
+    if (worker.job && worker.exitCode !== undefined && !worker.job.stopReason) {
+      // The response was complete on stdout; only its stderr marker is missing
+      this.completeJob(worker);
+    }
+    const job = worker.job;
+    worker.job = undefined;
+    if (job?.stopReason && worker.stdout && worker.stderr) {
+      const stopReason = job.stopReason;
+      const result = await collectResult(worker.stdout, worker.stderr, stopReason === 'timedOut' ? TIMEOUT_EXIT_CODE : CANCELLED_EXIT_CODE, performance.now() - worker.jobStartedAt);
+      job.resolve({ ...result, [stopReason]: true });
+    } else if (job) {
+      worker.stdout?.discard();
+      job.reject(new Error(`dscli worker ${worker.id} exited (code ${code}, signal ${signal}) while running a command`));
+    }
+    if (this.shuttingDown) {
+      return;
+    }
+    if (worker.retiring) {
+      this.spawnWorker();
+      this.dispatch();
+      return;
+    }
+
+    this.workersCrashed++;
+    if (worker.commandsRun === 0 && Date.now() - worker.spawnedAt < STARTUP_GRACE_MS) {
+      this.startupFailures++;
+    }
+    if (this.startupFailures >= MAX_STARTUP_FAILURES) {
+      this.disabledReason = `workers exited right after start ${this.startupFailures} times in a row`;
+      logger.warn(`Disabling dscli worker pool: ${this.disabledReason}. Falling back to one process per command.`);
+      this.rejectQueue(new CliWorkerPoolRejectedError(`dscli worker pool is unavailable: ${this.disabledReason}`));
+      return;
+    }
+    logger.warn(`dscli worker ${worker.id} exited unexpectedly (code ${code}, signal ${signal}). Replacing it.`);
+    this.spawnWorker();
+    this.dispatch();
+  }
+
+  private recycle(worker: CliWorker): void {
+    worker.retiring = true;
+    this.workersRecycled++;
+    worker.process.stdin?.end();
+    killProcessTree(worker.process);
+  }
+
+  /**
+   * Stop a job that timed out or was cancelled. A queued job is simply
+   * dropped; a running job kills its worker, which is then replaced.
+   */
+  private stopJob(job: PendingJob, reason: 'timedOut' | 'cancelled'): void {
+    if (job.stopReason) {
+      return;
+    }
+    job.stopReason = reason;
+    this.commandsStopped++;
+    const queueIndex = this.queue.indexOf(job);
+    if (queueIndex >= 0) {
+      this.queue.splice(queueIndex, 1);
+      job.resolve({ stdout: '', stderr: '', exitCode: reason === 'timedOut' ? TIMEOUT_EXIT_CODE : CANCELLED_EXIT_CODE, stdoutBytes: 0, [reason]: true });
+      return;
+    }
+    const worker = this.workers.find(w => w.job === job);
+    if (worker) {
+      logger.warn(`Stopping dscli worker ${worker.id}: command ${reason === 'timedOut' ? 'timed out' : 'was cancelled'}.`);
+      worker.retiring = true;
+      worker.process.stdin?.end();
+      killProcessTree(worker.process);
+    }
+  }
+
+  private dispatch(): void {
+    while (this.queue.length > 0) {
+      const worker = this.workers.find(w => !w.job && !w.retiring);
+      if (!worker) {
+        return;
+      }
+      const job = this.queue.shift()!;
+      worker.job = job;
+      worker.jobStartedAt = performance.now();
+      worker.stdout = new CliOutputCollector(job.options, worker.process.stdout ?? undefined);
+      worker.stderr = new CappedBuffer(job.options.maxBufferedBytes);
+      worker.stdoutScanner.reset();
+      worker.stderrScanner.reset();
+      worker.stderrEnded = false;
+      worker.process.stdin?.write(`${job.commandLine}\n`);
+    }
+  }
+
+  private rejectQueue(error: Error): void {
+    const pending = this.queue;
+    this.queue = [];
+    pending.forEach(job => job.reject(error));
+  }
+}
+
+/**
+ * Finds the end marker line in the output of one pipe. Each chunk is scanned
+ * once: complete lines are passed on right away, and only the start of a
+ * line that could still become the marker is held back.
+ */
+class EndMarkerScanner {
+  /** Start of a line that may still turn out to be the end marker */
+  private partialLine?: Buffer;
+  /** Whether the next byte starts a new line */
+  private atLineStart = true;
+
+  /**
+   * Scan the next chunk
+   * @param emit Receives the output before the marker line
+   * @returns The marker line once it is found; output after it is dropped
+   */
+  scan(chunk: Buffer, emit: (data: Buffer) => void): Buffer | undefined {
+    let data = chunk;
+    if (this.partialLine) {
+      data = Buffer.concat([this.partialLine, chunk]);
+      this.partialLine = undefined;
+    }
+
+    let lineStart = 0;
+    if (!this.atLineStart) {
+      const newline = data.indexOf(0x0a);
+      if (newline < 0) {
+        emit(data);
+        return undefined;
+      }
+      lineStart = newline + 1;
+      this.atLineStart = true;
+    }
+    while (lineStart < data.length) {
+      const newline = data.indexOf(0x0a, lineStart);
+      const lineEnd = newline < 0 ? data.length : newline + 1;
+      const line = data.subarray(lineStart, lineEnd);
+      if (newline >= 0 && isMarkerLine(line)) {
+        if (lineStart > 0) {
+          emit(data.subarray(0, lineStart));
+        }
+        this.reset();
+        return line;
+      }
+      if (newline < 0) {
+        if (couldBeMarkerLine(line)) {
+          this.partialLine = Buffer.from(line);
+          data = data.subarray(0, lineStart);
+        } else {
+          this.atLineStart = false;
+        }
+        break;
+      }
+      lineStart = lineEnd;
+    }
+    if (data.length > 0) {
+      emit(data);
+    }
+    return undefined;
+  }
+
+  reset(): void {
+    this.partialLine = undefined;
+    this.atLineStart = true;
+  }
+}
+
+/**
+ * Whether a complete line is the end marker
+ */
+function isMarkerLine(line: Buffer): boolean {
+  return line.length <= MAX_MARKER_LINE_BYTES && line.subarray(0, END_MARKER_BYTES.length).equals(END_MARKER_BYTES);
+}
+
+/**
+ * Whether the start of a line can still turn into the end marker
+ */
+function couldBeMarkerLine(start: Buffer): boolean {
+  const length = Math.min(start.length, END_MARKER_BYTES.length);
+  return start.length < MAX_MARKER_LINE_BYTES && start.subarray(0, length).equals(END_MARKER_BYTES.subarray(0, length));
+}
+
+/**
+ * Build the result of a pooled command from its collected output
+ */
+async function collectResult(stdout: CliOutputCollector, stderr: CappedBuffer, exitCode: number, runMs: number): Promise<CliProcessResult> {
+  const { parseMs, ...output } = await stdout.finish();
+  const result: CliProcessResult = { ...output, stderr: stderr.toString(), exitCode, timings: { spawnMs: 0, runMs, parseMs } };
+  if (stderr.truncated) result.stderrTruncated = true;
+  return result;
+}
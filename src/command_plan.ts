@@ -0,0 +1,196 @@
+/**
+ * Compiled command plans for DataSunrise CLI commands
+ *
+ * At startup every command definition is compiled once into a plan that
+ * holds the CLI parameter order, boolean flags, effective defaults and the
+ * per-command special cases. Rendering the argv of a call is then a single
+ * loop over the plan, and command lookups are Map lookups instead of a linear
+ * search over allCliCommands.
+ */
+
+import { ErrorCode, McpError } from '@modelcontextprotocol/sdk/types.js';
+import { CliCommand } from './commands/types.js';
+import { logger } from './logger.js';
+
+/**
+ * A command parameter prepared for rendering
+ */
+export interface CompiledParam {
+  name: string;
+  cliName: string;
+  isBoolean: boolean;
+  required: boolean;
+  /** Value used when the argument is absent (includes command-specific defaults) */
+  defaultValue?: any;
+  /** Command-specific value rewrite applied before rendering */
+  transform?: (value: any) => any;
+}
+
+/**
+ * Defaults used when an add-rule command is called without any arguments
+ */
+export interface SimpleAddPlan {
+  /** CLI name of the rule name parameter, if the command has one */
+  nameCliName?: string;
+  /** Rule type used in the generated name (e.g. 'AuditRule') */
+  ruleType: string;
+  /** Fixed arguments appended after the generated name */
+  extraArgv: string[];
+}
+
+/**
+ * A command definition compiled for fast argument rendering
+ */
+export interface CommandPlan {
+  commandDef: CliCommand;
+  baseCommand: string;
+  params: CompiledParam[];
+  simpleAdd?: SimpleAddPlan;
+}
+
+const SIMPLE_ADD_RULE_COMMANDS = new Set(['addAuditRule', 'addSecurityRule', 'addMaskRule', 'addLearnRule']);
+const ENABLE_BY_DEFAULT_COMMANDS = new Set(['addAuditRule', 'addSecurityRule']);
+
+/**
+ * Value rewrites for individual parameters, keyed by `toolName.paramName`
+ */
+const PARAM_TRANSFORMS: Record<string, (value: any) => any> = {
+  // The CLI does not resolve 'localhost' for the core state query
+  'core_show_state.dsServer': value => {
+    if (value === 'localhost') {
+      logger.debug(`Automatically converted 'localhost' to '127.0.0.1' for dsServer parameter in core_show_state.`);
+      return '127.0.0.1';
+    }
+    return value;
+  },
+};
+
+/**
+ * Compile a command definition into a plan
+ * @param commandDef Command definition (including the shared sessionToken parameter)
+ * @returns Compiled plan
+ */
+export function compileCommand(commandDef: CliCommand): CommandPlan {
+  const enableByDefault = ENABLE_BY_DEFAULT_COMMANDS.has(commandDef.baseCommand);
+  const params: CompiledParam[] = commandDef.params.map(param => ({
+    name: param.name,
+    cliName: param.cliName,
+    isBoolean: param.type === 'boolean',
+    required: param.required,
+    defaultValue: enableByDefault && param.name === 'enable' ? 'true' : param.defaultValue,
+    transform: PARAM_TRANSFORMS[`${commandDef.toolName}.${param.name}`],
+  }));
+
+  let simpleAdd: SimpleAddPlan | undefined;
+  if (SIMPLE_ADD_RULE_COMMANDS.has(commandDef.baseCommand)) {
+    const enableParam = params.find(p => p.name === 'enable');
+    simpleAdd = {
+      nameCliName: params.find(p => p.name === 'name')?.cliName,
+      ruleType: commandDef.baseCommand.substring(3),
+      extraArgv: enableByDefault && enableParam ? [enableParam.cliName, 'true'] : [],
+    };
+  }
+
+  return { commandDef, baseCommand: commandDef.baseCommand, params, simpleAdd };
+}
+
+/**
+ * Render the CLI argument vector for a call
+ * @param plan Compiled command plan
+ * @param args Tool arguments
+ * @returns argv starting with the base command
+ * @throws McpError when a required parameter is missing
+ */
+export function renderArgv(plan: CommandPlan, args: Record<string, any> | undefined): string[] {
+  const argv: string[] = [plan.baseCommand];
+
+  if (plan.simpleAdd && (!args || Object.keys(args).length === 0)) {
+    return renderSimpleAdd(plan, plan.simpleAdd, argv);
+  }
+
+  const params = plan.params;
+  for (let i = 0; i < params.length; i++) {
+    const param = params[i];
+    let value = args?.[param.name];
+    if (value === undefined) {
+      value = param.defaultValue;
+    }
+    if (param.transform) {
+      value = param.transform(value);
+    }
+
+    if (param.isBoolean) {
+      if (value === true || String(value).toLowerCase() === 'true') {
+        argv.push(param.cliName);
+      }
+    } else if (value !== undefined) {
+      // Values are passed as separate argv entries, so no shell quoting or escaping is needed
+      argv.push(param.cliName, String(value));
+    } else if (param.required) {
+      throw new McpError(ErrorCode.InvalidParams, `Missing required parameter: ${param.name} for command ${plan.commandDef.toolName}`);
+    }
+  }
+  return argv;
+}
+
+function renderSimpleAdd(plan: CommandPlan, simpleAdd: SimpleAddPlan, argv: string[]): string[] {
+  logger.debug(() => `Detected simple add rule request for ${plan.commandDef.toolName}. Base command: ${plan.baseCommand}`);
+  if (simpleAdd.nameCliName) {
+    const timestamp = new Date().toISOString().replace(/[-:.]/g, '').slice(0, 14);
+    const defaultName = `Default_${simpleAdd.ruleType}_${timestamp}`;
+    logger.debug(() => `No name provided for simple add. Generated default name: ${defaultName}`);
+    argv.push(simpleAdd.nameCliName, defaultName);
+  } else {
+    logger.warn(`'name' parameter definition not found for ${plan.commandDef.toolName}, though it's an add rule command. Proceeding without adding a name.`);
+  }
+  argv.push(...simpleAdd.extraArgv);
+  return argv;
+}
+
+/**
+ * Index of compiled command plans keyed by tool name
+ */
+export class CommandIndex {
+  private plans: Map<string, CommandPlan>;
+
+  /**
+   * Compile all commands
+   * @param commands Command definitions
+   */
+  constructor(commands: CliCommand[]) {
+    this.plans = new Map(commands.map(cmd => [cmd.toolName, compileCommand(cmd)]));
+  }
+
+  /**
+   * Get the plan of a command
+   * @param toolName Command tool name
+   * @returns The compiled plan or undefined for unknown commands
+   */
+  get(toolName: string): CommandPlan | undefined {
+    return this.plans.get(toolName);
+  }
+
+  /**
+   * Get the definition of a command
+   * @param toolName Command tool name
+   * @returns The command definition or undefined for unknown commands
+   */
+  getCommand(toolName: string): CliCommand | undefined {
+    return this.plans.get(toolName)?.commandDef;
+  }
+
+  /**
+   * Check whether a command exists
+   * @param toolName Command tool name
+   */
+  has(toolName: string): boolean {
+    return this.plans.has(toolName);
+  }
+
+  /**
+   * Number of compiled commands
+   */
+  get size(): number {
+    return this.plans.size;
+  }
+}
@@ -0,0 +1,75 @@
+/**
+ * Command traits for DataSunrise CLI MCP commands
+ *
+ * Helpers that classify command definitions, e.g. whether a command only
+ * reads configuration and can safely be cached, coalesced or retried.
+ */
+
+import { CliCommand } from './commands/types.js';
+
+/**
+ * Read-only commands whose base command does not start with 'show'
+ */
+const READ_ONLY_BASE_COMMANDS = new Set<string>(['isNeedRestart']);
+
+/**
+ * Check whether a command only reads data and has no side effects
+ * @param commandDef Command definition
+ * @returns True for read-only commands (an explicit `readOnly` flag wins)
+ */
+export function isReadOnlyCommand(commandDef: CliCommand): boolean {
+  if (commandDef.readOnly !== undefined) {
+    return commandDef.readOnly;
+  }
+  return commandDef.baseCommand.startsWith('show') || READ_ONLY_BASE_COMMANDS.has(commandDef.baseCommand);
+}
+
+/**
+ * Write commands that set state and can be repeated with the same result
+ */
+const IDEMPOTENT_BASE_COMMAND_PREFIXES = ['update', 'set', 'enable', 'disable'];
+
+/**
+ * Check whether running a command twice has the same effect as running it once
+ * @param commandDef Command definition
+ * @param args Command arguments; renames (`newName`) are never idempotent, since the old name is gone after the first run
+ * @returns True for read-only commands and idempotent writes (an explicit `idempotent` flag wins)
+ */
+export function isIdempotentCommand(commandDef: CliCommand, args: Record<string, any> = {}): boolean {
+  if (isReadOnlyCommand(commandDef)) {
+    return true;
+  }
+  if (commandDef.idempotent !== undefined) {
+    return commandDef.idempotent;
+  }
+  if (args.newName !== undefined && args.newName !== '') {
+    return false;
+  }
+  return IDEMPOTENT_BASE_COMMAND_PREFIXES.some(prefix => commandDef.baseCommand.startsWith(prefix));
+}
+
+/**
+ * Check whether a command opens or changes the CLI session
+ * @param commandDef Command definition
+ * @returns True for connect/disconnect style commands
+ */
+export function isSessionCommand(commandDef: CliCommand): boolean {
+  return commandDef.category === 'Connection' || /^(connect|disconnect)/.test(commandDef.baseCommand);
+}
+
+/**
+ * Build a stable fingerprint of a command invocation, used as cache and
+ * single-flight key. Argument names are sorted, empty values dropped and
+ * values compared as strings, since that is how they reach the CLI.
+ * @param toolName Command tool name
+ * @param args Command arguments
+ * @returns Fingerprint string
+ */
+export function commandFingerprint(toolName: string, args: Record<string, any>): string {
+  const { sessionToken, ...rest } = args || {};
+  const normalized = Object.keys(rest)
+    .filter(name => rest[name] !== undefined && rest[name] !== null && rest[name] !== '')
+    .sort()
+    .map(name => [name, String(rest[name])]);
+  return `${toolName}|${JSON.stringify(normalized)}|${sessionToken ?? ''}`;
+}
@@ -15,6 +15,8 @@ export interface CliCommand {
   category?: string; // Optional: to group commands, e.g., "Application", "Instance"
   highRiskOperation?: boolean; // Indicates if the operation is high risk (e.g., restart, stop core)
   requiresExplicitApproval?: boolean; // Indicates if the operation requires explicit user approval
+  readOnly?: boolean; // Overrides the read-only detection (show* commands) used for caching
+  idempotent?: boolean; // Overrides the idempotency detection (update*/set* commands) used for retries
   allowEmptyToolArguments?: boolean; // If true, an empty arguments object in use_mcp_tool will result in the baseCommand being run without any CLI parameters.
   dependencies?: {
     [key: string]: {
@@ -3,9 +3,62 @@
  * 
  * This module provides a central registry for enhanced descriptions of commands and sequences.
  * It allows retrieving detailed metadata, examples, and contextual help for all CLI operations.
+ *
+ * Description modules are loaded lazily: the first lookup for a command loads
+ * the module(s) of that command's category, so sessions that never ask for
+ * enhanced descriptions do not pay for loading them.
  */
 
 import { EnhancedDescription } from './enhanced_descriptions.js';
+import { allCliCommands } from './commands/index.js';
+
+type ModuleLoader = () => Promise<unknown>;
+
+/**
+ * Description modules per command category (CliCommand.category)
+ */
+const CATEGORY_MODULES: Record<string, ModuleLoader[]> = {
+  'Application': [() => import('./enhanced_descriptions/application_commands.js')],
+  'CEF': [() => import('./enhanced_descriptions/cef_commands.js')],
+  'Core': [() => import('./enhanced_descriptions/core_commands.js')],
+  'Database User': [() => import('./enhanced_descriptions/db_user_commands.js')],
+  'Dictionary': [() => import('./enhanced_descriptions/dictionary_commands.js')],
+  'Discovery': [() => import('./enhanced_descriptions/discovery_commands.js')],
+  'DataSunrise User': [() => import('./enhanced_descriptions/ds_user_commands.js')],
+  'Host': [() => import('./enhanced_descriptions/host_commands.js')],
+  'Import': [() => import('./enhanced_descriptions/import_commands.js')],
+  'Instance': [() => import('./enhanced_descriptions/instance_commands.js')],
+  'License': [() => import('./enhanced_descriptions/license_commands.js')],
+  'Object Group': [() => import('./enhanced_descriptions/object_group_commands.js')],
+  'System Parameter': [() => import('./enhanced_descriptions/parameters_commands.js')],
+  'Periodic Task': [() => import('./enhanced_descriptions/periodic_task_commands.js')],
+  'Query Group': [() => import('./enhanced_descriptions/query_group_commands.js')],
+  'Report Generation': [() => import('./enhanced_descriptions/report_gen_commands.js')],
+  'Reports': [() => import('./enhanced_descriptions/reports_commands.js')],
+  'Role': [() => import('./enhanced_descriptions/role_commands.js')],
+  'Rule': [
+    () => import('./enhanced_descriptions/rule_commands.js'),
+    () => import('./enhanced_descriptions/masking_rule_commands.js'),
+  ],
+  'Schedule': [() => import('./enhanced_descriptions/schedule_commands.js')],
+  'Server': [() => import('./enhanced_descriptions/server_commands.js')],
+  'SSL Key Group': [() => import('./enhanced_descriptions/ssl_key_group_commands.js')],
+  'Static Masking': [() => import('./enhanced_descriptions/static_masking_commands.js')],
+  'Subscriber': [() => import('./enhanced_descriptions/subscriber_commands.js')],
+  'Tag': [() => import('./enhanced_descriptions/tag_commands.js')],
+};
+
+/**
+ * Category of each command, used to find its description module
+ */
+const commandCategories: Map<string, string | undefined> = new Map(allCliCommands.map(cmd => [cmd.toolName, cmd.category]));
+
+/**
+ * Loads per category, shared by concurrent lookups
+ */
+const categoryLoads: Map<string, Promise<void>> = new Map();
+
+let sequenceLoad: Promise<void> | undefined;
 
 /**
  * Registry for command descriptions
@@ -35,12 +88,64 @@ export function registerSequenceDescription(sequenceName: string, description: E
   sequenceDescriptions.set(sequenceName, description);
 }
 
+/**
+ * Load the description modules of one category (once)
+ * @param category Command category
+ */
+function loadCategory(category: string): Promise<void> {
+  let load = categoryLoads.get(category);
+  if (!load) {
+    const loaders = CATEGORY_MODULES[category] ?? [];
+    load = Promise.all(loaders.map(loader => loader())).then(() => undefined);
+    categoryLoads.set(category, load);
+  }
+  return load;
+}
+
+/**
+ * Make sure the description of a command is registered, loading its
+ * category's module on first use. Names that are not CLI commands (some
+ * descriptions are registered under other names) load all modules.
+ * @param commandName Name of the command
+ */
+export async function loadCommandDescriptions(commandName: string): Promise<void> {
+  if (!commandCategories.has(commandName)) {
+    if (!commandDescriptions.has(commandName)) {
+      await loadAllCommandDescriptions();
+    }
+    return;
+  }
+  const category = commandCategories.get(commandName);
+  if (category !== undefined && CATEGORY_MODULES[category]) {
+    await loadCategory(category);
+  }
+}
+
+/**
+ * Load every command description module
+ */
+export async function loadAllCommandDescriptions(): Promise<void> {
+  await Promise.all(Object.keys(CATEGORY_MODULES).map(loadCategory));
+}
+
+/**
+ * Load sequence descriptions (once)
+ */
+function loadSequenceDescriptions(): Promise<void> {
+  if (!sequenceLoad) {
+    sequenceLoad = import('./enhanced_descriptions/sequence_descriptions.js')
+      .then(module => module.registerAllSequenceDescriptions());
+  }
+  return sequenceLoad;
+}
+
 /**
  * Get enhanced description for a command
  * @param commandName Name of the command
  * @returns Enhanced description or undefined if not found
  */
-export function getCommandDescription(commandName: string): EnhancedDescription | undefined {
+export async function getCommandDescription(commandName: string): Promise<EnhancedDescription | undefined> {
+  await loadCommandDescriptions(commandName);
   return commandDescriptions.get(commandName);
 }
 
@@ -49,7 +154,8 @@ export function getCommandDescription(commandName: string): EnhancedDescription
  * @param sequenceName Name of the sequence
  * @returns Enhanced description or undefined if not found
  */
-export function getSequenceDescription(sequenceName: string): EnhancedDescription | undefined {
+export async function getSequenceDescription(sequenceName: string): Promise<EnhancedDescription | undefined> {
+  await loadSequenceDescriptions();
   return sequenceDescriptions.get(sequenceName);
 }
 
@@ -57,7 +163,8 @@ export function getSequenceDescription(sequenceName: string): EnhancedDescriptio
  * Get all registered command names
  * @returns Array of command names
  */
-export function getAllCommandNames(): string[] {
+export async function getAllCommandNames(): Promise<string[]> {
+  await loadAllCommandDescriptions();
   return Array.from(commandDescriptions.keys());
 }
 
@@ -65,7 +172,8 @@ export function getAllCommandNames(): string[] {
  * Get all registered sequence names
  * @returns Array of sequence names
  */
-export function getAllSequenceNames(): string[] {
+export async function getAllSequenceNames(): Promise<string[]> {
+  await loadSequenceDescriptions();
   return Array.from(sequenceDescriptions.keys());
 }
 
@@ -74,7 +182,8 @@ export function getAllSequenceNames(): string[] {
  * @param commandName Name of the command
  * @returns True if the command has an enhanced description
  */
-export function hasCommandDescription(commandName: string): boolean {
+export async function hasCommandDescription(commandName: string): Promise<boolean> {
+  await loadCommandDescriptions(commandName);
   return commandDescriptions.has(commandName);
 }
 
@@ -83,7 +192,8 @@ export function hasCommandDescription(commandName: string): boolean {
  * @param sequenceName Name of the sequence
  * @returns True if the sequence has an enhanced description
  */
-export function hasSequenceDescription(sequenceName: string): boolean {
+export async function hasSequenceDescription(sequenceName: string): Promise<boolean> {
+  await loadSequenceDescriptions();
   return sequenceDescriptions.has(sequenceName);
 }
 
@@ -91,7 +201,8 @@ export function hasSequenceDescription(sequenceName: string): boolean {
  * Get all commands with enhanced descriptions
  * @returns Map of command names to descriptions
  */
-export function getAllCommandDescriptions(): Map<string, EnhancedDescription> {
+export async function getAllCommandDescriptions(): Promise<Map<string, EnhancedDescription>> {
+  await loadAllCommandDescriptions();
   return new Map(commandDescriptions);
 }
 
@@ -99,17 +210,27 @@ export function getAllCommandDescriptions(): Map<string, EnhancedDescription> {
  * Get all sequences with enhanced descriptions
  * @returns Map of sequence names to descriptions
  */
-export function getAllSequenceDescriptions(): Map<string, EnhancedDescription> {
+export async function getAllSequenceDescriptions(): Promise<Map<string, EnhancedDescription>> {
+  await loadSequenceDescriptions();
   return new Map(sequenceDescriptions);
 }
 
+/**
+ * Get the names of categories whose descriptions have been loaded
+ * @returns Array of category names
+ */
+export function getLoadedDescriptionCategories(): string[] {
+  return Array.from(categoryLoads.keys());
+}
+
 /**
  * Get contextual help for a command parameter
  * @param commandName Name of the command
  * @param paramName Name of the parameter
  * @returns Contextual help object or undefined if not found
  */
-export function getCommandParameterHelp(commandName: string, paramName: string): string | undefined {
+export async function getCommandParameterHelp(commandName: string, paramName: string): Promise<string | undefined> {
+  await loadCommandDescriptions(commandName);
   const desc = commandDescriptions.get(commandName);
   if (!desc || !desc.contextualHelp || !desc.contextualHelp[paramName]) {
     return undefined;
@@ -123,7 +244,8 @@ export function getCommandParameterHelp(commandName: string, paramName: string):
  * @param paramName Name of the parameter
  * @returns Contextual help object or undefined if not found
  */
-export function getSequenceParameterHelp(sequenceName: string, paramName: string): string | undefined {
+export async function getSequenceParameterHelp(sequenceName: string, paramName: string): Promise<string | undefined> {
+  await loadSequenceDescriptions();
   const desc = sequenceDescriptions.get(sequenceName);
   if (!desc || !desc.contextualHelp || !desc.contextualHelp[paramName]) {
     return undefined;
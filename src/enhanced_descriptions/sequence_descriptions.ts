@@ -10,6 +10,7 @@
 
 import { EnhancedDescription, Example, ParameterContextualHelp } from '../enhanced_descriptions.js';
 import { createSequenceDescription, createParameterHelp } from '../sequence_description_helpers.js';
+import { logger } from '../logger.js';
 
 /**
  * Register all sequence descriptions in the description registry
@@ -19,8 +20,8 @@ export const registerAllSequenceDescriptions = () => {
   import('../description_registry.js').then(registry => {
     // Register all sequence descriptions
     
-    console.error('All sequence descriptions registered successfully');
+    logger.debug('All sequence descriptions registered successfully');
   }).catch(error => {
-    console.error('Failed to register sequence descriptions:', error);
+    logger.error('Failed to register sequence descriptions:', error);
   });
 };
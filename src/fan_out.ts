@@ -0,0 +1,123 @@
+/**
+ * Fan-out of one read-only command to several DataSunrise backends
+ *
+ * The same command runs against every listed backend, in parallel up to a
+ * concurrency limit. Each backend gets its own outcome, keyed by backend, so
+ * a node that fails or times out is reported without failing the others.
+ */
+
+import { backendKey, SessionBackend } from './session_manager.js';
+
+/**
+ * A backend as listed by the client
+ */
+export interface FanOutBackend extends SessionBackend {
+  /** Token of a Multi session on this backend; optional when automatic sessions are configured */
+  sessionToken?: string;
+}
+
+export type FanOutStatus = 'succeeded' | 'failed';
+
+/**
+ * Outcome of the command on one backend
+ */
+export interface FanOutNodeOutcome<R> {
+  status: FanOutStatus;
+  /** Command result for backends where the command ran */
+  result?: R;
+  /** Error message for backends where the command could not be run */
+  error?: string;
+  durationMs: number;
+}
+
+/**
+ * Outcome of a fan-out, keyed by backend (e.g. "https://10.0.0.5:11000")
+ */
+export interface FanOutOutcome<R> {
+  /** True when the command succeeded on every backend */
+  success: boolean;
+  summary: { total: number; succeeded: number; failed: number };
+  backends: Record<string, FanOutNodeOutcome<R>>;
+}
+
+/**
+ * Callbacks and limits used to run a fan-out
+ */
+export interface FanOutRunOptions<R> {
+  /** Maximum number of backends queried at the same time */
+  maxParallel: number;
+  /** Runs the command on one backend; a thrown error marks the backend as failed */
+  execute: (backend: FanOutBackend) => Promise<R>;
+  /** Decides whether a returned result counts as success */
+  isSuccess: (result: R) => boolean;
+}
+
+/**
+ * Fill in default ports and protocols and check a backend list
+ * @param backends Backends as received from the client
+ * @param defaults Backend whose port and protocol are used when omitted
+ * @returns Complete backends in input order
+ * @throws Error describing the first problem found
+ */
+export function validateBackends(backends: any, defaults: SessionBackend): FanOutBackend[] {
+  if (!Array.isArray(backends) || backends.length === 0) {
+    throw new Error('At least one backend is required.');
+  }
+  const keys = new Set<string>();
+  return backends.map((raw, index) => {
+    if (!raw || typeof raw.host !== 'string' || raw.host.trim() === '') {
+      throw new Error(`Backend ${index + 1} has no host.`);
+    }
+    if (raw.sessionToken !== undefined && typeof raw.sessionToken !== 'string') {
+      throw new Error(`Backend ${index + 1} has an invalid sessionToken.`);
+    }
+    const backend: FanOutBackend = {
+      host: raw.host.trim(),
+      port: String(raw.port ?? defaults.port),
+      protocol: String(raw.protocol ?? defaults.protocol),
+      ...(raw.sessionToken ? { sessionToken: raw.sessionToken } : {}),
+    };
+    const key = backendKey(backend);
+    if (keys.has(key)) {
+      throw new Error(`Duplicate backend: ${key}`);
+    }
+    keys.add(key);
+    return backend;
+  });
+}
+
+/**
+ * Run a command on every backend
+ * @param backends Backends returned by validateBackends
+ * @param options Execution callbacks and parallelism limit
+ * @returns Per-backend outcomes in input order and a summary
+ */
+export async function runFanOut<R>(backends: FanOutBackend[], options: FanOutRunOptions<R>): Promise<FanOutOutcome<R>> {
+  const outcomes: Array<FanOutNodeOutcome<R>> = new Array(backends.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < backends.length) {
+      const index = next++;
+      const started = Date.now();
+      try {
+        const result = await options.execute(backends[index]);
+        outcomes[index] = { status: options.isSuccess(result) ? 'succeeded' : 'failed', result, durationMs: Date.now() - started };
+      } catch (error: any) {
+        outcomes[index] = { status: 'failed', error: error?.message ?? String(error), durationMs: Date.now() - started };
+      }
+    }
+  };
+  const workers = Math.min(Math.max(1, options.maxParallel), backends.length);
+  await Promise.all(Array.from({ length: workers }, worker));
+
+  const byBackend: Record<string, FanOutNodeOutcome<R>> = {};
+  backends.forEach((backend, index) => {
+    byBackend[backendKey(backend)] = outcomes[index];
+  });
+  const succeeded = outcomes.filter(outcome => outcome.status === 'succeeded').length;
+  return {
+    success: succeeded === backends.length,
+    summary: { total: backends.length, succeeded, failed: backends.length - succeeded },
+    backends: byBackend,
+  };
+}
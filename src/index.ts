@@ -7,46 +7,56 @@ import {
   ListToolsRequestSchema, 
   McpError,
   RequestSchema, // Generic request schema
-  ListResourcesResult
+  ListResourcesResult,
+  ReadResourceRequestSchema
 } from '@modelcontextprotocol/sdk/types.js';
 import { z } from 'zod'; // Import Zod
 import { exec } from 'node:child_process';
-import { BasicMCPServer, Tool, Prompt } from './mcp_server_framework.js'; // MCP Framework - Added Prompt
+import { BasicMCPServer, Tool, Prompt, Resource, ToolExecutionContext } from './mcp_server_framework.js'; // MCP Framework - Added Prompt
 import { promisify } from 'node:util';
 import * as path from 'node:path';
 import { allCliCommands, CliParam, CliCommand } from './commands/index.js';
-import { getCommandDescription, getCommandParameterHelp } from './description_registry.js';
-import { registerAllSequenceDescriptions } from './enhanced_descriptions/sequence_descriptions.js';
-import './enhanced_descriptions/masking_rule_commands.js'; // Ensure masking rule descriptions are registered
-import './enhanced_descriptions/rule_commands.js';
-import './enhanced_descriptions/application_commands.js';
-import './enhanced_descriptions/application_commands.js';
-import './enhanced_descriptions/cef_commands.js';
-import './enhanced_descriptions/core_commands.js';
-import './enhanced_descriptions/db_user_commands.js';
-import './enhanced_descriptions/dictionary_commands.js';
-import './enhanced_descriptions/discovery_commands.js';
-import './enhanced_descriptions/ds_user_commands.js';
-import './enhanced_descriptions/host_commands.js';
-import './enhanced_descriptions/import_commands.js';
-import './enhanced_descriptions/instance_commands.js';
-import './enhanced_descriptions/license_commands.js';
-import './enhanced_descriptions/object_group_commands.js';
-import './enhanced_descriptions/parameters_commands.js';
-import './enhanced_descriptions/periodic_task_commands.js';
-import './enhanced_descriptions/query_group_commands.js';
-import './enhanced_descriptions/report_gen_commands.js';
-import './enhanced_descriptions/reports_commands.js';
-import './enhanced_descriptions/role_commands.js';
-import './enhanced_descriptions/schedule_commands.js';
-import './enhanced_descriptions/server_commands.js';
-import './enhanced_descriptions/ssl_key_group_commands.js';
-import './enhanced_descriptions/static_masking_commands.js';
-import './enhanced_descriptions/subscriber_commands.js';
-import './enhanced_descriptions/tag_commands.js';
+import { loadAllCommandDescriptions } from './description_registry.js';
+import { CliWorkerPool, CliWorkerPoolRejectedError } from './cli_worker_pool.js';
+import {
+  claimSpillFile,
+  CliLaunch,
+  CliProcessResult,
+  executeCli,
+  formatCommandLine,
+  killActiveCliProcesses,
+  launchForExecutable,
+  redactArgv,
+  releaseSpillFile,
+  removeSpillFiles,
+  sweepSpillFiles,
+} from './cli_executor.js';
+import { getArgValue, loadServerConfig, ServerConfig } from './server_config.js';
+import { CacheMode, ResultCache } from './result_cache.js';
+import { commandFingerprint, isReadOnlyCommand, isSessionCommand } from './command_traits.js';
+import { SingleFlight } from './single_flight.js';
+import { BatchStep, runBatch, validateBatch } from './batch_executor.js';
+import { CommandIndex, CommandPlan, renderArgv } from './command_plan.js';
+import { PreserializedResult, SchemaCatalog } from './schema_catalog.js';
+import { CliVerificationCache, VerifiedCli } from './cli_verification_cache.js';
+import { OutputFormat, OutputRow, parseCliOutput } from './output_parser.js';
+import { CursorError, OutputPage, OutputPager } from './output_pager.js';
+import { encodeToolResult, RESPONSE_ENCODINGS, ResponseEncodingOptions } from './response_encoding.js';
+import { logger } from './logger.js';
+import { CancellationRegistry, CancelledNotificationSchema, REQUEST_ID_META_KEY } from './cancellation.js';
+import { SessionError, SessionManager } from './session_manager.js';
+import { FanOutBackend, runFanOut, validateBackends } from './fan_out.js';
+import { RetryPolicy } from './retry_policy.js';
+import { TtlLruCache } from './ttl_cache.js';
+import { MetadataRefreshCoordinator } from './metadata_refresh.js';
+import { PROMETHEUS_CONTENT_TYPE, ServerMetrics, startMetricsServer } from './metrics.js';
+import type { Server as HttpServer } from 'node:http';
 
 const execAsync = promisify(exec);
 const DEFAULT_CLI_EXECUTABLE = 'dscli';
+const VERIFY_TIMEOUT_MS = 60000;
+const MASK_RULE_FAILURE_TTL_MS = 5 * 60 * 1000;
+const MASK_RULE_FAILURE_MAX_ENTRIES = 1000;
 
 interface CommandExecutionResult {
   command: string;
@@ -54,6 +64,20 @@ interface CommandExecutionResult {
   stderr: string;
   error?: string;
   exitCode: number;
+  stdoutBytes?: number; // Total size of stdout, also when it was spilled to a file
+  stdoutFile?: string; // Temp file with the complete stdout when it exceeded the in-memory cap
+  stdoutTruncated?: boolean; // True when stdout only holds the first part of the output
+  outputFormat?: OutputFormat; // Layout detected in stdout when rows were parsed
+  rows?: OutputRow[]; // stdout parsed into records (lists, key/value blocks, tables or -json data)
+  rowsTruncated?: boolean; // True when stdout had more rows than --cli-max-rows
+  page?: Omit<OutputPage, 'command' | 'text'>; // Position of stdout within the complete output in paged mode
+  cached?: boolean; // True when the result was served from the read cache
+  coalesced?: boolean; // True when the result was shared with an identical concurrent call
+  timedOut?: boolean; // True when the command was killed after exceeding its timeout
+  cancelled?: boolean; // True when the client cancelled the call and the command was killed
+  timeoutMs?: number; // Timeout applied to the command (0 = none)
+  attempts?: number; // Number of runs when transient failures were retried
+  metadataRefreshed?: boolean; // True when the instance metadata was updated and the command retried
   stepName?: string; // Added for sequence results
   description?: string; // Added for sequence results
   // For sequences, to carry overall success status
@@ -62,6 +86,13 @@ interface CommandExecutionResult {
   stepOutputs?: any;
 }
 
+// Time limit and cancellation of one command execution
+interface ExecutionLimits {
+  signal?: AbortSignal;
+  timeoutSeconds?: number; // Per-call override of the configured timeout; 0 disables it
+  rows?: boolean; // Parse the output into rows
+}
+
 // For tools like set_cli_executable_path that return content directly
 interface DirectContentResult {
     content: Array<{type: string, text: string}>;
@@ -79,20 +110,53 @@ class DataSunriseCliServer {
   private server: Server;
   private mcpServer: BasicMCPServer; 
   private cliExecutable: string = DEFAULT_CLI_EXECUTABLE;
+  private cliLaunch: CliLaunch = launchForExecutable(DEFAULT_CLI_EXECUTABLE);
   private cliVerified: boolean = false;
-  private maskRuleFailureCache: Map<string, { count: number; timestamp: number }> = new Map();
+  private cliRequestedPath: string = DEFAULT_CLI_EXECUTABLE; // Path as configured, before resolving fallbacks
+  private cliVerification?: Promise<boolean>; // Pending verification, if one is running
+  private cliVerificationGeneration = 0;
+  private verificationCache: CliVerificationCache;
+  private config: ServerConfig;
+  private cliPool?: CliWorkerPool;
+  private resultCache: ResultCache<CommandExecutionResult>;
+  private readFlights: SingleFlight<CommandExecutionResult> = new SingleFlight();
+  private commandIndex!: CommandIndex; // Built by populateMcpServer once all params are final
+  private schemaCatalog: SchemaCatalog;
+  // Recent rule_add_masking failures on objects missing from the metadata cache, by instance and columns
+  private maskRuleFailureCache: TtlLruCache<string, number> = new TtlLruCache({ maxEntries: MASK_RULE_FAILURE_MAX_ENTRIES, defaultTtlMs: MASK_RULE_FAILURE_TTL_MS });
+  private metadataRefresh: MetadataRefreshCoordinator = new MetadataRefreshCoordinator({ maxInstances: MASK_RULE_FAILURE_MAX_ENTRIES, rememberMs: MASK_RULE_FAILURE_TTL_MS });
+  private cancellations: CancellationRegistry = new CancellationRegistry();
+  private pager: OutputPager;
+  private sessions: SessionManager;
+  private retries: RetryPolicy;
+  private metrics: ServerMetrics = new ServerMetrics();
+  private metricsListener?: HttpServer;
 
   constructor() {
+    this.config = loadServerConfig();
+    logger.setLevel(this.config.logLevel);
     this.mcpServer = new BasicMCPServer(); 
-    registerAllSequenceDescriptions();
-    console.error('Enhanced sequence descriptions registered');
+    this.resultCache = new ResultCache<CommandExecutionResult>(this.config.resultCache);
+    this.verificationCache = new CliVerificationCache(this.config.cliVerification.cacheFile);
+    this.pager = new OutputPager({ ...this.config.paging, dir: this.config.cliOutput.spillDir });
+    // Spill files that are not paged are kept as long as a page cursor would be
+    const spillTtlMs = this.config.paging.cursorTtlMs;
+    setInterval(() => sweepSpillFiles(spillTtlMs), Math.max(1000, Math.min(spillTtlMs, 60000))).unref();
+    process.once('exit', () => removeSpillFiles());
+    this.retries = new RetryPolicy(this.config.cliRetry);
+    this.sessions = new SessionManager(this.config.session, argv => {
+      const connectDef = this.commandIndex.getCommand(argv[0])!;
+      return this.runCli(argv, this.resolveTimeoutMs(connectDef), undefined, connectDef);
+    });
 
-    const cliPathArgIndex = process.argv.indexOf('--cli-path');
-    if (cliPathArgIndex > -1 && process.argv.length > cliPathArgIndex + 1) {
-      this.cliExecutable = process.argv[cliPathArgIndex + 1];
-      console.error(`DataSunrise CLI executable path set from --cli-path argument: ${this.cliExecutable}`);
+    const cliPathArg = getArgValue('--cli-path');
+    if (cliPathArg !== undefined) {
+      this.cliExecutable = cliPathArg;
+      this.cliRequestedPath = cliPathArg;
+      this.cliLaunch = launchForExecutable(cliPathArg);
+      logger.info(`DataSunrise CLI executable path set from --cli-path argument: ${this.cliExecutable}`);
     } else {
-      console.error(`DataSunrise CLI executable path defaulting to: ${this.cliExecutable}`);
+      logger.info(`DataSunrise CLI executable path defaulting to: ${this.cliExecutable}`);
     }
     
     this.server = new Server(
@@ -110,21 +174,26 @@ class DataSunriseCliServer {
       }
     );
     this.populateMcpServer();
+    this.registerMetrics();
+    this.schemaCatalog = new SchemaCatalog(this.mcpServer.listTools(), allCliCommands);
     this.setupRequestHandlers(); 
     this.server.onerror = (error: any) => {
       if (error instanceof SyntaxError && 
           (error.message.includes('Unexpected end of JSON input') || 
            error.message.includes('Unexpected token') ||
            error.message.includes('is not valid JSON'))) {
-        console.warn('[MCP Info] Received non-JSON input. This is expected when running directly in a terminal. ' +
-                     'The server is waiting for valid JSON messages from an MCP client.');
-      } else if (process.argv.includes('--verbose')) {
-        console.error('[MCP Error]', error);
+        logger.info('Received non-JSON input. This is expected when running directly in a terminal. ' +
+                    'The server is waiting for valid JSON messages from an MCP client.');
       } else {
-        console.error(`[MCP Error] ${error.name}: ${error.message}`);
+        // Includes the stack trace at debug level
+        logger.error('Server error:', error);
       }
     };
     process.on('SIGINT', async () => {
+      killActiveCliProcesses();
+      this.pager.close();
+      this.metricsListener?.close();
+      await this.cliPool?.shutdown();
       await this.server.close();
       process.exit(0);
     });
@@ -134,7 +203,7 @@ class DataSunriseCliServer {
     const sessionTokenParam: CliParam = {
       name: 'sessionToken',
       type: 'string',
-      description: 'Session token to execute command at specified DataSunrise backend application',
+      description: 'Session token to execute command at specified DataSunrise backend application. Omit it when the server opens sessions automatically (DS_LOGIN or DS_OAUTH2_TOKEN configured).',
       required: false,
       cliName: '-sessionToken'
     };
@@ -146,6 +215,7 @@ class DataSunriseCliServer {
         }
       }
     });
+    this.commandIndex = new CommandIndex(allCliCommands);
 
     this.mcpServer.addTool('run_cli_command', new Tool({
       description: 'Executes a DataSunrise CLI command. Use `get_command_schema` to get the input schema for a specific command.',
@@ -162,19 +232,244 @@ class DataSunriseCliServer {
             description: 'The arguments for the command.',
             properties: {},
             additionalProperties: true
+          },
+          cache: {
+            type: 'string',
+            description: 'Cache control for read-only (show) commands: "bypass" ignores the cache, "refresh" re-runs the command and updates the cached result.',
+            enum: ['bypass', 'refresh']
+          },
+          timeoutSeconds: {
+            type: 'number',
+            description: 'Kill the command if it runs longer than this many seconds. Overrides the server default for the command category; 0 means no limit.'
+          },
+          pageSize: {
+            type: 'number',
+            description: 'Return the output in pages of this many lines. The response carries `page.nextCursor` while more lines remain.'
+          },
+          cursor: {
+            type: 'string',
+            description: 'Cursor from a previous paged response. Returns the next page from the stored output without running the command again.'
+          },
+          responseEncoding: {
+            type: 'string',
+            description: 'Encoding of the response: "compact" drops indentation, empty stderr and the command echo of successful commands. Defaults to the server setting.',
+            enum: ['pretty', 'compact']
+          },
+          maxStdoutBytes: {
+            type: 'number',
+            description: 'Keep only the first and last bytes of stdout, up to this many in total, and report the omitted byte count. 0 keeps everything. Pages are not cut.'
+          },
+          rows: {
+            type: 'boolean',
+            description: 'Also return the output parsed into `rows` (with `outputFormat`). Defaults to the server setting, which leaves them out.'
           }
         },
         required: ['command_name']
       },
-      execute: async (args: any): Promise<CommandExecutionResult> => {
-        const { command_name, arguments: commandArgs } = args;
-        const commandDef = allCliCommands.find(cmd => cmd.toolName === command_name);
+      execute: async (args: any, context?: ToolExecutionContext): Promise<CommandExecutionResult> => {
+        const { command_name, arguments: commandArgs, cache, timeoutSeconds, pageSize, cursor } = args;
+        const commandDef = this.commandIndex.getCommand(command_name);
 
         if (!commandDef) {
           throw new McpError(ErrorCode.InvalidParams, `Unknown command: ${command_name}`);
         }
+        if (cache !== undefined && cache !== 'bypass' && cache !== 'refresh') {
+          throw new McpError(ErrorCode.InvalidParams, `Invalid cache mode: ${cache}. Expected "bypass" or "refresh".`);
+        }
+        validateTimeoutSeconds(timeoutSeconds);
+        if (pageSize !== undefined && (!Number.isInteger(pageSize) || pageSize < 1)) {
+          throw new McpError(ErrorCode.InvalidParams, `Invalid pageSize: ${pageSize}. Expected a positive integer.`);
+        }
+        if (cursor !== undefined && typeof cursor !== 'string') {
+          throw new McpError(ErrorCode.InvalidParams, `Invalid cursor: ${cursor}. Expected the page.nextCursor string of an earlier response.`);
+        }
+        if (cursor !== undefined) {
+          return this.nextPage(commandDef, cursor, pageSize);
+        }
         
-        return this.executeCliCommand(commandDef, commandArgs || {});
+        // Pages leave out rows, so paged output is not parsed
+        const rows = pageSize === undefined && this.rowsRequested(args);
+        const result = await this.executeCachedCliCommand(commandDef, commandArgs || {}, cache, { signal: context?.signal, timeoutSeconds, rows });
+        return pageSize !== undefined && result.exitCode === 0 ? this.firstPage(result, pageSize) : result;
+      }
+    }));
+
+    this.mcpServer.addTool('run_cli_batch', new Tool({
+      description: 'Executes several DataSunrise CLI commands in one request. Steps may list the ids of other steps in `dependsOn`; independent steps run in parallel, and steps depending on a failed step are skipped. Returns the result of every step.',
+      inputSchema: {
+        type: 'object',
+        properties: {
+          steps: {
+            type: 'array',
+            description: 'Commands to execute.',
+            items: {
+              type: 'object',
+              properties: {
+                id: {
+                  type: 'string',
+                  description: 'Step id referenced by dependsOn. Defaults to the 1-based position of the step.'
+                },
+                command_name: {
+                  type: 'string',
+                  description: 'The name of the CLI command to execute.',
+                  enum: allCliCommands.map(cmd => cmd.toolName)
+                },
+                arguments: {
+                  type: 'object',
+                  description: 'The arguments for the command.',
+                  properties: {},
+                  additionalProperties: true
+                },
+                dependsOn: {
+                  type: 'array',
+                  description: 'Ids of steps that must succeed before this step runs.',
+                  items: { type: 'string' }
+                },
+                timeoutSeconds: {
+                  type: 'number',
+                  description: 'Kill the command if it runs longer than this many seconds; 0 means no limit.'
+                }
+              },
+              required: ['command_name']
+            }
+          },
+          maxParallel: {
+            type: 'number',
+            description: `Maximum number of steps running at the same time (default ${this.config.batch.maxParallel}).`
+          },
+          responseEncoding: {
+            type: 'string',
+            description: 'Encoding of the response: "compact" drops indentation, empty stderr and the command echo of successful commands. Defaults to the server setting.',
+            enum: ['pretty', 'compact']
+          },
+          maxStdoutBytes: {
+            type: 'number',
+            description: 'Keep only the first and last bytes of stdout, up to this many in total, and report the omitted byte count. 0 keeps everything.'
+          },
+          rows: {
+            type: 'boolean',
+            description: 'Also return the output parsed into `rows` (with `outputFormat`). Defaults to the server setting, which leaves them out.'
+          }
+        },
+        required: ['steps']
+      },
+      execute: async (args: any, context?: ToolExecutionContext): Promise<any> => {
+        const { steps, maxParallel } = args || {};
+        let validatedSteps: Array<BatchStep & { id: string }>;
+        try {
+          validatedSteps = validateBatch(steps, name => this.commandIndex.has(name));
+        } catch (error: any) {
+          throw new McpError(ErrorCode.InvalidParams, `Invalid batch: ${error.message}`);
+        }
+        for (const step of validatedSteps) {
+          validateTimeoutSeconds(step.timeoutSeconds);
+        }
+        if (maxParallel !== undefined && (typeof maxParallel !== 'number' || maxParallel < 1)) {
+          throw new McpError(ErrorCode.InvalidParams, `Invalid maxParallel: ${maxParallel}. Expected a positive number.`);
+        }
+
+        return runBatch<CommandExecutionResult>(validatedSteps, {
+          maxParallel: Math.floor(maxParallel ?? this.config.batch.maxParallel),
+          execute: step => {
+            const commandDef = this.commandIndex.getCommand(step.command_name)!;
+            return this.executeCachedCliCommand(commandDef, step.arguments || {}, undefined, {
+              signal: context?.signal,
+              timeoutSeconds: step.timeoutSeconds,
+              rows: this.rowsRequested(args),
+            });
+          },
+          isSuccess: result => result.exitCode === 0 && !result.error,
+        });
+      }
+    }));
+
+    this.mcpServer.addTool('run_cli_fanout', new Tool({
+      description: 'Executes one read-only DataSunrise CLI command (e.g. core_show_state, license_show_all) on several DataSunrise backends in parallel. Returns the result of every backend keyed by "protocol://host:port"; backends that fail or time out are reported individually without failing the others.',
+      inputSchema: {
+        type: 'object',
+        properties: {
+          command_name: {
+            type: 'string',
+            description: 'The name of the read-only CLI command to execute.',
+            enum: allCliCommands.filter(cmd => isReadOnlyCommand(cmd)).map(cmd => cmd.toolName)
+          },
+          arguments: {
+            type: 'object',
+            description: 'The arguments for the command, shared by all backends.',
+            properties: {},
+            additionalProperties: true
+          },
+          backends: {
+            type: 'array',
+            description: 'Backends to query.',
+            items: {
+              type: 'object',
+              properties: {
+                host: { type: 'string', description: 'Host name or IP address of the DataSunrise backend.' },
+                port: { type: 'string', description: `Backend port (default ${this.config.session.backend.port}).` },
+                protocol: { type: 'string', description: `http or https (default ${this.config.session.backend.protocol}).` },
+                sessionToken: { type: 'string', description: 'Token of a Multi session on this backend. Optional when the server opens sessions automatically.' }
+              },
+              required: ['host']
+            }
+          },
+          maxParallel: {
+            type: 'number',
+            description: `Maximum number of backends queried at the same time (default ${this.config.fanOut.maxParallel}).`
+          },
+          timeoutSeconds: {
+            type: 'number',
+            description: 'Per-backend time limit in seconds; a backend that takes longer is reported as timed out. 0 means no limit.'
+          },
+          responseEncoding: {
+            type: 'string',
+            description: 'Encoding of the response: "compact" drops indentation, empty stderr and the command echo of successful commands. Defaults to the server setting.',
+            enum: ['pretty', 'compact']
+          },
+          maxStdoutBytes: {
+            type: 'number',
+            description: 'Keep only the first and last bytes of stdout, up to this many in total, and report the omitted byte count. 0 keeps everything.'
+          },
+          rows: {
+            type: 'boolean',
+            description: 'Also return the output parsed into `rows` (with `outputFormat`). Defaults to the server setting, which leaves them out.'
+          }
+        },
+        required: ['command_name', 'backends']
+      },
+      execute: async (args: any, context?: ToolExecutionContext): Promise<any> => {
+        const { command_name, arguments: commandArgs, backends, maxParallel, timeoutSeconds } = args || {};
+        const commandDef = this.commandIndex.getCommand(command_name);
+        if (!commandDef) {
+          throw new McpError(ErrorCode.InvalidParams, `Unknown command: ${command_name}`);
+        }
+        if (!isReadOnlyCommand(commandDef)) {
+          throw new McpError(ErrorCode.InvalidParams, `run_cli_fanout only runs read-only commands; ${command_name} changes the configuration.`);
+        }
+        validateTimeoutSeconds(timeoutSeconds);
+        if (maxParallel !== undefined && (typeof maxParallel !== 'number' || maxParallel < 1)) {
+          throw new McpError(ErrorCode.InvalidParams, `Invalid maxParallel: ${maxParallel}. Expected a positive number.`);
+        }
+        let validatedBackends: FanOutBackend[];
+        try {
+          validatedBackends = validateBackends(backends, this.sessions.defaultBackend);
+        } catch (error: any) {
+          throw new McpError(ErrorCode.InvalidParams, `Invalid backends: ${error.message}`);
+        }
+
+        // Each backend has its own session, so a shared token from the arguments does not apply
+        const { sessionToken, ...sharedArgs } = commandArgs || {};
+        return runFanOut<CommandExecutionResult>(validatedBackends, {
+          maxParallel: Math.floor(maxParallel ?? this.config.fanOut.maxParallel),
+          execute: async backend => {
+            if (!backend.sessionToken && !this.sessions.enabled) {
+              throw new Error('No sessionToken given for this backend and automatic sessions are not configured (DS_LOGIN or DS_OAUTH2_TOKEN).');
+            }
+            const nodeArgs = backend.sessionToken ? { ...sharedArgs, sessionToken: backend.sessionToken } : sharedArgs;
+            return this.executeCliCommand(commandDef, nodeArgs, { signal: context?.signal, timeoutSeconds, rows: this.rowsRequested(args) }, backend);
+          },
+          isSuccess: result => result.exitCode === 0 && !result.error,
+        });
       }
     }));
 
@@ -187,17 +482,21 @@ class DataSunriseCliServer {
                     type: 'string',
                     description: 'The name of the command to get the schema for.',
                     enum: allCliCommands.map(cmd => cmd.toolName)
+                },
+                knownHash: {
+                    type: 'string',
+                    description: 'Content hash of a schema the client already has. If it still matches, only {"unchanged": true} is returned.'
                 }
             },
             required: ['command_name']
         },
         execute: async (args: any): Promise<any> => {
-            const { command_name } = args;
-            const commandDef = allCliCommands.find(cmd => cmd.toolName === command_name);
-            if (!commandDef) {
+            const { command_name, knownHash } = args;
+            const response = await this.schemaCatalog.getSchemaResponse(command_name, knownHash);
+            if (!response) {
                 throw new McpError(ErrorCode.InvalidParams, `Unknown command: ${command_name}`);
             }
-            return this.buildInputSchema(commandDef.params, command_name);
+            return response;
         }
     }));
 
@@ -211,7 +510,9 @@ class DataSunriseCliServer {
       execute: async (args: any): Promise<DirectContentResult> => {
         if (args && typeof args.path === 'string') {
           this.cliExecutable = args.path;
-          const verified = await this.verifyCliExecutable(this.cliExecutable);
+          this.cliRequestedPath = args.path;
+          this.cliVerified = false; // Commands wait for the new path to be verified
+          const verified = await this.verifyCli(args.path, true);
           if (verified) {
             return { content: [{ type: 'text', text: `DataSunrise CLI executable path set and verified: ${this.cliExecutable}` }]};
           } else {
@@ -241,15 +542,70 @@ class DataSunriseCliServer {
         if (isSequence) {
           return { found: false, message: `Sequences are no longer supported.` };
         }
-        const commandDef = allCliCommands.find(cmd => cmd.toolName === name);
-        if (!commandDef) {
+        const entry = await this.schemaCatalog.getCommandSchema(name);
+        if (!entry) {
             throw new McpError(ErrorCode.InvalidParams, `Unknown command: ${name}`);
         }
-        return this.buildInputSchema(commandDef.params, name);
+        return entry.schema;
+      }
+    }));
+
+    this.mcpServer.addTool('get_server_stats', new Tool({
+      description: 'Returns runtime statistics of the MCP server, such as the dscli worker pool state, queue depth, result cache counters and executions saved by coalescing identical concurrent commands.',
+      inputSchema: {
+        type: 'object',
+        properties: {},
+      },
+      execute: async (): Promise<any> => {
+        return {
+          cliPool: this.cliPool ? this.cliPool.getStats() : null,
+          resultCache: this.resultCache.getStats(),
+          singleFlight: this.readFlights.getStats(),
+          cancellations: this.cancellations.getStats(),
+          sessions: this.sessions.enabled ? this.sessions.getStats() : null,
+          retries: this.retries.getStats(),
+          metadataRefresh: this.metadataRefresh.getStats(),
+          schemaCatalog: this.schemaCatalog.getStats(),
+          cli: {
+            executable: this.cliExecutable,
+            verified: this.cliVerified,
+            verificationPending: this.cliVerification !== undefined,
+          },
+        };
       }
     }));
   }
   
+  /**
+   * Register metrics read from other components and the metrics://prometheus resource
+   */
+  private registerMetrics(): void {
+    const registry = this.metrics.registry;
+    registry.collected('dscli_mcp_result_cache_requests_total', 'Result cache lookups by outcome.', 'counter', ['result'], () => {
+      const stats = this.resultCache.getStats();
+      return [[{ result: 'hit' }, stats.hits], [{ result: 'miss' }, stats.misses]];
+    });
+    registry.collected('dscli_mcp_coalesced_calls_total', 'Read commands that shared an identical in-flight execution.', 'counter', [], () =>
+      [[{}, this.readFlights.getStats().coalesced]]
+    );
+    registry.collected('dscli_mcp_cli_retries_total', 'Reruns of dscli commands after transient failures.', 'counter', [], () =>
+      [[{}, this.retries.getStats().retries]]
+    );
+    registry.collected('dscli_mcp_worker_pool_workers', 'dscli pool workers by state.', 'gauge', ['state'], () => {
+      const stats = this.cliPool?.getStats();
+      return stats ? [[{ state: 'busy' }, stats.busyWorkers], [{ state: 'idle' }, stats.idleWorkers]] : [];
+    });
+    registry.collected('dscli_mcp_worker_pool_queue_depth', 'Commands waiting for a pool worker.', 'gauge', [], () =>
+      this.cliPool ? [[{}, this.cliPool.getStats().queueDepth]] : []
+    );
+
+    this.mcpServer.addResource('metrics://prometheus', new Resource({
+      description: 'Server metrics in the Prometheus text format: tool calls, dscli executions and their phase latencies, output sizes, in-flight gauges and cache counters.',
+      mimeType: PROMETHEUS_CONTENT_TYPE,
+      getData: () => this.metrics.render(),
+    }));
+  }
+
   private static readonly ListResourcesRequestSchemaPlaceholder = z.object({
     method: z.literal('resources/list'),
     params: z.object({}).optional().nullable(), 
@@ -261,9 +617,13 @@ class DataSunriseCliServer {
   });
 
   private setupRequestHandlers() {
-    this.server.setRequestHandler(ListToolsRequestSchema, async () => {
-      const toolsList = this.mcpServer.listTools();
-      return { tools: toolsList };
+    this.server.setRequestHandler(ListToolsRequestSchema, async () => this.schemaCatalog.toolsList);
+
+    this.server.setNotificationHandler(CancelledNotificationSchema, async (notification) => {
+      const { requestId, reason } = notification.params;
+      if (this.cancellations.cancel(requestId, reason)) {
+        logger.info(() => `Cancelled request ${requestId}${reason ? `: ${reason}` : ''}`);
+      }
     });
     
     this.server.setRequestHandler(DataSunriseCliServer.ListPromptsRequestSchemaPlaceholder, async () => {
@@ -278,13 +638,33 @@ class DataSunriseCliServer {
         uri: r.uri,
         description: r.description,
         data: null, 
-        mimeType: undefined, 
+        mimeType: r.mimeType, 
       }));
       return { resources }; 
     });
 
-    this.server.setRequestHandler(CallToolRequestSchema, async (request) => {
+    this.server.setRequestHandler(ReadResourceRequestSchema, async (request) => {
+      const uri = request.params.uri;
+      const resource = this.mcpServer.getResource(uri);
+      if (!resource) {
+        throw new McpError(ErrorCode.InvalidParams, `Unknown resource: ${uri}`);
+      }
+      const data = await resource.getData();
+      return {
+        contents: [{
+          uri,
+          mimeType: resource.mimeType ?? 'application/json',
+          text: typeof data === 'string' ? data : JSON.stringify(data, null, 2),
+        }],
+      };
+    });
+
+    this.server.setRequestHandler(CallToolRequestSchema, async (request, extra?: any) => {
       let toolName = 'unknown'; 
+      const requestId = (request.params?._meta as any)?.[REQUEST_ID_META_KEY];
+      const signal = this.cancellations.begin(requestId, extra?.signal);
+      let endCall: ((status: 'ok' | 'error') => void) | undefined;
+      let callStatus: 'ok' | 'error' = 'error';
       try {
         if (!request.params) {
           throw new McpError(ErrorCode.InvalidParams, 'Request params are undefined.');
@@ -295,7 +675,17 @@ class DataSunriseCliServer {
         const toolToExecute = this.mcpServer.getTool(toolName);
 
         if (toolToExecute) {
-          const executionResult: any = await toolToExecute.execute(args);
+          endCall = this.metrics.startToolCall(toolName);
+          const responseOptions = this.responseOptionsFor(args);
+          const executionResult: any = await toolToExecute.execute(args, { signal });
+          if (executionResult instanceof PreserializedResult) {
+            callStatus = 'ok';
+            return {
+              content: [{ type: 'text', text: executionResult.text }],
+              isError: false,
+              _meta: { contentHash: executionResult.contentHash },
+            };
+          }
           let responseIsError = false;
 
           if (toolName === 'set_cli_executable_path') {
@@ -303,28 +693,130 @@ class DataSunriseCliServer {
           } else if (toolName === 'run_cli_command') {
             const cliResult = executionResult as CommandExecutionResult;
             responseIsError = cliResult.exitCode !== 0 || !!cliResult.error;
+          } else if (toolName === 'run_cli_batch') {
+            responseIsError = !executionResult.success;
+          } else if (toolName === 'run_cli_fanout') {
+            // Per-backend failures are part of the result; the call only fails when no backend answered
+            responseIsError = executionResult.summary.succeeded === 0;
           } else if (toolName === 'get_enhanced_description') {
             responseIsError = !(executionResult as EnhancedDescriptionResult).found;
           }
           
+          callStatus = responseIsError ? 'error' : 'ok';
           return {
-            content: [{ type: 'text', text: JSON.stringify(executionResult, null, 2) }],
+            content: [{ type: 'text', text: encodeToolResult(executionResult, responseOptions) }],
             isError: responseIsError,
           };
         }
         
         throw new McpError(ErrorCode.MethodNotFound, `Unknown tool: ${toolName}`);
       } catch (error: any) {
-        console.error(`[MCP Error] Error processing tool ${toolName}:`, error.message, error.stack);
+        logger.error(`Error processing tool ${toolName}:`, error);
         if (error instanceof McpError) {
           throw error; 
         }
         throw new McpError(ErrorCode.InternalError, `Error processing tool ${toolName}: ${error.message || String(error)}`);
+      } finally {
+        endCall?.(callStatus);
+        this.cancellations.end(requestId);
       }
     });
   }
 
-  private async verifyCliExecutable(pathToVerify: string): Promise<boolean> {
+  /**
+   * Resolve the response encoding of a call from its arguments and the server defaults
+   * @throws McpError for invalid per-call values
+   */
+  private responseOptionsFor(args: any): ResponseEncodingOptions {
+    const encoding = args?.responseEncoding ?? this.config.response.encoding;
+    const maxStdoutBytes = args?.maxStdoutBytes ?? this.config.response.maxStdoutBytes;
+    const rows = args?.rows ?? this.config.response.rows;
+    if (!RESPONSE_ENCODINGS.includes(encoding)) {
+      throw new McpError(ErrorCode.InvalidParams, `Invalid responseEncoding: ${encoding}. Expected "pretty" or "compact".`);
+    }
+    if (typeof maxStdoutBytes !== 'number' || !Number.isFinite(maxStdoutBytes) || maxStdoutBytes < 0) {
+      throw new McpError(ErrorCode.InvalidParams, `Invalid maxStdoutBytes: ${maxStdoutBytes}. Expected a non-negative number.`);
+    }
+    if (typeof rows !== 'boolean') {
+      throw new McpError(ErrorCode.InvalidParams, `Invalid rows: ${rows}. Expected true or false.`);
+    }
+    return { encoding, maxStdoutBytes: Math.floor(maxStdoutBytes), rows };
+  }
+
+  /**
+   * Check whether a call wants its output parsed into rows (validated in responseOptionsFor)
+   */
+  private rowsRequested(args: any): boolean {
+    return (args?.rows ?? this.config.response.rows) === true;
+  }
+
+  /**
+   * Verify the CLI in the background (or join a verification that is already
+   * running) and apply the result. Verified paths are remembered in the
+   * verification cache, keyed by path, modification time and size.
+   * @param requestedPath Path to verify
+   * @param restart True to start over even if a verification is running (path changed)
+   * @returns True if the CLI is usable
+   */
+  private verifyCli(requestedPath: string, restart: boolean = false): Promise<boolean> {
+    if (this.cliVerification && !restart) {
+      return this.cliVerification;
+    }
+    const generation = ++this.cliVerificationGeneration;
+    const verification = (async () => {
+      let verified = await this.verificationCache.lookup(requestedPath);
+      if (verified) {
+        logger.info(`Using cached verification of ${requestedPath}: ${verified.executable}`);
+      } else {
+        verified = await this.probeCliExecutable(requestedPath);
+        if (verified) {
+          await this.verificationCache.store(requestedPath, verified);
+        }
+      }
+      // A newer verification (set_cli_executable_path) owns the CLI state
+      if (generation !== this.cliVerificationGeneration) {
+        return !!verified;
+      }
+      if (verified) {
+        this.cliExecutable = verified.executable;
+        this.cliLaunch = verified.launch;
+      }
+      this.cliVerified = !!verified;
+      this.startCliPool();
+      return this.cliVerified;
+    })();
+    this.cliVerification = verification;
+    verification.finally(() => {
+      if (this.cliVerification === verification) {
+        this.cliVerification = undefined;
+      }
+    }).catch(() => {});
+    return verification;
+  }
+
+  /**
+   * Wait until the CLI is verified, verifying it now if needed
+   * @throws McpError when no working CLI executable is found
+   */
+  private async ensureCliReady(): Promise<void> {
+    if (this.cliVerified) {
+      return;
+    }
+    if (!this.cliVerification) {
+      logger.info(`CLI path '${this.cliExecutable}' not verified. Attempting verification now.`);
+    }
+    if (!await this.verifyCli(this.cliRequestedPath)) {
+      throw new McpError(ErrorCode.InvalidParams, `DataSunrise CLI executable ('${this.cliExecutable}') not found or failed verification. Error: PrerequisiteNotMet. Please set a valid path using 'set_cli_executable_path' tool or provide it via the --cli-path server startup argument.`);
+    }
+  }
+
+  /**
+   * Find a working CLI launch for a path by running it, the executecommand
+   * scripts next to it and finally the CLI main class through Java
+   * @param pathToVerify Configured CLI path
+   * @returns The verified executable or undefined if nothing worked
+   */
+  private async probeCliExecutable(pathToVerify: string): Promise<VerifiedCli | undefined> {
     const pathsToTry: string[] = [pathToVerify];
     const baseDir = path.dirname(pathToVerify) + path.sep;
     const baseName = path.basename(pathToVerify);
@@ -340,226 +832,431 @@ class DataSunriseCliServer {
       ? `"${path.join(baseDir, 'lib')}${path.sep}*"` 
       : `"${path.join(baseDir, 'lib')}${path.sep}*"`;
     const javaFallbackCmd = `java -Xms128m -Xmx128m -cp ${classpath} com.fw.console.client.cli.Main`;
+    const javaFallbackLaunch: CliLaunch = {
+      file: 'java',
+      args: ['-Xms128m', '-Xmx128m', '-cp', `${path.join(baseDir, 'lib')}${path.sep}*`, 'com.fw.console.client.cli.Main'],
+    };
     
     for (const currentPath of pathsToTry) {
       try {
-        console.error(`Verifying dscli at: ${currentPath} by running it without arguments.`);
-        const { stdout, stderr } = await execAsync(`"${currentPath}"`);
+        logger.debug(() => `Verifying dscli at: ${currentPath} by running it without arguments.`);
+        const { stdout, stderr } = await execAsync(`"${currentPath}"`, { timeout: VERIFY_TIMEOUT_MS });
         if (stdout.includes("Commands:") || stderr.includes("Commands:")) {
-          console.error(`dscli successfully verified at: ${currentPath} (detected help output)`);
-          this.cliExecutable = currentPath;
-          this.cliVerified = true;
-          return true;
+          logger.info(`dscli successfully verified at: ${currentPath} (detected help output)`);
+          return { executable: currentPath, launch: launchForExecutable(currentPath) };
         } else {
-          console.warn(`Output from '${currentPath}' did not contain expected help text. stdout: ${stdout}, stderr: ${stderr}`);
+          logger.warn(() => `Output from '${currentPath}' did not contain expected help text. stdout: ${stdout}, stderr: ${stderr}`);
         }
       } catch (e: any) {
         if (e.stderr && e.stderr.includes("Cannot read information from")) {
-          console.error(`dscli verified at: ${currentPath} (detected state.txt error, which means script ran)`);
-          this.cliExecutable = currentPath;
-          this.cliVerified = true;
-          return true;
+          logger.info(`dscli verified at: ${currentPath} (detected state.txt error, which means script ran)`);
+          return { executable: currentPath, launch: launchForExecutable(currentPath) };
         }
-        console.warn(`Failed with ${currentPath}: ${e.message}`);
+        logger.warn(() => `Failed with ${currentPath}: ${e.message}`);
       }
     }
     
     try {
-      console.error(`Trying direct Java execution as fallback`);
-      const { stdout, stderr } = await execAsync(javaFallbackCmd);
+      logger.debug('Trying direct Java execution as fallback');
+      const { stdout, stderr } = await execAsync(javaFallbackCmd, { timeout: VERIFY_TIMEOUT_MS });
       if (stdout.includes("Commands:") || stderr.includes("Commands:")) {
-        console.error(`Java execution successful. Using direct Java command.`);
-        this.cliExecutable = javaFallbackCmd;
-        this.cliVerified = true;
-        return true;
+        logger.info('Java execution successful. Using direct Java command.');
+        return { executable: javaFallbackCmd, launch: javaFallbackLaunch };
       }
     } catch (e: any) {
       if (e.stderr && e.stderr.includes("Cannot read information from")) {
-        console.error(`Java execution verified (detected state.txt error). Using direct Java command.`);
-        this.cliExecutable = javaFallbackCmd;
-        this.cliVerified = true;
-        return true;
+        logger.info('Java execution verified (detected state.txt error). Using direct Java command.');
+        return { executable: javaFallbackCmd, launch: javaFallbackLaunch };
       }
-      console.error(`Java fallback also failed: ${e.message}`);
+      logger.warn(() => `Java fallback also failed: ${e.message}`);
     }
     
-    console.error(`All CLI verification attempts failed. Could not find a working executable.`);
-    this.cliVerified = false;
-    return false;
+    logger.error('All CLI verification attempts failed. Could not find a working executable.');
+    return undefined;
   }
 
-  private buildInputSchema(params: CliParam[], commandName: string): any {
-    const properties: { [key: string]: any } = {};
-    const requiredParams: string[] = [];
-    params.forEach(p => {
-      const enhancedDescription = getCommandParameterHelp(commandName, p.name);
-      const schema: any = { 
-        type: p.type, 
-        description: enhancedDescription || p.description 
-      };
-      if (p.defaultValue !== undefined) {
-        schema.default = p.defaultValue;
-      }
-      properties[p.name] = schema;
-      if (p.required) {
-        requiredParams.push(p.name);
-      }
+  /**
+   * (Re)start the persistent dscli worker pool if it is configured.
+   * A previously running pool is shut down once the new one is warming up.
+   */
+  private startCliPool(): void {
+    const poolConfig = this.config.cliPool;
+    if (poolConfig.size <= 0 || !this.cliVerified) {
+      return;
+    }
+    const previousPool = this.cliPool;
+    this.cliPool = new CliWorkerPool({
+      size: poolConfig.size,
+      maxCommandsPerWorker: poolConfig.maxCommandsPerWorker,
+      launch: this.cliLaunch,
+      workerArgs: poolConfig.workerArgs,
     });
-    return {
-      type: 'object',
-      properties,
-      required: requiredParams.length > 0 ? requiredParams : undefined,
-    };
+    this.cliPool.start();
+    previousPool?.shutdown().catch(error => logger.warn('Failed to stop previous dscli worker pool:', error));
   }
 
-  private async executeCliCommand(commandDef: CliCommand, commandArgs: any): Promise<CommandExecutionResult> {
-    if (!this.cliVerified) {
-      console.error(`CLI path '${this.cliExecutable}' not verified. Attempting verification now.`);
-      await this.verifyCliExecutable(this.cliExecutable); 
-      if (!this.cliVerified) {
-        throw new McpError(ErrorCode.InvalidParams, `DataSunrise CLI executable ('${this.cliExecutable}') not found or failed verification. Error: PrerequisiteNotMet. Please set a valid path using 'set_cli_executable_path' tool or provide it via the --cli-path server startup argument.`);
-      }
+  /**
+   * Run a dscli command through the worker pool, or through a new process when
+   * the pool is disabled or unavailable.
+   * @param argv Arguments, starting with the dscli base command
+   * @param timeoutMs Kill the command after this many milliseconds (0 = no limit)
+   * @param signal Kill the command when this signal is aborted
+   * @param commandDef Command being run, for metrics
+   * @param maxRows Parse the output into at most this many rows (0 = do not parse)
+   */
+  private async runCli(argv: string[], timeoutMs: number, signal?: AbortSignal, commandDef?: CliCommand, maxRows: number = 0): Promise<CliProcessResult> {
+    const endCommand = this.metrics.startCommand(commandDef?.toolName ?? argv[0], commandDef?.category ?? 'Uncategorized');
+    let result: CliProcessResult | undefined;
+    try {
+      result = await this.runCliProcess(argv, timeoutMs, signal, maxRows);
+      return result;
+    } finally {
+      endCommand(commandOutcome(result), result?.stdoutBytes ?? 0, result?.timings);
     }
+  }
 
-    let cliCmdString = commandDef.baseCommand;
-    const simpleAddRuleCommands = ['addAuditRule', 'addSecurityRule', 'addMaskRule', 'addLearnRule'];
-    const isSimpleAddRuleRequest = (!commandArgs || Object.keys(commandArgs).length === 0) &&
-                                simpleAddRuleCommands.includes(commandDef.baseCommand);
-
-    if (isSimpleAddRuleRequest) {
-      console.error(`[MCP Info] Detected simple add rule request for ${commandDef.toolName}. Base command: ${commandDef.baseCommand}`);
-      const nameParamDef = commandDef.params.find(p => p.name === 'name');
-      if (nameParamDef) { 
-        if (nameParamDef.required || commandDef.baseCommand.startsWith('add')) { 
-            const timestamp = new Date().toISOString().replace(/[-:.]/g, '').slice(0, 14); 
-            const ruleTypeForName = commandDef.baseCommand.substring(3); 
-            const defaultName = `Default_${ruleTypeForName}_${timestamp}`;
-            console.error(`[MCP Info] No name provided for simple add. Generated default name: ${defaultName}`);
-            cliCmdString += ` ${nameParamDef.cliName} "${defaultName}"`; 
+  private async runCliProcess(argv: string[], timeoutMs: number, signal?: AbortSignal, maxRows: number = 0): Promise<CliProcessResult> {
+    const commandLine = formatCommandLine(argv);
+    const options = { ...this.config.cliOutput, maxRows, timeoutMs, signal };
+    if (this.cliPool?.available) {
+      try {
+        return await this.cliPool.execute(commandLine, options);
+      } catch (poolError: any) {
+        if (!(poolError instanceof CliWorkerPoolRejectedError)) {
+          // A worker already received the command, so running it again could repeat a write;
+          // the retry policy decides whether the command is safe to repeat
+          logger.warn(() => `dscli worker pool failed while running a command: ${poolError.message}`);
+          return { stdout: '', stderr: poolError.message, exitCode: 1, stdoutBytes: 0 };
         }
-      } else {
-        console.warn(`[MCP Warning] 'name' parameter definition not found for ${commandDef.toolName}, though it's an add rule command. Proceeding without adding a name.`);
+        logger.debug(() => `dscli worker pool did not take the command (${poolError.message}). Running it in a new process.`);
       }
+    }
+    logger.debug(() => `Executing: ${this.cliExecutable} ${formatCommandLine(redactArgv(argv))}`);
+    return executeCli(this.cliLaunch, argv, options);
+  }
 
-      if (commandDef.baseCommand === 'addAuditRule' || commandDef.baseCommand === 'addSecurityRule') {
-        const enableParamDef = commandDef.params.find(p => p.name === 'enable');
-        if (enableParamDef) {
-          console.error(`[MCP Info] Simple add for ${commandDef.baseCommand}, adding: ${enableParamDef.cliName} true`);
-          cliCmdString += ` ${enableParamDef.cliName} true`;
-        } else {
-          console.warn(`[MCP Warning] 'enable' parameter definition not found for ${commandDef.toolName}, cannot add default -enable true.`);
+  /**
+   * Execute a command through the read cache. Read-only commands are served
+   * from the cache when possible, and identical concurrent reads share one
+   * execution; successful writes invalidate their category.
+   */
+  private async executeCachedCliCommand(commandDef: CliCommand, commandArgs: any, cacheMode?: CacheMode, limits: ExecutionLimits = {}): Promise<CommandExecutionResult> {
+    if (!isReadOnlyCommand(commandDef)) {
+      const result = await this.executeCliCommand(commandDef, commandArgs, limits);
+      if (result.exitCode === 0) {
+        const removed = this.resultCache.invalidateFor(commandDef);
+        if (removed > 0) {
+          logger.debug(() => `${commandDef.toolName} invalidated ${removed} cached result(s) for category '${commandDef.category}'.`);
         }
       }
-    } else {
-      for (const param of commandDef.params) {
-        let currentValue = commandArgs?.[param.name];
-
-        if (param.name === 'enable' &&
-            (commandDef.baseCommand === 'addAuditRule' || commandDef.baseCommand === 'addSecurityRule') &&
-            commandArgs?.enable === undefined) {
-          currentValue = 'true'; 
-          console.error(`[MCP Info] Defaulting -enable to string 'true' for ${commandDef.baseCommand}`);
-        } else if (currentValue === undefined && param.defaultValue !== undefined) {
-          currentValue = param.defaultValue;
-        }
+      return result;
+    }
 
-        if (commandDef.toolName === 'core_show_state' && param.name === 'dsServer' && currentValue === 'localhost') {
-          currentValue = '127.0.0.1';
-          console.error(`[MCP Info] Automatically converted 'localhost' to '127.0.0.1' for dsServer parameter in core_show_state.`);
-        }
+    const cacheable = cacheMode !== 'bypass' && this.resultCache.isCacheable(commandDef);
+    if (cacheable && cacheMode !== 'refresh') {
+      const cachedResult = this.resultCache.get(commandDef, commandArgs);
+      if (cachedResult) {
+        return { ...this.withRows(cachedResult, limits), cached: true };
+      }
+    }
 
-        if (param.type === 'boolean') {
-          if (currentValue === true || String(currentValue).toLowerCase() === 'true') {
-            console.error(`[DEBUG] Boolean Param (true): "${param.cliName}", Input/Default: ${currentValue}, Appending flag.`);
-            cliCmdString += ` ${param.cliName}`;
-          } else {
-            console.error(`[DEBUG] Boolean Param (false): "${param.cliName}", Input/Default: ${currentValue}, Omitting flag.`);
-          }
-        } else { 
-          if (param.required && currentValue === undefined) {
-            throw new McpError(ErrorCode.InvalidParams, `Missing required parameter: ${param.name} for command ${commandDef.toolName}`);
-          }
+    // Only calls that agree on parsing share an execution
+    const { value: result, shared } = await this.readFlights.run(
+      `${commandFingerprint(commandDef.toolName, commandArgs)}|${limits.rows ? 'rows' : ''}`,
+      () => this.executeCliCommand(commandDef, commandArgs, limits)
+    );
+    if (shared) {
+      // The call we joined was cancelled by its own client; this caller still wants the result
+      if (result.cancelled && !limits.signal?.aborted) {
+        return this.executeCliCommand(commandDef, commandArgs, limits);
+      }
+      return { ...result, coalesced: true };
+    }
+    // Spilled output lives in a temp file that may be removed, so it is not cached
+    if (cacheable && result.exitCode === 0 && !result.stdoutFile) {
+      this.resultCache.set(commandDef, commandArgs, result);
+    }
+    return result;
+  }
 
-          if (currentValue !== undefined) {
-            let valueStr = String(currentValue);
-            if (commandDef.toolName === 'license_update_key' && param.name === 'key') {
-              valueStr = valueStr.replace(/"/g, '\\"');
-            }
-            if (typeof valueStr === 'string' &&
-                (valueStr.includes(' ') ||
-                 valueStr.includes('"') || 
-                 valueStr.includes('\'') ||
-                 valueStr.includes(':') ||
-                 valueStr.includes('{') ||
-                 valueStr.includes('}') ||
-                 valueStr.includes('\\') || 
-                 valueStr.includes('=') )) {
-              valueStr = `"${valueStr}"`;
-            }
-            console.error(`[DEBUG] NonBoolean Param: "${param.cliName}", CLI Value: "${valueStr}"`);
-            cliCmdString += ` ${param.cliName} ${valueStr}`;
-          }
-        }
+  /**
+   * Parse the rows of a cached result that was stored by a call without rows
+   */
+  private withRows(result: CommandExecutionResult, limits: ExecutionLimits): CommandExecutionResult {
+    const maxRows = this.config.cliOutput.maxRows;
+    if (!limits.rows || !maxRows || result.outputFormat !== undefined) {
+      return result;
+    }
+    const parsed = parseCliOutput(result.stdout, maxRows);
+    return parsed.format === 'text'
+      ? result
+      : { ...result, outputFormat: parsed.format, rows: parsed.rows, ...(parsed.rowsTruncated ? { rowsTruncated: true } : {}) };
+  }
+
+  /**
+   * Store the complete output of a result and replace its stdout with the first page
+   * @param result Successful command result
+   * @param pageSize Lines per page
+   */
+  private async firstPage(result: CommandExecutionResult, pageSize: number): Promise<CommandExecutionResult> {
+    if (result.stdoutFile) {
+      claimSpillFile(result.stdoutFile);
+    }
+    const page = await this.pager.open(result.command, result.stdout, result.stdoutFile, pageSize);
+    const { stdoutFile, stdoutTruncated, outputFormat, rows, rowsTruncated, ...rest } = result;
+    return this.withPage(rest, page);
+  }
+
+  /**
+   * Serve the page a cursor points to from the stored output
+   */
+  private async nextPage(commandDef: CliCommand, cursor: string, pageSize?: number): Promise<CommandExecutionResult> {
+    const command = this.pager.commandOf(cursor);
+    if (command !== undefined && command.split(' ')[0] !== commandDef.baseCommand) {
+      throw new McpError(ErrorCode.InvalidParams, `Cursor belongs to a different command: ${command}`);
+    }
+    let page: OutputPage;
+    try {
+      page = await this.pager.page(cursor, pageSize);
+    } catch (error: any) {
+      if (error instanceof CursorError) {
+        throw new McpError(ErrorCode.InvalidParams, error.message);
       }
+      throw error;
+    }
+    return this.withPage({ command: page.command, stdout: '', stderr: '', exitCode: 0 }, page);
+  }
+
+  /**
+   * Replace the stdout of a result with a page. Pages have no rows: a record
+   * can span two pages, so rows parsed per page could be cut in half.
+   */
+  private withPage(result: CommandExecutionResult, page: OutputPage): CommandExecutionResult {
+    const { command, text, ...position } = page;
+    return {
+      ...result,
+      stdout: text,
+      stdoutBytes: Buffer.byteLength(text),
+      page: position,
+    };
+  }
+
+  /**
+   * Resolve the timeout of a command: the per-call override, else the
+   * configured timeout of its category, else the default
+   */
+  private resolveTimeoutMs(commandDef: CliCommand, timeoutSeconds?: number): number {
+    if (timeoutSeconds !== undefined) {
+      return Math.round(timeoutSeconds * 1000);
+    }
+    const categoryTimeoutMs = commandDef.category ? this.config.cliTimeouts.categoryMs[commandDef.category] : undefined;
+    return categoryTimeoutMs ?? this.config.cliTimeouts.defaultMs;
+  }
+
+  /**
+   * Run a rendered command, adding the automatic session token unless the
+   * command manages sessions itself or the caller passed its own token
+   * @param backend Backend whose automatic session is used (defaults to the configured backend)
+   * @param maxRows Parse the output into at most this many rows (0 = do not parse)
+   */
+  private runWithSession(commandDef: CliCommand, plan: CommandPlan, commandArgs: any, timeoutMs: number, signal?: AbortSignal, backend?: FanOutBackend, maxRows: number = 0): Promise<CliProcessResult> {
+    if (!this.sessions.enabled || isSessionCommand(commandDef) || commandArgs.sessionToken) {
+      return this.runCli(renderArgv(plan, commandArgs), timeoutMs, signal, commandDef, maxRows);
     }
-    const fullCliCommand = `"${this.cliExecutable}" ${cliCmdString}`; 
-    console.error(`Executing: ${fullCliCommand}`);
+    return this.sessions.run(token =>
+      this.runCli(renderArgv(plan, token ? { ...commandArgs, sessionToken: token } : commandArgs), timeoutMs, signal, commandDef, maxRows),
+      backend
+    );
+  }
+
+  private async executeCliCommand(commandDef: CliCommand, commandArgs: any, limits: ExecutionLimits = {}, backend?: FanOutBackend): Promise<CommandExecutionResult> {
+    await this.ensureCliReady();
+
+    const plan = this.commandIndex.get(commandDef.toolName);
+    if (!plan) {
+      throw new McpError(ErrorCode.InvalidParams, `Unknown command: ${commandDef.toolName}`);
+    }
+    const argv = renderArgv(plan, commandArgs);
+    // Shown to the client and in logs, so secret values are masked
+    const cliCmdString = formatCommandLine(redactArgv(argv));
+    const timeoutMs = this.resolveTimeoutMs(commandDef, limits.timeoutSeconds);
+    const maxRows = limits.rows ? this.config.cliOutput.maxRows : 0;
+    const runOnce = () => this.retries.run(
+      commandDef,
+      commandArgs,
+      () => this.runWithSession(commandDef, plan, commandArgs, timeoutMs, limits.signal, backend, maxRows),
+      limits.signal
+    );
+    const startedAt = Date.now();
+    let result: CliProcessResult;
+    let attempts = 1;
+    let metadataRefreshed = false;
     try {
-      const { stdout, stderr } = await execAsync(fullCliCommand);
-      if (commandDef.toolName === 'rule_add_masking' && commandArgs.maskColumns) {
-        this.maskRuleFailureCache.delete(commandArgs.maskColumns);
+      ({ result, attempts } = await runOnce());
+      if (isMissingMetadata(commandDef, result) && this.config.metadataRefresh.autoRefresh && commandArgs.instance && !limits.signal?.aborted) {
+        // One update per instance, however many rule creations are waiting for it
+        const refresh = await this.metadataRefresh.refresh(commandArgs.instance, startedAt, () => this.updateMetadata(commandArgs.instance));
+        if (refresh.refreshed) {
+          metadataRefreshed = true;
+          if (result.stdoutFile) {
+            releaseSpillFile(result.stdoutFile);
+          }
+          const retried = await runOnce();
+          result = retried.result;
+          attempts += retried.attempts;
+        }
       }
-      return { command: cliCmdString, stdout, stderr, exitCode: 0 };
-    } catch (e: any) {
-      if (e.message?.includes('ENOENT') || e.code === 127) {
-         this.cliVerified = false; 
-         console.error(`Execution failed because dscli was not found at '${this.cliExecutable}'. Marking as unverified.`);
-         throw new McpError(ErrorCode.InvalidParams, `DataSunrise CLI executable ('${this.cliExecutable}') could not be executed. Path may be invalid. Error: PrerequisiteNotMet. Please re-verify the path.`);
+    } catch (error: any) {
+      if (!(error instanceof SessionError)) {
+        throw error;
       }
+      if (!error.result.spawnError && error.result.exitCode !== 127) {
+        logger.warn(error.message);
+        return { command: cliCmdString, stdout: error.result.stdout, stderr: error.result.stderr, error: error.message, exitCode: error.result.exitCode || 1 };
+      }
+      // dscli itself could not be started; reported below like any other command
+      result = error.result;
+    }
+    const outputInfo = {
+      stdoutBytes: result.stdoutBytes,
+      ...(result.stdoutFile ? { stdoutFile: result.stdoutFile, stdoutTruncated: true } : {}),
+      ...(attempts > 1 ? { attempts } : {}),
+      ...(metadataRefreshed ? { metadataRefreshed } : {}),
+    };
 
-      let finalStderr = e.stderr || '';
-      if (commandDef.toolName === 'rule_add_masking' && finalStderr.includes('is not in metadata cache')) {
-        const match = finalStderr.match(/\[(.*?)\] is not in metadata cache/);
-        const objectIdentifier = match ? match[1] : 'Unknown Object';
-        const instanceName = commandArgs.instance || 'the specified instance';
-        const cacheKey = commandArgs.maskColumns;
+    if (result.spawnError || result.exitCode === 127) {
+      this.cliVerified = false; 
+      this.verificationCache.remove(this.cliRequestedPath);
+      logger.error(`Execution failed because dscli was not found at '${this.cliExecutable}'. Marking as unverified.`);
+      throw new McpError(ErrorCode.InvalidParams, `DataSunrise CLI executable ('${this.cliExecutable}') could not be executed. Path may be invalid. Error: PrerequisiteNotMet. Please re-verify the path.`);
+    }
 
-        const failureRecord = this.maskRuleFailureCache.get(cacheKey) || { count: 0, timestamp: 0 };
-        const now = Date.now();
+    if (result.timedOut || result.cancelled) {
+      const error = result.timedOut
+        ? `Command timed out after ${timeoutMs} ms: ${cliCmdString}`
+        : `Command was cancelled: ${cliCmdString}`;
+      logger.warn(error);
+      return {
+        command: cliCmdString,
+        stdout: result.stdout,
+        stderr: result.stderr,
+        error,
+        exitCode: result.exitCode,
+        ...(result.timedOut ? { timedOut: true } : { cancelled: true }),
+        timeoutMs,
+        ...outputInfo,
+      };
+    }
 
-        if (now - failureRecord.timestamp > 300000) {
-            failureRecord.count = 0;
-        }
+    if (result.exitCode === 0) {
+      if (commandDef.toolName === 'rule_add_masking') {
+        this.maskRuleFailureCache.delete(maskRuleFailureKey(commandArgs));
+      }
+      const rowsInfo = result.parsed && result.parsed.format !== 'text'
+        ? { outputFormat: result.parsed.format, rows: result.parsed.rows, ...(result.parsed.rowsTruncated ? { rowsTruncated: true } : {}) }
+        : {};
+      return { command: cliCmdString, stdout: result.stdout, stderr: result.stderr, exitCode: 0, ...outputInfo, ...rowsInfo };
+    }
 
-        failureRecord.count++;
-        failureRecord.timestamp = now;
-        this.maskRuleFailureCache.set(cacheKey, failureRecord);
+    let finalStderr = result.stderr;
+    if (isMissingMetadata(commandDef, result)) {
+      const match = finalStderr.match(/\[(.*?)\] is not in metadata cache/);
+      const objectIdentifier = match ? match[1] : 'Unknown Object';
+      const instanceName = commandArgs.instance || 'the specified instance';
+      const cacheKey = maskRuleFailureKey(commandArgs);
 
-        let promptMessage;
-        if (failureRecord.count > 1) {
-          this.maskRuleFailureCache.delete(cacheKey);
-          promptMessage = `MCP-PROMPT:{"message":"Metadata for instance '${instanceName}' was updated, but the object '${objectIdentifier}' was still not found. The specified Database, Schema, Table, or Column likely does not exist. Please correct the name and try again."}`;
-        } else {
-          promptMessage = `MCP-PROMPT:{"message":"The specified object '${objectIdentifier}' was not found in the metadata. This can happen if the database schema has changed. Please verify that the object exists and the name is correct. Would you like to try updating the metadata for instance '${instanceName}'?","suggested_tool":"instance_update_metadata","tool_args":{"instance":"${instanceName}"}}`;
-        }
-        finalStderr = `${promptMessage}\n${finalStderr}`;
+      // Failures are forgotten after MASK_RULE_FAILURE_TTL_MS
+      const failureCount = (this.maskRuleFailureCache.get(cacheKey) ?? 0) + 1;
+      this.maskRuleFailureCache.set(cacheKey, failureCount);
+
+      let promptMessage;
+      if (metadataRefreshed || failureCount > 1) {
+        this.maskRuleFailureCache.delete(cacheKey);
+        promptMessage = `MCP-PROMPT:{"message":"Metadata for instance '${instanceName}' was updated, but the object '${objectIdentifier}' was still not found. The specified Database, Schema, Table, or Column likely does not exist. Please correct the name and try again."}`;
+      } else {
+        promptMessage = `MCP-PROMPT:{"message":"The specified object '${objectIdentifier}' was not found in the metadata. This can happen if the database schema has changed. Please verify that the object exists and the name is correct. Would you like to try updating the metadata for instance '${instanceName}'?","suggested_tool":"instance_update_metadata","tool_args":{"instance":"${instanceName}"}}`;
       }
-      
-      return { command: cliCmdString, stdout: e.stdout || '', stderr: finalStderr, error: e.message, exitCode: e.code || 1 };
+      finalStderr = `${promptMessage}\n${finalStderr}`;
+    }
+    
+    const error = result.signal
+      ? `Command was terminated by signal ${result.signal}: ${cliCmdString}`
+      : `Command failed with exit code ${result.exitCode}: ${cliCmdString}`;
+    return { command: cliCmdString, stdout: result.stdout, stderr: finalStderr, error, exitCode: result.exitCode, ...outputInfo };
+  }
+
+  /**
+   * Update the metadata of an instance for rule creations that found objects missing.
+   * The update is shared by several callers, so it does not use the signal of any of them.
+   * @returns True if the update succeeded
+   */
+  private async updateMetadata(instance: string): Promise<boolean> {
+    const commandDef = this.commandIndex.getCommand('instance_update_metadata')!;
+    logger.info(`Updating metadata of instance '${instance}' because a masking rule references objects missing from its metadata cache.`);
+    const result = await this.executeCachedCliCommand(commandDef, { instance });
+    if (result.exitCode !== 0 || result.error) {
+      logger.warn(`Metadata update of instance '${instance}' failed: ${(result.stderr || result.error || '').trim()}`);
+      return false;
     }
+    return true;
   }
 
   async run() {
     const transport = new StdioServerTransport();
-    await this.verifyCliExecutable(this.cliExecutable);
+    if (this.config.preloadDescriptions) {
+      // Enhanced descriptions are otherwise loaded per category on first use
+      await loadAllCommandDescriptions();
+      await this.schemaCatalog.prebuild();
+    }
     await this.server.connect(transport);
-    console.error(`DataSunrise CLI MCP server (v0.5.1 - modular commands & sequences, configurable CLI path) running on stdio. CLI Verified: ${this.cliVerified}`);
+    this.cancellations.attach(transport);
+    if (this.config.metrics.port > 0) {
+      this.metricsListener = startMetricsServer(this.config.metrics.host, this.config.metrics.port, () => this.metrics.render());
+    }
+    logger.info('DataSunrise CLI MCP server (v0.5.1 - modular commands & sequences, configurable CLI path) running on stdio. Verifying CLI in the background.');
+    // Tool calls that need the CLI wait for this in ensureCliReady()
+    this.verifyCli(this.cliRequestedPath).then(
+      verified => logger.info(`Background CLI verification finished. CLI Verified: ${verified}`),
+      error => logger.warn('Background CLI verification failed:', error)
+    );
+  }
+}
+
+/**
+ * Outcome label of a dscli execution for metrics
+ */
+function commandOutcome(result: CliProcessResult | undefined): string {
+  if (!result || result.spawnError) return 'error';
+  if (result.timedOut) return 'timeout';
+  if (result.cancelled) return 'cancelled';
+  return result.exitCode === 0 ? 'success' : 'failure';
+}
+
+/**
+ * Check whether a masking rule failed because it references objects missing from the metadata cache
+ */
+function isMissingMetadata(commandDef: CliCommand, result: CliProcessResult): boolean {
+  return commandDef.toolName === 'rule_add_masking' && result.exitCode !== 0 && result.stderr.includes('is not in metadata cache');
+}
+
+function maskRuleFailureKey(commandArgs: any): string {
+  return `${commandArgs.instance ?? ''}\u0000${commandArgs.maskColumns ?? ''}`;
+}
+
+/**
+ * Check a per-call timeout override
+ * @throws McpError when the value is not a non-negative number
+ */
+function validateTimeoutSeconds(timeoutSeconds: unknown): void {
+  if (timeoutSeconds !== undefined && (typeof timeoutSeconds !== 'number' || !Number.isFinite(timeoutSeconds) || timeoutSeconds < 0)) {
+    throw new McpError(ErrorCode.InvalidParams, `Invalid timeoutSeconds: ${timeoutSeconds}. Expected a non-negative number.`);
   }
 }
 
 const server = new DataSunriseCliServer();
 server.run().catch(error => {
-  console.error("Server run failed:", error);
+  logger.error('Server run failed:', error);
+  logger.flushSync();
   if (error instanceof McpError) {
     // Log McpError specifically if needed
   }
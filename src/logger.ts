@@ -0,0 +1,154 @@
+/**
+ * Leveled logger for the MCP server
+ *
+ * stdout carries the MCP protocol, so all diagnostics go to stderr. Messages
+ * below the configured level cost a single comparison: pass a function
+ * instead of a string and it is only called when the level is enabled.
+ * Enabled messages are collected and written to stderr in one asynchronous
+ * write per event loop turn instead of one synchronous write per message.
+ * Anything still buffered is written synchronously when the process exits.
+ */
+
+import * as fs from 'node:fs';
+
+export type LogLevel = 'debug' | 'info' | 'warn' | 'error' | 'silent';
+
+export const LOG_LEVELS: LogLevel[] = ['debug', 'info', 'warn', 'error', 'silent'];
+
+/**
+ * A message, or a function that builds it only when the level is enabled
+ */
+export type LogMessage = string | (() => string);
+
+const SEVERITY: Record<LogLevel, number> = { debug: 10, info: 20, warn: 30, error: 40, silent: 100 };
+const PREFIX: Record<Exclude<LogLevel, 'silent'>, string> = {
+  debug: '[MCP Debug] ',
+  info: '[MCP Info] ',
+  warn: '[MCP Warning] ',
+  error: '[MCP Error] ',
+};
+
+// Flush early when this much text is waiting, so bursts do not grow the buffer without bound
+const MAX_BUFFERED_CHARS = 64 * 1024;
+
+/**
+ * Logger writing batched lines to stderr
+ */
+export class Logger {
+  private threshold = SEVERITY.info;
+  private buffer: string[] = [];
+  private bufferedChars = 0;
+  private flushScheduled = false;
+
+  /**
+   * @param write Sink for batched output (defaults to process.stderr)
+   */
+  constructor(private readonly write: (text: string) => void = text => process.stderr.write(text)) {
+    process.once('exit', () => this.flushSync());
+  }
+
+  /**
+   * Set the minimum level that is written
+   * @param level New level
+   */
+  setLevel(level: LogLevel): void {
+    this.threshold = SEVERITY[level];
+  }
+
+  /**
+   * Get the current level
+   */
+  get level(): LogLevel {
+    return LOG_LEVELS.find(level => SEVERITY[level] === this.threshold)!;
+  }
+
+  /**
+   * Check whether messages of a level are written, e.g. to skip building expensive details
+   * @param level Level to check
+   */
+  isEnabled(level: Exclude<LogLevel, 'silent'>): boolean {
+    return SEVERITY[level] >= this.threshold;
+  }
+
+  debug(message: LogMessage, error?: unknown): void {
+    if (SEVERITY.debug >= this.threshold) this.log('debug', message, error);
+  }
+
+  info(message: LogMessage, error?: unknown): void {
+    if (SEVERITY.info >= this.threshold) this.log('info', message, error);
+  }
+
+  warn(message: LogMessage, error?: unknown): void {
+    if (SEVERITY.warn >= this.threshold) this.log('warn', message, error);
+  }
+
+  error(message: LogMessage, error?: unknown): void {
+    if (SEVERITY.error >= this.threshold) this.log('error', message, error);
+  }
+
+  /**
+   * Write everything buffered right away (used on exit and before fatal errors)
+   */
+  flushSync(): void {
+    if (this.buffer.length === 0) {
+      return;
+    }
+    const text = this.take();
+    try {
+      fs.writeSync(2, text);
+    } catch {
+      // stderr is gone; nothing left to report to
+    }
+  }
+
+  private log(level: Exclude<LogLevel, 'silent'>, message: LogMessage, error?: unknown): void {
+    let line = PREFIX[level] + (typeof message === 'function' ? message() : message);
+    if (error !== undefined) {
+      line += ' ' + formatError(error, this.threshold <= SEVERITY.debug);
+    }
+    this.buffer.push(line + '\n');
+    this.bufferedChars += line.length + 1;
+    if (this.bufferedChars >= MAX_BUFFERED_CHARS) {
+      this.flush();
+    } else if (!this.flushScheduled) {
+      this.flushScheduled = true;
+      setImmediate(() => this.flush());
+    }
+  }
+
+  private flush(): void {
+    this.flushScheduled = false;
+    if (this.buffer.length > 0) {
+      this.write(this.take());
+    }
+  }
+
+  private take(): string {
+    const text = this.buffer.join('');
+    this.buffer = [];
+    this.bufferedChars = 0;
+    return text;
+  }
+}
+
+function formatError(error: unknown, withStack: boolean): string {
+  if (error instanceof Error) {
+    return withStack && error.stack ? error.stack : `${error.name}: ${error.message}`;
+  }
+  return String(error);
+}
+
+/**
+ * Parse a log level name
+ * @param value Level name (case-insensitive)
+ * @returns The level, or undefined if the name is unknown
+ */
+export function parseLogLevel(value: string | undefined): LogLevel | undefined {
+  const level = value?.toLowerCase() as LogLevel | undefined;
+  return level && LOG_LEVELS.includes(level) ? level : undefined;
+}
+
+/**
+ * Shared logger of the server
+ */
+export const logger = new Logger();
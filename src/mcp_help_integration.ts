@@ -25,6 +25,7 @@ import { MCPServer, Resource, Tool } from './mcp_server_framework.js';
 
 // Import commands and sequences
 import { allCliCommands as allCommands } from './commands/index.js';
+import { logger } from './logger.js';
 
 /**
  * Initializes the context-aware help system and registers all MCP server resources and tools
@@ -32,9 +33,9 @@ import { allCliCommands as allCommands } from './commands/index.js';
  */
 export function registerHelpSystem(server: MCPServer): void {
   // Initialize the help repository with all commands
-  console.log('Initializing context-aware help system...');
+  logger.debug('Initializing context-aware help system...');
   initializeHelp(allCommands);
-  console.log(`Initialized help for ${Object.keys(allCommands).length} commands`);
+  logger.debug(() => `Initialized help for ${Object.keys(allCommands).length} commands`);
 
   // Register direct help resources
   registerHelpResources(server);
@@ -42,7 +43,7 @@ export function registerHelpSystem(server: MCPServer): void {
   // Register help tools
   registerHelpTools(server);
   
-  console.log('Context-aware help system integration complete');
+  logger.debug('Context-aware help system integration complete');
 }
 
 /**
@@ -8,11 +8,14 @@
  * you would replace these with your actual MCP server framework interfaces.
  */
 
+import { logger } from './logger.js';
+
 /**
  * Resource configuration for MCP server resources
  */
 export interface ResourceConfig {
   description: string;
+  mimeType?: string;
   getData: () => any;
 }
 
@@ -21,21 +24,31 @@ export interface ResourceConfig {
  */
 export class Resource {
   description: string;
+  mimeType?: string;
   getData: () => any;
   
   constructor(config: ResourceConfig) {
     this.description = config.description;
+    this.mimeType = config.mimeType;
     this.getData = config.getData;
   }
 }
 
+/**
+ * Per-call context passed to tool implementations
+ */
+export interface ToolExecutionContext {
+  /** Aborted when the client cancels the call */
+  signal?: AbortSignal;
+}
+
 /**
  * Tool configuration for MCP server tools
  */
 export interface ToolConfig {
   description: string;
   inputSchema: any;
-  execute: (params: any) => any;
+  execute: (params: any, context?: ToolExecutionContext) => any;
 }
 
 /**
@@ -44,7 +57,7 @@ export interface ToolConfig {
 export class Tool {
   description: string;
   inputSchema: any;
-  execute: (params: any) => any;
+  execute: (params: any, context?: ToolExecutionContext) => any;
   
   constructor(config: ToolConfig) {
     this.description = config.description;
@@ -106,7 +119,7 @@ export interface MCPServer {
    * List all registered resources
    * @returns An array of resource details
    */
-  listResources(): Array<{ uri: string; description: string }>;
+  listResources(): Array<{ uri: string; description: string; mimeType?: string }>;
 
   /**
    * List all registered tools
@@ -131,17 +144,17 @@ export class BasicMCPServer implements MCPServer {
   
   addResource(uri: string, resource: Resource): void {
     this.resources.set(uri, resource);
-    console.error(`[MCP Server Info] Added resource: ${uri}`);
+    logger.debug(() => `Added resource: ${uri}`);
   }
   
   addTool(name: string, tool: Tool): void {
     this.tools.set(name, tool);
-    console.error(`[MCP Server Info] Added tool: ${name}`);
+    logger.debug(() => `Added tool: ${name}`);
   }
 
   addPrompt(name: string, prompt: Prompt): void {
     this.prompts.set(name, prompt);
-    console.error(`[MCP Server Info] Added prompt: ${name}`);
+    logger.debug(() => `Added prompt: ${name}`);
   }
   
   getResource(uri: string): Resource | undefined {
@@ -157,10 +170,10 @@ export class BasicMCPServer implements MCPServer {
     return this.prompts.get(name);
   }
 
-  listResources(): Array<{ uri: string; description: string }> {
-    const resourceList: Array<{ uri: string; description: string }> = [];
+  listResources(): Array<{ uri: string; description: string; mimeType?: string }> {
+    const resourceList: Array<{ uri: string; description: string; mimeType?: string }> = [];
     this.resources.forEach((resource, uri) => {
-      resourceList.push({ uri, description: resource.description });
+      resourceList.push({ uri, description: resource.description, mimeType: resource.mimeType });
     });
     return resourceList;
   }
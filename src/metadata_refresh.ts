@@ -0,0 +1,104 @@
+/**
+ * Coordination of metadata updates per database instance
+ *
+ * Masking rules can only reference objects that are in the metadata cache of
+ * their instance. When several rule creations fail on the same instance
+ * because the cache is stale, one metadata update is enough: the first
+ * failure starts it, later failures join it, and failures of commands that
+ * started before a finished update simply retry. All callers then retry
+ * their rule creation.
+ */
+
+import { SingleFlight } from './single_flight.js';
+import { TtlLruCache } from './ttl_cache.js';
+
+/**
+ * Settings for the coordinator
+ */
+export interface MetadataRefreshOptions {
+  /** Maximum number of instances whose last update time is remembered */
+  maxInstances: number;
+  /** How long the time of a finished update is remembered, in milliseconds */
+  rememberMs: number;
+  /** Clock (overridable for tests) */
+  now?: () => number;
+}
+
+/**
+ * Coordinator counters
+ */
+export interface MetadataRefreshStats {
+  /** Metadata updates run */
+  updates: number;
+  /** Updates that failed */
+  failedUpdates: number;
+  /** Callers that joined a running update or reused one that finished after their command started */
+  shared: number;
+}
+
+/**
+ * Outcome of a refresh request
+ */
+export interface MetadataRefreshOutcome {
+  /** True when the metadata of the instance is up to date, so the failed command may be retried */
+  refreshed: boolean;
+  /** True when no update was started for this caller */
+  shared: boolean;
+}
+
+/**
+ * Runs at most one metadata update per instance at a time
+ */
+export class MetadataRefreshCoordinator {
+  private flights: SingleFlight<boolean> = new SingleFlight();
+  private refreshedAt: TtlLruCache<string, number>;
+  private now: () => number;
+  private updates = 0;
+  private failedUpdates = 0;
+  private shared = 0;
+
+  /**
+   * @param options Coordinator options
+   */
+  constructor(options: MetadataRefreshOptions) {
+    this.now = options.now ?? Date.now;
+    this.refreshedAt = new TtlLruCache({ maxEntries: options.maxInstances, defaultTtlMs: options.rememberMs, now: this.now });
+  }
+
+  /**
+   * Make sure the metadata of an instance is newer than a failed command
+   * @param instance Instance name
+   * @param commandStartedAt Time the failed command started; an update that finished later is reused
+   * @param update Runs the metadata update; resolves to true on success
+   * @returns Whether the metadata is now fresh and whether the update was shared
+   */
+  async refresh(instance: string, commandStartedAt: number, update: () => Promise<boolean>): Promise<MetadataRefreshOutcome> {
+    const finishedAt = this.refreshedAt.get(instance);
+    if (finishedAt !== undefined && finishedAt >= commandStartedAt) {
+      this.shared++;
+      return { refreshed: true, shared: true };
+    }
+    const { value, shared } = await this.flights.run(instance, async () => {
+      this.updates++;
+      const succeeded = await update().catch(() => false);
+      if (succeeded) {
+        this.refreshedAt.set(instance, this.now());
+      } else {
+        this.failedUpdates++;
+      }
+      return succeeded;
+    });
+    if (shared) {
+      this.shared++;
+    }
+    return { refreshed: value, shared };
+  }
+
+  /**
+   * Get coordinator counters
+   * @returns Current statistics
+   */
+  getStats(): MetadataRefreshStats {
+    return { updates: this.updates, failedUpdates: this.failedUpdates, shared: this.shared };
+  }
+}
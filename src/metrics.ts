@@ -0,0 +1,322 @@
+/**
+ * Prometheus metrics of the MCP server
+ *
+ * A small dependency-free registry of counters, gauges and histograms with
+ * labels, rendered in the Prometheus text exposition format (version 0.0.4).
+ * The server exposes it as the MCP resource `metrics://prometheus` and,
+ * optionally, on a local HTTP `/metrics` endpoint.
+ */
+
+import * as http from 'node:http';
+import { CliTimings } from './cli_executor.js';
+import { logger } from './logger.js';
+
+/** MIME type of the Prometheus text format */
+export const PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8';
+
+/** Default latency buckets in seconds: dscli runs take from a few hundred milliseconds (pool) to minutes */
+export const LATENCY_BUCKETS_SECONDS = [0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300];
+
+/** Default size buckets in bytes for command output */
+export const BYTE_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216];
+
+type Labels = Record<string, string>;
+
+interface Metric {
+  render(): string[];
+}
+
+/**
+ * Escape a label value for the text format
+ */
+function escapeLabelValue(value: string): string {
+  return value.replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(names: string[], values: string[], extra: string = ''): string {
+  const pairs = names.map((name, index) => `${name}="${escapeLabelValue(values[index])}"`);
+  if (extra) {
+    pairs.push(extra);
+  }
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+}
+
+function formatValue(value: number): string {
+  if (value === Infinity) return '+Inf';
+  if (value === -Infinity) return '-Inf';
+  return String(value);
+}
+
+/**
+ * Base of labeled metrics: one series per distinct label combination
+ */
+abstract class LabeledMetric<S> implements Metric {
+  protected series: Map<string, { values: string[]; state: S }> = new Map();
+
+  constructor(readonly name: string, readonly help: string, readonly labelNames: string[], private readonly type: string) {}
+
+  protected seriesFor(labels: Labels): S {
+    const values = this.labelNames.map(name => labels[name] ?? '');
+    const key = values.join('\u0000');
+    let entry = this.series.get(key);
+    if (!entry) {
+      entry = { values, state: this.initialState() };
+      this.series.set(key, entry);
+    }
+    return entry.state;
+  }
+
+  protected abstract initialState(): S;
+
+  protected abstract renderSeries(values: string[], state: S): string[];
+
+  render(): string[] {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+    for (const { values, state } of this.series.values()) {
+      lines.push(...this.renderSeries(values, state));
+    }
+    return lines;
+  }
+}
+
+/**
+ * Monotonically increasing counter
+ */
+export class Counter extends LabeledMetric<{ value: number }> {
+  constructor(name: string, help: string, labelNames: string[] = []) {
+    super(name, help, labelNames, 'counter');
+  }
+
+  inc(labels: Labels = {}, amount: number = 1): void {
+    this.seriesFor(labels).value += amount;
+  }
+
+  protected initialState() {
+    return { value: 0 };
+  }
+
+  protected renderSeries(values: string[], state: { value: number }): string[] {
+    return [`${this.name}${formatLabels(this.labelNames, values)} ${formatValue(state.value)}`];
+  }
+}
+
+/**
+ * Value that can go up and down, such as the number of running calls
+ */
+export class Gauge extends LabeledMetric<{ value: number }> {
+  constructor(name: string, help: string, labelNames: string[] = []) {
+    super(name, help, labelNames, 'gauge');
+  }
+
+  inc(labels: Labels = {}, amount: number = 1): void {
+    this.seriesFor(labels).value += amount;
+  }
+
+  dec(labels: Labels = {}, amount: number = 1): void {
+    this.seriesFor(labels).value -= amount;
+  }
+
+  set(labels: Labels, value: number): void {
+    this.seriesFor(labels).value = value;
+  }
+
+  protected initialState() {
+    return { value: 0 };
+  }
+
+  protected renderSeries(values: string[], state: { value: number }): string[] {
+    return [`${this.name}${formatLabels(this.labelNames, values)} ${formatValue(state.value)}`];
+  }
+}
+
+interface HistogramState {
+  counts: number[];
+  sum: number;
+  count: number;
+}
+
+/**
+ * Distribution of observed values in cumulative buckets
+ */
+export class Histogram extends LabeledMetric<HistogramState> {
+  private readonly buckets: number[];
+
+  constructor(name: string, help: string, labelNames: string[] = [], buckets: number[] = LATENCY_BUCKETS_SECONDS) {
+    super(name, help, labelNames, 'histogram');
+    this.buckets = [...buckets].sort((a, b) => a - b);
+  }
+
+  observe(labels: Labels, value: number): void {
+    const state = this.seriesFor(labels);
+    const index = this.buckets.findIndex(bound => value <= bound);
+    if (index >= 0) {
+      state.counts[index]++;
+    }
+    state.sum += value;
+    state.count++;
+  }
+
+  protected initialState(): HistogramState {
+    return { counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+  }
+
+  protected renderSeries(values: string[], state: HistogramState): string[] {
+    const lines: string[] = [];
+    let cumulative = 0;
+    this.buckets.forEach((bound, index) => {
+      cumulative += state.counts[index];
+      lines.push(`${this.name}_bucket${formatLabels(this.labelNames, values, `le="${formatValue(bound)}"`)} ${cumulative}`);
+    });
+    lines.push(`${this.name}_bucket${formatLabels(this.labelNames, values, 'le="+Inf"')} ${state.count}`);
+    lines.push(`${this.name}_sum${formatLabels(this.labelNames, values)} ${formatValue(state.sum)}`);
+    lines.push(`${this.name}_count${formatLabels(this.labelNames, values)} ${state.count}`);
+    return lines;
+  }
+}
+
+/**
+ * Metric whose series are read from another component when rendered,
+ * e.g. hit and miss counters kept by a cache
+ */
+export class CollectedMetric implements Metric {
+  constructor(
+    readonly name: string,
+    readonly help: string,
+    private readonly type: 'counter' | 'gauge',
+    private readonly labelNames: string[],
+    private readonly collect: () => Array<[Labels, number]>
+  ) {}
+
+  render(): string[] {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+    for (const [labels, value] of this.collect()) {
+      lines.push(`${this.name}${formatLabels(this.labelNames, this.labelNames.map(name => labels[name] ?? ''))} ${formatValue(value)}`);
+    }
+    return lines;
+  }
+}
+
+/**
+ * Collection of metrics rendered together
+ */
+export class MetricsRegistry {
+  private metrics: Map<string, Metric> = new Map();
+
+  counter(name: string, help: string, labelNames: string[] = []): Counter {
+    return this.register(name, new Counter(name, help, labelNames));
+  }
+
+  gauge(name: string, help: string, labelNames: string[] = []): Gauge {
+    return this.register(name, new Gauge(name, help, labelNames));
+  }
+
+  histogram(name: string, help: string, labelNames: string[] = [], buckets?: number[]): Histogram {
+    return this.register(name, new Histogram(name, help, labelNames, buckets));
+  }
+
+  collected(name: string, help: string, type: 'counter' | 'gauge', labelNames: string[], collect: () => Array<[Labels, number]>): CollectedMetric {
+    return this.register(name, new CollectedMetric(name, help, type, labelNames, collect));
+  }
+
+  /**
+   * Render all metrics in the Prometheus text format
+   * @returns Exposition text
+   */
+  render(): string {
+    const lines: string[] = [];
+    for (const metric of this.metrics.values()) {
+      lines.push(...metric.render());
+    }
+    return lines.join('\n') + '\n';
+  }
+
+  private register<M extends Metric>(name: string, metric: M): M {
+    if (this.metrics.has(name)) {
+      throw new Error(`Metric already registered: ${name}`);
+    }
+    this.metrics.set(name, metric);
+    return metric;
+  }
+}
+
+/**
+ * Metrics of tool calls and dscli executions
+ */
+export class ServerMetrics {
+  readonly registry = new MetricsRegistry();
+  private toolCalls = this.registry.counter('dscli_mcp_tool_calls_total', 'Tool calls by tool and outcome.', ['tool', 'status']);
+  private toolDuration = this.registry.histogram('dscli_mcp_tool_call_duration_seconds', 'Duration of tool calls.', ['tool']);
+  private toolsInFlight = this.registry.gauge('dscli_mcp_tool_calls_in_flight', 'Tool calls currently running.', ['tool']);
+  private commands = this.registry.counter('dscli_mcp_cli_commands_total', 'dscli executions by command, category and outcome.', ['command', 'category', 'outcome']);
+  private commandsInFlight = this.registry.gauge('dscli_mcp_cli_commands_in_flight', 'dscli executions currently running, by category.', ['category']);
+  private phaseDuration = this.registry.histogram('dscli_mcp_cli_phase_duration_seconds', 'Time spent per dscli execution phase: spawn, run (JVM) and parse.', ['phase', 'category']);
+  private stdoutBytes = this.registry.histogram('dscli_mcp_cli_stdout_bytes', 'Size of dscli stdout per execution.', ['category'], BYTE_BUCKETS);
+
+  /**
+   * Start timing a tool call
+   * @param tool Tool name
+   * @returns Function to call with the outcome when the call ends
+   */
+  startToolCall(tool: string): (status: 'ok' | 'error') => void {
+    const started = process.hrtime.bigint();
+    this.toolsInFlight.inc({ tool });
+    return status => {
+      this.toolsInFlight.dec({ tool });
+      this.toolCalls.inc({ tool, status });
+      this.toolDuration.observe({ tool }, Number(process.hrtime.bigint() - started) / 1e9);
+    };
+  }
+
+  /**
+   * Mark the start of a dscli execution
+   * @param category Command category
+   * @returns Function to call with the outcome, output size and timings when the execution ends
+   */
+  startCommand(command: string, category: string): (outcome: string, stdoutBytes: number, timings?: CliTimings) => void {
+    this.commandsInFlight.inc({ category });
+    return (outcome, bytes, timings) => {
+      this.commandsInFlight.dec({ category });
+      this.commands.inc({ command, category, outcome });
+      this.stdoutBytes.observe({ category }, bytes);
+      if (timings) {
+        this.phaseDuration.observe({ phase: 'spawn', category }, timings.spawnMs / 1000);
+        this.phaseDuration.observe({ phase: 'run', category }, timings.runMs / 1000);
+        this.phaseDuration.observe({ phase: 'parse', category }, timings.parseMs / 1000);
+      }
+    };
+  }
+
+  /**
+   * Render all metrics
+   */
+  render(): string {
+    return this.registry.render();
+  }
+}
+
+/**
+ * Serve metrics on GET /metrics
+ * @param host Address to listen on
+ * @param port Port to listen on
+ * @param render Produces the exposition text
+ * @returns The listening server
+ */
+export function startMetricsServer(host: string, port: number, render: () => string): http.Server {
+  const server = http.createServer((request, response) => {
+    if (request.method === 'GET' && request.url?.split('?')[0] === '/metrics') {
+      response.writeHead(200, { 'Content-Type': PROMETHEUS_CONTENT_TYPE });
+      response.end(render());
+      return;
+    }
+    response.writeHead(404, { 'Content-Type': 'text/plain' });
+    response.end('Not found\n');
+  });
+  server.on('error', error => logger.error(`Metrics listener on ${host}:${port} failed:`, error));
+  server.listen(port, host, () => {
+    const address = server.address();
+    logger.info(`Serving metrics on http://${host}:${typeof address === 'object' && address ? address.port : port}/metrics`);
+  });
+  // Never keep the process alive just for metrics
+  server.unref();
+  return server;
+}
@@ -0,0 +1,262 @@
+/**
+ * Cursor-based paging of large command outputs
+ *
+ * The complete output of a command is kept in a file (the spill file written
+ * by the executor, or a new file for outputs that fit in memory) and indexed
+ * once by the byte offset of every line. Pages are then read from the file by
+ * line range, so later pages never run dscli again. Cursors expire after a
+ * TTL, and the file is deleted when its last cursor expires.
+ */
+
+import { randomBytes } from 'node:crypto';
+import * as fs from 'node:fs';
+import * as os from 'node:os';
+import * as path from 'node:path';
+import { logger } from './logger.js';
+
+/**
+ * Settings for the output pager
+ */
+export interface OutputPagerOptions {
+  /** Lifetime of a cursor in milliseconds, renewed whenever it is used */
+  cursorTtlMs: number;
+  /** Maximum number of paged outputs kept; the least recently used is dropped first */
+  maxOutputs: number;
+  /** Directory for page files (defaults to the OS temp directory) */
+  dir?: string;
+  /** Clock used for expiry (overridable for tests) */
+  now?: () => number;
+}
+
+/**
+ * One page of an output
+ */
+export interface OutputPage {
+  /** Command the output belongs to */
+  command: string;
+  text: string;
+  /** Index of the first line of the page (0-based) */
+  startLine: number;
+  lineCount: number;
+  totalLines: number;
+  totalBytes: number;
+  /** Cursor of the next page; absent on the last page */
+  nextCursor?: string;
+}
+
+/**
+ * Pager statistics
+ */
+export interface OutputPagerStats {
+  outputs: number;
+  pagesServed: number;
+  expired: number;
+}
+
+interface PagedOutput {
+  command: string;
+  file: string;
+  /** Byte offset of the start of every line, plus the file size at the end */
+  lineOffsets: number[];
+  pageSize: number;
+  expiresAt: number;
+}
+
+/**
+ * Error raised for unknown, malformed or expired cursors
+ */
+export class CursorError extends Error {}
+
+/**
+ * Stores complete outputs and serves them page by page
+ */
+export class OutputPager {
+  private outputs: Map<string, PagedOutput> = new Map();
+  private fileRefs: Map<string, number> = new Map();
+  private options: OutputPagerOptions;
+  private now: () => number;
+  private sweepTimer: NodeJS.Timeout;
+  private pagesServed = 0;
+  private expired = 0;
+
+  /**
+   * Create a pager
+   * @param options Pager options
+   */
+  constructor(options: OutputPagerOptions) {
+    this.options = options;
+    this.now = options.now ?? Date.now;
+    this.sweepTimer = setInterval(() => this.sweep(), Math.max(1000, Math.min(options.cursorTtlMs, 60000)));
+    this.sweepTimer.unref();
+  }
+
+  /**
+   * Store an output and return its first page
+   * @param command Command line that produced the output
+   * @param output In-memory output; ignored when `file` is given
+   * @param file File holding the complete output (e.g. a spill file); the pager takes ownership of it
+   * @param pageSize Lines per page
+   * @returns The first page
+   */
+  async open(command: string, output: string, file: string | undefined, pageSize: number): Promise<OutputPage> {
+    if (!file) {
+      file = path.join(this.options.dir ?? os.tmpdir(), `dscli-pages-${process.pid}-${randomBytes(6).toString('hex')}.txt`);
+      await fs.promises.writeFile(file, output);
+    }
+    const lineOffsets = await indexLines(file);
+    const id = randomBytes(9).toString('base64url');
+    this.fileRefs.set(file, (this.fileRefs.get(file) ?? 0) + 1);
+    this.outputs.set(id, { command, file, lineOffsets, pageSize, expiresAt: this.now() + this.options.cursorTtlMs });
+    this.enforceLimit();
+    return this.readPage(id, 0);
+  }
+
+  /**
+   * Get the page a cursor points to
+   * @param cursor Cursor returned with a previous page
+   * @param pageSize Lines per page; defaults to the size used when the output was opened
+   * @returns The page
+   * @throws CursorError when the cursor is malformed, unknown or expired
+   */
+  async page(cursor: string, pageSize?: number): Promise<OutputPage> {
+    const separator = cursor.lastIndexOf('.');
+    const id = cursor.slice(0, separator);
+    const startLine = Number(cursor.slice(separator + 1));
+    if (separator <= 0 || !Number.isInteger(startLine) || startLine < 0) {
+      throw new CursorError(`Malformed cursor: ${cursor}`);
+    }
+    const output = this.outputs.get(id);
+    if (!output || output.expiresAt <= this.now()) {
+      if (output) {
+        this.remove(id);
+        this.expired++;
+      }
+      throw new CursorError('Cursor expired or unknown. Run the command again without a cursor to get a new one.');
+    }
+    if (pageSize !== undefined) {
+      output.pageSize = pageSize;
+    }
+    // Renew the cursor and mark the output as most recently used
+    output.expiresAt = this.now() + this.options.cursorTtlMs;
+    this.outputs.delete(id);
+    this.outputs.set(id, output);
+    return this.readPage(id, startLine);
+  }
+
+  /**
+   * Command a cursor belongs to
+   * @param cursor Cursor returned with a previous page
+   * @returns The command line, or undefined for unknown cursors
+   */
+  commandOf(cursor: string): string | undefined {
+    return this.outputs.get(cursor.slice(0, cursor.lastIndexOf('.')))?.command;
+  }
+
+  /**
+   * Get pager statistics
+   * @returns Current statistics
+   */
+  getStats(): OutputPagerStats {
+    return { outputs: this.outputs.size, pagesServed: this.pagesServed, expired: this.expired };
+  }
+
+  /**
+   * Drop all outputs and delete their files
+   */
+  close(): void {
+    clearInterval(this.sweepTimer);
+    for (const id of [...this.outputs.keys()]) {
+      this.remove(id);
+    }
+  }
+
+  private async readPage(id: string, startLine: number): Promise<OutputPage> {
+    const output = this.outputs.get(id)!;
+    const offsets = output.lineOffsets;
+    const totalLines = offsets.length - 1;
+    const first = Math.min(startLine, totalLines);
+    const last = Math.min(first + output.pageSize, totalLines);
+    const length = offsets[last] - offsets[first];
+    const buffer = Buffer.alloc(length);
+    if (length > 0) {
+      const handle = await fs.promises.open(output.file, 'r');
+      try {
+        await handle.read(buffer, 0, length, offsets[first]);
+      } finally {
+        await handle.close();
+      }
+    }
+    this.pagesServed++;
+    const page: OutputPage = {
+      command: output.command,
+      text: buffer.toString('utf8'),
+      startLine: first,
+      lineCount: last - first,
+      totalLines,
+      totalBytes: offsets[totalLines],
+    };
+    if (last < totalLines) {
+      page.nextCursor = `${id}.${last}`;
+    }
+    return page;
+  }
+
+  private enforceLimit(): void {
+    while (this.outputs.size > Math.max(1, this.options.maxOutputs)) {
+      this.remove(this.outputs.keys().next().value as string);
+    }
+  }
+
+  private sweep(): void {
+    const now = this.now();
+    for (const [id, output] of this.outputs) {
+      if (output.expiresAt <= now) {
+        this.remove(id);
+        this.expired++;
+      }
+    }
+  }
+
+  private remove(id: string): void {
+    const output = this.outputs.get(id);
+    if (!output) {
+      return;
+    }
+    this.outputs.delete(id);
+    const refs = (this.fileRefs.get(output.file) ?? 1) - 1;
+    if (refs > 0) {
+      this.fileRefs.set(output.file, refs);
+      return;
+    }
+    this.fileRefs.delete(output.file);
+    fs.promises.unlink(output.file).catch(error => {
+      if (error.code !== 'ENOENT') {
+        logger.warn(`Could not delete page file ${output.file}: ${error.message}`);
+      }
+    });
+  }
+}
+
+/**
+ * Index a file by line: one streaming pass that records where every line starts
+ * @param file File to index
+ * @returns Line start offsets followed by the file size
+ */
+async function indexLines(file: string): Promise<number[]> {
+  const offsets: number[] = [0];
+  let position = 0;
+  for await (const chunk of fs.createReadStream(file)) {
+    const buffer = chunk as Buffer;
+    let newline = buffer.indexOf(10);
+    while (newline >= 0) {
+      offsets.push(position + newline + 1);
+      newline = buffer.indexOf(10, newline + 1);
+    }
+    position += buffer.length;
+  }
+  // A last line without a trailing newline still counts as a line
+  if (offsets[offsets.length - 1] !== position) {
+    offsets.push(position);
+  }
+  return offsets;
+}
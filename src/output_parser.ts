@@ -0,0 +1,280 @@
+/**
+ * Structured parser for dscli text output
+ *
+ * dscli prints a few recurring layouts:
+ *
+ * - lists under a heading, e.g. "Available tasks:" followed by one name per line
+ * - `Name : value` blocks, one record per block, separated by blank lines
+ * - column tables, one row per line, e.g. `: 1 : smtp1 : SMTP : 10.0.0.1 : 25`
+ * - JSON, for commands called with `-json` (e.g. `showDSServers -json`)
+ *
+ * The parser is fed the output in chunks as it arrives and looks at every line
+ * once, so large outputs are not copied or re-scanned. Only JSON output is
+ * buffered, because it can only be parsed as a whole.
+ */
+
+/**
+ * Layout detected in the output
+ */
+export type OutputFormat = 'json' | 'list' | 'keyValue' | 'table' | 'text';
+
+/**
+ * One parsed row. Repeated keys and continuation lines collect their values in an array.
+ */
+export type OutputRow = Record<string, string | string[]>;
+
+/**
+ * Result of parsing a command output
+ */
+export interface ParsedOutput {
+  format: OutputFormat;
+  rows: OutputRow[];
+  /** Heading of a list, e.g. 'Available tasks' */
+  title?: string;
+  /** True when more rows were found than the parser was allowed to keep */
+  rowsTruncated?: boolean;
+}
+
+/**
+ * Default maximum number of rows kept per output
+ */
+export const DEFAULT_MAX_ROWS = 10000;
+
+// Closing line printed after every successful command
+const STATUS_LINE = 'OK';
+// Table cells are separated by colons followed by whitespace, so times such as 12:00:00 stay intact
+const CELL_SEPARATOR = /:(?=\s|$)/;
+
+/**
+ * Incremental parser for the output of one command
+ */
+export class CliOutputParser {
+  private partialLine = '';
+  private format?: OutputFormat;
+  private rows: OutputRow[] = [];
+  private rowsTruncated = false;
+  private title?: string;
+  private record?: OutputRow;
+  private lastKey?: string;
+  private section?: string;
+  private jsonChunks?: string[];
+  private sawContent = false;
+
+  /**
+   * @param maxRows Maximum number of rows kept; further rows only set `rowsTruncated`
+   */
+  constructor(private readonly maxRows: number = DEFAULT_MAX_ROWS) {}
+
+  /**
+   * Feed the next chunk of output
+   * @param chunk Decoded text; lines may be split across chunks
+   */
+  push(chunk: string): void {
+    if (this.jsonChunks) {
+      this.jsonChunks.push(chunk);
+      return;
+    }
+    if (!this.sawContent) {
+      const firstChar = chunk.trimStart()[0];
+      if (firstChar === undefined) {
+        this.partialLine += chunk;
+        return;
+      }
+      this.sawContent = true;
+      if (firstChar === '{' || firstChar === '[') {
+        this.jsonChunks = [this.partialLine, chunk];
+        this.partialLine = '';
+        return;
+      }
+    }
+
+    let start = 0;
+    let newline = chunk.indexOf('\n');
+    if (newline >= 0 && this.partialLine) {
+      this.processLine(this.partialLine + chunk.slice(0, newline));
+      this.partialLine = '';
+      start = newline + 1;
+      newline = chunk.indexOf('\n', start);
+    }
+    while (newline >= 0) {
+      this.processLine(chunk.slice(start, newline));
+      start = newline + 1;
+      newline = chunk.indexOf('\n', start);
+    }
+    this.partialLine += chunk.slice(start);
+  }
+
+  /**
+   * Finish parsing after the last chunk
+   * @returns The detected format and rows
+   */
+  finish(): ParsedOutput {
+    if (this.jsonChunks) {
+      return this.finishJson(this.jsonChunks.join(''));
+    }
+    if (this.partialLine) {
+      this.processLine(this.partialLine);
+      this.partialLine = '';
+    }
+    this.flushRecord();
+    const parsed: ParsedOutput = { format: this.format ?? 'text', rows: this.rows };
+    if (this.title !== undefined && this.format === 'list') parsed.title = this.title;
+    if (this.rowsTruncated) parsed.rowsTruncated = true;
+    return parsed;
+  }
+
+  private processLine(rawLine: string): void {
+    const line = rawLine.endsWith('\r') ? rawLine.slice(0, -1).trimEnd() : rawLine.trimEnd();
+    const trimmed = line.trimStart();
+
+    if (trimmed === '') {
+      this.flushRecord();
+      return;
+    }
+    if (trimmed === STATUS_LINE && !this.record) {
+      return;
+    }
+
+    if (trimmed[0] === ':') {
+      if (line[0] !== ':' && this.record && this.lastKey !== undefined) {
+        // Indented ': value' continues the previous key
+        this.appendValue(this.record, this.lastKey, trimmed.slice(1).trim());
+        return;
+      }
+      this.flushRecord();
+      const cells = trimmed.split(CELL_SEPARATOR).slice(1).map(cell => cell.trim());
+      const row: OutputRow = {};
+      cells.forEach((cell, index) => {
+        row[`column${index + 1}`] = cell;
+      });
+      this.addRow(row, 'table');
+      return;
+    }
+
+    const pair = splitKeyValue(trimmed);
+    if (pair) {
+      if (!this.record) {
+        this.record = {};
+      }
+      this.appendValue(this.record, pair[0], pair[1]);
+      this.lastKey = pair[0];
+      return;
+    }
+
+    if (trimmed.endsWith(':') && trimmed.indexOf(':') === trimmed.length - 1) {
+      // Heading of a list or of a group of keys, e.g. 'Available tasks:' or 'Actions:'
+      this.section = trimmed.slice(0, -1).trim();
+      return;
+    }
+
+    if (this.section === undefined) {
+      // Free text such as 'No Servers' or a block caption such as 'Basic Info'
+      return;
+    }
+    if (this.record) {
+      this.appendValue(this.record, this.section, trimmed);
+    } else {
+      if (this.title === undefined) {
+        this.title = this.section;
+      }
+      this.addRow({ value: trimmed }, 'list');
+    }
+  }
+
+  private appendValue(record: OutputRow, key: string, value: string): void {
+    const existing = record[key];
+    if (existing === undefined) {
+      record[key] = value;
+    } else if (Array.isArray(existing)) {
+      existing.push(value);
+    } else {
+      record[key] = [existing, value];
+    }
+  }
+
+  private flushRecord(): void {
+    if (this.record) {
+      const record = this.record;
+      this.record = undefined;
+      this.lastKey = undefined;
+      this.addRow(record, 'keyValue');
+    }
+  }
+
+  private addRow(row: OutputRow, format: OutputFormat): void {
+    if (!this.format) {
+      this.format = format;
+    }
+    if (this.rows.length >= this.maxRows) {
+      this.rowsTruncated = true;
+      return;
+    }
+    this.rows.push(row);
+  }
+
+  private finishJson(text: string): ParsedOutput {
+    let json = text.trimEnd();
+    if (json.endsWith(STATUS_LINE)) {
+      json = json.slice(0, -STATUS_LINE.length);
+    }
+    let value: any;
+    try {
+      value = JSON.parse(json);
+    } catch {
+      return { format: 'text', rows: [] };
+    }
+    const parsed: ParsedOutput = { format: 'json', rows: [] };
+    let rows: any[];
+    if (Array.isArray(value?.data) && Array.isArray(value.data[0])) {
+      // Tabular JSON: the first entry holds the column names
+      const [columns, ...records] = value.data as any[][];
+      rows = records.map(record => Object.fromEntries(columns.map((column, index) => [String(column), record[index]])));
+    } else {
+      rows = Array.isArray(value) ? value : [value];
+    }
+    if (rows.length > this.maxRows) {
+      parsed.rowsTruncated = true;
+      rows = rows.slice(0, this.maxRows);
+    }
+    parsed.rows = rows;
+    return parsed;
+  }
+}
+
+/**
+ * Split a `Name : value` line. dscli pads names with spaces before the colon;
+ * some blocks use `Name: value` instead.
+ * @returns [name, value], or undefined if the line is not a key/value line
+ */
+function splitKeyValue(line: string): [string, string] | undefined {
+  let separator = line.indexOf(' : ');
+  let valueStart = separator + 3;
+  if (separator < 0 && line.endsWith(' :')) {
+    separator = line.length - 2;
+    valueStart = line.length;
+  }
+  if (separator < 0) {
+    separator = line.indexOf(': ');
+    valueStart = separator + 2;
+  }
+  if (separator <= 0) {
+    return undefined;
+  }
+  let key = line.slice(0, separator).trim();
+  if (key.endsWith(':')) {
+    key = key.slice(0, -1).trimEnd();
+  }
+  return key ? [key, line.slice(valueStart).trim()] : undefined;
+}
+
+/**
+ * Parse a complete output held in memory
+ * @param output Command output
+ * @param maxRows Maximum number of rows kept
+ * @returns The detected format and rows
+ */
+export function parseCliOutput(output: string, maxRows: number = DEFAULT_MAX_ROWS): ParsedOutput {
+  const parser = new CliOutputParser(maxRows);
+  parser.push(output);
+  return parser.finish();
+}
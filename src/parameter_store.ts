@@ -9,6 +9,7 @@
 import * as fs from 'fs';
 import * as path from 'path';
 import { fileURLToPath } from 'url';
+import { logger } from './logger.js';
 
 // Get the current module path
 const __dirname = path.dirname(fileURLToPath(import.meta.url));
@@ -43,7 +44,7 @@ export class ParameterStore {
         return JSON.parse(rawData);
       }
     } catch (error) {
-      console.error(`Error loading parameter store data: ${error}`);
+      logger.error('Error loading parameter store data:', error);
     }
     
     // If file doesn't exist or there's an error, return an empty structure
@@ -61,7 +62,7 @@ export class ParameterStore {
     try {
       fs.writeFileSync(this.storagePath, JSON.stringify(this.data, null, 2), 'utf-8');
     } catch (error) {
-      console.error(`Error saving parameter store data: ${error}`);
+      logger.error('Error saving parameter store data:', error);
     }
   }
 
@@ -86,7 +87,7 @@ export class ParameterStore {
       this.saveData();
       return true;
     } catch (error) {
-      console.error(`Error saving parameters: ${error}`);
+      logger.error('Error saving parameters:', error);
       return false;
     }
   }
@@ -0,0 +1,126 @@
+/**
+ * Encoding of tool results into CallTool response text
+ *
+ * "pretty" is the historical format: the result object indented with two
+ * spaces. "compact" is meant for large outputs and token-conscious clients:
+ * no indentation, no empty `stderr`, and no `command` echo on successful
+ * commands (the client sent the command itself). In both modes `stdout` can
+ * be cut down to its head and tail, with byte counts describing the cut.
+ * Pages of a paged read are never cut: their page size already bounds them,
+ * and a cut would drop lines the client reads the output for.
+ * The parsed `rows` of a command repeat its `stdout` in another shape, so
+ * they are only sent to clients that ask for them.
+ */
+
+export type ResponseEncoding = 'pretty' | 'compact';
+
+export const RESPONSE_ENCODINGS: ResponseEncoding[] = ['pretty', 'compact'];
+
+/**
+ * How a tool result is turned into response text
+ */
+export interface ResponseEncodingOptions {
+  encoding: ResponseEncoding;
+  /** Keep at most this many stdout bytes (half from the start, half from the end); 0 keeps everything. Pages are not cut */
+  maxStdoutBytes: number;
+  /** Keep the parsed `rows` (and `outputFormat`) of command results; they are dropped by default */
+  rows?: boolean;
+}
+
+/**
+ * Encode a tool result as response text
+ * @param result Tool result; command results and the per-command results of run_cli_batch and run_cli_fanout get the compact and truncation treatment
+ * @param options Encoding options
+ * @returns JSON text
+ */
+export function encodeToolResult(result: any, options: ResponseEncodingOptions): string {
+  const compact = options.encoding === 'compact';
+  if (!compact && !options.maxStdoutBytes && options.rows) {
+    return JSON.stringify(result, null, 2);
+  }
+  let encoded = result;
+  if (isCommandResult(result)) {
+    encoded = encodeCommandResult(result, compact, options);
+  } else if (result && Array.isArray(result.steps)) {
+    encoded = {
+      ...result,
+      steps: result.steps.map((step: any) => isCommandResult(step.result)
+        ? { ...step, result: encodeCommandResult(step.result, compact, options) }
+        : step),
+    };
+  } else if (result && result.backends && typeof result.backends === 'object') {
+    const backends: Record<string, any> = {};
+    for (const [backend, outcome] of Object.entries<any>(result.backends)) {
+      backends[backend] = isCommandResult(outcome?.result)
+        ? { ...outcome, result: encodeCommandResult(outcome.result, compact, options) }
+        : outcome;
+    }
+    encoded = { ...result, backends };
+  }
+  return compact ? JSON.stringify(encoded) : JSON.stringify(encoded, null, 2);
+}
+
+function isCommandResult(value: any): boolean {
+  return !!value && typeof value.stdout === 'string' && typeof value.exitCode === 'number';
+}
+
+function encodeCommandResult(result: any, compact: boolean, options: ResponseEncodingOptions): any {
+  let encoded = result;
+  if (!options.rows && (result.rows !== undefined || result.outputFormat !== undefined)) {
+    const { rows, rowsTruncated, outputFormat, ...rest } = result;
+    encoded = rest;
+  }
+  if (compact) {
+    const { command, stderr, ...rest } = encoded;
+    encoded = rest;
+    if (result.exitCode !== 0 || result.error) {
+      encoded.command = command;
+    }
+    if (stderr) {
+      encoded.stderr = stderr;
+    }
+  }
+  if (options.maxStdoutBytes > 0 && !result.page) {
+    const truncated = truncateHeadTail(result.stdout, options.maxStdoutBytes);
+    if (truncated) {
+      encoded = {
+        ...encoded,
+        stdout: truncated.text,
+        stdoutBytes: result.stdoutBytes ?? truncated.totalBytes,
+        stdoutOmittedBytes: truncated.omittedBytes,
+      };
+    }
+  }
+  return encoded;
+}
+
+/**
+ * Cut text to its first and last bytes, without splitting UTF-8 characters
+ * @param text Text to cut
+ * @param maxBytes Total number of bytes kept
+ * @returns The shortened text with byte counts, or undefined if the text fits
+ */
+export function truncateHeadTail(text: string, maxBytes: number): { text: string; totalBytes: number; omittedBytes: number } | undefined {
+  // UTF-8 needs at most 3 bytes per UTF-16 code unit, so short strings can skip the byte count
+  if (text.length * 3 <= maxBytes) {
+    return undefined;
+  }
+  const buffer = Buffer.from(text, 'utf8');
+  if (buffer.length <= maxBytes) {
+    return undefined;
+  }
+  let headEnd = Math.floor(maxBytes / 2);
+  while (headEnd > 0 && (buffer[headEnd] & 0xc0) === 0x80) {
+    headEnd--;
+  }
+  let tailStart = buffer.length - (maxBytes - headEnd);
+  while (tailStart < buffer.length && (buffer[tailStart] & 0xc0) === 0x80) {
+    tailStart++;
+  }
+  const omittedBytes = tailStart - headEnd;
+  return {
+    text: `${buffer.toString('utf8', 0, headEnd)}\n... [${omittedBytes} bytes omitted] ...\n${buffer.toString('utf8', tailStart)}`,
+    totalBytes: buffer.length,
+    omittedBytes,
+  };
+}
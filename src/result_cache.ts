@@ -0,0 +1,143 @@
+/**
+ * Result cache for read-only DataSunrise CLI commands
+ *
+ * Caches successful results of show* commands keyed by tool name, normalized
+ * arguments and session token. Each command category can have its own TTL.
+ * Successful write commands invalidate the cached entries of their category,
+ * and session changes (connect/disconnect) invalidate everything.
+ */
+
+import { CliCommand } from './commands/types.js';
+import { commandFingerprint, isReadOnlyCommand, isSessionCommand } from './command_traits.js';
+import { TtlLruCache, TtlCacheStats } from './ttl_cache.js';
+
+/**
+ * Per-call cache control
+ * - bypass: do not read from or write to the cache
+ * - refresh: skip the cached entry, run the command and store the new result
+ */
+export type CacheMode = 'bypass' | 'refresh';
+
+/**
+ * Options for creating a result cache
+ */
+export interface ResultCacheOptions {
+  /** TTL for categories without an override; 0 disables caching */
+  defaultTtlMs: number;
+  /** TTL overrides keyed by CliCommand.category */
+  categoryTtlMs: Record<string, number>;
+  /** Maximum number of cached results */
+  maxEntries: number;
+  /** Clock used for expiry (overridable for tests) */
+  now?: () => number;
+}
+
+/**
+ * Result cache statistics
+ */
+export interface ResultCacheStats extends TtlCacheStats {
+  invalidations: number;
+}
+
+interface CachedResult<T> {
+  category: string;
+  result: T;
+}
+
+const UNCATEGORIZED = 'Uncategorized';
+
+/**
+ * TTL/LRU cache of command results with category-based invalidation
+ */
+export class ResultCache<T> {
+  private cache: TtlLruCache<string, CachedResult<T>>;
+  private options: ResultCacheOptions;
+  private invalidations = 0;
+
+  /**
+   * Create a new result cache
+   * @param options Cache options
+   */
+  constructor(options: ResultCacheOptions) {
+    this.options = options;
+    this.cache = new TtlLruCache({
+      maxEntries: options.maxEntries,
+      defaultTtlMs: options.defaultTtlMs,
+      now: options.now,
+    });
+  }
+
+  /**
+   * Get the TTL that applies to a command category
+   * @param category Command category
+   * @returns TTL in milliseconds (0 means not cached)
+   */
+  ttlFor(category: string | undefined): number {
+    const override = category !== undefined ? this.options.categoryTtlMs[category] : undefined;
+    return override ?? this.options.defaultTtlMs;
+  }
+
+  /**
+   * Check whether results of a command may be cached
+   * @param commandDef Command definition
+   * @returns True for read-only commands in a category with a positive TTL
+   */
+  isCacheable(commandDef: CliCommand): boolean {
+    return isReadOnlyCommand(commandDef) && this.ttlFor(commandDef.category) > 0;
+  }
+
+  /**
+   * Look up a cached result
+   * @param commandDef Command definition
+   * @param args Command arguments
+   * @returns The cached result or undefined
+   */
+  get(commandDef: CliCommand, args: Record<string, any>): T | undefined {
+    return this.cache.get(commandFingerprint(commandDef.toolName, args))?.result;
+  }
+
+  /**
+   * Store a result
+   * @param commandDef Command definition
+   * @param args Command arguments
+   * @param result Result to cache
+   */
+  set(commandDef: CliCommand, args: Record<string, any>, result: T): void {
+    const category = commandDef.category ?? UNCATEGORIZED;
+    this.cache.set(commandFingerprint(commandDef.toolName, args), { category, result }, this.ttlFor(commandDef.category));
+  }
+
+  /**
+   * Invalidate the entries affected by a successful write command
+   * @param commandDef Definition of the command that changed state
+   * @returns Number of removed entries
+   */
+  invalidateFor(commandDef: CliCommand): number {
+    if (isSessionCommand(commandDef)) {
+      const removed = this.cache.size;
+      this.cache.clear();
+      this.invalidations += removed;
+      return removed;
+    }
+    return this.invalidateCategory(commandDef.category ?? UNCATEGORIZED);
+  }
+
+  /**
+   * Remove all entries of a category
+   * @param category Command category
+   * @returns Number of removed entries
+   */
+  invalidateCategory(category: string): number {
+    const removed = this.cache.deleteWhere((_key, entry) => entry.category === category);
+    this.invalidations += removed;
+    return removed;
+  }
+
+  /**
+   * Get cache statistics
+   * @returns Hit/miss/eviction counters and the number of invalidated entries
+   */
+  getStats(): ResultCacheStats {
+    return { ...this.cache.getStats(), invalidations: this.invalidations };
+  }
+}
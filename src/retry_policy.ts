@@ -0,0 +1,220 @@
+/**
+ * Retries of transient dscli failures
+ *
+ * Some failures say nothing about the command itself: the backend was
+ * restarting, a connection was reset, or the configuration database was
+ * briefly locked. The retry policy recognizes them by stderr patterns (shared
+ * ones plus patterns for single command categories) and runs the command
+ * again after an exponential backoff with full jitter. Only commands that are
+ * safe to repeat are retried: read-only commands and idempotent writes.
+ */
+
+import { CliProcessResult, releaseSpillFile } from './cli_executor.js';
+import { CliCommand } from './commands/types.js';
+import { isIdempotentCommand, isSessionCommand } from './command_traits.js';
+import { logger } from './logger.js';
+
+/** Category key whose patterns apply to every command */
+export const ALL_CATEGORIES = '*';
+
+/**
+ * Built-in transient failure patterns keyed by command category
+ */
+export const DEFAULT_RETRY_PATTERNS: Record<string, RegExp[]> = {
+  [ALL_CATEGORIES]: [
+    /connection (refused|reset|timed out)|ConnectException|SocketTimeoutException|read timed out/i,
+    /\b(502|503|504)\b|bad gateway|service unavailable|gateway timeout/i,
+    /temporarily unavailable|try again later|server is busy|too many requests/i,
+    /deadlock|lock wait timeout|database is locked|could not obtain lock/i,
+    // A pooled dscli worker died while running the command
+    /dscli worker \d+ exited .* while running a command/,
+  ],
+  // Metadata is loaded asynchronously after an instance is added or updated
+  'Instance': [/metadata (is )?(being )?(loaded|updated|refreshed)|metadata update is in progress/i],
+  'Discovery': [/metadata (is )?(being )?(loaded|updated|refreshed)|metadata update is in progress/i],
+};
+
+/**
+ * Settings for retrying transient failures
+ */
+export interface RetryConfig {
+  /** Total attempts per command, including the first; 1 disables retries */
+  maxAttempts: number;
+  /** Backoff before the first retry in milliseconds; doubles with every retry */
+  baseDelayMs: number;
+  /** Upper bound of a single backoff in milliseconds */
+  maxDelayMs: number;
+  /** Extra patterns keyed by command category ('*' for all), added to the built-in ones */
+  patterns: Record<string, RegExp[]>;
+}
+
+/**
+ * Retry counters
+ */
+export interface RetryStats {
+  /** Retries performed */
+  retries: number;
+  /** Commands that succeeded after at least one retry */
+  recovered: number;
+  /** Commands that still failed transiently after the last attempt */
+  exhausted: number;
+}
+
+/**
+ * Result of a command run under the retry policy
+ */
+export interface RetriedResult {
+  result: CliProcessResult;
+  /** Number of times the command ran */
+  attempts: number;
+}
+
+/**
+ * Decides which failures are retried and runs the retries
+ */
+export class RetryPolicy {
+  private patterns: Record<string, RegExp[]> = {};
+  private retries = 0;
+  private recovered = 0;
+  private exhausted = 0;
+
+  /**
+   * @param config Retry settings
+   * @param random Source of jitter in [0, 1) (overridable for tests)
+   */
+  constructor(private readonly config: RetryConfig, private readonly random: () => number = Math.random) {
+    for (const source of [DEFAULT_RETRY_PATTERNS, config.patterns]) {
+      for (const [category, patterns] of Object.entries(source)) {
+        this.patterns[category] = [...(this.patterns[category] ?? []), ...patterns];
+      }
+    }
+  }
+
+  /**
+   * Find the transient failure pattern a failed result matches
+   * @param commandDef Command that produced the result
+   * @param result Command result
+   * @returns The matching pattern, or undefined when the failure is not transient
+   */
+  classify(commandDef: CliCommand, result: CliProcessResult): RegExp | undefined {
+    if (result.exitCode === 0 || result.timedOut || result.cancelled || result.spawnError) {
+      return undefined;
+    }
+    const text = result.stderr || result.stdout;
+    const candidates = [...this.patterns[ALL_CATEGORIES] ?? [], ...(commandDef.category ? this.patterns[commandDef.category] ?? [] : [])];
+    return candidates.find(pattern => pattern.test(text));
+  }
+
+  /**
+   * Backoff before a retry: a random delay up to base * 2^(retry - 1), capped at the maximum
+   * @param retry 1 for the first retry
+   * @returns Delay in milliseconds
+   */
+  backoffMs(retry: number): number {
+    const ceiling = Math.min(this.config.maxDelayMs, this.config.baseDelayMs * 2 ** (retry - 1));
+    return Math.floor(this.random() * ceiling);
+  }
+
+  /**
+   * Run a command, retrying transient failures if the command is safe to repeat
+   * @param commandDef Command definition
+   * @param args Command arguments (renames are not retried)
+   * @param execute Runs the command once
+   * @param signal Stops retrying when aborted
+   * @returns The last result and the number of attempts
+   */
+  async run(commandDef: CliCommand, args: Record<string, any>, execute: () => Promise<CliProcessResult>, signal?: AbortSignal): Promise<RetriedResult> {
+    const maxAttempts = this.config.maxAttempts > 1 && isIdempotentCommand(commandDef, args) && !isSessionCommand(commandDef)
+      ? this.config.maxAttempts
+      : 1;
+    let attempts = 1;
+    let result = await execute();
+    let transient = this.classify(commandDef, result);
+    while (transient && attempts < maxAttempts && !signal?.aborted) {
+      const delayMs = this.backoffMs(attempts);
+      const matched = (result.stderr || result.stdout).match(transient)?.[0];
+      logger.info(() => `${commandDef.toolName} failed transiently ("${matched}"); retry ${attempts} of ${maxAttempts - 1} in ${delayMs} ms.`);
+      if (!await sleep(delayMs, signal)) {
+        break;
+      }
+      this.retries++;
+      attempts++;
+      if (result.stdoutFile) {
+        releaseSpillFile(result.stdoutFile);
+      }
+      result = await execute();
+      transient = this.classify(commandDef, result);
+    }
+    if (attempts > 1) {
+      if (result.exitCode === 0) {
+        this.recovered++;
+      } else if (transient) {
+        this.exhausted++;
+      }
+    }
+    return { result, attempts };
+  }
+
+  /**
+   * Get retry counters
+   * @returns Current statistics
+   */
+  getStats(): RetryStats {
+    return { retries: this.retries, recovered: this.recovered, exhausted: this.exhausted };
+  }
+}
+
+/**
+ * Wait unless the signal is aborted
+ * @returns False if the wait was cut short by the signal
+ */
+function sleep(ms: number, signal?: AbortSignal): Promise<boolean> {
+  return new Promise(resolve => {
+    if (signal?.aborted) {
+      resolve(false);
+      return;
+    }
+    const onAbort = () => {
+      clearTimeout(timer);
+      resolve(false);
+    };
+    const timer = setTimeout(() => {
+      signal?.removeEventListener('abort', onAbort);
+      resolve(true);
+    }, ms);
+    signal?.addEventListener('abort', onAbort, { once: true });
+  });
+}
+
+/**
+ * Parse retry patterns given as JSON, e.g. {"*": ["lock timeout"], "Instance": ["metadata busy"]}
+ * @param raw JSON object mapping categories to a pattern or a list of patterns
+ * @returns Compiled case-insensitive patterns; invalid entries are ignored with a warning
+ */
+export function parseRetryPatterns(raw: string): Record<string, RegExp[]> {
+  if (raw.trim() === '') {
+    return {};
+  }
+  let parsed: any;
+  try {
+    parsed = JSON.parse(raw);
+  } catch (error: any) {
+    logger.warn(`Ignoring invalid retry patterns (${error.message}).`);
+    return {};
+  }
+  if (!parsed || typeof parsed !== 'object' || Array.isArray(parsed)) {
+    logger.warn('Ignoring retry patterns: expected a JSON object mapping categories to patterns.');
+    return {};
+  }
+  const result: Record<string, RegExp[]> = {};
+  for (const [category, value] of Object.entries(parsed)) {
+    for (const source of Array.isArray(value) ? value : [value]) {
+      try {
+        (result[category] ??= []).push(new RegExp(String(source), 'i'));
+      } catch (error: any) {
+        logger.warn(`Ignoring invalid retry pattern '${source}' for ${category}: ${error.message}`);
+      }
+    }
+  }
+  return result;
+}
@@ -0,0 +1,177 @@
+/**
+ * Precomputed tool list and command schemas
+ *
+ * The tool list and the input schema of every command are static for the
+ * life of the process. The tool list is built once after the server has
+ * registered its tools; each command schema is built on first request (which
+ * loads the enhanced descriptions of its category) and then kept. Both are
+ * serialized once and tagged with a content hash. Clients can send a hash
+ * they already hold and get a short "unchanged" answer instead of the full
+ * schema.
+ */
+
+import { createHash } from 'node:crypto';
+import { CliCommand, CliParam } from './commands/types.js';
+import { getCommandParameterHelp } from './description_registry.js';
+
+/**
+ * A payload serialized once, returned as-is in tool responses
+ */
+export class PreserializedResult {
+  /**
+   * @param text JSON text sent as the tool response content
+   * @param contentHash Hash of the payload
+   */
+  constructor(public readonly text: string, public readonly contentHash: string) {}
+}
+
+/**
+ * A schema with its serialized form and content hash
+ */
+export interface CatalogEntry {
+  schema: any;
+  json: string;
+  hash: string;
+}
+
+/**
+ * Schema catalog statistics
+ */
+export interface SchemaCatalogStats {
+  tools: number;
+  /** Command schemas built so far */
+  commandSchemas: number;
+  buildMs: number;
+  toolsListHash: string;
+}
+
+/**
+ * Compute the content hash of a serialized payload
+ * @param json Serialized payload
+ * @returns Short hex SHA-256 digest
+ */
+export function contentHash(json: string): string {
+  return createHash('sha256').update(json).digest('hex').slice(0, 16);
+}
+
+/**
+ * Build the JSON input schema of a command, using enhanced parameter help where available
+ * @param params Command parameters
+ * @param commandName Command tool name
+ * @returns JSON schema object
+ */
+export async function buildCommandInputSchema(params: CliParam[], commandName: string): Promise<any> {
+  const properties: { [key: string]: any } = {};
+  const requiredParams: string[] = [];
+  for (const p of params) {
+    const enhancedDescription = await getCommandParameterHelp(commandName, p.name);
+    const schema: any = {
+      type: p.type,
+      description: enhancedDescription || p.description
+    };
+    if (p.defaultValue !== undefined) {
+      schema.default = p.defaultValue;
+    }
+    properties[p.name] = schema;
+    if (p.required) {
+      requiredParams.push(p.name);
+    }
+  }
+  return {
+    type: 'object',
+    properties,
+    required: requiredParams.length > 0 ? requiredParams : undefined,
+  };
+}
+
+function toEntry(schema: any): CatalogEntry {
+  // Pretty-printed to match the format of other tool responses
+  const json = JSON.stringify(schema, null, 2);
+  return { schema, json, hash: contentHash(json) };
+}
+
+/**
+ * Tool list computed at startup and per-command schemas computed once on demand
+ */
+export class SchemaCatalog {
+  readonly toolsList: { tools: Array<{ name: string; description: string; inputSchema: any }>; _meta: { contentHash: string } };
+  private commands: Map<string, CliCommand>;
+  private schemas: Map<string, Promise<CatalogEntry>> = new Map();
+  private builtSchemas = 0;
+  private buildMs = 0;
+
+  /**
+   * Build the catalog
+   * @param tools Registered tools as returned by BasicMCPServer.listTools()
+   * @param commands Command definitions with their final parameter lists
+   */
+  constructor(tools: Array<{ name: string; description: string; inputSchema: any }>, commands: CliCommand[]) {
+    const start = performance.now();
+    this.toolsList = { tools, _meta: { contentHash: contentHash(JSON.stringify(tools)) } };
+    this.commands = new Map(commands.map(cmd => [cmd.toolName, cmd]));
+    this.buildMs = performance.now() - start;
+  }
+
+  /**
+   * Get the schema of a command, building it on first use
+   * @param toolName Command tool name
+   * @returns The catalog entry or undefined for unknown commands
+   */
+  getCommandSchema(toolName: string): Promise<CatalogEntry> | undefined {
+    let entry = this.schemas.get(toolName);
+    if (!entry) {
+      const commandDef = this.commands.get(toolName);
+      if (!commandDef) {
+        return undefined;
+      }
+      entry = this.buildEntry(commandDef);
+      this.schemas.set(toolName, entry);
+    }
+    return entry;
+  }
+
+  /**
+   * Build all command schemas now instead of on first request
+   */
+  async prebuild(): Promise<void> {
+    await Promise.all([...this.commands.keys()].map(toolName => this.getCommandSchema(toolName)));
+  }
+
+  /**
+   * Get the schema of a command as a tool response
+   * @param toolName Command tool name
+   * @param knownHash Hash the client already holds, if any
+   * @returns The serialized schema, or a short "unchanged" payload when the hash matches
+   */
+  async getSchemaResponse(toolName: string, knownHash?: string): Promise<PreserializedResult | undefined> {
+    const entry = await this.getCommandSchema(toolName);
+    if (!entry) {
+      return undefined;
+    }
+    if (knownHash === entry.hash) {
+      return new PreserializedResult(JSON.stringify({ unchanged: true, contentHash: entry.hash }), entry.hash);
+    }
+    return new PreserializedResult(entry.json, entry.hash);
+  }
+
+  /**
+   * Get catalog statistics
+   * @returns Sizes, time spent building schemas and the tool list hash
+   */
+  getStats(): SchemaCatalogStats {
+    return {
+      tools: this.toolsList.tools.length,
+      commandSchemas: this.builtSchemas,
+      buildMs: Math.round(this.buildMs * 100) / 100,
+      toolsListHash: this.toolsList._meta.contentHash,
+    };
+  }
+
+  private async buildEntry(commandDef: CliCommand): Promise<CatalogEntry> {
+    const start = performance.now();
+    const entry = toEntry(await buildCommandInputSchema(commandDef.params, commandDef.toolName));
+    this.buildMs += performance.now() - start;
+    this.builtSchemas++;
+    return entry;
+  }
+}
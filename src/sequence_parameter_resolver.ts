@@ -6,6 +6,7 @@
  */
 
 import { SequenceContext } from './parameter_store.js';
+import { logger } from './logger.js';
 
 /**
  * Parameter search strategies for finding parameter values in previous results
@@ -123,7 +124,7 @@ export function resolveAutomaticParameters(
       resolvedParams[param] = paramValue;
       
       if (config.logResolutions) {
-        console.log(`Auto-resolved parameter '${param}' from previous step result`);
+        logger.debug(() => `Auto-resolved parameter '${param}' from previous step result`);
       }
     }
   }
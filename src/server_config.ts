@@ -0,0 +1,347 @@
+/**
+ * Server configuration for the DataSunrise CLI MCP server
+ *
+ * Options are read from command-line flags (e.g. `--cli-pool-size 4`) with
+ * environment variable fallbacks (e.g. `DS_CLI_POOL_SIZE=4`). Flags win over
+ * environment variables, which win over the built-in defaults.
+ */
+
+import * as os from 'node:os';
+import * as path from 'node:path';
+import { DEFAULT_MAX_ROWS } from './output_parser.js';
+import { RESPONSE_ENCODINGS, ResponseEncoding, ResponseEncodingOptions } from './response_encoding.js';
+import { logger, LogLevel, parseLogLevel } from './logger.js';
+import { SessionConfig } from './session_manager.js';
+import { parseRetryPatterns, RetryConfig } from './retry_policy.js';
+
+const DEFAULT_VERIFY_CACHE_FILE = path.join(os.homedir(), '.datasunrise-cli-mcp', 'cli-verification.json');
+
+/**
+ * Built-in timeouts in milliseconds for categories whose commands routinely
+ * run longer than the default (connection attempts fail faster)
+ */
+const DEFAULT_CATEGORY_TIMEOUTS_MS: Record<string, number> = {
+  'Connection': 60 * 1000,
+  'Static Masking': 30 * 60 * 1000,
+  'Dictionary': 30 * 60 * 1000,
+};
+
+/**
+ * Settings for the persistent dscli worker pool
+ */
+export interface CliPoolConfig {
+  /** Number of long-lived dscli workers. 0 disables the pool. */
+  size: number;
+  /** Number of commands a worker runs before it is recycled */
+  maxCommandsPerWorker: number;
+  /** Arguments passed to the CLI executable to start it in stdin (worker) mode */
+  workerArgs: string[];
+}
+
+/**
+ * Settings for capturing dscli output
+ */
+export interface CliOutputConfig {
+  /** Maximum stdout/stderr bytes kept in memory; larger stdout is spilled to a file */
+  maxBufferedBytes: number;
+  /** Directory for spill files; undefined means the OS temp directory */
+  spillDir?: string;
+  /** Maximum number of rows parsed from stdout; 0 disables parsing */
+  maxRows: number;
+}
+
+/**
+ * Settings for the read-only command result cache
+ */
+export interface ResultCacheConfig {
+  /** Default TTL in milliseconds; 0 disables caching */
+  defaultTtlMs: number;
+  /** TTL overrides in milliseconds keyed by command category */
+  categoryTtlMs: Record<string, number>;
+  /** Maximum number of cached results */
+  maxEntries: number;
+}
+
+/**
+ * Settings for limiting how long a dscli command may run
+ */
+export interface CliTimeoutConfig {
+  /** Default timeout in milliseconds; 0 means no limit */
+  defaultMs: number;
+  /** Timeout overrides in milliseconds keyed by command category */
+  categoryMs: Record<string, number>;
+}
+
+/**
+ * Settings for paged command output
+ */
+export interface PagingConfig {
+  /** Lifetime of a page cursor in milliseconds */
+  cursorTtlMs: number;
+  /** Maximum number of paged outputs kept at the same time */
+  maxOutputs: number;
+}
+
+/**
+ * Settings for CLI executable verification
+ */
+export interface CliVerificationConfig {
+  /** File that remembers verified executables; undefined disables it */
+  cacheFile?: string;
+}
+
+/**
+ * Settings for run_cli_batch
+ */
+export interface BatchConfig {
+  /** Default number of batch steps running at the same time */
+  maxParallel: number;
+}
+
+/**
+ * Settings for handling masking rules that reference objects missing from the metadata cache
+ */
+export interface MetadataRefreshConfig {
+  /** Update the instance metadata automatically and retry the rule creation (off by default) */
+  autoRefresh: boolean;
+}
+
+/**
+ * Settings for the Prometheus metrics listener
+ */
+export interface MetricsConfig {
+  /** Port of the HTTP /metrics listener; 0 disables it */
+  port: number;
+  /** Address the listener binds to */
+  host: string;
+}
+
+/**
+ * Settings for run_cli_fanout
+ */
+export interface FanOutConfig {
+  /** Default number of backends queried at the same time */
+  maxParallel: number;
+}
+
+/**
+ * Complete server configuration
+ */
+export interface ServerConfig {
+  cliPool: CliPoolConfig;
+  cliOutput: CliOutputConfig;
+  resultCache: ResultCacheConfig;
+  cliTimeouts: CliTimeoutConfig;
+  /** Retries of transient dscli failures */
+  cliRetry: RetryConfig;
+  paging: PagingConfig;
+  /** Default encoding of tool responses; clients can override it per call */
+  response: ResponseEncodingOptions;
+  batch: BatchConfig;
+  fanOut: FanOutConfig;
+  metadataRefresh: MetadataRefreshConfig;
+  metrics: MetricsConfig;
+  /** Credentials and backend for automatic sessions */
+  session: SessionConfig;
+  cliVerification: CliVerificationConfig;
+  /** Minimum level of messages written to stderr */
+  logLevel: LogLevel;
+  /** Load all enhanced descriptions and build all command schemas before accepting connections */
+  preloadDescriptions: boolean;
+}
+
+/**
+ * Get the value that follows a command-line flag
+ * @param flag Flag name including dashes (e.g. '--cli-path')
+ * @param argv Argument vector to search (defaults to process.argv)
+ * @returns The flag value or undefined if the flag is absent or has no value
+ */
+export function getArgValue(flag: string, argv: string[] = process.argv): string | undefined {
+  const index = argv.indexOf(flag);
+  if (index > -1 && argv.length > index + 1) {
+    return argv[index + 1];
+  }
+  return undefined;
+}
+
+/**
+ * Read a string option from a flag or environment variable
+ * @param flag Command-line flag name
+ * @param envVar Environment variable name
+ * @param defaultValue Value used when neither source is set
+ * @param argv Argument vector
+ * @param env Environment variables
+ * @returns The resolved option value
+ */
+export function getStringOption(
+  flag: string,
+  envVar: string,
+  defaultValue: string,
+  argv: string[] = process.argv,
+  env: NodeJS.ProcessEnv = process.env
+): string {
+  return getArgValue(flag, argv) ?? env[envVar] ?? defaultValue;
+}
+
+/**
+ * Read a non-negative integer option from a flag or environment variable
+ * @param flag Command-line flag name
+ * @param envVar Environment variable name
+ * @param defaultValue Value used when neither source is set or the value is invalid
+ * @param argv Argument vector
+ * @param env Environment variables
+ * @returns The resolved option value
+ */
+export function getNumberOption(
+  flag: string,
+  envVar: string,
+  defaultValue: number,
+  argv: string[] = process.argv,
+  env: NodeJS.ProcessEnv = process.env
+): number {
+  const raw = getArgValue(flag, argv) ?? env[envVar];
+  if (raw === undefined || raw === '') {
+    return defaultValue;
+  }
+  const parsed = Number(raw);
+  if (!Number.isFinite(parsed) || parsed < 0) {
+    logger.warn(`Ignoring invalid value '${raw}' for ${flag}/${envVar}; using ${defaultValue}.`);
+    return defaultValue;
+  }
+  return Math.floor(parsed);
+}
+
+/**
+ * Read an on/off option: enabled by the presence of a flag or by the
+ * environment variable being set to 'true' or '1'
+ * @param flag Command-line flag name
+ * @param envVar Environment variable name
+ * @param argv Argument vector
+ * @param env Environment variables
+ * @returns True if the option is enabled
+ */
+export function getFlagOption(
+  flag: string,
+  envVar: string,
+  argv: string[] = process.argv,
+  env: NodeJS.ProcessEnv = process.env
+): boolean {
+  return argv.includes(flag) || env[envVar] === 'true' || env[envVar] === '1';
+}
+
+/**
+ * Parse a comma-separated list of `name=number` pairs, e.g. "Instance=60,Database User=120".
+ * Names may contain spaces; invalid pairs are ignored with a warning.
+ * @param raw Raw option value
+ * @param scale Factor applied to each number (e.g. 1000 for seconds to milliseconds)
+ * @returns Map of names to scaled numbers
+ */
+export function parseNumberMap(raw: string, scale: number = 1): Record<string, number> {
+  const result: Record<string, number> = {};
+  for (const pair of raw.split(',')) {
+    if (pair.trim() === '') {
+      continue;
+    }
+    const separator = pair.lastIndexOf('=');
+    const name = pair.slice(0, separator).trim();
+    const value = Number(pair.slice(separator + 1).trim());
+    if (separator <= 0 || name === '' || !Number.isFinite(value) || value < 0) {
+      logger.warn(`Ignoring invalid 'name=value' entry '${pair}'.`);
+      continue;
+    }
+    result[name] = value * scale;
+  }
+  return result;
+}
+
+/**
+ * Load the server configuration
+ * @param argv Argument vector (defaults to process.argv)
+ * @param env Environment variables (defaults to process.env)
+ * @returns The resolved server configuration
+ */
+export function loadServerConfig(
+  argv: string[] = process.argv,
+  env: NodeJS.ProcessEnv = process.env
+): ServerConfig {
+  const workerArgs = getStringOption('--cli-pool-worker-args', 'DS_CLI_POOL_WORKER_ARGS', '', argv, env);
+  const rawLogLevel = getStringOption('--log-level', 'DS_LOG_LEVEL', '', argv, env);
+  const logLevel = parseLogLevel(rawLogLevel) ?? (argv.includes('--verbose') ? 'debug' : 'info');
+  if (rawLogLevel && !parseLogLevel(rawLogLevel)) {
+    logger.warn(`Ignoring invalid value '${rawLogLevel}' for --log-level/DS_LOG_LEVEL; using ${logLevel}.`);
+  }
+  let encoding = getStringOption('--response-encoding', 'DS_RESPONSE_ENCODING', 'pretty', argv, env) as ResponseEncoding;
+  if (!RESPONSE_ENCODINGS.includes(encoding)) {
+    logger.warn(`Ignoring invalid value '${encoding}' for --response-encoding/DS_RESPONSE_ENCODING; using pretty.`);
+    encoding = 'pretty';
+  }
+  return {
+    cliPool: {
+      size: getNumberOption('--cli-pool-size', 'DS_CLI_POOL_SIZE', 0, argv, env),
+      maxCommandsPerWorker: getNumberOption('--cli-pool-max-commands', 'DS_CLI_POOL_MAX_COMMANDS', 200, argv, env),
+      workerArgs: workerArgs.split(' ').filter(arg => arg.length > 0),
+    },
+    cliOutput: {
+      maxBufferedBytes: getNumberOption('--cli-max-output-bytes', 'DS_CLI_MAX_OUTPUT_BYTES', 1024 * 1024, argv, env),
+      spillDir: getStringOption('--cli-spill-dir', 'DS_CLI_SPILL_DIR', '', argv, env) || undefined,
+      maxRows: getNumberOption('--cli-max-rows', 'DS_CLI_MAX_ROWS', DEFAULT_MAX_ROWS, argv, env),
+    },
+    resultCache: {
+      defaultTtlMs: getNumberOption('--cache-ttl', 'DS_CACHE_TTL', 30, argv, env) * 1000,
+      categoryTtlMs: parseNumberMap(getStringOption('--cache-category-ttl', 'DS_CACHE_CATEGORY_TTL', '', argv, env), 1000),
+      maxEntries: getNumberOption('--cache-max-entries', 'DS_CACHE_MAX_ENTRIES', 500, argv, env),
+    },
+    cliTimeouts: {
+      defaultMs: getNumberOption('--cli-timeout', 'DS_CLI_TIMEOUT', 300, argv, env) * 1000,
+      categoryMs: {
+        ...DEFAULT_CATEGORY_TIMEOUTS_MS,
+        ...parseNumberMap(getStringOption('--cli-category-timeout', 'DS_CLI_CATEGORY_TIMEOUT', '', argv, env), 1000),
+      },
+    },
+    cliRetry: {
+      maxAttempts: Math.max(1, getNumberOption('--cli-retry-attempts', 'DS_CLI_RETRY_ATTEMPTS', 3, argv, env)),
+      baseDelayMs: getNumberOption('--cli-retry-base-delay', 'DS_CLI_RETRY_BASE_DELAY', 500, argv, env),
+      maxDelayMs: getNumberOption('--cli-retry-max-delay', 'DS_CLI_RETRY_MAX_DELAY', 10000, argv, env),
+      patterns: parseRetryPatterns(getStringOption('--cli-retry-patterns', 'DS_CLI_RETRY_PATTERNS', '', argv, env)),
+    },
+    paging: {
+      cursorTtlMs: getNumberOption('--page-cursor-ttl', 'DS_PAGE_CURSOR_TTL', 600, argv, env) * 1000,
+      maxOutputs: Math.max(1, getNumberOption('--page-max-outputs', 'DS_PAGE_MAX_OUTPUTS', 50, argv, env)),
+    },
+    response: {
+      encoding,
+      maxStdoutBytes: getNumberOption('--response-max-stdout-bytes', 'DS_RESPONSE_MAX_STDOUT_BYTES', 0, argv, env),
+      rows: getFlagOption('--response-rows', 'DS_RESPONSE_ROWS', argv, env),
+    },
+    batch: {
+      maxParallel: Math.max(1, getNumberOption('--batch-max-parallel', 'DS_BATCH_MAX_PARALLEL', 4, argv, env)),
+    },
+    fanOut: {
+      maxParallel: Math.max(1, getNumberOption('--fanout-max-parallel', 'DS_FANOUT_MAX_PARALLEL', 8, argv, env)),
+    },
+    metadataRefresh: {
+      // Off by default: the update can take long on large instances and changes server state the caller did not ask for
+      autoRefresh: ['on', 'true', '1'].includes(getStringOption('--metadata-auto-refresh', 'DS_METADATA_AUTO_REFRESH', 'off', argv, env).toLowerCase()),
+    },
+    metrics: {
+      port: getNumberOption('--metrics-port', 'DS_METRICS_PORT', 0, argv, env),
+      host: getStringOption('--metrics-host', 'DS_METRICS_HOST', '127.0.0.1', argv, env),
+    },
+    session: {
+      login: getStringOption('--ds-login', 'DS_LOGIN', '', argv, env) || undefined,
+      // Secrets are only read from the environment so they do not show up in process listings
+      oauth2Token: env.DS_OAUTH2_TOKEN || undefined,
+      backend: {
+        host: getStringOption('--ds-host', 'DS_HOST', '127.0.0.1', argv, env),
+        port: getStringOption('--ds-port', 'DS_PORT', '11000', argv, env),
+        protocol: getStringOption('--ds-protocol', 'DS_PROTOCOL', 'https', argv, env),
+      },
+    },
+    cliVerification: {
+      // An explicitly empty value disables the cache
+      cacheFile: getStringOption('--cli-verify-cache', 'DS_CLI_VERIFY_CACHE', DEFAULT_VERIFY_CACHE_FILE, argv, env) || undefined,
+    },
+    logLevel,
+    preloadDescriptions: getFlagOption('--preload-descriptions', 'DS_PRELOAD_DESCRIPTIONS', argv, env),
+  };
+}
@@ -0,0 +1,258 @@
+/**
+ * Automatic DataSunrise sessions
+ *
+ * When credentials are configured, the server opens sessions itself instead of
+ * leaving `connect` and `sessionToken` to the client. The first command for a
+ * backend runs `connect` (or `connectOAuth2`) in Multi session mode, and the
+ * session token is cached per backend and added to every later command. When
+ * a command fails because its session expired, the session is reopened once
+ * and the command retried. Concurrent commands that hit the same expired
+ * session share a single reconnect.
+ *
+ * Secrets are not passed on the command line, where process listings and logs
+ * would show them: dscli reads the password from DS_PASSWORD and the OAuth2
+ * access token from DS_OAUTH2_TOKEN, which the server's child processes inherit.
+ */
+
+import { CliProcessResult, releaseSpillFile } from './cli_executor.js';
+import { SingleFlight } from './single_flight.js';
+import { logger } from './logger.js';
+
+/**
+ * A DataSunrise backend application
+ */
+export interface SessionBackend {
+  host: string;
+  port: string;
+  protocol: string;
+}
+
+/**
+ * Credentials used to open sessions automatically
+ */
+export interface SessionConfig {
+  /** Login for `connect`; the password comes from DS_PASSWORD */
+  login?: string;
+  /** Access token for `connectOAuth2` (read by dscli from DS_OAUTH2_TOKEN); used when no login is configured */
+  oauth2Token?: string;
+  /** Backend used by commands that do not name one */
+  backend: SessionBackend;
+}
+
+/**
+ * Per-backend session counters
+ */
+export interface SessionStats {
+  backend: string;
+  connected: boolean;
+  /** Sessions opened */
+  connects: number;
+  failedConnects: number;
+  /** Sessions found expired by a command */
+  expirations: number;
+  /** Commands retried after reconnecting */
+  retries: number;
+}
+
+/**
+ * stderr messages that mean the session is gone and reconnecting may help
+ */
+export const SESSION_EXPIRED_PATTERNS: RegExp[] = [
+  /session\b.*\b(expired|is invalid|not found|is closed|does not exist)/i,
+  /invalid session/i,
+  /not connected/i,
+  /please,? (re)?connect/i,
+  /(authentication|authorization) (is )?required/i,
+  /\b401\b.*unauthori[sz]ed/i,
+];
+
+// Token printed by connect in Multi session mode
+const SESSION_TOKEN_PATTERN = /session\s*token\s*(?:is)?\s*[:=]?\s*([A-Za-z0-9._~+\/=-]{8,})/i;
+
+/**
+ * Error raised when a session cannot be opened
+ */
+export class SessionError extends Error {
+  /**
+   * @param message Error message
+   * @param result Result of the failed connect command
+   */
+  constructor(message: string, readonly result: CliProcessResult) {
+    super(message);
+  }
+}
+
+interface Session {
+  /** Token to pass as -sessionToken; undefined when dscli keeps the session in its state file */
+  token?: string;
+}
+
+interface BackendState {
+  session?: Session;
+  connects: number;
+  failedConnects: number;
+  expirations: number;
+  retries: number;
+}
+
+/**
+ * Check whether a failed command failed because its session expired
+ * @param result Command result
+ * @returns True if reconnecting and retrying may succeed
+ */
+export function isSessionExpired(result: CliProcessResult): boolean {
+  if (result.exitCode === 0 || result.timedOut || result.cancelled) {
+    return false;
+  }
+  const text = result.stderr || result.stdout;
+  return SESSION_EXPIRED_PATTERNS.some(pattern => pattern.test(text));
+}
+
+/**
+ * Find the session token in the output of a connect command
+ * @param output stdout and stderr of connect
+ * @returns The token, or undefined if none was printed
+ */
+export function parseSessionToken(output: string): string | undefined {
+  return output.match(SESSION_TOKEN_PATTERN)?.[1];
+}
+
+/**
+ * Opens, caches and renews sessions per backend
+ */
+export class SessionManager {
+  private backends: Map<string, BackendState> = new Map();
+  private connects: SingleFlight<Session> = new SingleFlight();
+
+  /**
+   * @param config Credentials and default backend
+   * @param runCli Runs a dscli command line (used for connect)
+   */
+  constructor(
+    private readonly config: SessionConfig,
+    private readonly runCli: (argv: string[]) => Promise<CliProcessResult>
+  ) {}
+
+  /**
+   * Check whether credentials for automatic sessions are configured
+   */
+  get enabled(): boolean {
+    return !!(this.config.login || this.config.oauth2Token);
+  }
+
+  /**
+   * Default backend of the server
+   */
+  get defaultBackend(): SessionBackend {
+    return this.config.backend;
+  }
+
+  /**
+   * Run a command with the session of a backend, opening the session first if
+   * needed. If the command fails because the session expired, the session is
+   * reopened and the command run once more.
+   * @param execute Runs the command with the given session token (undefined when dscli needs none)
+   * @param backend Backend to run on (defaults to the configured backend)
+   * @returns Result of the last run
+   * @throws SessionError when the session cannot be opened
+   */
+  async run(execute: (token: string | undefined) => Promise<CliProcessResult>, backend: SessionBackend = this.config.backend): Promise<CliProcessResult> {
+    const session = await this.acquire(backend);
+    const result = await execute(session.token);
+    if (!isSessionExpired(result)) {
+      return result;
+    }
+    this.invalidate(backend, session);
+    if (result.stdoutFile) {
+      releaseSpillFile(result.stdoutFile);
+    }
+    const renewed = await this.acquire(backend);
+    this.state(backend).retries++;
+    return execute(renewed.token);
+  }
+
+  /**
+   * Get session counters per backend
+   * @returns Statistics of every backend used so far
+   */
+  getStats(): SessionStats[] {
+    return [...this.backends.entries()].map(([backend, state]) => ({
+      backend,
+      connected: state.session !== undefined,
+      connects: state.connects,
+      failedConnects: state.failedConnects,
+      expirations: state.expirations,
+      retries: state.retries,
+    }));
+  }
+
+  private async acquire(backend: SessionBackend): Promise<Session> {
+    const state = this.state(backend);
+    if (state.session) {
+      return state.session;
+    }
+    const { value } = await this.connects.run(backendKey(backend), () => this.connect(backend, state));
+    return value;
+  }
+
+  /**
+   * Drop a session unless it was already replaced, so callers that fail with
+   * an old token after someone else reconnected reuse the new session
+   */
+  private invalidate(backend: SessionBackend, session: Session): void {
+    const state = this.state(backend);
+    if (state.session === session) {
+      state.session = undefined;
+      state.expirations++;
+      logger.info(`Session for ${backendKey(backend)} expired; reconnecting.`);
+    }
+  }
+
+  private async connect(backend: SessionBackend, state: BackendState): Promise<Session> {
+    const argv = this.connectArgv(backend);
+    logger.debug(() => `Opening session: ${argv[0]} to ${backendKey(backend)}`);
+    const result = await this.runCli(argv);
+    // Only the token is used; the output itself is never returned
+    if (result.stdoutFile) {
+      releaseSpillFile(result.stdoutFile);
+    }
+    if (result.exitCode !== 0) {
+      state.failedConnects++;
+      const detail = (result.stderr || result.stdout).trim();
+      throw new SessionError(`Automatic ${argv[0]} to ${backendKey(backend)} failed${detail ? `: ${detail}` : ` with exit code ${result.exitCode}`}`, result);
+    }
+    const session: Session = { token: parseSessionToken(`${result.stdout}\n${result.stderr}`) };
+    if (!session.token) {
+      logger.warn(`${argv[0]} to ${backendKey(backend)} printed no session token; commands rely on the dscli session state.`);
+    }
+    state.session = session;
+    state.connects++;
+    return session;
+  }
+
+  private connectArgv(backend: SessionBackend): string[] {
+    const target = ['-host', backend.host, '-port', backend.port, '-protocol', backend.protocol, '-sessionType', 'Multi'];
+    return this.config.login
+      ? ['connect', ...target, '-login', this.config.login]
+      : ['connectOAuth2', ...target];
+  }
+
+  private state(backend: SessionBackend): BackendState {
+    const key = backendKey(backend);
+    let state = this.backends.get(key);
+    if (!state) {
+      state = { connects: 0, failedConnects: 0, expirations: 0, retries: 0 };
+      this.backends.set(key, state);
+    }
+    return state;
+  }
+}
+
+/**
+ * Key of a backend in caches and statistics
+ * @param backend Backend
+ * @returns URL-like key, e.g. "https://10.0.0.5:11000"
+ */
+export function backendKey(backend: SessionBackend): string {
+  return `${backend.protocol}://${backend.host}:${backend.port}`;
+}
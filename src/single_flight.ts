@@ -0,0 +1,65 @@
+/**
+ * Single-flight coalescing of identical concurrent work
+ *
+ * While a call for a key is in flight, further calls with the same key do not
+ * start new work; they wait for and receive the result of the running call.
+ * The key is forgotten as soon as the call settles, so later calls run again.
+ */
+
+/**
+ * Single-flight counters
+ */
+export interface SingleFlightStats {
+  /** Keys with a call currently in flight */
+  inFlight: number;
+  /** Calls that started new work */
+  executions: number;
+  /** Calls that joined an in-flight call instead of starting new work (executions saved) */
+  coalesced: number;
+}
+
+/**
+ * Deduplicates concurrent calls that share a key
+ */
+export class SingleFlight<T> {
+  private calls: Map<string, Promise<T>> = new Map();
+  private executions = 0;
+  private coalesced = 0;
+
+  /**
+   * Run `fn` unless a call for the same key is already in flight
+   * @param key Call fingerprint
+   * @param fn Function that performs the work
+   * @returns The result and whether it was shared with an earlier call
+   */
+  async run(key: string, fn: () => Promise<T>): Promise<{ value: T; shared: boolean }> {
+    const existing = this.calls.get(key);
+    if (existing) {
+      this.coalesced++;
+      return { value: await existing, shared: true };
+    }
+
+    this.executions++;
+    const call = (async () => {
+      try {
+        return await fn();
+      } finally {
+        this.calls.delete(key);
+      }
+    })();
+    this.calls.set(key, call);
+    return { value: await call, shared: false };
+  }
+
+  /**
+   * Get single-flight counters
+   * @returns Current statistics
+   */
+  getStats(): SingleFlightStats {
+    return {
+      inFlight: this.calls.size,
+      executions: this.executions,
+      coalesced: this.coalesced,
+    };
+  }
+}
@@ -0,0 +1,179 @@
+/**
+ * Bounded TTL/LRU cache
+ *
+ * A small Map-based cache used by the MCP server for command results and other
+ * short-lived state. Entries expire after a per-entry TTL and the least
+ * recently used entry is evicted once the cache is full.
+ */
+
+/**
+ * Options for creating a TTL/LRU cache
+ */
+export interface TtlCacheOptions {
+  /** Maximum number of entries kept in the cache */
+  maxEntries: number;
+  /** TTL used when set() is called without an explicit TTL */
+  defaultTtlMs: number;
+  /** Clock used for expiry (defaults to Date.now, overridable for tests) */
+  now?: () => number;
+}
+
+/**
+ * Cache counters for monitoring and tuning
+ */
+export interface TtlCacheStats {
+  size: number;
+  maxEntries: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  expirations: number;
+}
+
+interface CacheEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+/**
+ * Cache with per-entry expiry and least-recently-used eviction
+ */
+export class TtlLruCache<K, V> {
+  private entries: Map<K, CacheEntry<V>> = new Map();
+  private maxEntries: number;
+  private defaultTtlMs: number;
+  private now: () => number;
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+  private expirations = 0;
+
+  /**
+   * Create a new cache
+   * @param options Cache options
+   */
+  constructor(options: TtlCacheOptions) {
+    this.maxEntries = Math.max(1, options.maxEntries);
+    this.defaultTtlMs = options.defaultTtlMs;
+    this.now = options.now ?? Date.now;
+  }
+
+  /**
+   * Get a value and mark it as most recently used
+   * @param key Cache key
+   * @returns The cached value or undefined if it is missing or expired
+   */
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+    if (entry.expiresAt <= this.now()) {
+      this.entries.delete(key);
+      this.expirations++;
+      this.misses++;
+      return undefined;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  /**
+   * Check whether a live entry exists without touching recency or counters
+   * @param key Cache key
+   * @returns True if the key is cached and not expired
+   */
+  has(key: K): boolean {
+    const entry = this.entries.get(key);
+    return !!entry && entry.expiresAt > this.now();
+  }
+
+  /**
+   * Store a value
+   * @param key Cache key
+   * @param value Value to cache
+   * @param ttlMs Time to live in milliseconds (defaults to the cache default)
+   */
+  set(key: K, value: V, ttlMs: number = this.defaultTtlMs): void {
+    if (ttlMs <= 0) {
+      return;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: this.now() + ttlMs });
+    if (this.entries.size > this.maxEntries) {
+      this.pruneExpired();
+    }
+    while (this.entries.size > this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value as K;
+      this.entries.delete(oldestKey);
+      this.evictions++;
+    }
+  }
+
+  /**
+   * Remove a single entry
+   * @param key Cache key
+   * @returns True if an entry was removed
+   */
+  delete(key: K): boolean {
+    return this.entries.delete(key);
+  }
+
+  /**
+   * Remove all entries matching a predicate
+   * @param predicate Function called with each key and value
+   * @returns Number of removed entries
+   */
+  deleteWhere(predicate: (key: K, value: V) => boolean): number {
+    let removed = 0;
+    for (const [key, entry] of this.entries) {
+      if (predicate(key, entry.value)) {
+        this.entries.delete(key);
+        removed++;
+      }
+    }
+    return removed;
+  }
+
+  /**
+   * Remove all entries
+   */
+  clear(): void {
+    this.entries.clear();
+  }
+
+  /**
+   * Number of entries currently stored (including not yet pruned expired ones)
+   */
+  get size(): number {
+    return this.entries.size;
+  }
+
+  /**
+   * Get cache counters
+   * @returns Current cache statistics
+   */
+  getStats(): TtlCacheStats {
+    return {
+      size: this.entries.size,
+      maxEntries: this.maxEntries,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      expirations: this.expirations,
+    };
+  }
+
+  private pruneExpired(): void {
+    const now = this.now();
+    for (const [key, entry] of this.entries) {
+      if (entry.expiresAt <= now) {
+        this.entries.delete(key);
+        this.expirations++;
+      }
+    }
+  }
+}
@@ -0,0 +1,60 @@
+/**
+ * Throughput benchmark: one dscli process per command versus the worker pool
+ *
+ * Runs the same read-only commands against the fake dscli (test/fake_dscli)
+ * with a simulated JVM start and command latency, once by spawning a process
+ * per command and once through a persistent worker pool, with the same number
+ * of commands in flight. No DataSunrise installation is needed.
+ *
+ * Run with: npm run bench:cli-throughput
+ */
+
+import * as path from 'node:path';
+import { performance } from 'node:perf_hooks';
+import { fileURLToPath } from 'node:url';
+import { CliLaunch, executeCli, formatCommandLine } from '../../src/cli_executor.js';
+import { CliWorkerPool } from '../../src/cli_worker_pool.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const FAKE_DSCLI: CliLaunch = { file: process.execPath, args: [path.join(__dirname, '../fake_dscli/fake_dscli.js')] };
+const COMMANDS = 64;
+const CONCURRENCY = 4;
+const ARGV = ['showInstances'];
+
+// Simulated JVM start and backend latency, inherited by the fake dscli processes
+process.env.FAKE_DSCLI_STARTUP_MS = process.env.FAKE_DSCLI_STARTUP_MS ?? '500';
+process.env.FAKE_DSCLI_LATENCY_MS = process.env.FAKE_DSCLI_LATENCY_MS ?? '20-60';
+process.env.FAKE_DSCLI_SEED = process.env.FAKE_DSCLI_SEED ?? '1';
+
+async function runConcurrently(execute: () => Promise<unknown>): Promise<number> {
+  let next = 0;
+  const started = performance.now();
+  await Promise.all(Array.from({ length: CONCURRENCY }, async () => {
+    while (next++ < COMMANDS) {
+      await execute();
+    }
+  }));
+  return performance.now() - started;
+}
+
+function report(label: string, elapsedMs: number): void {
+  const perSecond = COMMANDS / (elapsedMs / 1000);
+  console.log(`${label.padEnd(12)} ${elapsedMs.toFixed(0).padStart(7)} ms   ${perSecond.toFixed(1).padStart(7)} commands/s   (${COMMANDS} commands, ${CONCURRENCY} in flight)`);
+}
+
+async function main(): Promise<void> {
+  console.log(`Fake dscli: startup ${process.env.FAKE_DSCLI_STARTUP_MS} ms, latency ${process.env.FAKE_DSCLI_LATENCY_MS} ms`);
+  report('per-process', await runConcurrently(() => executeCli(FAKE_DSCLI, ARGV)));
+
+  const pool = new CliWorkerPool({ size: CONCURRENCY, maxCommandsPerWorker: 0, launch: FAKE_DSCLI, workerArgs: ['--worker'] });
+  pool.start();
+  // Let the workers start, as they would while the server waits for its first request
+  await Promise.all(Array.from({ length: CONCURRENCY }, () => pool.execute(formatCommandLine(ARGV))));
+  report('worker pool', await runConcurrently(() => pool.execute(formatCommandLine(ARGV))));
+  await pool.shutdown();
+}
+
+main().catch(error => {
+  console.error('Benchmark failed:', error);
+  process.exit(1);
+});
@@ -0,0 +1,92 @@
+/**
+ * Microbenchmark: per-call overhead of resolving a command and rendering its argv
+ *
+ * "legacy" reproduces the previous path (linear allCliCommands.find plus a
+ * walk over the raw parameter definitions with per-call special-case checks,
+ * without its debug logging). "compiled" uses the CommandIndex built at startup.
+ *
+ * Run with: npm run bench:command-plan
+ */
+
+import { performance } from 'node:perf_hooks';
+import { allCliCommands } from '../../src/commands/index.js';
+import { CliCommand } from '../../src/commands/types.js';
+import { CommandIndex, renderArgv } from '../../src/command_plan.js';
+
+const ITERATIONS = 200000;
+
+interface Call {
+  toolName: string;
+  args: Record<string, any>;
+}
+
+// Build valid arguments for a command: required parameters plus the given extras
+function callFor(toolName: string, extras: Record<string, any> = {}): Call {
+  const commandDef = allCliCommands.find(cmd => cmd.toolName === toolName) as CliCommand;
+  const args: Record<string, any> = {};
+  for (const param of commandDef.params) {
+    if (param.required) {
+      args[param.name] = param.type === 'boolean' ? true : param.type === 'number' ? 1 : 'value';
+    }
+  }
+  return { toolName, args: { ...args, ...extras } };
+}
+
+// A mix of commands from the start, middle and end of the command list
+const CALLS: Call[] = [
+  callFor('instance_show_all'),
+  callFor('core_show_state', { dsServer: 'localhost' }),
+  callFor('rule_add_audit', { name: 'audit_sales', instance: 'sales_db' }),
+  callFor(allCliCommands[Math.floor(allCliCommands.length / 2)].toolName),
+  callFor(allCliCommands[allCliCommands.length - 1].toolName),
+];
+
+function legacyRender(toolName: string, commandArgs: Record<string, any>): string[] {
+  const commandDef = allCliCommands.find(cmd => cmd.toolName === toolName) as CliCommand;
+  const argv: string[] = [commandDef.baseCommand];
+  for (const param of commandDef.params) {
+    let currentValue = commandArgs?.[param.name];
+    if (param.name === 'enable' &&
+        (commandDef.baseCommand === 'addAuditRule' || commandDef.baseCommand === 'addSecurityRule') &&
+        commandArgs?.enable === undefined) {
+      currentValue = 'true';
+    } else if (currentValue === undefined && param.defaultValue !== undefined) {
+      currentValue = param.defaultValue;
+    }
+    if (commandDef.toolName === 'core_show_state' && param.name === 'dsServer' && currentValue === 'localhost') {
+      currentValue = '127.0.0.1';
+    }
+    if (param.type === 'boolean') {
+      if (currentValue === true || String(currentValue).toLowerCase() === 'true') {
+        argv.push(param.cliName);
+      }
+    } else if (currentValue !== undefined) {
+      argv.push(param.cliName, String(currentValue));
+    }
+  }
+  return argv;
+}
+
+function measure(label: string, render: (call: Call) => string[]): number {
+  // Warm up the JIT before timing
+  for (let i = 0; i < 10000; i++) {
+    render(CALLS[i % CALLS.length]);
+  }
+  const start = performance.now();
+  let sink = 0;
+  for (let i = 0; i < ITERATIONS; i++) {
+    sink += render(CALLS[i % CALLS.length]).length;
+  }
+  const elapsedMs = performance.now() - start;
+  const nsPerCall = (elapsedMs * 1e6) / ITERATIONS;
+  console.log(`${label.padEnd(10)} ${nsPerCall.toFixed(0).padStart(8)} ns/call  (${ITERATIONS} calls, checksum ${sink})`);
+  return nsPerCall;
+}
+
+const indexStart = performance.now();
+const index = new CommandIndex(allCliCommands);
+console.log(`Compiled ${index.size} commands in ${(performance.now() - indexStart).toFixed(2)} ms`);
+
+const legacy = measure('legacy', call => legacyRender(call.toolName, call.args));
+const compiled = measure('compiled', call => renderArgv(index.get(call.toolName)!, call.args));
+console.log(`Speedup: ${(legacy / compiled).toFixed(1)}x`);
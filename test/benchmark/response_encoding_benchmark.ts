@@ -0,0 +1,93 @@
+/**
+ * Benchmark: size and serialization time of CallTool response text
+ *
+ * Builds run_cli_command results for representative show outputs (a short
+ * key/value block, a list of entities and a large event table, with and
+ * without parsed rows) and encodes them as "pretty" (the previous format),
+ * "compact" and "compact" with a 64 KB head/tail stdout cut, all with rows
+ * requested, and as "compact" without rows ("stdout only", the default).
+ *
+ * Run with: npm run bench:response-encoding
+ */
+
+import { performance } from 'node:perf_hooks';
+import { parseCliOutput } from '../../src/output_parser.js';
+import { encodeToolResult, ResponseEncodingOptions } from '../../src/response_encoding.js';
+
+interface Sample {
+  label: string;
+  result: any;
+}
+
+function commandResult(command: string, stdout: string, withRows: boolean): any {
+  const result: any = { command, stdout, stderr: '', exitCode: 0, stdoutBytes: Buffer.byteLength(stdout) };
+  if (withRows) {
+    const parsed = parseCliOutput(stdout);
+    result.outputFormat = parsed.format;
+    result.rows = parsed.rows;
+  }
+  return result;
+}
+
+const instanceInfo = [
+  'Name                 : sales_db',
+  'Login                : postgres',
+  'Search for Table Relations : no',
+  'Environment Name     : DS_ENVIRONMENT',
+  'Automatically Create Environment : no',
+  '',
+  'Interface: 10.0.0.5:5432',
+  '  Proxy: 10.0.0.6:54321',
+  '',
+  'OK',
+  '',
+].join('\n');
+const ruleList = 'Rules:\n' + Array.from({ length: 200 }, (_, i) => `audit_rule_${i}`).join('\n') + '\n\nOK\n';
+const events = Array.from({ length: 20000 }, (_, i) =>
+  `: ${i} : 2025-10-28 12:${String(i % 60).padStart(2, '0')}:00 : sales_db : postgres : SELECT * FROM "orders" WHERE id = ${i} : Audit`
+).join('\n') + '\n';
+
+const SAMPLES: Sample[] = [
+  { label: 'instance_show_one', result: commandResult('showInstance -name sales_db', instanceInfo, true) },
+  { label: 'rule_show_all', result: commandResult('showRules', ruleList, true) },
+  { label: 'events (stdout)', result: commandResult('showEvents -beginDate "2025-10-28 00:00:00"', events, false) },
+  { label: 'events (+rows)', result: commandResult('showEvents -beginDate "2025-10-28 00:00:00"', events, true) },
+];
+
+const MODES: Array<{ label: string; options: ResponseEncodingOptions }> = [
+  { label: 'pretty', options: { encoding: 'pretty', maxStdoutBytes: 0, rows: true } },
+  { label: 'compact', options: { encoding: 'compact', maxStdoutBytes: 0, rows: true } },
+  { label: 'compact+64KB', options: { encoding: 'compact', maxStdoutBytes: 64 * 1024, rows: true } },
+  { label: 'stdout only', options: { encoding: 'compact', maxStdoutBytes: 0 } },
+];
+
+function measure(result: any, options: ResponseEncodingOptions): { bytes: number; msPerCall: number } {
+  const bytes = Buffer.byteLength(encodeToolResult(result, options));
+  // Scale iterations so every measurement runs for a similar time
+  const iterations = Math.max(5, Math.min(20000, Math.floor(5e7 / bytes)));
+  for (let i = 0; i < Math.min(iterations, 100); i++) {
+    encodeToolResult(result, options);
+  }
+  const start = performance.now();
+  let sink = 0;
+  for (let i = 0; i < iterations; i++) {
+    sink += encodeToolResult(result, options).length;
+  }
+  const msPerCall = (performance.now() - start) / iterations;
+  return sink > 0 ? { bytes, msPerCall } : { bytes: 0, msPerCall };
+}
+
+console.log(`${'Output'.padEnd(18)} ${'Mode'.padEnd(13)} ${'Bytes'.padStart(11)} ${'vs pretty'.padStart(10)} ${'ms/call'.padStart(9)}`);
+for (const sample of SAMPLES) {
+  let prettyBytes = 0;
+  for (const mode of MODES) {
+    const { bytes, msPerCall } = measure(sample.result, mode.options);
+    if (mode.label === 'pretty') {
+      prettyBytes = bytes;
+    }
+    console.log(
+      `${sample.label.padEnd(18)} ${mode.label.padEnd(13)} ${String(bytes).padStart(11)} ` +
+      `${((bytes / prettyBytes) * 100).toFixed(1).padStart(9)}% ${msPerCall.toFixed(3).padStart(9)}`
+    );
+  }
+}
@@ -0,0 +1,55 @@
+/**
+ * Startup benchmark: time to precompute all command schemas, and the
+ * per-request cost of building get_command_schema responses on demand versus
+ * serving the precomputed JSON.
+ *
+ * Run with: npm run bench:schema-catalog
+ */
+
+import { performance } from 'node:perf_hooks';
+import { allCliCommands } from '../../src/commands/index.js';
+import { loadAllCommandDescriptions } from '../../src/description_registry.js';
+import { buildCommandInputSchema, SchemaCatalog } from '../../src/schema_catalog.js';
+
+const REQUESTS = 20000;
+
+async function measure(label: string, respond: (toolName: string) => Promise<string>): Promise<number> {
+  const start = performance.now();
+  let bytes = 0;
+  for (let i = 0; i < REQUESTS; i++) {
+    bytes += (await respond(allCliCommands[i % allCliCommands.length].toolName)).length;
+  }
+  const usPerRequest = ((performance.now() - start) * 1000) / REQUESTS;
+  console.log(`${label.padEnd(12)} ${usPerRequest.toFixed(2).padStart(8)} us/request  (${REQUESTS} requests, ${bytes} bytes)`);
+  return usPerRequest;
+}
+
+async function main(): Promise<void> {
+  // Load descriptions first so the schema timings do not include module loading
+  const loadStart = performance.now();
+  await loadAllCommandDescriptions();
+  console.log(`Loaded enhanced descriptions in ${(performance.now() - loadStart).toFixed(2)} ms`);
+
+  const tools = [{ name: 'run_cli_command', description: 'Executes a DataSunrise CLI command.', inputSchema: { type: 'object' } }];
+  const catalog = new SchemaCatalog(tools, allCliCommands);
+  const buildStart = performance.now();
+  await catalog.prebuild();
+  const buildMs = performance.now() - buildStart;
+  let totalBytes = 0;
+  for (const cmd of allCliCommands) {
+    totalBytes += (await catalog.getCommandSchema(cmd.toolName))!.json.length;
+  }
+  console.log(`Precomputed ${catalog.getStats().commandSchemas} schemas (${(totalBytes / 1024).toFixed(0)} KiB) in ${buildMs.toFixed(2)} ms`);
+
+  const onDemand = await measure('on demand', async toolName => {
+    const commandDef = allCliCommands.find(cmd => cmd.toolName === toolName)!;
+    return JSON.stringify(await buildCommandInputSchema(commandDef.params, toolName), null, 2);
+  });
+  const precomputed = await measure('precomputed', async toolName => (await catalog.getSchemaResponse(toolName))!.text);
+  console.log(`Speedup: ${(onDemand / precomputed).toFixed(0)}x; building all schemas costs as much as ~${Math.ceil((buildMs * 1000) / onDemand)} on-demand requests`);
+}
+
+main().catch(error => {
+  console.error('Benchmark failed:', error);
+  process.exit(1);
+});
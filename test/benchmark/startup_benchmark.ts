@@ -0,0 +1,94 @@
+/**
+ * Startup benchmark: eager versus lazy loading of enhanced descriptions
+ *
+ * Starts the built server process several times, with and without
+ * --preload-descriptions, and measures the time from spawn until the MCP
+ * initialize request is answered and until the first get_command_schema call
+ * (which loads one description category in lazy mode) returns.
+ *
+ * Run with: npm run bench:startup
+ */
+
+import { spawn } from 'node:child_process';
+import * as path from 'node:path';
+import { performance } from 'node:perf_hooks';
+import { fileURLToPath } from 'node:url';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const SERVER_SCRIPT = path.join(__dirname, '../../src/index.js');
+const RUNS = 7;
+
+interface StartupTiming {
+  initializeMs: number;
+  firstSchemaMs: number;
+}
+
+function measureStartup(extraArgs: string[]): Promise<StartupTiming> {
+  return new Promise((resolve, reject) => {
+    const start = performance.now();
+    // A missing CLI path keeps background verification cheap and independent of the machine
+    const child = spawn(process.execPath, [SERVER_SCRIPT, '--cli-path', path.join(__dirname, 'missing-dscli'), '--cli-verify-cache', '', ...extraArgs], {
+      stdio: ['pipe', 'pipe', 'ignore'],
+    });
+    const timing: Partial<StartupTiming> = {};
+    let buffer = '';
+    const send = (message: object) => child.stdin.write(JSON.stringify(message) + '\n');
+
+    child.stdout.setEncoding('utf-8');
+    child.stdout.on('data', chunk => {
+      buffer += chunk;
+      let newline: number;
+      while ((newline = buffer.indexOf('\n')) >= 0) {
+        const message = JSON.parse(buffer.slice(0, newline));
+        buffer = buffer.slice(newline + 1);
+        if (message.id === 1) {
+          timing.initializeMs = performance.now() - start;
+          send({ jsonrpc: '2.0', method: 'notifications/initialized' });
+          send({ jsonrpc: '2.0', id: 2, method: 'tools/call', params: { name: 'get_command_schema', arguments: { command_name: 'rule_add_audit' } } });
+        } else if (message.id === 2) {
+          timing.firstSchemaMs = performance.now() - start;
+          child.kill();
+          resolve(timing as StartupTiming);
+        }
+      }
+    });
+    child.on('error', reject);
+    child.on('exit', code => {
+      if (timing.firstSchemaMs === undefined) {
+        reject(new Error(`Server exited early with code ${code}`));
+      }
+    });
+
+    send({
+      jsonrpc: '2.0',
+      id: 1,
+      method: 'initialize',
+      params: { protocolVersion: '2024-11-05', capabilities: {}, clientInfo: { name: 'startup-benchmark', version: '1.0.0' } },
+    });
+  });
+}
+
+function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+async function run(label: string, extraArgs: string[]): Promise<void> {
+  const timings: StartupTiming[] = [];
+  for (let i = 0; i < RUNS; i++) {
+    timings.push(await measureStartup(extraArgs));
+  }
+  const initialize = median(timings.map(t => t.initializeMs));
+  const firstSchema = median(timings.map(t => t.firstSchemaMs));
+  console.log(`${label.padEnd(6)} initialize ${initialize.toFixed(1).padStart(7)} ms   first schema ${firstSchema.toFixed(1).padStart(7)} ms   (median of ${RUNS})`);
+}
+
+async function main(): Promise<void> {
+  await run('eager', ['--preload-descriptions']);
+  await run('lazy', []);
+}
+
+main().catch(error => {
+  console.error('Benchmark failed:', error);
+  process.exit(1);
+});
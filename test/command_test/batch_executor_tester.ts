@@ -0,0 +1,123 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { BatchStep, runBatch, validateBatch } from '../../src/batch_executor.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+interface FakeResult {
+  exitCode: number;
+}
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+  const throws = (fn: () => unknown, pattern: RegExp) => {
+    try {
+      fn();
+      return false;
+    } catch (error: any) {
+      return pattern.test(error.message);
+    }
+  };
+
+  outputLines.push("Batch Executor Test Results:");
+  outputLines.push("===========================");
+
+  const known = (name: string) => !name.startsWith('unknown');
+
+  outputLines.push("\nTest: validation");
+  check('empty batch is rejected', throws(() => validateBatch([], known), /at least one step/));
+  check('unknown command is rejected', throws(() => validateBatch([{ command_name: 'unknown_cmd' }], known), /Unknown command/));
+  check('duplicate ids are rejected',
+    throws(() => validateBatch([{ id: 'a', command_name: 'x' }, { id: 'a', command_name: 'y' }], known), /Duplicate step id/));
+  check('unknown dependency is rejected',
+    throws(() => validateBatch([{ id: 'a', command_name: 'x', dependsOn: ['b'] }], known), /unknown step/));
+  check('cycles are rejected', throws(() => validateBatch([
+    { id: 'a', command_name: 'x', dependsOn: ['b'] },
+    { id: 'b', command_name: 'y', dependsOn: ['a'] },
+  ], known), /cycle/));
+  check('numeric id is rejected',
+    throws(() => validateBatch([{ id: 1, command_name: 'x' } as any, { command_name: 'y', dependsOn: ['1'] }], known), /Step id must be a string/));
+  check('string dependsOn is rejected',
+    throws(() => validateBatch([{ id: 'ab', command_name: 'x' }, { command_name: 'y', dependsOn: 'ab' } as any], known), /must be an array/));
+  check('non-string dependency is rejected',
+    throws(() => validateBatch([{ command_name: 'x' }, { command_name: 'y', dependsOn: [1] } as any], known), /must be an array/));
+  const defaulted = validateBatch([{ command_name: 'x' }, { command_name: 'y', dependsOn: ['1'] }], known);
+  check('ids default to the 1-based position', defaulted[0].id === '1' && defaulted[1].id === '2');
+
+  outputLines.push("\nTest: dependencies and parallelism");
+  const order: string[] = [];
+  let running = 0;
+  let maxRunning = 0;
+  const steps: BatchStep[] = [
+    { id: 'instance', command_name: 'instance_add_plus' },
+    { id: 'tag', command_name: 'tag_add' },
+    { id: 'audit', command_name: 'rule_add_audit', dependsOn: ['instance'] },
+    { id: 'masking', command_name: 'rule_add_masking', dependsOn: ['instance'] },
+    { id: 'check', command_name: 'rule_show_all', dependsOn: ['audit', 'masking'] },
+  ];
+  const outcome = await runBatch<FakeResult>(validateBatch(steps, known), {
+    maxParallel: 2,
+    execute: async step => {
+      running++;
+      maxRunning = Math.max(maxRunning, running);
+      await new Promise(resolve => setTimeout(resolve, 10));
+      order.push(step.id!);
+      running--;
+      return { exitCode: 0 };
+    },
+    isSuccess: result => result.exitCode === 0,
+  });
+  check('all steps succeed', outcome.success && outcome.summary.succeeded === 5);
+  check('parallelism limit is respected', maxRunning === 2);
+  check('dependencies run before dependents',
+    order.indexOf('instance') < order.indexOf('audit') && order.indexOf('masking') < order.indexOf('check'));
+  check('outcomes are returned in input order', outcome.steps.map(s => s.id).join(',') === 'instance,tag,audit,masking,check');
+
+  outputLines.push("\nTest: failures skip dependents only");
+  const failing = await runBatch<FakeResult>(validateBatch(steps, known), {
+    maxParallel: 4,
+    execute: async step => {
+      if (step.id === 'audit') {
+        return { exitCode: 1 };
+      }
+      if (step.id === 'tag') {
+        throw new Error('tag failed');
+      }
+      return { exitCode: 0 };
+    },
+    isSuccess: result => result.exitCode === 0,
+  });
+  const status = (id: string) => failing.steps.find(s => s.id === id)!.status;
+  check('batch is not successful', !failing.success);
+  check('non-zero exit marks a step as failed', status('audit') === 'failed');
+  check('thrown errors mark a step as failed', status('tag') === 'failed' && failing.steps[1].error === 'tag failed');
+  check('independent steps still run', status('masking') === 'succeeded');
+  check('dependents of a failed step are skipped', status('check') === 'skipped');
+  check('summary counts each status',
+    failing.summary.succeeded === 2 && failing.summary.failed === 2 && failing.summary.skipped === 1);
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_batch_executor.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running batch executor tests:", error);
+  process.exit(1);
+});
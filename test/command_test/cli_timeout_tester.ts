@@ -0,0 +1,87 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CANCELLED_EXIT_CODE, CliLaunch, executeCli, TIMEOUT_EXIT_CODE } from '../../src/cli_executor.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+// A wrapper script that starts a long-running child, like executecommand.sh starting the JVM
+const wrapperLaunch: CliLaunch = { file: 'sh', args: ['-c', 'sleep 30 & echo $!; wait'] };
+
+function isAlive(pid: number): boolean {
+  try {
+    process.kill(pid, 0);
+  } catch {
+    return false;
+  }
+  // A killed process whose parent is gone may linger as a zombie until init reaps it
+  try {
+    return !/^\d+ \(.*\) Z/.test(fs.readFileSync(`/proc/${pid}/stat`, 'utf-8'));
+  } catch {
+    return true;
+  }
+}
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("CLI Timeout and Cancellation Test Results:");
+  outputLines.push("==========================================");
+
+  if (process.platform === 'win32') {
+    outputLines.push("\nSkipped: the tests use a POSIX shell.");
+  } else {
+    outputLines.push("\nTest: a command exceeding its timeout is killed with its children");
+    const start = Date.now();
+    const timedOut = await executeCli(wrapperLaunch, [], { timeoutMs: 300 });
+    const grandchildPid = Number(timedOut.stdout.trim());
+    check('result is marked as timed out', timedOut.timedOut === true && !timedOut.cancelled);
+    check(`exit code is ${TIMEOUT_EXIT_CODE}`, timedOut.exitCode === TIMEOUT_EXIT_CODE);
+    check('the call returns promptly', Date.now() - start < 5000);
+    check('output written before the timeout is kept', grandchildPid > 0);
+    await new Promise(resolve => setTimeout(resolve, 100));
+    check('the grandchild process was killed', grandchildPid > 0 && !isAlive(grandchildPid));
+
+    outputLines.push("\nTest: aborting the signal cancels the command");
+    const controller = new AbortController();
+    setTimeout(() => controller.abort(), 200);
+    const cancelled = await executeCli(wrapperLaunch, [], { signal: controller.signal });
+    check('result is marked as cancelled', cancelled.cancelled === true && !cancelled.timedOut);
+    check(`exit code is ${CANCELLED_EXIT_CODE}`, cancelled.exitCode === CANCELLED_EXIT_CODE);
+
+    outputLines.push("\nTest: an already aborted signal does not start the command");
+    const aborted = new AbortController();
+    aborted.abort();
+    const notStarted = await executeCli(wrapperLaunch, [], { signal: aborted.signal });
+    check('result is cancelled without output', notStarted.cancelled === true && notStarted.stdout === '');
+
+    outputLines.push("\nTest: commands finishing in time are not affected");
+    const quick = await executeCli({ file: 'sh', args: ['-c', 'echo done'] }, [], { timeoutMs: 5000 });
+    check('exit code 0 and output kept', quick.exitCode === 0 && quick.stdout.trim() === 'done');
+    check('no timeout or cancellation flags', !quick.timedOut && !quick.cancelled);
+  }
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_cli_timeout.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running CLI timeout tests:", error);
+  process.exit(1);
+});
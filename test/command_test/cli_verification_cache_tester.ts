@@ -0,0 +1,118 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CliVerificationCache, VerifiedCli } from '../../src/cli_verification_cache.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("CLI Verification Cache Test Results:");
+  outputLines.push("====================================");
+
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'dscli-verify-cache-test-'));
+  const executable = path.join(dir, 'bin', 'dscli');
+  fs.mkdirSync(path.dirname(executable));
+  fs.writeFileSync(executable, '#!/bin/sh\necho dscli\n', { mode: 0o755 });
+  const cacheFile = path.join(dir, 'state', 'cli-verification.json');
+  const verified: VerifiedCli = { executable, launch: { file: executable, args: [] } };
+  const fixedTime = new Date('2025-01-01T00:00:00Z');
+  fs.utimesSync(executable, fixedTime, fixedTime);
+
+  outputLines.push("\nTest: store and lookup");
+  const cache = new CliVerificationCache(cacheFile);
+  check('unknown path is not found', await cache.lookup(executable) === undefined);
+  await cache.store(executable, verified);
+  check('cache file is created with its directory', fs.existsSync(cacheFile));
+  const entry = JSON.parse(fs.readFileSync(cacheFile, 'utf8')).entries[executable];
+  const stats = fs.statSync(executable);
+  check('entry is keyed by the absolute path and records mtime and size',
+    entry !== undefined && entry.mtimeMs === stats.mtimeMs && entry.size === stats.size);
+  check('no temp file is left behind', fs.readdirSync(path.dirname(cacheFile)).length === 1);
+  const found = await new CliVerificationCache(cacheFile).lookup(executable);
+  check('a new cache instance finds the stored launch', JSON.stringify(found) === JSON.stringify(verified));
+  const relative = path.relative(process.cwd(), executable);
+  check('a relative path finds the same entry', JSON.stringify(await cache.lookup(relative)) === JSON.stringify(verified));
+
+  outputLines.push("\nTest: stale entries");
+  fs.writeFileSync(executable, '#!/bin/sh\necho dscli 2.0\n');
+  fs.utimesSync(executable, fixedTime, fixedTime);
+  check('a new executable with the same mtime but another size is stale', await cache.lookup(executable) === undefined);
+  await cache.store(executable, verified);
+  check('storing again makes it valid', await cache.lookup(executable) !== undefined);
+  const touched = new Date('2025-06-01T00:00:00Z');
+  fs.utimesSync(executable, touched, touched);
+  check('a changed mtime with the same size is stale', await cache.lookup(executable) === undefined);
+  await cache.store(executable, verified);
+  fs.unlinkSync(executable);
+  check('a deleted executable is not found', await cache.lookup(executable) === undefined);
+  fs.writeFileSync(executable, '#!/bin/sh\necho dscli\n', { mode: 0o755 });
+
+  outputLines.push("\nTest: paths that are not cached");
+  await cache.store('dscli-on-path', { executable: 'dscli-on-path', launch: { file: 'dscli-on-path', args: [] } });
+  check('a bare command name is not stored', !Object.keys(JSON.parse(fs.readFileSync(cacheFile, 'utf8')).entries).some(key => key.endsWith('dscli-on-path')));
+  const disabled = new CliVerificationCache(undefined);
+  await disabled.store(executable, verified);
+  check('a disabled cache stores and finds nothing', await disabled.lookup(executable) === undefined);
+
+  outputLines.push("\nTest: remove");
+  await cache.store(executable, verified);
+  await cache.remove(executable);
+  check('a removed path is not found', await cache.lookup(executable) === undefined);
+  await cache.remove(executable);
+  check('removing twice is harmless', fs.existsSync(cacheFile));
+
+  outputLines.push("\nTest: corrupt and unwritable cache files");
+  fs.writeFileSync(cacheFile, '{"version": 1, "entries": {');
+  check('a corrupt file is treated as empty', await cache.lookup(executable) === undefined);
+  await cache.store(executable, verified);
+  check('storing replaces a corrupt file', JSON.parse(fs.readFileSync(cacheFile, 'utf8')).entries[executable] !== undefined);
+  fs.writeFileSync(cacheFile, JSON.stringify({ version: 99, entries: { [executable]: { ...verified, mtimeMs: 0, size: 0 } } }));
+  check('a file of another version is treated as empty', await cache.lookup(executable) === undefined);
+  fs.writeFileSync(cacheFile, JSON.stringify({ version: 1, entries: { [executable]: { ...verified, mtimeMs: fs.statSync(executable).mtimeMs } } }));
+  check('an entry without a size is stale', await cache.lookup(executable) === undefined);
+
+  // A regular file where the cache directory should be; permissions do not stop root
+  const blocker = path.join(dir, 'not-a-directory');
+  fs.writeFileSync(blocker, '');
+  const unwritable = new CliVerificationCache(path.join(blocker, 'cli-verification.json'));
+  let threw = false;
+  try {
+    await unwritable.store(executable, verified);
+  } catch {
+    threw = true;
+  }
+  check('an unwritable cache file does not fail the store', !threw);
+  check('an unwritable cache file finds nothing', await unwritable.lookup(executable) === undefined);
+  const directoryAsFile = new CliVerificationCache(dir);
+  await directoryAsFile.store(executable, verified);
+  check('a failed write leaves no temp file', !fs.readdirSync(path.dirname(dir)).some(name => name.startsWith(`${path.basename(dir)}.`)));
+
+  fs.rmSync(dir, { recursive: true, force: true });
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_cli_verification_cache.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running CLI verification cache tests:", error);
+  process.exit(1);
+});
@@ -0,0 +1,205 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CliLaunch, CliProcessResult, formatCommandLine } from '../../src/cli_executor.js';
+import { CliWorkerPool, CliWorkerPoolRejectedError } from '../../src/cli_worker_pool.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const FAKE_DSCLI: CliLaunch = { file: process.execPath, args: [path.join(__dirname, '../fake_dscli/fake_dscli.js')] };
+
+const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Launch a shell script as a worker; the worker arguments end up in "$@"
+ */
+function script(body: string): CliLaunch {
+  return { file: '/bin/sh', args: ['-c', body, 'dscli'] };
+}
+
+/**
+ * Start a pool of fake dscli workers with extra environment variables
+ * (kept set until the returned cleanup runs, so replacement workers see them too)
+ */
+function startPool(options: { size?: number; maxCommandsPerWorker?: number; launch?: CliLaunch } = {}, env: Record<string, string> = {}) {
+  Object.assign(process.env, env);
+  const pool = new CliWorkerPool({
+    size: options.size ?? 1,
+    maxCommandsPerWorker: options.maxCommandsPerWorker ?? 0,
+    launch: options.launch ?? FAKE_DSCLI,
+    workerArgs: ['--worker'],
+  });
+  pool.start();
+  const stop = async () => {
+    await pool.shutdown();
+    for (const name of Object.keys(env)) {
+      delete process.env[name];
+    }
+  };
+  return { pool, stop };
+}
+
+/**
+ * Settle a promise into its result or error
+ */
+async function settle(promise: Promise<CliProcessResult>): Promise<{ result?: CliProcessResult; error?: Error }> {
+  try {
+    return { result: await promise };
+  } catch (error: any) {
+    return { error };
+  }
+}
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("CLI Worker Pool Test Results:");
+  outputLines.push("=============================");
+
+  outputLines.push("\nTest: end-marker framing");
+  let { pool, stop } = startPool({}, { FAKE_DSCLI_EVENT_ROWS: '2000' });
+  const name = 'C:\\data\\"quoted" app\\';
+  await pool.execute(formatCommandLine(['addApplication', '-name', name]));
+  const listed = await pool.execute(formatCommandLine(['showApplications']));
+  check('backslashes and quotes round-trip', listed.stdout === `Applications:\n${name}\n\nOK\n`);
+  check('response ends before the marker line', listed.exitCode === 0 && !listed.stdout.includes('__DSCLI_END__'));
+  const missing = await pool.execute(formatCommandLine(['showApplication', '-name', 'missing']));
+  check('exit code is read from the marker', missing.exitCode === 1 && missing.stderr.includes('not found'));
+  const events = await pool.execute(formatCommandLine(['showEvents']), { maxRows: 5000 });
+  check('large output split over many chunks is framed once', events.exitCode === 0 && events.stdoutBytes === Buffer.byteLength(events.stdout) && events.stdout.endsWith('OK\n'));
+  check('output is parsed into rows while it streams', (events.parsed?.rows.length ?? 0) >= 2000);
+  check('timings are reported', events.timings !== undefined && events.timings.spawnMs === 0 && events.timings.runMs > 0);
+  const afterLarge = await pool.execute(formatCommandLine(['showApplications']));
+  check('next response starts clean', afterLarge.stdout === listed.stdout);
+
+  outputLines.push("\nTest: output cap and spill file");
+  const capped = await pool.execute(formatCommandLine(['showEvents']), { maxBufferedBytes: 1024, maxRows: 5000 });
+  const spilled = capped.stdoutFile ? fs.readFileSync(capped.stdoutFile, 'utf8') : '';
+  check('output past the cap is spilled', capped.stdoutTruncated === true && capped.stdoutFile !== undefined);
+  check('only the cap is kept in memory', Buffer.byteLength(capped.stdout) <= 1024);
+  check('spill file holds the complete response without the marker', Buffer.byteLength(spilled) === capped.stdoutBytes && spilled === events.stdout);
+  check('rows cover the spilled part', capped.parsed?.rows.length === events.parsed?.rows.length);
+  if (capped.stdoutFile) fs.unlinkSync(capped.stdoutFile);
+
+  outputLines.push("\nTest: control characters");
+  const executed = pool.getStats().commandsExecuted;
+  const newline = await settle(pool.execute(formatCommandLine(['addApplication', '-name', 'two\nlines'])));
+  check('line breaks are rejected before reaching a worker', newline.error instanceof CliWorkerPoolRejectedError);
+  check('no command was run', pool.getStats().commandsExecuted === executed);
+  const stillListed = await pool.execute(formatCommandLine(['showApplications']));
+  check('no extra command line was written', stillListed.stdout === listed.stdout);
+
+  outputLines.push("\nTest: back-to-back jobs on one worker");
+  let started: number;
+  const burst = await Promise.all(Array.from({ length: 8 }, (_, i) =>
+    settle(pool.execute(formatCommandLine(i % 2 ? ['showApplications'] : ['showApplication', '-name', `missing_${i}`])))));
+  check('every job settles with a result', burst.every(outcome => outcome.result !== undefined));
+  check('every failed job gets its own stderr', burst.every((outcome, i) => i % 2
+    ? outcome.result?.exitCode === 0 && outcome.result.stderr === ''
+    : outcome.result?.exitCode === 1 && outcome.result.stderr.trim().endsWith(`not found: missing_${i}`)));
+  // Callers that send their next command as soon as the last one returns
+  let misattributed = 0;
+  await Promise.all(Array.from({ length: 4 }, async (_, caller) => {
+    for (let i = 0; i < 20; i++) {
+      const name = `missing_${caller}_${i}`;
+      const outcome = await settle(pool.execute(formatCommandLine(['showApplication', '-name', name]), { timeoutMs: 5000 }));
+      if (!outcome.result || outcome.result.stderr.trim() !== `Application not found: ${name}`) {
+        misattributed++;
+      }
+    }
+  }));
+  check('commands sent while another one finishes keep their stderr', misattributed === 0);
+  check('no stderr marker leaks into results', !burst.some(outcome => outcome.result?.stderr.includes('__DSCLI_END__')));
+  await stop();
+
+  outputLines.push("\nTest: worker without a stderr marker");
+  ({ pool, stop } = startPool({ launch: script('while read line; do echo "warning $line" >&2; echo "done $line"; echo "__DSCLI_END__ 0"; done') }));
+  started = Date.now();
+  const firstUnmarked = await pool.execute('first');
+  check('first command completes after the stderr wait', firstUnmarked.stdout === 'done first\n' && Date.now() - started >= 900);
+  started = Date.now();
+  const laterUnmarked = await pool.execute('second');
+  check('later commands complete on the stdout marker', laterUnmarked.stdout === 'done second\n' && Date.now() - started < 900);
+  await stop();
+
+  outputLines.push("\nTest: worker crash mid-command");
+  ({ pool, stop } = startPool({}, { FAKE_DSCLI_CRASH_COMMANDS: 'crashNow' }));
+  await pool.execute(formatCommandLine(['showApplications']));
+  const crashed = await settle(pool.execute(formatCommandLine(['crashNow'])));
+  check('crash rejects the command', crashed.error !== undefined && /exited .* while running a command/.test(crashed.error.message));
+  check('crash is not a rejection that allows running the command again', !(crashed.error instanceof CliWorkerPoolRejectedError));
+  const afterCrash = await pool.execute(formatCommandLine(['showApplications']));
+  check('crashed worker is replaced', afterCrash.exitCode === 0 && pool.getStats().workersCrashed === 1 && pool.getStats().workersSpawned === 2);
+  await stop();
+
+  outputLines.push("\nTest: timeout and cancel");
+  ({ pool, stop } = startPool({}, { FAKE_DSCLI_LATENCY_MS: '3000' }));
+  started = Date.now();
+  const timedOut = await pool.execute(formatCommandLine(['showApplications']), { timeoutMs: 200 });
+  check('timeout stops the command', timedOut.timedOut === true && timedOut.exitCode === 124 && Date.now() - started < 2000);
+  const controller = new AbortController();
+  started = Date.now();
+  const running = pool.execute(formatCommandLine(['showApplications']), { signal: controller.signal });
+  const queuedController = new AbortController();
+  const queued = pool.execute(formatCommandLine(['showApplications']), { signal: queuedController.signal });
+  setTimeout(() => {
+    queuedController.abort();
+    controller.abort();
+  }, 200);
+  const cancelled = await running;
+  const cancelledQueued = await queued;
+  check('cancel stops the running command', cancelled.cancelled === true && cancelled.exitCode === 130 && Date.now() - started < 2000);
+  check('cancel drops a queued command', cancelledQueued.cancelled === true && cancelledQueued.stdoutBytes === 0);
+  await delay(100);
+  const stopped = pool.getStats();
+  check('stopped workers are replaced', stopped.commandsStopped === 3 && stopped.workersSpawned === 3 && stopped.liveWorkers === 1);
+  await stop();
+
+  outputLines.push("\nTest: recycling");
+  ({ pool, stop } = startPool({ maxCommandsPerWorker: 2 }));
+  for (let i = 0; i < 5; i++) {
+    await pool.execute(formatCommandLine(['showApplications']));
+  }
+  await delay(100);
+  const recycled = pool.getStats();
+  check('workers are recycled after maxCommandsPerWorker', recycled.workersRecycled === 2 && recycled.workersSpawned === 3);
+  check('recycling is not a crash', recycled.workersCrashed === 0 && recycled.liveWorkers === 1);
+  await stop();
+
+  outputLines.push("\nTest: repeated startup failures");
+  ({ pool, stop } = startPool({ launch: { file: process.execPath, args: ['-e', 'process.exit(3)'] } }));
+  const failures: { result?: CliProcessResult; error?: Error }[] = [];
+  while (failures.length < 5 && pool.available) {
+    failures.push(await settle(pool.execute(formatCommandLine(['showApplications']))));
+  }
+  check('commands written to a dying worker fail instead of running elsewhere', failures.length > 0 && failures.every(failure => failure.error !== undefined) && !(failures[0].error instanceof CliWorkerPoolRejectedError));
+  const disabled = pool.getStats();
+  check('pool disables itself', !pool.available && disabled.enabled === false && (disabled.disabledReason ?? '').includes('3 times'));
+  const afterDisable = await settle(pool.execute(formatCommandLine(['showApplications'])));
+  check('disabled pool rejects new commands', afterDisable.error instanceof CliWorkerPoolRejectedError);
+  await stop();
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_cli_worker_pool.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running CLI worker pool tests:", error);
+  process.exit(1);
+});
@@ -0,0 +1,139 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CliLaunch, executeCli, formatCommandLine } from '../../src/cli_executor.js';
+import { CliWorkerPool } from '../../src/cli_worker_pool.js';
+import { parseCliOutput } from '../../src/output_parser.js';
+import { isSessionExpired, parseSessionToken } from '../../src/session_manager.js';
+import { EntityStore, resolveCommand } from '../fake_dscli/entity_store.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const FAKE_DSCLI: CliLaunch = { file: process.execPath, args: [path.join(__dirname, '../fake_dscli/fake_dscli.js')] };
+
+/**
+ * Run the fake dscli as a process with extra environment variables
+ */
+async function runFake(argv: string[], env: Record<string, string> = {}) {
+  Object.assign(process.env, env);
+  try {
+    return await executeCli(FAKE_DSCLI, argv, { timeoutMs: 10000 });
+  } finally {
+    for (const name of Object.keys(env)) {
+      delete process.env[name];
+    }
+  }
+}
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Fake dscli Test Results:");
+  outputLines.push("========================");
+
+  outputLines.push("\nTest: command resolution");
+  check('show with a plural noun lists', resolveCommand('showHostGroups')?.verb === 'showAll' && resolveCommand('showHostGroups')?.kind === 'hostgroup');
+  check('abbreviated group nouns', resolveCommand('addHostGr')?.kind === 'hostgroup' && resolveCommand('delDbUserGr')?.kind === 'dbusergroup');
+  check('typed rule commands share the rule kind', resolveCommand('addMaskRule')?.kind === 'rule' && resolveCommand('showRule')?.verb === 'showOne');
+  check('periodic task commands share one kind', resolveCommand('addPerCleanAudit')?.kind === 'pertask' && resolveCommand('delPerTask')?.verb === 'delete');
+  check('commands without a kind are not modeled', resolveCommand('changeParameter') === undefined && resolveCommand('showCoreState') === undefined);
+
+  outputLines.push("\nTest: entity store output (contexts samples)");
+  const store = new EntityStore();
+  check('empty list', store.execute(['showApplications']).stdout === 'No Applications\n\nOK\n');
+  check('add prints OK', store.execute(['addApplication', '-name', 'test_app']).stdout === 'OK\n');
+  check('list after add', store.execute(['showApplications']).stdout === 'Applications:\ntest_app\n\nOK\n');
+  check('show one', store.execute(['showApplication', '-name', 'test_app']).stdout === 'Name                 : test_app\n\nOK\n');
+  const duplicate = store.execute(['addApplication', '-name', 'test_app']);
+  check('duplicate add fails', duplicate.exitCode === 1 && duplicate.stderr.includes('already exists'));
+  store.execute(['updateApplication', '-name', 'test_app', '-newName', 'Test App']);
+  check('rename', store.execute(['showApplication', '-name', 'Test App']).exitCode === 0 && store.execute(['showApplication', '-name', 'test_app']).exitCode === 1);
+  store.execute(['delApplication', '-name', 'Test App']);
+  check('delete', store.execute(['showApplications']).stdout === 'No Applications\n\nOK\n');
+  check('missing entity', store.execute(['delApplication', '-name', 'nope']).stderr.includes('not found'));
+
+  store.execute(['addHost', '-name', 'test_host', '-host', '10.0.0.1']);
+  check('host block', store.execute(['showHost', '-name', 'test_host']).stdout === 'Name                 : test_host\nAddress Type         : HOST\nHost                 : 10.0.0.1\n\nOK\n');
+  store.execute(['addHostGr', '-name', 'test_group', '-addMembers', 'test_host']);
+  check('group members', store.execute(['showHostGr', '-name', 'test_group']).stdout.includes('Member               : test_host'));
+  check('built-in roles', store.execute(['showAccessRoles']).stdout.startsWith('Access Roles:\nAdmin\nDataSunrise Admin\nOperator\nSecurity Manager\n'));
+
+  store.execute(['addInstancePlus', '-name', 'sales_db', '-dbType', 'postgresql', '-dbHost', 'db1', '-dbPort', '5432', '-login', 'postgres', '-password', 'secret', '-proxyHost', '127.0.0.1', '-proxyPort', '54321']);
+  const instance = store.execute(['showInstance', '-name', 'sales_db']).stdout;
+  check('instance shows its interface and proxy', instance.includes('Login                : postgres') && instance.includes('Interface: db1:5432\n  Proxy: 127.0.0.1:54321'));
+  check('passwords are not stored', !JSON.stringify(store.snapshot()).includes('secret'));
+  check('interfaces of an instance', store.execute(['showInterfaces', '-instance', 'sales_db']).stdout === 'Interfaces:\ndb1:5432\n\nOK\n');
+
+  store.execute(['addAuditRule', '-name', 'test_audit', '-dbType', 'postgresql']);
+  const rule = parseCliOutput(store.execute(['showRule', '-name', 'test_audit']).stdout);
+  check('rule blocks parse into records', rule.format === 'keyValue' && rule.rows[1]['Rule Type'] === 'Audit');
+  check('rule list heading', store.execute(['showRules']).stdout === 'Rules:\ntest_audit\n\nOK\n');
+
+  store.execute(['addTag', '-name', 'owner', '-entityType', 'rule', '-entityName', 'test_audit']);
+  check('tags are scoped to their entity', store.execute(['showTags', '-entityType', 'rule', '-entityName', 'test_audit']).stdout === 'Tags:\nowner\n\nOK\n'
+    && store.execute(['showTags', '-entityType', 'rule', '-entityName', 'other']).stdout === 'No Tags\n\nOK\n');
+
+  const servers = parseCliOutput(store.execute(['showDsServers', '-json']).stdout);
+  check('-json output is tabular JSON', servers.format === 'json' && servers.rows[0].Name === 'local');
+  const events = parseCliOutput(store.execute(['showEvents']).stdout);
+  check('generated event rows', events.format === 'table' && events.rows.length === 50);
+  check('unmodeled commands succeed', store.execute(['changeParameter', '-name', 'x', '-value', '1']).stdout === 'OK\n');
+
+  outputLines.push("\nTest: sessions");
+  const expiring = new EntityStore(undefined, { eventRows: 0, sessionTtlMs: 1000 });
+  const token = parseSessionToken(expiring.execute(['connect', '-host', '127.0.0.1', '-login', 'admin'], 0).stdout);
+  check('connect prints a session token', token !== undefined);
+  check('valid token is accepted', expiring.execute(['showApplications', '-sessionToken', token!], 500).exitCode === 0);
+  const expired = expiring.execute(['showApplications', '-sessionToken', token!], 5000);
+  check('expired token is reported as an expired session', expired.exitCode === 1 && isSessionExpired({ ...expired, stdoutBytes: 0 }));
+
+  outputLines.push("\nTest: process per command");
+  const help = await runFake([]);
+  check('help output passes CLI verification', help.stdout.includes('Commands:'));
+  const stateFile = path.join(os.tmpdir(), `fake-dscli-state-${process.pid}.json`);
+  await runFake(['addHost', '-name', 'persisted', '-host', '10.0.0.2'], { FAKE_DSCLI_STATE: stateFile });
+  const persisted = await runFake(['showHosts'], { FAKE_DSCLI_STATE: stateFile });
+  check('state file keeps entities between processes', persisted.stdout === 'Hosts:\npersisted\n\nOK\n');
+  fs.rmSync(stateFile, { force: true });
+  const failed = await runFake(['showHosts'], { FAKE_DSCLI_FAILURE_RATE: '1' });
+  check('failure injection', failed.exitCode === 1 && failed.stderr.includes('ConnectException'));
+  const spared = await runFake(['showHosts'], { FAKE_DSCLI_FAILURE_RATE: '1', FAKE_DSCLI_FAILURE_COMMANDS: 'addHost' });
+  check('failures can be limited to some commands', spared.exitCode === 0);
+  const slow = await runFake(['showHosts'], { FAKE_DSCLI_LATENCY_MS: '300' });
+  check('latency injection', slow.timings !== undefined && slow.timings.runMs >= 300);
+
+  outputLines.push("\nTest: worker mode");
+  const pool = new CliWorkerPool({ size: 1, maxCommandsPerWorker: 0, launch: FAKE_DSCLI, workerArgs: ['--worker'] });
+  pool.start();
+  await pool.execute(formatCommandLine(['addApplication', '-name', 'Pooled App']));
+  const pooled = await pool.execute(formatCommandLine(['showApplications']));
+  check('worker keeps the store between commands and quoted names survive', pooled.stdout === 'Applications:\nPooled App\n\nOK\n' && pooled.exitCode === 0);
+  const pooledError = await pool.execute(formatCommandLine(['showApplication', '-name', 'missing']));
+  check('worker reports exit codes', pooledError.exitCode === 1);
+  await pool.shutdown();
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_fake_dscli.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running fake dscli tests:", error);
+  process.exit(1);
+});
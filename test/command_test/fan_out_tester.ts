@@ -0,0 +1,98 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { FanOutBackend, runFanOut, validateBackends } from '../../src/fan_out.js';
+import { encodeToolResult } from '../../src/response_encoding.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const defaults = { host: '127.0.0.1', port: '11000', protocol: 'https' };
+
+interface NodeResult {
+  command: string;
+  stdout: string;
+  stderr: string;
+  exitCode: number;
+}
+
+const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  const throws = (fn: () => unknown, text: string) => {
+    try {
+      fn();
+      return false;
+    } catch (error: any) {
+      return error.message.includes(text);
+    }
+  };
+
+  outputLines.push("Fan-out Test Results:");
+  outputLines.push("=====================");
+
+  outputLines.push("\nTest: backend validation");
+  const backends = validateBackends([{ host: 'ds1' }, { host: 'ds2', port: 11001, protocol: 'http', sessionToken: 'abc' }], defaults);
+  check('port and protocol default to the configured backend', backends[0].port === '11000' && backends[0].protocol === 'https');
+  check('explicit values and tokens are kept', backends[1].port === '11001' && backends[1].protocol === 'http' && backends[1].sessionToken === 'abc');
+  check('empty list is rejected', throws(() => validateBackends([], defaults), 'At least one backend'));
+  check('backend without host is rejected', throws(() => validateBackends([{ port: '1' }], defaults), 'no host'));
+  check('duplicate backends are rejected', throws(() => validateBackends([{ host: 'ds1' }, { host: 'ds1', port: '11000' }], defaults), 'Duplicate backend'));
+
+  outputLines.push("\nTest: parallel execution with per-node failures");
+  const nodes = validateBackends(['ds1', 'ds2', 'ds3', 'ds4', 'ds5'].map(host => ({ host })), defaults);
+  let running = 0;
+  let maxRunning = 0;
+  const outcome = await runFanOut<NodeResult>(nodes, {
+    maxParallel: 2,
+    execute: async (backend: FanOutBackend) => {
+      running++;
+      maxRunning = Math.max(maxRunning, running);
+      await delay(backend.host === 'ds1' ? 40 : 10);
+      running--;
+      if (backend.host === 'ds3') {
+        throw new Error('connect refused');
+      }
+      return { command: 'showState', stdout: `State of ${backend.host}\n`, stderr: '', exitCode: backend.host === 'ds4' ? 124 : 0 };
+    },
+    isSuccess: result => result.exitCode === 0,
+  });
+  check('concurrency cap is respected', maxRunning === 2);
+  check('results are keyed by backend in input order',
+    JSON.stringify(Object.keys(outcome.backends)) === JSON.stringify(nodes.map(node => `https://${node.host}:11000`)));
+  check('slow node still reports its result', outcome.backends['https://ds1:11000'].result?.stdout === 'State of ds1\n');
+  check('thrown errors are reported per node', outcome.backends['https://ds3:11000'].status === 'failed' && outcome.backends['https://ds3:11000'].error === 'connect refused');
+  check('failed results are reported per node', outcome.backends['https://ds4:11000'].status === 'failed' && outcome.backends['https://ds4:11000'].result?.exitCode === 124);
+  check('summary counts nodes', outcome.summary.total === 5 && outcome.summary.succeeded === 3 && outcome.summary.failed === 2 && !outcome.success);
+  check('durations are recorded', Object.values(outcome.backends).every(node => node.durationMs >= 0));
+
+  outputLines.push("\nTest: compact encoding");
+  const compact = JSON.parse(encodeToolResult(outcome, { encoding: 'compact', maxStdoutBytes: 0 }));
+  check('per-node command results are compacted', compact.backends['https://ds1:11000'].result.command === undefined && compact.backends['https://ds1:11000'].result.stderr === undefined);
+  check('failed node keeps its command', compact.backends['https://ds4:11000'].result.command === 'showState');
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_fan_out.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running fan-out tests:", error);
+  process.exit(1);
+});
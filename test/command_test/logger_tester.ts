@@ -0,0 +1,82 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { Logger, parseLogLevel } from '../../src/logger.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Logger Test Results:");
+  outputLines.push("====================");
+
+  const writes: string[] = [];
+  const log = new Logger(text => writes.push(text));
+  const nextTurn = () => new Promise(resolve => setImmediate(resolve));
+
+  outputLines.push("\nTest: levels");
+  let built = 0;
+  log.setLevel('info');
+  log.debug(() => {
+    built++;
+    return 'expensive';
+  });
+  log.info('started');
+  log.warn('careful');
+  await nextTurn();
+  check('disabled messages are not built', built === 0);
+  check('enabled messages get their level prefix', writes.join('') === '[MCP Info] started\n[MCP Warning] careful\n');
+  check('isEnabled follows the level', !log.isEnabled('debug') && log.isEnabled('error'));
+
+  outputLines.push("\nTest: batching");
+  writes.length = 0;
+  log.info('one');
+  log.info('two');
+  log.error('three');
+  check('nothing is written synchronously', writes.length === 0);
+  await nextTurn();
+  check('messages of one turn are written together', writes.length === 1 && writes[0].split('\n').length === 4);
+
+  outputLines.push("\nTest: errors and flushSync");
+  writes.length = 0;
+  log.error('failed:', new Error('boom'));
+  await nextTurn();
+  check('errors are appended to the message', writes[0] === '[MCP Error] failed: Error: boom\n');
+  log.setLevel('debug');
+  log.error('failed:', new Error('boom'));
+  await nextTurn();
+  check('stack traces are included at debug level', writes[1].includes('at '));
+  log.setLevel('silent');
+  log.error('hidden');
+  await nextTurn();
+  check('silent writes nothing', writes.length === 2 && log.level === 'silent');
+
+  outputLines.push("\nTest: level names");
+  check('names are case-insensitive', parseLogLevel('DEBUG') === 'debug');
+  check('unknown names are rejected', parseLogLevel('verbose') === undefined && parseLogLevel(undefined) === undefined);
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_logger.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running logger tests:", error);
+  process.exit(1);
+});
@@ -0,0 +1,105 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { AddressInfo } from 'net';
+import { MetricsRegistry, ServerMetrics, startMetricsServer, PROMETHEUS_CONTENT_TYPE } from '../../src/metrics.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Metrics Test Results:");
+  outputLines.push("=====================");
+
+  outputLines.push("\nTest: registry rendering");
+  const registry = new MetricsRegistry();
+  const counter = registry.counter('test_calls_total', 'Calls.', ['tool']);
+  counter.inc({ tool: 'instance_show_all' });
+  counter.inc({ tool: 'instance_show_all' }, 2);
+  counter.inc({ tool: 'say "hi"\\\n' });
+  const gauge = registry.gauge('test_in_flight', 'Running.');
+  gauge.inc();
+  gauge.inc();
+  gauge.dec();
+  const histogram = registry.histogram('test_seconds', 'Durations.', [], [0.1, 1]);
+  histogram.observe({}, 0.05);
+  histogram.observe({}, 0.5);
+  histogram.observe({}, 5);
+  let text = registry.render();
+  check('help and type lines', text.includes('# HELP test_calls_total Calls.\n# TYPE test_calls_total counter\n'));
+  check('counter series per label value', text.includes('test_calls_total{tool="instance_show_all"} 3\n'));
+  check('label values are escaped', text.includes('test_calls_total{tool="say \\"hi\\"\\\\\\n"} 1\n'));
+  check('gauge without labels', text.includes('test_in_flight 1\n'));
+  check('histogram buckets are cumulative', text.includes('test_seconds_bucket{le="0.1"} 1\n') && text.includes('test_seconds_bucket{le="1"} 2\n') && text.includes('test_seconds_bucket{le="+Inf"} 3\n'));
+  check('histogram sum and count', text.includes('test_seconds_sum 5.55\n') && text.includes('test_seconds_count 3\n'));
+
+  let duplicateRejected = false;
+  try {
+    registry.counter('test_calls_total', 'Again.');
+  } catch {
+    duplicateRejected = true;
+  }
+  check('duplicate names are rejected', duplicateRejected);
+
+  let hits = 0;
+  registry.collected('test_cache_requests_total', 'Lookups.', 'counter', ['result'], () => [[{ result: 'hit' }, hits], [{ result: 'miss' }, 4]]);
+  hits = 7;
+  text = registry.render();
+  check('collected metrics are read at render time', text.includes('test_cache_requests_total{result="hit"} 7\n') && text.includes('test_cache_requests_total{result="miss"} 4\n'));
+
+  outputLines.push("\nTest: server metrics");
+  const metrics = new ServerMetrics();
+  const endCall = metrics.startToolCall('run_cli_command');
+  const endCommand = metrics.startCommand('instance_show_all', 'Instance');
+  text = metrics.render();
+  check('in-flight gauges count running work', text.includes('dscli_mcp_tool_calls_in_flight{tool="run_cli_command"} 1\n') && text.includes('dscli_mcp_cli_commands_in_flight{category="Instance"} 1\n'));
+  endCommand('success', 2048, { spawnMs: 20, runMs: 1500, parseMs: 3 });
+  endCall('ok');
+  text = metrics.render();
+  check('in-flight gauges drop when work ends', text.includes('dscli_mcp_tool_calls_in_flight{tool="run_cli_command"} 0\n') && text.includes('dscli_mcp_cli_commands_in_flight{category="Instance"} 0\n'));
+  check('tool call counted by status', text.includes('dscli_mcp_tool_calls_total{tool="run_cli_command",status="ok"} 1\n'));
+  check('command counted by category and outcome', text.includes('dscli_mcp_cli_commands_total{command="instance_show_all",category="Instance",outcome="success"} 1\n'));
+  check('phases are observed separately', text.includes('dscli_mcp_cli_phase_duration_seconds_sum{phase="run",category="Instance"} 1.5\n') && text.includes('dscli_mcp_cli_phase_duration_seconds_sum{phase="spawn",category="Instance"} 0.02\n'));
+  check('stdout size is observed', text.includes('dscli_mcp_cli_stdout_bytes_bucket{category="Instance",le="4096"} 1\n') && text.includes('dscli_mcp_cli_stdout_bytes_bucket{category="Instance",le="1024"} 0\n'));
+  metrics.startCommand('instance_show_all', 'Instance')('timeout', 0);
+  text = metrics.render();
+  check('executions without timings skip the phase histogram', text.includes('dscli_mcp_cli_phase_duration_seconds_count{phase="run",category="Instance"} 1\n'));
+
+  outputLines.push("\nTest: HTTP listener");
+  const server = startMetricsServer('127.0.0.1', 0, () => metrics.render());
+  await new Promise(resolve => server.once('listening', resolve));
+  const port = (server.address() as AddressInfo).port;
+  const response = await fetch(`http://127.0.0.1:${port}/metrics`);
+  const body = await response.text();
+  check('GET /metrics serves the exposition text', response.status === 200 && body === metrics.render());
+  check('content type is the Prometheus text format', response.headers.get('content-type') === PROMETHEUS_CONTENT_TYPE);
+  const missing = await fetch(`http://127.0.0.1:${port}/other`);
+  await missing.text();
+  check('other paths are not found', missing.status === 404);
+  server.close();
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_metrics.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running metrics tests:", error);
+  process.exit(1);
+});
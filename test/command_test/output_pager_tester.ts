@@ -0,0 +1,95 @@
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CursorError, OutputPager } from '../../src/output_pager.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Output Pager Test Results:");
+  outputLines.push("==========================");
+
+  let now = 1000;
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'pager-test-'));
+  const pager = new OutputPager({ cursorTtlMs: 5000, maxOutputs: 2, dir, now: () => now });
+  const output = Array.from({ length: 25 }, (_, i) => `event ${i} é`).join('\n') + '\n';
+
+  outputLines.push("\nTest: pages cover the output in order");
+  const first = await pager.open('showEvents', output, undefined, 10);
+  check('first page has pageSize lines', first.startLine === 0 && first.lineCount === 10 && first.text.split('\n')[0] === 'event 0 é');
+  check('totals describe the complete output', first.totalLines === 25 && first.totalBytes === Buffer.byteLength(output));
+  const second = await pager.page(first.nextCursor!);
+  const third = await pager.page(second.nextCursor!);
+  check('later pages continue where the previous ended', second.startLine === 10 && third.startLine === 20);
+  check('last page has no next cursor', third.lineCount === 5 && third.nextCursor === undefined);
+  check('pages join to the original output', first.text + second.text + third.text === output);
+  check('a cursor can be reused', (await pager.page(first.nextCursor!)).text === second.text);
+  check('the page size can change between pages', (await pager.page(first.nextCursor!, 3)).lineCount === 3);
+
+  outputLines.push("\nTest: existing files and missing trailing newline");
+  const spillFile = path.join(dir, 'spill.txt');
+  fs.writeFileSync(spillFile, 'a\nb\nc');
+  const spilled = await pager.open('showSessions', '', spillFile, 2);
+  const rest = await pager.page(spilled.nextCursor!);
+  check('the last line without newline is a line', spilled.totalLines === 3 && rest.text === 'c');
+  check('commandOf reports the command of a cursor', pager.commandOf(spilled.nextCursor!) === 'showSessions');
+
+  outputLines.push("\nTest: expiry and limits");
+  await pager.open('showSystemErrors', output, undefined, 10);
+  let evicted = false;
+  try {
+    await pager.page(first.nextCursor!);
+  } catch (error) {
+    evicted = error instanceof CursorError;
+  }
+  check('the least recently used output is dropped above maxOutputs', evicted);
+  now += 6000;
+  let expired = false;
+  try {
+    await pager.page(spilled.nextCursor!);
+  } catch (error) {
+    expired = error instanceof CursorError;
+  }
+  check('cursors expire after the TTL', expired);
+  let malformed = false;
+  try {
+    await pager.page('nonsense');
+  } catch (error) {
+    malformed = error instanceof CursorError;
+  }
+  check('malformed cursors are rejected', malformed);
+  await new Promise(resolve => setTimeout(resolve, 50));
+  check('files of dropped outputs are deleted', !fs.existsSync(spillFile));
+
+  pager.close();
+  await new Promise(resolve => setTimeout(resolve, 50));
+  check('close deletes all page files', fs.readdirSync(dir).length === 0);
+  fs.rmSync(dir, { recursive: true, force: true });
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_output_pager.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running output pager tests:", error);
+  process.exit(1);
+});
@@ -0,0 +1,124 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CliOutputParser, parseCliOutput } from '../../src/output_parser.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+interface ParserTestCase {
+  name: string;
+  output: string;
+  format: string;
+  rows: unknown[];
+}
+
+// Output samples in the layouts used by test/test-mcp-client/contexts
+const listOutput = 'Available tasks:\nweekly_audit\nmonthly_errors\n\nOK\n';
+const keyValueOutput = [
+  'Name                 : smtp1',
+  'Type                 : SMTP',
+  'Login                :',
+  'Send security emails from this server : false',
+  '',
+  'OK',
+  '',
+].join('\n');
+const multiBlockOutput = [
+  'Name                 : my_app',
+  '',
+  'Interface: 10.0.0.5:5432',
+  '  Proxy: 10.0.0.6:54321',
+  '',
+  'Search by:                : Information Types',
+  '                          : Email',
+  '',
+  'OK',
+].join('\n');
+const tableOutput = ': 1 : smtp1 : SMTP : 10.0.0.1      : 25\n: 2 : snmp1: SNMP : 10.0.0.2 :\n';
+const jsonOutput = '{"data": [["ID", "Name"], [1, "ds-node-1"], [2, "ds-node-2"]]}\nOK\n';
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Output Parser Test Results:");
+  outputLines.push("===========================");
+
+  outputLines.push("\nTest: lists under a heading");
+  const list = parseCliOutput(listOutput);
+  check('format is list with its title', list.format === 'list' && list.title === 'Available tasks');
+  check('one row per item, OK line ignored', JSON.stringify(list.rows) === JSON.stringify([{ value: 'weekly_audit' }, { value: 'monthly_errors' }]));
+
+  outputLines.push("\nTest: key/value blocks");
+  const keyValue = parseCliOutput(keyValueOutput);
+  check('format is keyValue', keyValue.format === 'keyValue');
+  check('padded names and empty values', JSON.stringify(keyValue.rows) === JSON.stringify([{
+    'Name': 'smtp1',
+    'Type': 'SMTP',
+    'Login': '',
+    'Send security emails from this server': 'false',
+  }]));
+  const multiBlock = parseCliOutput(multiBlockOutput);
+  check('blank lines separate records', multiBlock.rows.length === 3);
+  check('values containing colons are kept', multiBlock.rows[1]['Interface'] === '10.0.0.5:5432' && multiBlock.rows[1]['Proxy'] === '10.0.0.6:54321');
+  check('continuation lines collect values', JSON.stringify(multiBlock.rows[2]['Search by']) === JSON.stringify(['Information Types', 'Email']));
+
+  outputLines.push("\nTest: column tables");
+  const table = parseCliOutput(tableOutput);
+  check('format is table', table.format === 'table' && table.rows.length === 2);
+  check('cells are split and trimmed', JSON.stringify(table.rows[0]) === JSON.stringify({ column1: '1', column2: 'smtp1', column3: 'SMTP', column4: '10.0.0.1', column5: '25' }));
+  check('unpadded separators and empty last cells', table.rows[1]['column2'] === 'snmp1' && table.rows[1]['column5'] === '');
+
+  outputLines.push("\nTest: -json output");
+  const json = parseCliOutput(jsonOutput);
+  check('format is json', json.format === 'json');
+  check('tabular data becomes objects keyed by column', JSON.stringify(json.rows) === JSON.stringify([{ ID: 1, Name: 'ds-node-1' }, { ID: 2, Name: 'ds-node-2' }]));
+  check('invalid JSON falls back to text', parseCliOutput('{not json').format === 'text');
+
+  outputLines.push("\nTest: streaming");
+  for (const sample of [listOutput, multiBlockOutput, tableOutput, jsonOutput, multiBlockOutput.replace(/\n/g, '\r\n')]) {
+    const parser = new CliOutputParser();
+    for (let i = 0; i < sample.length; i += 3) {
+      parser.push(sample.slice(i, i + 3));
+    }
+    check(`chunked input gives the same result (${sample.split('\n')[0].trim()})`,
+      JSON.stringify(parser.finish()) === JSON.stringify(parseCliOutput(sample.replace(/\r\n/g, '\n'))));
+  }
+
+  // Shared with the Python client's row parser (test/test-mcp-client/test_mcp_row_parser.py)
+  outputLines.push("\nTest: shared fixtures");
+  const testCases: ParserTestCase[] = JSON.parse(fs.readFileSync(path.join(__dirname, 'output_parser_test_cases.json'), 'utf8'));
+  for (const testCase of testCases) {
+    const parsed = parseCliOutput(testCase.output);
+    check(`${testCase.name}: format and rows match`, parsed.format === testCase.format && JSON.stringify(parsed.rows) === JSON.stringify(testCase.rows));
+  }
+
+  outputLines.push("\nTest: limits and plain text");
+  const many = parseCliOutput('Available tasks:\n' + Array.from({ length: 50 }, (_, i) => `task${i}`).join('\n'), 10);
+  check('rows are capped', many.rows.length === 10 && many.rowsTruncated === true);
+  const text = parseCliOutput('No Servers\n\nOK\n');
+  check('messages without structure give no rows', text.format === 'text' && text.rows.length === 0);
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_output_parser.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running output parser tests:", error);
+  process.exit(1);
+});
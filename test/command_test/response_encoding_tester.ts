@@ -0,0 +1,79 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { encodeToolResult, truncateHeadTail } from '../../src/response_encoding.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Response Encoding Test Results:");
+  outputLines.push("===============================");
+
+  const success = { command: 'showInstances', stdout: 'Instances:\nsales_db\n\nOK\n', stderr: '', exitCode: 0, stdoutBytes: 26 };
+  const failure = { command: 'showInstance -name x', stdout: '', stderr: 'Instance not found', exitCode: 1, error: 'Command failed with exit code 1: showInstance -name x' };
+
+  outputLines.push("\nTest: pretty encoding");
+  check('pretty keeps the previous format', encodeToolResult(success, { encoding: 'pretty', maxStdoutBytes: 0 }) === JSON.stringify(success, null, 2));
+
+  outputLines.push("\nTest: compact encoding");
+  const compact = encodeToolResult(success, { encoding: 'compact', maxStdoutBytes: 0 });
+  check('no indentation', !compact.includes('\n  '));
+  check('empty stderr and the command echo are omitted', JSON.stringify(JSON.parse(compact)) === JSON.stringify({ stdout: success.stdout, exitCode: 0, stdoutBytes: 26 }));
+  const compactFailure = JSON.parse(encodeToolResult(failure, { encoding: 'compact', maxStdoutBytes: 0 }));
+  check('failed commands keep command and stderr', compactFailure.command === failure.command && compactFailure.stderr === failure.stderr);
+  const batch = JSON.parse(encodeToolResult({ success: true, steps: [{ id: '1', status: 'succeeded', result: success }] }, { encoding: 'compact', maxStdoutBytes: 0 }));
+  check('batch step results are compacted', batch.steps[0].result.command === undefined && batch.steps[0].result.stderr === undefined);
+  const other = { cliPool: null, resultCache: { size: 0 } };
+  check('other results are only unindented', encodeToolResult(other, { encoding: 'compact', maxStdoutBytes: 0 }) === JSON.stringify(other));
+
+  outputLines.push("\nTest: parsed rows");
+  const parsed = { ...success, outputFormat: 'list', rows: [{ value: 'sales_db' }], rowsTruncated: true };
+  const withoutRows = JSON.parse(encodeToolResult(parsed, { encoding: 'pretty', maxStdoutBytes: 0 }));
+  check('rows are left out by default', JSON.stringify(withoutRows) === JSON.stringify(success));
+  const withRows = encodeToolResult(parsed, { encoding: 'pretty', maxStdoutBytes: 0, rows: true });
+  check('rows are kept when asked for', withRows === JSON.stringify(parsed, null, 2));
+  const compactRows = JSON.parse(encodeToolResult(parsed, { encoding: 'compact', maxStdoutBytes: 0, rows: true }));
+  check('compact encoding keeps asked-for rows', compactRows.rows[0].value === 'sales_db' && compactRows.outputFormat === 'list' && compactRows.command === undefined);
+  const batchRows = JSON.parse(encodeToolResult({ success: true, steps: [{ id: '1', status: 'succeeded', result: parsed }] }, { encoding: 'compact', maxStdoutBytes: 0 }));
+  check('batch step results drop rows too', batchRows.steps[0].result.rows === undefined && batchRows.steps[0].result.stdout === success.stdout);
+
+  outputLines.push("\nTest: head/tail truncation");
+  const long = Array.from({ length: 1000 }, (_, i) => `line ${i} ü`).join('\n');
+  const cut = JSON.parse(encodeToolResult({ ...success, stdout: long, stdoutBytes: Buffer.byteLength(long) }, { encoding: 'compact', maxStdoutBytes: 200 }));
+  check('stdout keeps the start and the end', cut.stdout.startsWith('line 0 ü') && cut.stdout.endsWith('line 999 ü'));
+  check('byte counts describe the cut', cut.stdoutBytes === Buffer.byteLength(long) && cut.stdoutOmittedBytes === Buffer.byteLength(long) - 200);
+  check('short stdout is not touched', truncateHeadTail('short', 200) === undefined);
+  const multibyte = truncateHeadTail('€'.repeat(100), 10)!;
+  check('UTF-8 characters are not split', !multibyte.text.includes('�') && multibyte.omittedBytes + 9 === 300);
+  const pretty = JSON.parse(encodeToolResult({ ...success, stdout: long }, { encoding: 'pretty', maxStdoutBytes: 200 }));
+  check('truncation also works with pretty encoding', pretty.stdoutOmittedBytes > 0 && pretty.command === success.command);
+  const page = { startLine: 0, lineCount: 1000, totalLines: 5000 };
+  const paged = JSON.parse(encodeToolResult({ ...success, stdout: long, page }, { encoding: 'compact', maxStdoutBytes: 200 }));
+  check('pages are not cut', paged.stdout === long && paged.stdoutOmittedBytes === undefined && paged.page.totalLines === 5000);
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_response_encoding.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running response encoding tests:", error);
+  process.exit(1);
+});
@@ -0,0 +1,105 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { allCliCommands } from '../../src/commands/index.js';
+import { CliCommand } from '../../src/commands/types.js';
+import { ResultCache } from '../../src/result_cache.js';
+import { commandFingerprint } from '../../src/command_traits.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+function findCommand(toolName: string): CliCommand {
+  const commandDef = allCliCommands.find(cmd => cmd.toolName === toolName);
+  if (!commandDef) {
+    throw new Error(`Command definition not found: ${toolName}`);
+  }
+  return commandDef;
+}
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+  let clock = 0;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Result Cache Test Results:");
+  outputLines.push("=========================");
+
+  const cache = new ResultCache<string>({
+    defaultTtlMs: 1000,
+    categoryTtlMs: { 'Rule': 5000, 'License': 0 },
+    maxEntries: 3,
+    now: () => clock,
+  });
+  const instanceShowAll = findCommand('instance_show_all');
+  const instanceShowOne = findCommand('instance_show_one');
+  const instanceDelete = findCommand('instance_delete');
+  const ruleShowAll = findCommand('rule_show_all');
+  const hostShowAll = findCommand('host_show_all');
+  const licenseShowAll = findCommand('license_show_all');
+  const connect = findCommand('connect');
+
+  outputLines.push("\nTest: cache keys are normalized");
+  check('argument order does not matter',
+    commandFingerprint('instance_show_one', { name: 'a', dsServer: 'b' }) === commandFingerprint('instance_show_one', { dsServer: 'b', name: 'a' }));
+  check('empty and undefined arguments are ignored',
+    commandFingerprint('instance_show_all', { name: undefined, other: '' }) === commandFingerprint('instance_show_all', {}));
+  check('numbers and strings with the same value match',
+    commandFingerprint('core_show_state', { worker: 1 }) === commandFingerprint('core_show_state', { worker: '1' }));
+  check('session tokens are part of the key',
+    commandFingerprint('instance_show_all', { sessionToken: 'a' }) !== commandFingerprint('instance_show_all', { sessionToken: 'b' }));
+
+  outputLines.push("\nTest: cacheability");
+  check('show commands are cacheable', cache.isCacheable(instanceShowAll));
+  check('write commands are not cacheable', !cache.isCacheable(instanceDelete));
+  check('categories with a zero TTL are not cacheable', !cache.isCacheable(licenseShowAll));
+
+  outputLines.push("\nTest: TTL per category");
+  cache.set(instanceShowAll, {}, 'instances');
+  cache.set(ruleShowAll, {}, 'rules');
+  check('fresh entry is returned', cache.get(instanceShowAll, {}) === 'instances');
+  clock = 1500;
+  check('default TTL expires', cache.get(instanceShowAll, {}) === undefined);
+  check('category TTL override is applied', cache.get(ruleShowAll, {}) === 'rules');
+
+  outputLines.push("\nTest: invalidation by category");
+  cache.set(instanceShowAll, {}, 'instances');
+  cache.set(instanceShowOne, { name: 'db1' }, 'db1');
+  const removed = cache.invalidateFor(instanceDelete);
+  check('write command removes entries of its category', removed === 2);
+  check('entries of other categories are kept', cache.get(ruleShowAll, {}) === 'rules');
+  cache.invalidateFor(connect);
+  check('session commands clear the whole cache', cache.get(ruleShowAll, {}) === undefined);
+
+  outputLines.push("\nTest: LRU eviction");
+  cache.set(instanceShowAll, {}, 'instances');
+  cache.set(ruleShowAll, {}, 'rules');
+  cache.set(hostShowAll, {}, 'hosts');
+  cache.get(instanceShowAll, {});
+  cache.set(instanceShowOne, { name: 'db1' }, 'db1');
+  check('least recently used entry is evicted', cache.get(ruleShowAll, {}) === undefined);
+  check('recently used entry is kept', cache.get(instanceShowAll, {}) === 'instances');
+  check('eviction is counted', cache.getStats().evictions === 1);
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_result_cache.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running result cache tests:", error);
+  process.exit(1);
+});
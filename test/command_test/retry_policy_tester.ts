@@ -0,0 +1,123 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CliProcessResult } from '../../src/cli_executor.js';
+import { CliCommand } from '../../src/commands/types.js';
+import { isIdempotentCommand } from '../../src/command_traits.js';
+import { parseRetryPatterns, RetryPolicy } from '../../src/retry_policy.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+function command(toolName: string, baseCommand: string, category: string, extra: Partial<CliCommand> = {}): CliCommand {
+  return { toolName, baseCommand, category, description: '', params: [], ...extra };
+}
+
+function cliResult(exitCode: number, stderr: string = '', extra: Partial<CliProcessResult> = {}): CliProcessResult {
+  return { stdout: exitCode === 0 ? 'OK\n' : '', stderr, exitCode, stdoutBytes: exitCode === 0 ? 3 : 0, ...extra };
+}
+
+const showInstances = command('instance_show_all', 'showInstances', 'Instance');
+const updateInstance = command('instance_update', 'updateInstance', 'Instance');
+const addRule = command('rule_add_audit', 'addRule', 'Rule');
+
+/**
+ * Execute callback that returns the given results in turn
+ */
+function sequence(results: CliProcessResult[]) {
+  let calls = 0;
+  const execute = async () => results[Math.min(calls++, results.length - 1)];
+  return { execute, calls: () => calls };
+}
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Retry Policy Test Results:");
+  outputLines.push("==========================");
+
+  const config = { maxAttempts: 3, baseDelayMs: 1, maxDelayMs: 4, patterns: parseRetryPatterns('{"Rule": "rule engine is busy", "*": ["(invalid"]}') };
+  const policy = new RetryPolicy(config);
+
+  outputLines.push("\nTest: command traits");
+  check('read-only commands are idempotent', isIdempotentCommand(showInstances));
+  check('update commands are idempotent', isIdempotentCommand(updateInstance, { name: 'sales_db' }));
+  check('renames are not idempotent', !isIdempotentCommand(updateInstance, { name: 'sales_db', newName: 'crm_db' }));
+  check('add commands are not idempotent', !isIdempotentCommand(addRule));
+  check('explicit flag wins', isIdempotentCommand(command('x', 'addSomething', 'Rule', { idempotent: true })));
+
+  outputLines.push("\nTest: classification");
+  check('shared pattern matches in every category', policy.classify(addRule, cliResult(1, 'java.net.ConnectException: Connection refused')) !== undefined);
+  check('category pattern applies to its category', policy.classify(showInstances, cliResult(1, 'Metadata is being updated')) !== undefined);
+  check('category pattern does not apply elsewhere', policy.classify(addRule, cliResult(1, 'Metadata is being updated')) === undefined);
+  check('configured pattern is added', policy.classify(addRule, cliResult(1, 'Error: rule engine is busy')) !== undefined);
+  check('ordinary failures are not transient', policy.classify(showInstances, cliResult(1, 'Instance not found')) === undefined);
+  check('worker crash is transient', policy.classify(showInstances, cliResult(1, 'dscli worker 3 exited (code null, signal SIGKILL) while running a command')) !== undefined);
+  check('timeouts are not retried', policy.classify(showInstances, cliResult(124, 'Connection reset', { timedOut: true })) === undefined);
+
+  outputLines.push("\nTest: backoff");
+  const jitter = new RetryPolicy({ maxAttempts: 5, baseDelayMs: 100, maxDelayMs: 300, patterns: {} }, () => 0.999);
+  check('backoff doubles per retry', jitter.backoffMs(1) === 99 && jitter.backoffMs(2) === 199);
+  check('backoff is capped', jitter.backoffMs(5) === 299);
+  const noJitter = new RetryPolicy({ maxAttempts: 5, baseDelayMs: 100, maxDelayMs: 300, patterns: {} }, () => 0);
+  check('full jitter can pick zero', noJitter.backoffMs(3) === 0);
+
+  outputLines.push("\nTest: retries");
+  let run = sequence([cliResult(1, 'Service Unavailable'), cliResult(1, 'Connection reset'), cliResult(0)]);
+  let outcome = await policy.run(showInstances, {}, run.execute);
+  check('read command recovers after two retries', outcome.result.exitCode === 0 && outcome.attempts === 3 && run.calls() === 3);
+
+  run = sequence([cliResult(1, 'Service Unavailable')]);
+  outcome = await policy.run(updateInstance, { name: 'sales_db' }, run.execute);
+  check('attempts stop at the maximum', outcome.result.exitCode === 1 && outcome.attempts === 3);
+
+  run = sequence([cliResult(1, 'Service Unavailable'), cliResult(0)]);
+  outcome = await policy.run(addRule, {}, run.execute);
+  check('non-idempotent writes are not retried', outcome.attempts === 1 && run.calls() === 1);
+
+  run = sequence([cliResult(1, 'Instance not found'), cliResult(0)]);
+  outcome = await policy.run(showInstances, {}, run.execute);
+  check('permanent failures are not retried', outcome.attempts === 1 && outcome.result.exitCode === 1);
+
+  const controller = new AbortController();
+  const slow = new RetryPolicy({ maxAttempts: 3, baseDelayMs: 10000, maxDelayMs: 10000, patterns: {} }, () => 0.5);
+  run = sequence([cliResult(1, 'Service Unavailable'), cliResult(0)]);
+  const started = Date.now();
+  const pending = slow.run(showInstances, {}, run.execute, controller.signal);
+  setTimeout(() => controller.abort(), 20);
+  outcome = await pending;
+  check('cancellation stops waiting for a retry', outcome.attempts === 1 && Date.now() - started < 1000);
+
+  const stats = policy.getStats();
+  check('stats count retries, recoveries and exhausted commands', stats.retries === 4 && stats.recovered === 1 && stats.exhausted === 1);
+
+  const spillFile = path.join(__dirname, 'generated_retry_spill.tmp');
+  fs.writeFileSync(spillFile, 'partial output');
+  run = sequence([cliResult(1, 'Service Unavailable', { stdoutFile: spillFile, stdoutTruncated: true }), cliResult(0)]);
+  outcome = await policy.run(showInstances, {}, run.execute);
+  await new Promise(resolve => setTimeout(resolve, 50));
+  check('spill file of a retried attempt is deleted', outcome.result.exitCode === 0 && !fs.existsSync(spillFile));
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_retry_policy.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running retry policy tests:", error);
+  process.exit(1);
+});
@@ -0,0 +1,136 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import { CliProcessResult, formatCommandLine, REDACTED, redactArgv } from '../../src/cli_executor.js';
+import { isSessionExpired, parseSessionToken, SessionError, SessionManager } from '../../src/session_manager.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const backend = { host: '10.0.0.5', port: '11000', protocol: 'https' };
+
+function cliResult(exitCode: number, stdout: string, stderr: string = ''): CliProcessResult {
+  return { stdout, stderr, exitCode, stdoutBytes: Buffer.byteLength(stdout) };
+}
+
+const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Fake dscli backend: connect hands out numbered tokens, commands succeed
+ * only with the newest token
+ */
+function fakeBackend(options: { failConnect?: boolean } = {}) {
+  const calls: string[][] = [];
+  let tokenNumber = 0;
+  const runCli = async (argv: string[]): Promise<CliProcessResult> => {
+    calls.push(argv);
+    await delay(10);
+    if (options.failConnect) {
+      return cliResult(1, '', 'Wrong login or password');
+    }
+    tokenNumber++;
+    return cliResult(0, `Connected.\nSession token: token-000${tokenNumber}\nOK\n`);
+  };
+  const runCommand = async (token: string | undefined): Promise<CliProcessResult> => {
+    await delay(5);
+    return token === `token-000${tokenNumber}`
+      ? cliResult(0, 'Instances:\nsales_db\n\nOK\n')
+      : cliResult(1, '', 'Error: session token has expired. Please, connect again.');
+  };
+  return { calls, runCli, runCommand, expire: () => tokenNumber++ };
+}
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Session Manager Test Results:");
+  outputLines.push("=============================");
+
+  outputLines.push("\nTest: helpers");
+  check('token is found in connect output', parseSessionToken('Connected.\nSession token: abcdef123456\nOK') === 'abcdef123456');
+  check('no token in Single mode output', parseSessionToken('Connected.\nOK') === undefined);
+  check('expired session is detected from stderr', isSessionExpired(cliResult(1, '', 'Session has expired')));
+  check('other failures are not session expiry', !isSessionExpired(cliResult(1, '', 'Instance not found')));
+  check('timed out commands are not session expiry', !isSessionExpired({ ...cliResult(124, '', 'not connected'), timedOut: true }));
+
+  outputLines.push("\nTest: lazy connect shared by concurrent commands");
+  let fake = fakeBackend();
+  let sessions = new SessionManager({ login: 'admin', backend }, fake.runCli);
+  check('enabled with a login', sessions.enabled);
+  check('disabled without credentials', !new SessionManager({ backend }, fake.runCli).enabled);
+  check('no connect before the first command', fake.calls.length === 0);
+  const tokens: Array<string | undefined> = [];
+  const results = await Promise.all([1, 2, 3].map(() => sessions.run(async token => {
+    tokens.push(token);
+    return fake.runCommand(token);
+  })));
+  check('one connect for three concurrent commands', fake.calls.length === 1);
+  check('connect uses Multi sessions and the configured login, without a password',
+    fake.calls[0].join(' ') === 'connect -host 10.0.0.5 -port 11000 -protocol https -sessionType Multi -login admin');
+  check('token is injected into every command', tokens.every(token => token === 'token-0001'));
+  check('all commands succeed', results.every(result => result.exitCode === 0));
+
+  outputLines.push("\nTest: expired session reconnects once");
+  fake.expire();
+  const retried = await Promise.all([1, 2, 3].map(() => sessions.run(token => fake.runCommand(token))));
+  check('concurrent commands share one reconnect', fake.calls.length === 2);
+  check('commands succeed after the reconnect', retried.every(result => result.exitCode === 0));
+  const stats = sessions.getStats()[0];
+  check('stats count the expiry and the retries', stats.backend === 'https://10.0.0.5:11000' && stats.connects === 2 && stats.expirations === 1 && stats.retries === 3);
+
+  let runs = 0;
+  const stillExpired = await sessions.run(async () => {
+    runs++;
+    return cliResult(1, '', 'Session has expired');
+  });
+  check('a command is retried only once', runs === 2 && stillExpired.exitCode === 1);
+
+  outputLines.push("\nTest: failed connect");
+  fake = fakeBackend({ failConnect: true });
+  sessions = new SessionManager({ login: 'admin', backend }, fake.runCli);
+  let error: unknown;
+  try {
+    await sessions.run(token => fake.runCommand(token));
+  } catch (e) {
+    error = e;
+  }
+  check('connect failure raises SessionError with its output', error instanceof SessionError && error.message.includes('Wrong login or password'));
+  check('failed connect is not cached', sessions.getStats()[0].connected === false && sessions.getStats()[0].failedConnects === 1);
+
+  outputLines.push("\nTest: OAuth2");
+  fake = fakeBackend();
+  sessions = new SessionManager({ oauth2Token: 'access-token', backend }, fake.runCli);
+  await sessions.run(token => fake.runCommand(token));
+  check('connectOAuth2 is used without a login', fake.calls[0][0] === 'connectOAuth2');
+  check('access token is not on the command line', !fake.calls[0].some(arg => arg.includes('access-token')) && !fake.calls[0].includes('-token'));
+
+  outputLines.push("\nTest: redaction of logged command lines");
+  const argv = ['addInstance', '-name', 'sales_db', '-login', 'postgres', '-password', 'p@ss word', '-sessionToken', 'token-0001', '-savePassword', 'ds'];
+  const redacted = formatCommandLine(redactArgv(argv));
+  check('passwords and session tokens are masked', !redacted.includes('p@ss word') && !redacted.includes('token-0001') && redacted.includes(`-password ${REDACTED}`));
+  check('other values are kept', redacted.includes('-name sales_db') && redacted.includes('-login postgres') && redacted.includes('-savePassword ds'));
+  check('argv itself is not changed', argv[6] === 'p@ss word');
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_session_manager.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running session manager tests:", error);
+  process.exit(1);
+});
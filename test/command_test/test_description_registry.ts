@@ -0,0 +1,60 @@
+import * as fs from 'fs';
+import * as path from 'path';
+import { fileURLToPath } from 'url';
+import { dirname } from 'path';
+import {
+  getAllCommandNames,
+  getCommandDescription,
+  getCommandParameterHelp,
+  getLoadedDescriptionCategories,
+  hasCommandDescription,
+} from '../../src/description_registry.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+async function runTests() {
+  const outputLines: string[] = [];
+  let allTestsPassed = true;
+
+  const check = (description: string, condition: boolean) => {
+    outputLines.push(`  ${condition ? 'PASS' : 'FAIL'}: ${description}`);
+    if (!condition) {
+      allTestsPassed = false;
+    }
+  };
+
+  outputLines.push("Description Registry Test Results:");
+  outputLines.push("=================================");
+
+  outputLines.push("\nTest: descriptions are loaded lazily per category");
+  check('nothing is loaded before the first lookup', getLoadedDescriptionCategories().length === 0);
+  const help = await getCommandParameterHelp('rule_add_audit', 'name');
+  check('parameter help is found', typeof help === 'string' && help.length > 0);
+  check('only the Rule category is loaded', getLoadedDescriptionCategories().join(',') === 'Rule');
+  check('commands of the loaded category are described', (await getCommandDescription('rule_show_all')) !== undefined);
+  check('commands without a description module load nothing', !(await hasCommandDescription('misc_show_workers')) &&
+    getLoadedDescriptionCategories().join(',') === 'Rule');
+  const tagDescription = await getCommandDescription('tag_add');
+  check('another category is loaded on its first lookup',
+    tagDescription !== undefined && getLoadedDescriptionCategories().includes('Tag'));
+
+  outputLines.push("\nTest: listing loads every category");
+  const names = await getAllCommandNames();
+  check('all descriptions are listed', names.includes('license_show_all') && names.includes('cef_add_group'));
+  check('descriptions registered under non-command names are reachable', await hasCommandDescription('updateMaskRule'));
+
+  outputLines.push(`\nOverall Test Suite Result: ${allTestsPassed ? "ALL PASSED" : "SOME FAILED"}`);
+
+  const outputPath = path.join(__dirname, 'generated_description_registry.txt');
+  fs.writeFileSync(outputPath, outputLines.join('\n'));
+  console.log(`Test results written to ${outputPath}`);
+  if (!allTestsPassed) {
+    // process.exit(1);
+  }
+}
+
+runTests().catch(error => {
+  console.error("Error running description registry tests:", error);
+  process.exit(1);
+});
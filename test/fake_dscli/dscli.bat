@@ -0,0 +1,3 @@
+@echo off
+rem Fake dscli for offline tests and benchmarks (build it first with npm run build)
+node "%~dp0..\..\build\test\fake_dscli\fake_dscli.js" %*
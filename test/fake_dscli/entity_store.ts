@@ -0,0 +1,490 @@
+/**
+ * In-memory DataSunrise configuration used by the fake dscli
+ *
+ * Commands are mapped to entity kinds by their name: `addHostGr`,
+ * `updateHostGr`, `showHostGroups`, `showHostGr` and `delHostGr` all work on
+ * host groups. Adding, updating (including renames with `-newName`), showing
+ * and deleting keep the store consistent, and the output follows the samples
+ * in test/test-mcp-client/contexts: lists under a plural heading,
+ * `Name                 : value` blocks, `No <Kind>s` for empty lists and a
+ * closing `OK` line. Commands without a matching kind (start, flush,
+ * changeParameter, ...) succeed with a plain `OK`.
+ */
+
+/**
+ * Output of one emulated command
+ */
+export interface CommandOutput {
+  stdout: string;
+  stderr: string;
+  exitCode: number;
+}
+
+/**
+ * A stored entity
+ */
+export interface Entity {
+  name: string;
+  /** Values of the scope parameters, e.g. the instance of an interface */
+  scope: string[];
+  /** Remaining command arguments, keyed without the leading dash */
+  attributes: Record<string, string>;
+}
+
+/**
+ * Serializable snapshot of the store
+ */
+export interface StoreSnapshot {
+  entities: Record<string, Entity[]>;
+  sessions: Record<string, number>;
+  commandsRun: number;
+}
+
+interface KindSpec {
+  /** Display name in messages, e.g. 'Host group' */
+  display: string;
+  /** List heading, e.g. 'Host Groups' */
+  plural: string;
+  /** Text of an empty list (default: 'No <plural>') */
+  empty?: string;
+  /** Scope of an entity from the command arguments; entities with the same name in different scopes are distinct */
+  scope?: (args: Record<string, string>) => string[];
+  /** Name of an entity from the arguments of a command (default: -name) */
+  key?: (args: Record<string, string>, verb: Verb) => string | undefined;
+  /** Lines of a show command (default: the Name line) */
+  format?: (entity: Entity, store: EntityStore) => string[];
+  /** Entities that exist from the start */
+  builtIn?: Array<{ name: string; attributes?: Record<string, string> }>;
+  /** Columns of -json output (default: Name) */
+  jsonColumns?: Array<[string, (entity: Entity) => string | number]>;
+}
+
+type Verb = 'add' | 'update' | 'delete' | 'showOne' | 'showAll';
+
+// Arguments that are never stored as attributes
+const TRANSIENT_ARGS = new Set(['sessionToken', 'json', 'newName', 'password', 'dbPassword']);
+
+const label = (name: string, width: number = 21) => `${name.padEnd(width)}: `;
+const ruleLabel = (name: string) => label(name, 31);
+
+const nameOnly = (entity: Entity) => [`${label('Name')}${entity.name}`];
+const withMembers = (entity: Entity) => [
+  `${label('Name')}${entity.name}`,
+  ...splitList(entity.attributes.addMembers).map(member => `${label('Member')}${member}`),
+];
+const hostPort = (host?: string, port?: string) => (host && port ? `${host}:${port}` : undefined);
+
+const RULE_TYPES: Record<string, string> = {
+  addAuditRule: 'Audit',
+  addMaskRule: 'Masking',
+  addSecurityRule: 'Security',
+  addLearnRule: 'Learning',
+};
+const RULE_ACTIONS: Record<string, string> = {
+  Audit: 'Audit',
+  Security: 'Block',
+  Learning: 'Learn',
+};
+
+const KINDS: Record<string, KindSpec> = {
+  application: { display: 'Application', plural: 'Applications' },
+  instance: {
+    display: 'Instance',
+    plural: 'Instances',
+    format: (entity, store) => {
+      const lines = [
+        `${label('Name')}${entity.name}`,
+        `${label('Login')}${entity.attributes.login ?? ''}`,
+        'Search for Table Relations : no',
+        'Environment Name     : DS_ENVIRONMENT',
+        'Automatically Create Environment : no',
+      ];
+      const interfaces = store.list('interface', [entity.name]);
+      if (interfaces.length > 0) {
+        lines.push('');
+        for (const iface of interfaces) {
+          lines.push(`Interface: ${iface.name}`);
+          for (const proxy of store.list('proxy', [entity.name, iface.name])) {
+            lines.push(`  Proxy: ${proxy.name}`);
+          }
+        }
+      }
+      return lines;
+    },
+  },
+  interface: {
+    display: 'Interface',
+    plural: 'Interfaces',
+    scope: args => [args.instance ?? ''],
+    key: (args, verb) => verb === 'add'
+      ? hostPort(args.newHost, args.newPort)
+      : hostPort(args.host ?? args.prevHost, args.port ?? args.prevPort),
+    format: entity => {
+      const [host, port] = entity.name.split(':');
+      return [`${label('Host')}${host}`, `${label('Port')}${port}`, `${label('IP Version')}Auto`, `${label('Encryption')}No`];
+    },
+  },
+  proxy: {
+    display: 'Proxy',
+    plural: 'Proxies',
+    scope: args => [args.instance ?? '', hostPort(args.interfaceHost, args.interfacePort) ?? ''],
+    key: args => hostPort(args.proxyHost ?? args.host, args.proxyPort ?? args.port),
+    format: entity => {
+      const [host, port] = entity.name.split(':');
+      return [`${label('Host')}${host}`, `${label('Port')}${port}`, `${label('Enabled')}true`];
+    },
+  },
+  rule: {
+    display: 'Rule',
+    plural: 'Rules',
+    empty: 'No rules',
+    format: entity => {
+      const ruleType = entity.attributes.ruleType ?? 'Audit';
+      const lines = [
+        'Main Settings:',
+        `${ruleLabel('Name')}${entity.name}`,
+        `${ruleLabel('Enabled')}${entity.attributes.enable ?? 'true'}`,
+        `${ruleLabel('Comment')}${entity.attributes.comment ?? ''}`,
+        '',
+        'Actions:',
+        `${ruleLabel('Rule Type')}${ruleType}`,
+      ];
+      if (RULE_ACTIONS[ruleType]) {
+        lines.push(`${ruleLabel('Action')}${RULE_ACTIONS[ruleType]}`);
+      }
+      lines.push(`${ruleLabel('Log Event in Storage')}yes`);
+      return lines;
+    },
+  },
+  host: {
+    display: 'Host',
+    plural: 'Hosts',
+    format: entity => [`${label('Name')}${entity.name}`, `${label('Address Type')}HOST`, `${label('Host')}${entity.attributes.host ?? ''}`],
+  },
+  hostgroup: { display: 'Host group', plural: 'Host Groups', format: withMembers },
+  tag: {
+    display: 'Tag',
+    plural: 'Tags',
+    scope: args => [args.entityType ?? '', args.entityName ?? ''],
+    format: entity => [`${label('Key', 8)}${entity.name}`, `${label('Value', 8)}${entity.attributes.value ?? ''}`],
+  },
+  dbuser: { display: 'Database user', plural: 'Database Users' },
+  dbusergroup: { display: 'Database user group', plural: 'Database User Groups', format: withMembers },
+  ldapserver: { display: 'LDAP server', plural: 'LDAP Servers' },
+  objectgroup: { display: 'Object group', plural: 'Object Groups' },
+  querygroup: { display: 'Query group', plural: 'Query Groups' },
+  schedule: { display: 'Schedule', plural: 'Schedules' },
+  subscriber: { display: 'Subscriber', plural: 'Subscribers' },
+  dsuser: { display: 'DataSunrise user', plural: 'DataSunrise Users', builtIn: [{ name: 'admin' }] },
+  accessrole: {
+    display: 'Access role',
+    plural: 'Access Roles',
+    builtIn: ['Admin', 'DataSunrise Admin', 'Operator', 'Security Manager'].map(name => ({ name })),
+  },
+  cefgroup: { display: 'CEF group', plural: 'CEF Groups' },
+  pertask: { display: 'Periodic task', plural: 'Periodic Tasks' },
+  reportgen: { display: 'Report generator', plural: 'Report Generators' },
+  sslkeygroup: { display: 'SSL key group', plural: 'SSL Key Groups' },
+  discoverygroup: { display: 'Discovery group', plural: 'Discovery Groups' },
+  server: { display: 'Server', plural: 'Servers' },
+  sniffer: { display: 'Sniffer', plural: 'Sniffers' },
+  dsserver: {
+    display: 'DataSunrise server',
+    plural: 'DataSunrise Servers',
+    builtIn: [{ name: 'local', attributes: { host: '127.0.0.1', port: '11000' } }],
+    jsonColumns: [
+      ['ID', entity => entity.attributes.id ?? 1],
+      ['Name', entity => entity.name],
+      ['Host', entity => entity.attributes.host ?? ''],
+      ['Port', entity => Number(entity.attributes.port ?? 0)],
+    ],
+  },
+};
+
+// Nouns in command names that differ from the kind key
+const NOUN_ALIASES: Record<string, string> = {
+  instanceplus: 'instance',
+  reportsgen: 'reportgens',
+};
+
+// Commands that run against data the store does not model and print generated rows
+const EVENT_COMMANDS = new Set(['showEvents', 'showSessions', 'showSystemErrors']);
+
+/**
+ * Split a comma-separated argument
+ */
+function splitList(value: string | undefined): string[] {
+  return value ? value.split(',').map(item => item.trim()).filter(item => item.length > 0) : [];
+}
+
+/**
+ * Resolve a dscli base command to a verb and an entity kind
+ * @param baseCommand e.g. 'addHostGr' or 'showInstances'
+ * @returns Verb and kind key, or undefined for commands the store does not model
+ */
+export function resolveCommand(baseCommand: string): { verb: Verb; kind: string } | undefined {
+  const match = /^(add|update|del|show)(.+)$/.exec(baseCommand);
+  if (!match) {
+    return undefined;
+  }
+  let noun = match[2].toLowerCase();
+  noun = NOUN_ALIASES[noun] ?? noun;
+  let plural = false;
+  if (!KINDS[noun]) {
+    if (/ies$/.test(noun) && KINDS[noun.slice(0, -3) + 'y']) {
+      noun = noun.slice(0, -3) + 'y';
+      plural = true;
+    } else if (noun.endsWith('s') && KINDS[normalizeNoun(noun.slice(0, -1))]) {
+      noun = normalizeNoun(noun.slice(0, -1));
+      plural = true;
+    } else {
+      noun = normalizeNoun(noun);
+    }
+  }
+  if (!KINDS[noun]) {
+    return undefined;
+  }
+  switch (match[1]) {
+    case 'add': return { verb: 'add', kind: noun };
+    case 'update': return { verb: 'update', kind: noun };
+    case 'del': return { verb: 'delete', kind: noun };
+    default: return { verb: plural ? 'showAll' : 'showOne', kind: noun };
+  }
+}
+
+function normalizeNoun(noun: string): string {
+  if (noun.endsWith('gr')) return noun + 'oup';
+  if (noun.endsWith('rule')) return 'rule';
+  if (noun.endsWith('reportgen')) return 'reportgen';
+  if (noun.startsWith('per') || noun.endsWith('pertask')) return 'pertask';
+  return noun;
+}
+
+/**
+ * Entities of a fake DataSunrise backend
+ */
+export class EntityStore {
+  private entities: Map<string, Map<string, Entity>> = new Map();
+  private sessions: Map<string, number> = new Map();
+  /** Commands run against the store, also across processes when the store is persisted */
+  commandsRun = 0;
+
+  /**
+   * @param snapshot Previously saved state
+   * @param options Number of generated event rows and session lifetime (0 = sessions never expire)
+   */
+  constructor(snapshot?: StoreSnapshot, private readonly options: { eventRows: number; sessionTtlMs: number } = { eventRows: 50, sessionTtlMs: 0 }) {
+    for (const [kind, spec] of Object.entries(KINDS)) {
+      const entities = new Map<string, Entity>();
+      for (const builtIn of spec.builtIn ?? []) {
+        entities.set(entityKey([], builtIn.name), { name: builtIn.name, scope: [], attributes: { ...builtIn.attributes } });
+      }
+      this.entities.set(kind, entities);
+    }
+    if (snapshot) {
+      for (const [kind, list] of Object.entries(snapshot.entities)) {
+        const entities = new Map<string, Entity>();
+        for (const entity of list) {
+          entities.set(entityKey(entity.scope, entity.name), entity);
+        }
+        this.entities.set(kind, entities);
+      }
+      this.sessions = new Map(Object.entries(snapshot.sessions ?? {}));
+      this.commandsRun = snapshot.commandsRun ?? 0;
+    }
+  }
+
+  /**
+   * Entities of a kind in a scope, in insertion order
+   */
+  list(kind: string, scope: string[] = []): Entity[] {
+    return [...this.entities.get(kind)?.values() ?? []].filter(entity => entity.scope.join('\u0000') === scope.join('\u0000'));
+  }
+
+  /**
+   * Run one dscli command
+   * @param argv Base command followed by `-name value` pairs and bare flags
+   * @param now Current time (for session expiry)
+   * @returns Emulated output
+   */
+  execute(argv: string[], now: number = Date.now()): CommandOutput {
+    this.commandsRun++;
+    const [baseCommand, ...rest] = argv;
+    const args = parseArgs(rest);
+
+    if (baseCommand === 'connect' || baseCommand === 'connectOAuth2') {
+      const token = `fake${String(this.commandsRun).padStart(6, '0')}${Math.floor(now).toString(36)}`;
+      this.sessions.set(token, now);
+      return ok([`Connected to ${args.protocol ?? 'https'}://${args.host ?? '127.0.0.1'}:${args.port ?? '11000'}`, `Session token: ${token}`]);
+    }
+    if (args.sessionToken && this.options.sessionTtlMs > 0) {
+      const openedAt = this.sessions.get(args.sessionToken);
+      if (openedAt === undefined || now - openedAt > this.options.sessionTtlMs) {
+        this.sessions.delete(args.sessionToken);
+        return fail('Error: Session has expired. Please reconnect.');
+      }
+    }
+    if (EVENT_COMMANDS.has(baseCommand)) {
+      return this.events(args);
+    }
+
+    const resolved = resolveCommand(baseCommand);
+    if (!resolved) {
+      return ok([]);
+    }
+    const { verb, kind } = resolved;
+    const spec = KINDS[kind];
+    const scope = spec.scope ? spec.scope(args) : [];
+    if (verb === 'showAll') {
+      return this.showAll(kind, spec, scope, args.json !== undefined);
+    }
+
+    const name = spec.key ? spec.key(args, verb) : args.name;
+    if (!name) {
+      return fail(`Error: Missing required parameter: ${kind === 'interface' || kind === 'proxy' ? 'host/port' : '-name'}`);
+    }
+    const entities = this.entities.get(kind)!;
+    const key = entityKey(scope, name);
+    const existing = entities.get(key);
+
+    switch (verb) {
+      case 'add': {
+        if (existing) {
+          return fail(`Error: ${spec.display} '${name}' already exists.`);
+        }
+        const attributes = storedAttributes(args);
+        if (kind === 'rule') {
+          attributes.ruleType = RULE_TYPES[baseCommand] ?? args.action ?? 'Audit';
+        }
+        entities.set(key, { name, scope, attributes });
+        if (kind === 'instance') {
+          this.addInstanceEndpoints(name, args);
+        }
+        return ok([]);
+      }
+      case 'update': {
+        if (!existing) {
+          return fail(`${spec.display} not found: ${name}`);
+        }
+        Object.assign(existing.attributes, storedAttributes(args));
+        const newName = args.newName ?? (kind === 'interface' ? hostPort(args.newHost, args.newPort) : undefined);
+        if (newName && newName !== name) {
+          if (entities.has(entityKey(scope, newName))) {
+            return fail(`Error: ${spec.display} '${newName}' already exists.`);
+          }
+          entities.delete(key);
+          existing.name = newName;
+          entities.set(entityKey(scope, newName), existing);
+        }
+        return ok([]);
+      }
+      case 'delete':
+        if (!existing) {
+          return fail(`${spec.display} not found: ${name}`);
+        }
+        entities.delete(key);
+        return ok([]);
+      default:
+        if (!existing) {
+          return fail(`${spec.display} not found: ${name}`);
+        }
+        return ok((spec.format ?? nameOnly)(existing, this));
+    }
+  }
+
+  /**
+   * Serializable copy of the store
+   */
+  snapshot(): StoreSnapshot {
+    const entities: Record<string, Entity[]> = {};
+    for (const [kind, map] of this.entities) {
+      entities[kind] = [...map.values()];
+    }
+    return { entities, sessions: Object.fromEntries(this.sessions), commandsRun: this.commandsRun };
+  }
+
+  private showAll(kind: string, spec: KindSpec, scope: string[], json: boolean): CommandOutput {
+    const entities = this.list(kind, scope);
+    if (json) {
+      const columns = spec.jsonColumns ?? [['Name', (entity: Entity) => entity.name]];
+      const data = [columns.map(([column]) => column), ...entities.map(entity => columns.map(([, value]) => value(entity)))];
+      return ok([JSON.stringify({ data })]);
+    }
+    if (entities.length === 0) {
+      return ok([spec.empty ?? `No ${spec.plural}`]);
+    }
+    return ok([`${spec.plural}:`, ...entities.map(entity => entity.name)]);
+  }
+
+  private addInstanceEndpoints(instance: string, args: Record<string, string>): void {
+    const iface = hostPort(args.dbHost, args.dbPort);
+    if (!iface) {
+      return;
+    }
+    this.entities.get('interface')!.set(entityKey([instance], iface), { name: iface, scope: [instance], attributes: {} });
+    const proxy = hostPort(args.proxyHost, args.proxyPort);
+    if (proxy) {
+      this.entities.get('proxy')!.set(entityKey([instance, iface], proxy), { name: proxy, scope: [instance, iface], attributes: {} });
+    }
+  }
+
+  /**
+   * Generated rows for event and session listings, so that large outputs and paging can be exercised
+   */
+  private events(args: Record<string, string>): CommandOutput {
+    const instances = this.list('instance').map(entity => entity.name);
+    const count = args.limit ? Math.min(Number(args.limit), this.options.eventRows) : this.options.eventRows;
+    const lines: string[] = [];
+    for (let id = 1; id <= count; id++) {
+      const seconds = String(id % 60).padStart(2, '0');
+      const instance = instances.length > 0 ? instances[id % instances.length] : 'default';
+      lines.push(`: ${id} : 2025-01-01 00:00:${seconds} : ${instance} : SELECT * FROM users WHERE id = ${id}`);
+    }
+    return ok(lines.length > 0 ? lines : ['No Events']);
+  }
+}
+
+/**
+ * Split `-name value` pairs; a flag followed by another flag or by nothing is 'true'
+ * @param tokens Arguments after the base command
+ * @returns Values keyed by parameter name without the dash
+ */
+export function parseArgs(tokens: string[]): Record<string, string> {
+  const args: Record<string, string> = {};
+  for (let i = 0; i < tokens.length; i++) {
+    const token = tokens[i];
+    if (!token.startsWith('-')) {
+      continue;
+    }
+    const next = tokens[i + 1];
+    if (next === undefined || (next.startsWith('-') && !/^-\d/.test(next))) {
+      args[token.slice(1)] = 'true';
+    } else {
+      args[token.slice(1)] = next;
+      i++;
+    }
+  }
+  return args;
+}
+
+function storedAttributes(args: Record<string, string>): Record<string, string> {
+  const attributes: Record<string, string> = {};
+  for (const [name, value] of Object.entries(args)) {
+    if (!TRANSIENT_ARGS.has(name)) {
+      attributes[name] = value;
+    }
+  }
+  return attributes;
+}
+
+function entityKey(scope: string[], name: string): string {
+  return [...scope, name].join('\u0000');
+}
+
+function ok(lines: string[]): CommandOutput {
+  return { stdout: [...lines, ...(lines.length > 0 ? [''] : []), 'OK', ''].join('\n'), stderr: '', exitCode: 0 };
+}
+
+function fail(message: string): CommandOutput {
+  return { stdout: '', stderr: message + '\n', exitCode: 1 };
+}
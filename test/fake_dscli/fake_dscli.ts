@@ -0,0 +1,219 @@
+/**
+ * Fake dscli for offline tests and benchmarks
+ *
+ * Stands in for the DataSunrise CLI without a DataSunrise installation. Point
+ * the server at the wrapper script next to this file:
+ *
+ *   node build/src/index.js --cli-path test/fake_dscli/dscli
+ *
+ * Every command runs against an in-memory entity store (see entity_store.ts).
+ * Run as one process per command, the store only lives for that command
+ * unless FAKE_DSCLI_STATE names a JSON file to keep it in. Started with
+ * `--worker` (e.g. `--cli-pool-size 4 --cli-pool-worker-args --worker`), the
+ * process reads command lines from stdin and ends each response with
+ * `__DSCLI_END__ <exitCode>` on stdout and `__DSCLI_END__` on stderr, like
+ * pooled dscli workers.
+ *
+ * Environment:
+ * - FAKE_DSCLI_LATENCY_MS: delay per command, `200` or a range `100-400`
+ * - FAKE_DSCLI_STARTUP_MS: delay before the first command of a process (JVM start)
+ * - FAKE_DSCLI_FAILURE_RATE: share of commands that fail, 0 to 1
+ * - FAKE_DSCLI_FAILURE_MESSAGE: stderr of failed commands (default: a connection error)
+ * - FAKE_DSCLI_FAILURE_COMMANDS: comma-separated base commands that may fail (default: all)
+ * - FAKE_DSCLI_SEED: seed for latency and failure draws; makes runs repeatable
+ *   (one process per command needs FAKE_DSCLI_STATE as well, or every
+ *   process draws the same numbers)
+ * - FAKE_DSCLI_STATE: JSON file that keeps the store between processes
+ * - FAKE_DSCLI_EVENT_ROWS: rows printed by showEvents/showSessions (default 50)
+ * - FAKE_DSCLI_SESSION_TTL_MS: session lifetime; 0 (default) accepts any token
+ * - FAKE_DSCLI_CRASH_COMMANDS: comma-separated base commands that make the
+ *   process exit halfway through its output (like a crashing JVM)
+ */
+
+import * as fs from 'node:fs';
+import * as readline from 'node:readline';
+import { DSCLI_END_MARKER } from '../../src/cli_worker_pool.js';
+import { CommandOutput, EntityStore, StoreSnapshot } from './entity_store.js';
+
+/**
+ * Settings read from the environment
+ */
+interface FakeDscliOptions {
+  latencyMs: [number, number];
+  startupMs: number;
+  failureRate: number;
+  failureMessage: string;
+  failureCommands: Set<string>;
+  seed?: number;
+  stateFile?: string;
+  eventRows: number;
+  sessionTtlMs: number;
+  crashCommands: Set<string>;
+}
+
+const DEFAULT_FAILURE_MESSAGE = 'java.net.ConnectException: Connection refused';
+
+/**
+ * Read the emulator settings
+ * @param env Environment variables
+ * @returns Parsed settings
+ */
+function readOptions(env: NodeJS.ProcessEnv = process.env): FakeDscliOptions {
+  const commandSet = (value: string | undefined) => new Set((value ?? '').split(',').map(name => name.trim()).filter(name => name.length > 0));
+  const [minLatency, maxLatency = minLatency] = (env.FAKE_DSCLI_LATENCY_MS ?? '0').split('-').map(part => Number(part) || 0);
+  return {
+    latencyMs: [minLatency, Math.max(minLatency, maxLatency)],
+    startupMs: Number(env.FAKE_DSCLI_STARTUP_MS) || 0,
+    failureRate: Math.min(1, Math.max(0, Number(env.FAKE_DSCLI_FAILURE_RATE) || 0)),
+    failureMessage: env.FAKE_DSCLI_FAILURE_MESSAGE || DEFAULT_FAILURE_MESSAGE,
+    failureCommands: commandSet(env.FAKE_DSCLI_FAILURE_COMMANDS),
+    seed: env.FAKE_DSCLI_SEED !== undefined && env.FAKE_DSCLI_SEED !== '' ? Number(env.FAKE_DSCLI_SEED) : undefined,
+    stateFile: env.FAKE_DSCLI_STATE || undefined,
+    eventRows: env.FAKE_DSCLI_EVENT_ROWS !== undefined ? Number(env.FAKE_DSCLI_EVENT_ROWS) || 0 : 50,
+    sessionTtlMs: Number(env.FAKE_DSCLI_SESSION_TTL_MS) || 0,
+    crashCommands: commandSet(env.FAKE_DSCLI_CRASH_COMMANDS),
+  };
+}
+
+/**
+ * Small seeded generator (mulberry32) so injected latency and failures can be repeated
+ */
+function seededRandom(seed: number): () => number {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Split a command line written by the worker pool (see quoteCliArgument)
+ * @param line Command line
+ * @returns argv
+ */
+function splitCommandLine(line: string): string[] {
+  const argv: string[] = [];
+  const pattern = /"((?:\\.|[^"\\])*)"|(\S+)/g;
+  let match: RegExpExecArray | null;
+  while ((match = pattern.exec(line)) !== null) {
+    argv.push(match[1] !== undefined ? match[1].replace(/\\(.)/g, '$1') : match[2]);
+  }
+  return argv;
+}
+
+const HELP_TEXT = [
+  'DataSunrise CLI emulator (fake dscli)',
+  '',
+  'Commands:',
+  '  add<Entity>, update<Entity>, del<Entity>, show<Entity>, show<Entities>',
+  '  connect, connectOAuth2, disconnect, showEvents, showSessions',
+  '  Any other command succeeds without output.',
+  '',
+  'Run with --worker to read command lines from stdin.',
+  '',
+].join('\n');
+
+const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Emulator state of one process
+ */
+class FakeDscli {
+  private store: EntityStore;
+  private random: () => number;
+
+  constructor(private readonly options: FakeDscliOptions) {
+    let snapshot: StoreSnapshot | undefined;
+    if (options.stateFile && fs.existsSync(options.stateFile)) {
+      snapshot = JSON.parse(fs.readFileSync(options.stateFile, 'utf8'));
+    }
+    this.store = new EntityStore(snapshot, { eventRows: options.eventRows, sessionTtlMs: options.sessionTtlMs });
+    // Continue the sequence across processes that share a state file
+    this.random = options.seed !== undefined ? seededRandom(options.seed + this.store.commandsRun) : Math.random;
+  }
+
+  /**
+   * Run one command with the configured latency and failure injection
+   * @param argv Base command and arguments
+   * @returns Emulated output
+   */
+  async run(argv: string[]): Promise<CommandOutput> {
+    const [minLatency, maxLatency] = this.options.latencyMs;
+    const latency = minLatency + (maxLatency - minLatency) * this.random();
+    const failing = this.options.failureRate > 0
+      && (this.options.failureCommands.size === 0 || this.options.failureCommands.has(argv[0]))
+      && this.random() < this.options.failureRate;
+    if (latency > 0) {
+      await delay(latency);
+    }
+    if (this.options.crashCommands.has(argv[0])) {
+      process.stdout.write('Partial output\n', () => process.exit(134));
+      await new Promise(() => undefined);
+    }
+    let output: CommandOutput;
+    if (failing) {
+      // Count the command anyway, so the next process sharing the state file draws new numbers
+      this.store.commandsRun++;
+      output = { stdout: '', stderr: this.options.failureMessage + '\n', exitCode: 1 };
+    } else {
+      output = this.store.execute(argv);
+    }
+    this.saveState();
+    return output;
+  }
+
+  private saveState(): void {
+    if (!this.options.stateFile) {
+      return;
+    }
+    // Write and rename, so a concurrent reader never sees a partial file
+    const temporary = `${this.options.stateFile}.${process.pid}.tmp`;
+    fs.writeFileSync(temporary, JSON.stringify(this.store.snapshot()));
+    fs.renameSync(temporary, this.options.stateFile);
+  }
+}
+
+/**
+ * Serve commands from stdin until it closes
+ */
+async function runWorker(dscli: FakeDscli): Promise<void> {
+  const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of lines) {
+    const argv = splitCommandLine(line);
+    if (argv.length === 0) {
+      continue;
+    }
+    const output = await dscli.run(argv);
+    process.stderr.write(`${output.stderr}${output.stderr === '' || output.stderr.endsWith('\n') ? '' : '\n'}${DSCLI_END_MARKER}\n`);
+    process.stdout.write(`${output.stdout}${output.stdout === '' || output.stdout.endsWith('\n') ? '' : '\n'}${DSCLI_END_MARKER} ${output.exitCode}\n`);
+  }
+}
+
+async function main(): Promise<void> {
+  const argv = process.argv.slice(2);
+  const options = readOptions();
+  if (options.startupMs > 0) {
+    await delay(options.startupMs);
+  }
+  if (argv.length === 0 || argv[0] === '-h' || argv[0] === '--help' || argv[0] === 'help') {
+    process.stdout.write(HELP_TEXT);
+    return;
+  }
+  const dscli = new FakeDscli(options);
+  if (argv[0] === '--worker') {
+    await runWorker(dscli);
+    return;
+  }
+  const output = await dscli.run(argv);
+  process.stdout.write(output.stdout);
+  process.stderr.write(output.stderr);
+  process.exitCode = output.exitCode;
+}
+
+main().catch(error => {
+  process.stderr.write(`fake dscli failed: ${error?.stack ?? error}\n`);
+  process.exit(1);
+});
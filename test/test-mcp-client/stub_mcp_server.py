@@ -0,0 +1,131 @@
+"""
+Stub MCP server for the mcp_client unit tests.
+
+Speaks newline-delimited JSON-RPC on stdin/stdout like the real server and
+answers every request on its own thread, so slow commands finish after fast
+ones. run_cli_command behaves according to `command_name`:
+
+- sleep: waits `arguments.seconds`, then echoes its arguments
+- exit: the server exits at once without answering
+- bad: rejected with a JSON-RPC error, like an unknown command
+- fail: a command that failed (exit code 1)
+- lines: prints `arguments.count` lines `Items:` / `item_<n>`, paged with pageSize/cursor
+- stats: the largest number of commands that were running at once, the
+  ids named by notifications/cancelled and the number of calls per command
+- anything else: echoes its arguments as JSON
+
+Options: `--batch` offers run_cli_batch; `--short-batch` also makes it
+answer one step fewer than it was sent; `--cut-pages` cuts the middle out
+of every page, like a server that applies maxStdoutBytes to pages.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+write_lock = threading.Lock()
+state_lock = threading.Lock()
+running = 0
+max_running = 0
+cancelled = []
+calls = Counter()
+
+
+def send(message):
+    with write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+def reply(request, result):
+    send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+
+
+def tool_result(payload, is_error=False):
+    return {"content": [{"type": "text", "text": json.dumps(payload)}], "isError": is_error}
+
+
+def run_command(name, arguments, options):
+    global running, max_running
+    with state_lock:
+        calls[name] += 1
+        running += 1
+        max_running = max(max_running, running)
+    try:
+        if name == "sleep":
+            time.sleep(float(arguments.get("seconds", 0)))
+        if name == "stats":
+            stdout = json.dumps({"max_running": max_running, "cancelled": cancelled, "calls": calls})
+            return {"command": name, "stdout": stdout, "stderr": "", "exitCode": 0}
+        if name == "fail":
+            return {"command": name, "stdout": "", "stderr": "Error: boom", "exitCode": 1, "error": "Command failed with exit code 1"}
+        if name == "lines":
+            lines = ["Items:\n"] + ["item_%d\n" % i for i in range(int(arguments["count"]))] + ["\n", "OK\n"]
+            start = int(options.get("cursor", "c.0").split(".")[1])
+            size = int(options.get("pageSize", len(lines)))
+            page = {"startLine": start, "lineCount": len(lines[start:start + size]), "totalLines": len(lines)}
+            if start + size < len(lines):
+                page["nextCursor"] = "c.%d" % (start + size)
+            stdout = "".join(lines[start:start + size])
+            if "--cut-pages" in sys.argv and len(stdout) > 20:
+                return {"command": name, "stdout": stdout[:10] + "\n... [%d bytes omitted] ...\n" % (len(stdout) - 20) + stdout[-10:],
+                        "stderr": "", "exitCode": 0, "stdoutBytes": len(stdout), "stdoutOmittedBytes": len(stdout) - 20, "page": page}
+            return {"command": name, "stdout": stdout, "stderr": "", "exitCode": 0, "page": page}
+        return {"command": name, "stdout": json.dumps(arguments, sort_keys=True), "stderr": "", "exitCode": 0}
+    finally:
+        with state_lock:
+            running -= 1
+
+
+def handle(request):
+    method = request.get("method")
+    if method == "initialize":
+        reply(request, {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}}, "serverInfo": {"name": "stub"}})
+    elif method == "tools/list":
+        tools = [{"name": "run_cli_command"}]
+        if "--batch" in sys.argv or "--short-batch" in sys.argv:
+            tools.append({"name": "run_cli_batch"})
+        reply(request, {"tools": tools})
+    elif method == "tools/call" and request["params"]["name"] == "run_cli_batch":
+        steps = request["params"]["arguments"]["steps"]
+        if any(step["command_name"] == "bad" for step in steps):
+            send({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32602, "message": "Invalid batch: unknown command bad"}})
+            return
+        results = []
+        for index, step in enumerate(steps):
+            payload = run_command(step["command_name"], step.get("arguments", {}), {})
+            results.append({"id": str(index + 1), "command_name": step["command_name"],
+                            "status": "succeeded" if payload["exitCode"] == 0 else "failed", "result": payload})
+        if "--short-batch" in sys.argv:
+            results = results[:-1]
+        reply(request, tool_result({"success": all(r["status"] == "succeeded" for r in results), "steps": results}))
+    elif method == "tools/call":
+        arguments = request["params"]["arguments"]
+        name = arguments["command_name"]
+        if name == "exit":
+            sys.stdout.flush()
+            os._exit(3)
+        if name == "bad":
+            send({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32602, "message": "Unknown command: bad"}})
+            return
+        options = {key: value for key, value in arguments.items() if key not in ("command_name", "arguments")}
+        payload = run_command(name, arguments.get("arguments", {}), options)
+        reply(request, tool_result(payload, payload["exitCode"] != 0))
+    elif method == "notifications/cancelled":
+        with state_lock:
+            cancelled.append(request["params"]["requestId"])
+    elif "id" in request:
+        send({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "Method not found"}})
+
+
+def main():
+    print("Stub MCP server starting", flush=True)
+    for line in sys.stdin:
+        threading.Thread(target=handle, args=(json.loads(line),), daemon=True).start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Unit tests for AsyncDataSunriseMCPClient against a stub MCP server subprocess.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../mcp-client')))
+
+from mcp_client import AsyncDataSunriseMCPClient
+
+STUB_SERVER = [sys.executable, os.path.join(os.path.dirname(__file__), 'stub_mcp_server.py')]
+
+
+@pytest.fixture
+def client():
+    client = AsyncDataSunriseMCPClient(server_command=STUB_SERVER, max_concurrency=2)
+    yield client
+    client.close()
+
+
+async def server_stats(client):
+    return json.loads((await client._call_tool("stats", {}))["data"])
+
+
+def test_concurrency_is_bounded_by_max_concurrency(client):
+    async def scenario():
+        started = time.monotonic()
+        responses = await asyncio.gather(*(client._call_tool("sleep", {"seconds": 0.2, "n": n}) for n in range(6)))
+        return responses, time.monotonic() - started, await server_stats(client)
+
+    responses, elapsed, stats = asyncio.run(scenario())
+    assert [json.loads(r["data"])["n"] for r in responses] == list(range(6))
+    assert stats["max_running"] == 2
+    # Three rounds of two calls each
+    assert elapsed >= 0.55
+
+
+def test_timeout_cancels_the_request_on_the_server(client):
+    client.timeout = 0.2
+
+    async def scenario():
+        with pytest.raises(TimeoutError):
+            await client._call_tool("sleep", {"seconds": 1})
+        client.timeout = 5
+        return await server_stats(client)
+
+    stats = asyncio.run(scenario())
+    assert len(stats["cancelled"]) == 1
+    assert client.transport._pending == {}
+
+
+def test_task_cancellation_cancels_the_request_and_frees_its_slot(client):
+    async def scenario():
+        task = asyncio.create_task(client._call_tool("sleep", {"seconds": 2}))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Both slots are free again
+        await asyncio.wait_for(asyncio.gather(client._call_tool("echo", {"n": 1}), client._call_tool("echo", {"n": 2})), 1)
+        return await server_stats(client)
+
+    stats = asyncio.run(scenario())
+    assert len(stats["cancelled"]) == 1
+    assert client.transport._pending == {}
+
+
+def test_client_can_be_reused_by_another_event_loop(client):
+    async def scenario(n):
+        return await asyncio.gather(*(client._call_tool("echo", {"n": n + i}) for i in range(3)))
+
+    first = asyncio.run(scenario(0))
+    second = asyncio.run(scenario(10))
+    assert [json.loads(r["data"])["n"] for r in first + second] == [0, 1, 2, 10, 11, 12]
+
+
+def test_command_methods_are_awaitable(client):
+    async def scenario():
+        async with client:
+            return await client.host_show_one("web1")
+
+    response = asyncio.run(scenario())
+    assert response["status"] == "success"
+    assert json.loads(response["data"]) == {"name": "web1"}
+    assert client.transport.closed
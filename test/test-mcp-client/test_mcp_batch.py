@@ -0,0 +1,120 @@
+"""
+Unit tests for DataSunriseMCPClient.batch() against a stub MCP server subprocess.
+"""
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../mcp-client')))
+
+from mcp_client import DataSunriseMCPClient, ResponseCache
+
+STUB_SERVER = [sys.executable, os.path.join(os.path.dirname(__file__), 'stub_mcp_server.py')]
+
+
+def make_client(*server_options, **kwargs):
+    return DataSunriseMCPClient(server_command=STUB_SERVER + list(server_options), timeout=10, **kwargs)
+
+
+def server_calls(client):
+    return json.loads(client._call_tool("stats", {})["data"])["calls"]
+
+
+def test_batch_sends_one_run_cli_batch_request():
+    with make_client("--batch") as client:
+        with client.batch() as batch:
+            added = batch.host_add(name="web1", host_address="10.0.0.1")
+            failed = batch._call_tool("fail", {})
+            shown = batch.host_show_one("web1")
+        assert json.loads(added.result(0)["data"]) == {"host": "10.0.0.1", "name": "web1"}
+        assert failed.result(0)["status"] == "error"
+        assert failed.result(0)["error"] == "Command failed with exit code 1"
+        assert shown.result(0)["status"] == "success"
+        assert "run_cli_batch" in client._server_tools()
+
+
+def test_batch_rejected_as_a_whole_gives_every_call_an_error():
+    with make_client("--batch") as client:
+        with client.batch() as batch:
+            first = batch.host_show_all()
+            second = batch._call_tool("bad", {})
+        for future in (first, second):
+            assert future.result(0)["status"] == "error"
+            assert future.result(0)["code"] == -32602
+        assert "host_show_all" not in server_calls(client)
+
+
+def test_steps_missing_from_the_batch_result_resolve_with_an_error():
+    with make_client("--short-batch") as client:
+        with client.batch() as batch:
+            first = batch.host_show_one("web1")
+            last = batch.host_show_one("web2")
+        assert first.result(0)["status"] == "success"
+        assert last.result(0)["status"] == "error"
+        assert "no result" in last.result(0)["error"]
+
+
+def test_pipelined_fallback_keeps_order_and_parallelism():
+    with make_client() as client:
+        started = time.monotonic()
+        with client.batch(max_parallel=2) as batch:
+            futures = [batch._call_tool("sleep", {"seconds": 0.2, "n": n}) for n in range(4)]
+        elapsed = time.monotonic() - started
+        assert [json.loads(f.result(0)["data"])["n"] for f in futures] == [0, 1, 2, 3]
+        assert 0.35 <= elapsed < 0.8
+        stats = json.loads(client._call_tool("stats", {})["data"])
+        assert stats["max_running"] == 2
+        assert "run_cli_batch" not in client._server_tools()
+
+
+def test_exception_in_the_block_discards_the_calls():
+    with make_client("--batch") as client:
+        with pytest.raises(RuntimeError):
+            with client.batch() as batch:
+                added = batch.host_add(name="web1", host_address="10.0.0.1")
+                raise RuntimeError("changed my mind")
+        assert added.cancelled()
+        assert "host_add" not in server_calls(client)
+        with pytest.raises(RuntimeError):
+            batch.host_show_all()
+
+
+def test_batch_shares_client_state():
+    cache = ResponseCache()
+    with make_client("--batch", cache=cache) as client:
+        client.host_show_all()
+        batch = client.batch()
+        assert batch.cache is cache
+        assert batch.transport is client.transport
+        with pytest.raises(TypeError):
+            batch.iter_db_users()
+        with batch:
+            batch.host_add(name="web1", host_address="10.0.0.1")
+        # The write invalidated the cached host list
+        assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("server_options", [("--batch",), ()])
+def test_batched_connect_updates_the_client_session(server_options):
+    with make_client(*server_options) as client:
+        with client.batch() as batch:
+            connected = batch.connect(login="admin", password="secret")
+            batch.host_show_all()
+        assert connected.result(0)["status"] == "success"
+        assert client.session_active
+
+
+def test_pipelined_timeout_cancels_the_requests_in_flight():
+    with make_client() as client:
+        client.timeout = 0.2
+        with pytest.raises(TimeoutError):
+            with client.batch(max_parallel=2) as batch:
+                futures = [batch._call_tool("sleep", {"seconds": 1, "n": n}) for n in range(3)]
+        assert all(future.done() for future in futures)
+        client.timeout = 10
+        stats = json.loads(client._call_tool("stats", {})["data"])
+        assert len(stats["cancelled"]) == 2
+        assert client.transport._pending == {}
@@ -0,0 +1,58 @@
+"""
+Unit tests for the row iterators of the Python client against a stub MCP server subprocess.
+"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../mcp-client')))
+
+from mcp_client import AsyncDataSunriseMCPClient, DataSunriseMCPClient, MCPCommandError
+
+STUB_SERVER = [sys.executable, os.path.join(os.path.dirname(__file__), 'stub_mcp_server.py')]
+
+ROWS = [{"value": "item_%d" % i} for i in range(25)]
+
+
+def test_rows_are_read_page_by_page():
+    with DataSunriseMCPClient(server_command=STUB_SERVER, timeout=10) as client:
+        assert list(client.iter_rows("lines", {"count": 25}, page_size=4)) == ROWS
+        assert json.loads(client._call_tool("stats", {})["data"])["calls"]["lines"] == 7
+
+
+def test_async_rows_are_read_page_by_page():
+    async def collect(client):
+        return [row async for row in client.iter_rows("lines", {"count": 25}, page_size=4)]
+
+    client = AsyncDataSunriseMCPClient(server_command=STUB_SERVER, timeout=10)
+    try:
+        assert asyncio.run(collect(client)) == ROWS
+    finally:
+        client.close()
+
+
+def test_failed_command_raises():
+    with DataSunriseMCPClient(server_command=STUB_SERVER, timeout=10) as client:
+        with pytest.raises(MCPCommandError):
+            list(client.iter_rows("fail", {}))
+
+
+def test_cut_page_raises_instead_of_yielding_broken_rows():
+    with DataSunriseMCPClient(server_command=STUB_SERVER + ["--cut-pages"], timeout=10) as client:
+        with pytest.raises(MCPCommandError, match="bytes out of a page"):
+            list(client.iter_rows("lines", {"count": 25}, page_size=10))
+
+
+def test_async_cut_page_raises():
+    async def collect(client):
+        return [row async for row in client.iter_rows("lines", {"count": 25}, page_size=10)]
+
+    client = AsyncDataSunriseMCPClient(server_command=STUB_SERVER + ["--cut-pages"], timeout=10)
+    try:
+        with pytest.raises(MCPCommandError):
+            asyncio.run(collect(client))
+    finally:
+        client.close()
@@ -0,0 +1,145 @@
+"""
+Unit tests for ResponseCache with a fake clock.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../mcp-client')))
+
+from mcp_client import ResponseCache
+
+OK = {"status": "success", "data": "rows"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ResponseCache(ttl=30, max_entries=3, clock=clock)
+
+
+def store(cache, tool_name, args=None, response=OK):
+    cached, ticket = cache.begin(tool_name, args or {})
+    assert cached is None
+    cache.finish(tool_name, ticket, response)
+
+
+def cached(cache, tool_name, args=None):
+    return cache.begin(tool_name, args or {})[0]
+
+
+def test_reads_are_cached_until_their_ttl(cache, clock):
+    store(cache, "host_show_one", {"name": "web1", "unused": None})
+    assert cached(cache, "host_show_one", {"name": "web1"}) is OK
+    assert cached(cache, "host_show_one", {"name": "web2"}) is None
+    clock.now = 30
+    assert cached(cache, "host_show_one", {"name": "web1"}) is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_failed_responses_are_not_cached(cache):
+    store(cache, "host_show_all", response={"status": "error", "error": "boom"})
+    assert cached(cache, "host_show_all") is None
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    for name in ("a", "b", "c"):
+        store(cache, "host_show_one", {"name": name})
+    assert cached(cache, "host_show_one", {"name": "a"}) is OK
+    store(cache, "host_show_one", {"name": "d"})
+    assert cached(cache, "host_show_one", {"name": "b"}) is None
+    assert cached(cache, "host_show_one", {"name": "a"}) is OK
+    assert cache.stats()["evicted"] == 1
+
+
+def test_write_evicts_its_family_and_related_families(cache):
+    store(cache, "instance_show_all")
+    store(cache, "instance_proxy_show_all")
+    store(cache, "host_show_all")
+    cache.finish("instance_update", *cache.begin("instance_update", {})[1:], OK)
+    assert cached(cache, "instance_show_all") is None
+    assert cached(cache, "instance_proxy_show_all") is None
+    assert cached(cache, "host_show_all") is OK
+
+    store(cache, "instance_show_one", {"name": "db"})
+    cache.invalidate("instance_proxy_add")
+    assert cached(cache, "instance_show_one", {"name": "db"}) is None
+    assert cached(cache, "host_show_all") is OK
+
+
+def test_family_is_matched_on_whole_words(cache):
+    store(cache, "host_show_all")
+    store(cache, "hostname_show_all")
+    cache.invalidate("host_delete")
+    assert cached(cache, "host_show_all") is None
+    assert cached(cache, "hostname_show_all") is OK
+
+
+def test_imports_evict_the_family_they_change(cache):
+    store(cache, "db_user_show_all")
+    store(cache, "host_show_all")
+    cache.invalidate("import_users")
+    assert cached(cache, "db_user_show_all") is None
+    assert cached(cache, "host_show_all") is OK
+
+
+@pytest.mark.parametrize("tool_name", ["connect", "dictionary_recover", "dictionary_clean"])
+def test_cache_clears_drop_every_entry(cache, tool_name):
+    store(cache, "host_show_all")
+    store(cache, "instance_show_all")
+    cache.invalidate(tool_name)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["invalidated"] == 2
+
+
+def test_write_between_begin_and_finish_is_not_stored(cache):
+    _, ticket = cache.begin("host_show_all", {})
+    cache.begin("host_add", {"name": "web1"})
+    cache.finish("host_show_all", ticket, OK)
+    assert cached(cache, "host_show_all") is None
+
+
+def test_unrelated_write_between_begin_and_finish_is_not_stored(cache):
+    # Invalidations bump one generation for the whole cache
+    _, ticket = cache.begin("host_show_all", {})
+    cache.invalidate("instance_update")
+    cache.finish("host_show_all", ticket, OK)
+    assert cached(cache, "host_show_all") is None
+
+
+def test_write_invalidates_again_when_it_finishes(cache):
+    _, ticket = cache.begin("host_add", {"name": "web1"})
+    assert ticket is None
+    # A read that starts and finishes while the write is running
+    store(cache, "host_show_all")
+    cache.finish("host_add", ticket, OK)
+    assert cached(cache, "host_show_all") is None
+
+
+def test_stats_count_hits_and_misses(cache):
+    store(cache, "host_show_all")
+    cached(cache, "host_show_all")
+    cached(cache, "host_show_all")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        ResponseCache(ttl=0)
+    with pytest.raises(ValueError):
+        ResponseCache(max_entries=0)
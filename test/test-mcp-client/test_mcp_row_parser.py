@@ -0,0 +1,37 @@
+"""
+Checks that the client's _RowParser gives the same rows as the server's
+output parser (src/output_parser.ts) on the shared fixture outputs.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../mcp-client')))
+
+from mcp_client import _RowParser
+
+CASES_PATH = os.path.join(os.path.dirname(__file__), '../command_test/output_parser_test_cases.json')
+
+with open(CASES_PATH, encoding='utf-8') as cases_file:
+    TEST_CASES = json.load(cases_file)
+
+
+def parse(chunks):
+    parser = _RowParser()
+    rows = []
+    for chunk in chunks:
+        rows.extend(parser.feed(chunk))
+    return rows + parser.finish()
+
+
+@pytest.mark.parametrize("case", TEST_CASES, ids=[case["name"] for case in TEST_CASES])
+def test_rows_match_the_server_parser(case):
+    assert parse([case["output"]]) == case["rows"]
+
+
+@pytest.mark.parametrize("case", TEST_CASES, ids=[case["name"] for case in TEST_CASES])
+def test_chunked_output_gives_the_same_rows(case):
+    output = case["output"]
+    assert parse(output[i:i + 3] for i in range(0, len(output), 3)) == case["rows"]
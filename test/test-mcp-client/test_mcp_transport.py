@@ -0,0 +1,106 @@
+"""
+Unit tests for StdioTransport against a stub MCP server subprocess.
+"""
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../mcp-client')))
+
+from mcp_client import MCPError, MCPTransportError, StdioTransport
+
+STUB_SERVER = [sys.executable, os.path.join(os.path.dirname(__file__), 'stub_mcp_server.py')]
+
+
+def tool_call(command_name, **arguments):
+    return {"name": "run_cli_command", "arguments": {"command_name": command_name, "arguments": arguments}}
+
+
+def stdout_of(result):
+    return json.loads(result["content"][0]["text"])["stdout"]
+
+
+@pytest.fixture
+def transport():
+    transport = StdioTransport(STUB_SERVER)
+    transport.start(timeout=10)
+    yield transport
+    transport.close()
+
+
+def test_handshake_skips_non_protocol_output(transport):
+    assert transport.started
+    assert transport.server_info == {"name": "stub"}
+
+
+def test_out_of_order_responses_reach_their_requests(transport):
+    slow = transport.send_request("tools/call", tool_call("sleep", seconds=0.5))
+    fast = transport.send_request("tools/call", tool_call("echo", value="fast"))
+    assert slow.request_id != fast.request_id
+    assert json.loads(stdout_of(fast.result(5))) == {"value": "fast"}
+    assert not slow.done()
+    assert json.loads(stdout_of(slow.result(5))) == {"seconds": 0.5}
+
+
+def test_error_response_raises_mcp_error(transport):
+    with pytest.raises(MCPError) as error:
+        transport.request("tools/call", tool_call("bad"), timeout=5)
+    assert error.value.code == -32602
+
+
+def test_timeout_cancels_the_request(transport):
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        transport.request("tools/call", tool_call("sleep", seconds=1), timeout=0.2)
+    assert time.monotonic() - started < 1
+    assert transport._pending == {}
+    stats = json.loads(stdout_of(transport.request("tools/call", tool_call("stats"), timeout=5)))
+    # initialize was request 1, the timed out call request 2
+    assert stats["cancelled"] == [2]
+    # The late response is dropped without disturbing later requests
+    time.sleep(1)
+    assert json.loads(stdout_of(transport.request("tools/call", tool_call("echo", n=1), timeout=5))) == {"n": 1}
+
+
+def test_cancel_resolves_future_as_cancelled(transport):
+    future = transport.send_request("tools/call", tool_call("sleep", seconds=1))
+    transport.cancel(future, "test")
+    assert future.cancelled()
+    transport.cancel(future, "again")  # no second notification
+    stats = json.loads(stdout_of(transport.request("tools/call", tool_call("stats"), timeout=5)))
+    assert stats["cancelled"] == [future.request_id]
+
+
+def test_server_exit_fails_pending_requests(transport):
+    pending = transport.send_request("tools/call", tool_call("sleep", seconds=5))
+    exiting = transport.send_request("tools/call", tool_call("exit"))
+    for future in (pending, exiting):
+        with pytest.raises(MCPTransportError):
+            future.result(5)
+    assert transport.closed
+    with pytest.raises(MCPTransportError):
+        transport.send_request("tools/call", tool_call("echo"))
+
+
+def test_close_stops_server_and_fails_pending_requests():
+    transport = StdioTransport(STUB_SERVER)
+    transport.start(timeout=10)
+    pending = transport.send_request("tools/call", tool_call("sleep", seconds=5))
+    started = time.monotonic()
+    transport.close()
+    assert time.monotonic() - started < 5
+    assert transport.process.poll() is not None
+    with pytest.raises(MCPTransportError):
+        pending.result(1)
+    transport.close()  # closing twice is harmless
+    with pytest.raises(MCPTransportError):
+        transport.start()
+
+
+def test_start_is_idempotent(transport):
+    process = transport.process
+    transport.start()
+    assert transport.process is process